@@ -0,0 +1,77 @@
+"""
+Benchmark: reportes agrupados de cohortes con MotorAnaliticas.
+
+Crea N alumnos con carrera, semestre, año de ingreso y matrículas aleatorias, proyecta las
+columnas y mide consultas en frío (construyendo el índice de grupos) y en caliente (índice en
+caché), además del costo de mantener la proyección al día tras cambios de matrícula.
+
+Uso (desde src/):  python -m benchmarks.benchmark_analiticas [alumnos]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from models.TiposEstudiante.Estudiante import Estudiante
+from models.TiposEstudiante.EstudianteMagister import EstudianteMagister
+from services.MotorAnaliticas import MotorAnaliticas
+
+CARRERAS = ["Ingeniería Informática", "Ingeniería Civil", "Medicina", "Derecho", "Arquitectura",
+            "Psicología", "Magíster en Informática", "Química", "Física", "Pedagogía"]
+
+def crear_repositorio(cantidad: int, aleatorio: random.Random) -> RepositorioAlumnos:
+    repositorio = RepositorioAlumnos()
+    for i in range(cantidad):
+        fecha = datetime(aleatorio.randint(2015, 2025), 3, 1)
+        carrera = aleatorio.choice(CARRERAS)
+        if i % 10 == 0:
+            alumno = EstudianteMagister(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", fecha, carrera, "Tesis")
+        else:
+            alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", fecha, carrera)
+        for _ in range(aleatorio.randrange(10)):
+            alumno.avanzar_semestre()
+        for j in range(aleatorio.randrange(7)):
+            alumno.matricular_asignatura(f"ASG{j:03d}")
+        repositorio.agregar(alumno)
+    return repositorio
+
+def medir(nombre: str, consulta) -> None:
+    inicio = time.perf_counter()
+    consulta()
+    frio = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    resultado = consulta()
+    caliente = time.perf_counter() - inicio
+    print(f"{nombre:<44} frío {frio * 1000:8.1f} ms, en caché {caliente * 1000:8.1f} ms ({len(resultado)} grupos)")
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    aleatorio = random.Random(11)
+    print(f"=== Benchmark analíticas de cohortes: {cantidad} alumnos ===")
+    repositorio = crear_repositorio(cantidad, aleatorio)
+    
+    inicio = time.perf_counter()
+    motor = MotorAnaliticas(repositorio)
+    print(f"Proyección inicial: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    
+    medir("Conteo por carrera y tipo", lambda: motor.agrupar(['carrera', 'tipo']))
+    medir("Matrículas por carrera (promedio, p50, p90)", lambda: motor.agrupar(['carrera'], 'matriculas'))
+    medir("Semestre por año de ingreso", lambda: motor.agrupar(['anio_ingreso'], 'semestre_actual'))
+    medir("Matrículas por semestre, solo pregrado",
+          lambda: motor.agrupar(['semestre_actual'], 'matriculas', filtros={'tipo': 'Estudiante Pregrado'}))
+    
+    # Cambios de matrícula: actualizan la columna en su lugar sin invalidar el índice por carrera
+    alumnos = repositorio.obtener_todos()
+    inicio = time.perf_counter()
+    for alumno in aleatorio.sample(alumnos, min(10000, len(alumnos))):
+        alumno.matricular_asignatura("ASG999")
+        repositorio.actualizar(alumno.id, alumno)
+    duracion = time.perf_counter() - inicio
+    print(f"10000 matrículas propagadas a la proyección: {duracion * 1000:.0f} ms")
+    inicio = time.perf_counter()
+    motor.agrupar(['carrera'], 'matriculas')
+    print(f"{'Matrículas por carrera tras los cambios':<44} {(time.perf_counter() - inicio) * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Benchmark: latencia de búsqueda BM25 sobre un corpus sintético de publicaciones.
+
+Genera artículos con un vocabulario de distribución Zipf (pocas palabras muy frecuentes y
+muchas raras), los indexa de forma incremental en BuscadorPublicaciones y mide la latencia
+de consultas de 1 a 3 términos, con y sin filtro por tipo de autor.
+
+Uso (desde src/):  python -m benchmarks.benchmark_busqueda [articulos] [consultas]
+"""
+
+import itertools
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+from services.BuscadorPublicaciones import BuscadorPublicaciones
+from models.TiposEstudiante.EstudianteMagister import EstudianteMagister
+from models.TiposEstudiante.Titulado import Titulado
+
+SILABAS = ["ma", "te", "ri", "co", "la", "ne", "to", "sa", "pro", "gra", "ci", "on", "da", "tos", "red", "lo",
+           "gi", "ca", "mo", "de", "lar", "sis", "tem", "in", "for", "ti", "va", "cu", "al", "es"]
+
+def crear_vocabulario(tamano: int, aleatorio: random.Random) -> list:
+    palabras = set()
+    while len(palabras) < tamano:
+        palabras.add("".join(aleatorio.choice(SILABAS) for _ in range(aleatorio.randint(2, 4))))
+    return sorted(palabras)
+
+def crear_autores(cantidad: int) -> list:
+    especialidades = ["Programación", "Bases de Datos", "Redes", "Inteligencia Artificial", "Educación"]
+    autores = []
+    for i in range(cantidad):
+        if i % 2:
+            autores.append(Titulado(f"PROF{i:05d}", "Nombre", "Apellido", f"prof{i}@uv.cl", datetime.now(),
+                                    "Doctor", especialidades[i % len(especialidades)]))
+        else:
+            autores.append(EstudianteMagister(f"MAG{i:05d}", "Nombre", "Apellido", f"mag{i}@uv.cl", datetime.now(),
+                                              "Magíster en Informática", "Tesis"))
+    return autores
+
+def percentil(valores: list, fraccion: float) -> float:
+    return valores[min(int(len(valores) * fraccion), len(valores) - 1)] * 1000
+
+def main():
+    cantidad_articulos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    cantidad_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    aleatorio = random.Random(7)
+    vocabulario = crear_vocabulario(50000, aleatorio)
+    pesos_acumulados = list(itertools.accumulate(1 / rango for rango in range(1, len(vocabulario) + 1)))
+    autores = crear_autores(2000)
+    buscador = BuscadorPublicaciones()
+    print(f"=== Benchmark búsqueda BM25: {cantidad_articulos} artículos, {cantidad_consultas} consultas ===")
+    
+    inicio = time.perf_counter()
+    for i in range(cantidad_articulos):
+        palabras = aleatorio.choices(vocabulario, cum_weights=pesos_acumulados, k=aleatorio.randint(20, 60))
+        articulo = {'titulo': " ".join(palabras[:6]), 'contenido': " ".join(palabras[6:])}
+        buscador.indexar_articulo(autores[i % len(autores)], articulo)
+    duracion = time.perf_counter() - inicio
+    estadisticas = buscador.obtener_estadisticas()
+    memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"Indexación: {duracion:.1f} s ({cantidad_articulos / duracion:.0f} artículos/s), "
+          f"{estadisticas['terminos']} términos, {estadisticas['entradas']} entradas, memoria máx. {memoria:.0f} MB")
+    
+    # Consultas con términos de frecuencia media a baja y una palabra frecuente ocasional
+    escenarios = [("1 término", 1, None), ("2 términos", 2, None), ("3 términos", 3, None),
+                  ("2 términos + filtro tipo", 2, "Titulado/Profesor")]
+    for nombre, cantidad_terminos, tipo in escenarios:
+        latencias = []
+        for _ in range(cantidad_consultas):
+            consulta = " ".join(vocabulario[int(aleatorio.paretovariate(0.5)) % len(vocabulario)]
+                                for _ in range(cantidad_terminos))
+            inicio = time.perf_counter()
+            buscador.buscar(consulta, k=10, tipo=tipo)
+            latencias.append(time.perf_counter() - inicio)
+        latencias.sort()
+        print(f"{nombre:<28} p50 {percentil(latencias, 0.5):8.2f} ms, p95 {percentil(latencias, 0.95):8.2f} ms, "
+              f"p99 {percentil(latencias, 0.99):8.2f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Benchmark: RepositorioCache sobre un repositorio lento (sustituto local de un almacenamiento en disco o remoto).
+
+RepositorioLento envuelve un RepositorioAlumnos y agrega una latencia fija a cada lectura y
+escritura. Se comparan, con la misma secuencia de accesos, el repositorio sin caché y la caché
+con políticas LRU y TinyLFU, en una carga con popularidad Zipf mezclada con recorridos de IDs
+que se usan una sola vez (que contaminan una LRU) y consultas de IDs inexistentes.
+
+Uso (desde src/):  python -m benchmarks.benchmark_cache [alumnos] [accesos] [capacidad] [latencia_us]
+"""
+
+import bisect
+import itertools
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioCache import RepositorioCache, LRU, TINYLFU, ESCRITURA_DIRECTA, ESCRITURA_DIFERIDA
+from models.TiposEstudiante.Estudiante import Estudiante
+
+class RepositorioLento:
+    """Sustituto de un repositorio lento: delega en memoria y espera 'latencia' segundos por operación."""
+    
+    def __init__(self, repositorio: RepositorioAlumnos, latencia: float):
+        self._repositorio = repositorio
+        self._latencia = latencia
+        self.lecturas = 0
+        self.escrituras = 0
+    
+    def _esperar(self) -> None:
+        fin = time.perf_counter() + self._latencia
+        while time.perf_counter() < fin:
+            pass
+    
+    def obtener_por_id(self, id: str):
+        self.lecturas += 1
+        self._esperar()
+        return self._repositorio.obtener_por_id(id)
+    
+    def actualizar(self, id: str, alumno) -> bool:
+        self.escrituras += 1
+        self._esperar()
+        return self._repositorio.actualizar(id, alumno)
+    
+    def aplicar_lote(self, operaciones) -> bool:
+        # Un lote paga una sola latencia de ida y vuelta
+        self.escrituras += 1
+        self._esperar()
+        return self._repositorio.aplicar_lote(operaciones)
+    
+    def __getattr__(self, nombre: str):
+        return getattr(self._repositorio, nombre)
+
+def generar_accesos(cantidad: int, accesos: int, aleatorio: random.Random):
+    """Zipf(1.0) sobre los IDs, con un recorrido secuencial de IDs fríos cada 2000 accesos y 5% de IDs inexistentes."""
+    acumulados = list(itertools.accumulate(1.0 / (rango + 1) for rango in range(cantidad)))
+    total = acumulados[-1]
+    permutacion = list(range(cantidad))
+    aleatorio.shuffle(permutacion)
+    secuencia = []
+    frio = 0
+    while len(secuencia) < accesos:
+        if len(secuencia) % 2000 == 0:
+            for _ in range(500):
+                secuencia.append(f"EST{permutacion[-1 - frio % cantidad]:07d}")
+                frio += 1
+        elif aleatorio.random() < 0.05:
+            secuencia.append(f"NOEXISTE{aleatorio.randrange(200):03d}")
+        else:
+            rango = min(bisect.bisect_left(acumulados, aleatorio.random() * total), cantidad - 1)
+            secuencia.append(f"EST{permutacion[rango]:07d}")
+    return secuencia[:accesos]
+
+def ejecutar(nombre: str, repositorio, lento: RepositorioLento, accesos) -> None:
+    lento.lecturas = 0
+    inicio = time.perf_counter()
+    for id in accesos:
+        repositorio.obtener_por_id(id)
+    duracion = time.perf_counter() - inicio
+    tasa = ""
+    if isinstance(repositorio, RepositorioCache):
+        metricas = repositorio.obtener_metricas()
+        tasa = f", tasa de aciertos {metricas['tasa_aciertos']:.3f} (negativos {metricas['aciertos_negativos']})"
+    print(f"{nombre:<22} {duracion * 1000:8.0f} ms, {lento.lecturas:7d} lecturas al repositorio{tasa}")
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    total_accesos = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    capacidad = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    latencia = (int(sys.argv[4]) if len(sys.argv) > 4 else 50) / 1e6
+    aleatorio = random.Random(29)
+    print(f"=== Benchmark caché de repositorio: {cantidad} alumnos, {total_accesos} accesos, "
+          f"capacidad {capacidad}, latencia {latencia * 1e6:.0f} µs ===")
+    base = RepositorioAlumnos()
+    for i in range(cantidad):
+        base.agregar(Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2024, 3, 1), "Ingeniería"))
+    lento = RepositorioLento(base, latencia)
+    accesos = generar_accesos(cantidad, total_accesos, aleatorio)
+    
+    ejecutar("Sin caché", lento, lento, accesos)
+    ejecutar("LRU", RepositorioCache(lento, capacidad, LRU), lento, accesos)
+    ejecutar("TinyLFU", RepositorioCache(lento, capacidad, TINYLFU), lento, accesos)
+    
+    # Escrituras: 10000 actualizaciones de alumnos populares, directas vs diferidas en lotes de 100
+    populares = [id for id in accesos if id.startswith("EST")][:10000]
+    for escritura in (ESCRITURA_DIRECTA, ESCRITURA_DIFERIDA):
+        cache = RepositorioCache(lento, capacidad, LRU, escritura)
+        lento.escrituras = 0
+        inicio = time.perf_counter()
+        for id in populares:
+            cache.actualizar(id, cache.obtener_por_id(id))
+        cache.sincronizar()
+        duracion = time.perf_counter() - inicio
+        print(f"Actualizar ({escritura:<13}) {duracion * 1000:8.0f} ms, {lento.escrituras:7d} escrituras al repositorio")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""
+Benchmark: cierre masivo de semestre con GestorCierreSemestre.cerrar_semestre.
+
+Crea N alumnos matriculados en hasta 6 asignaturas y compara el cierre en una sola pasada por
+lotes (avance de semestre, archivo compacto de matrículas y vaciado de ambos lados) con el
+enfoque anterior: avanzar_semestre, desmatricular asignatura por asignatura y actualizar cada
+objeto.
+
+Uso (desde src/):  python -m benchmarks.benchmark_cierre_semestre [alumnos] [asignaturas]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from models.Asignatura import Asignatura
+from models.TiposEstudiante.Estudiante import Estudiante
+from services.ControlCreditos import ControlCreditos
+from services.ControlHorarios import ControlHorarios
+from services.GestorMatriculas import GestorMatriculas
+from services.GestorCierreSemestre import GestorCierreSemestre
+
+def crear_datos(cantidad: int, asignaturas: int, aleatorio: random.Random):
+    repositorio_alumnos = RepositorioAlumnos()
+    repositorio_asignaturas = RepositorioAsignaturas()
+    for j in range(asignaturas):
+        repositorio_asignaturas.agregar(Asignatura(f"ASG{j:04d}", "Asignatura", 6, j % 10 + 1, "PROF001"))
+    ids_asignaturas = [f"ASG{j:04d}" for j in range(asignaturas)]
+    for i in range(cantidad):
+        alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2024, 3, 1), "Ingeniería")
+        for asignatura_id in aleatorio.sample(ids_asignaturas, aleatorio.randrange(7)):
+            alumno.matricular_asignatura(asignatura_id)
+            repositorio_asignaturas.obtener_por_id(asignatura_id).agregar_estudiante(alumno.id)
+        repositorio_alumnos.agregar(alumno)
+    return repositorio_alumnos, repositorio_asignaturas
+
+def crear_gestor(repositorio_alumnos, repositorio_asignaturas) -> GestorCierreSemestre:
+    # Controles vacíos: el benchmark mide el cierre, no la reconstrucción inicial de índices
+    matriculas = GestorMatriculas(repositorio_alumnos, repositorio_asignaturas,
+                                  control_horarios=ControlHorarios(), control_creditos=ControlCreditos())
+    return GestorCierreSemestre(repositorio_alumnos, repositorio_asignaturas, matriculas)
+
+def cierre_ingenuo(repositorio_alumnos, repositorio_asignaturas) -> None:
+    for alumno in repositorio_alumnos.obtener_todos():
+        alumno.avanzar_semestre()
+        for asignatura_id in alumno.asignaturas_matriculadas:
+            asignatura = repositorio_asignaturas.obtener_por_id(asignatura_id)
+            asignatura.remover_estudiante(alumno.id)
+            repositorio_asignaturas.actualizar(asignatura_id, asignatura)
+            alumno.desmatricular_asignatura(asignatura_id)
+        repositorio_alumnos.actualizar(alumno.id, alumno)
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    asignaturas = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    aleatorio = random.Random(23)
+    print(f"=== Benchmark cierre de semestre: {cantidad} alumnos, {asignaturas} asignaturas ===")
+    
+    repositorio_alumnos, repositorio_asignaturas = crear_datos(cantidad, asignaturas, aleatorio)
+    inicio = time.perf_counter()
+    cierre_ingenuo(repositorio_alumnos, repositorio_asignaturas)
+    duracion = time.perf_counter() - inicio
+    print(f"Enfoque anterior: {duracion * 1000:.0f} ms ({duracion / cantidad * 1e6:.2f} µs por alumno, sin archivar matrículas)")
+    del repositorio_alumnos, repositorio_asignaturas
+    
+    repositorio_alumnos, repositorio_asignaturas = crear_datos(cantidad, asignaturas, aleatorio)
+    gestor = crear_gestor(repositorio_alumnos, repositorio_asignaturas)
+    avances = []
+    inicio = time.perf_counter()
+    resumen = gestor.cerrar_semestre("2025-1", lambda procesados, total: avances.append(procesados), tamano_lote=50000)
+    duracion = time.perf_counter() - inicio
+    print(f"cerrar_semestre ({cantidad} alumnos): {duracion * 1000:.0f} ms ({duracion / cantidad * 1e6:.2f} µs por alumno), "
+          f"{len(avances)} reportes de progreso")
+    print(f"Resumen: {resumen}")
+    print(f"Historial: {gestor._historial_semestres.obtener_estadisticas()}")
+    
+    inicio = time.perf_counter()
+    for i in range(0, cantidad, max(1, cantidad // 1000)):
+        gestor.obtener_historial_matriculas(f"EST{i:07d}")
+    print(f"1000 consultas de historial: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Benchmark: matriz de co-matrícula y pares de asignaturas más compartidos (MatrizCoMatricula).
+
+Crea N alumnos con hasta 7 asignaturas cada uno (con algunas asignaturas más populares), y mide
+la reconstrucción completa (en serie y repartida en procesos), el mantenimiento incremental
+tras cambios de matrícula y la consulta de los k pares con más alumnos en común, comparando
+con el conteo ingenuo por alumno con diccionarios.
+
+Uso (desde src/):  python -m benchmarks.benchmark_comatricula [alumnos] [asignaturas] [procesos]
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from models.TiposEstudiante.Estudiante import Estudiante
+from services.MatrizCoMatricula import MatrizCoMatricula
+
+def crear_repositorio(cantidad: int, asignaturas: int, aleatorio: random.Random) -> RepositorioAlumnos:
+    repositorio = RepositorioAlumnos()
+    ids_asignaturas = [f"ASG{j:04d}" for j in range(asignaturas)]
+    pesos = [1.0 / (j + 1) ** 0.5 for j in range(asignaturas)]
+    for i in range(cantidad):
+        alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2024, 3, 1), "Ingeniería")
+        for asignatura_id in set(aleatorio.choices(ids_asignaturas, pesos, k=aleatorio.randrange(1, 8))):
+            alumno.matricular_asignatura(asignatura_id)
+        repositorio.agregar(alumno)
+    return repositorio
+
+def conteo_ingenuo(repositorio: RepositorioAlumnos) -> dict:
+    conteos = {}
+    for alumno in repositorio.obtener_todos():
+        asignaturas = alumno.asignaturas_matriculadas
+        for i in range(len(asignaturas)):
+            for j in range(len(asignaturas)):
+                if asignaturas[i] < asignaturas[j]:
+                    par = (asignaturas[i], asignaturas[j])
+                    conteos[par] = conteos.get(par, 0) + 1
+    return conteos
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    asignaturas = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    procesos = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+    aleatorio = random.Random(17)
+    print(f"=== Benchmark co-matrícula: {cantidad} alumnos, {asignaturas} asignaturas, {os.cpu_count()} CPU ===")
+    repositorio = crear_repositorio(cantidad, asignaturas, aleatorio)
+    
+    inicio = time.perf_counter()
+    ingenuo = conteo_ingenuo(repositorio)
+    mayores = sorted(ingenuo.items(), key=lambda par: par[1], reverse=True)[:10]
+    print(f"Conteo ingenuo por alumno + orden:        {(time.perf_counter() - inicio) * 1000:8.0f} ms")
+    
+    matriz = MatrizCoMatricula()
+    inicio = time.perf_counter()
+    matriz.reconstruir(repositorio)
+    print(f"Reconstrucción en serie:                  {(time.perf_counter() - inicio) * 1000:8.0f} ms, {matriz.obtener_estadisticas()}")
+    # Repartir solo conviene con varios núcleos; reconstruir limita los procesos a os.cpu_count()
+    if procesos > 1 and (os.cpu_count() or 1) > 1:
+        inicio = time.perf_counter()
+        matriz.reconstruir(repositorio, procesos)
+        print(f"Reconstrucción con {procesos} procesos:            {(time.perf_counter() - inicio) * 1000:8.0f} ms")
+    
+    inicio = time.perf_counter()
+    principales = matriz.obtener_pares_principales(10)
+    print(f"Top 10 pares:                             {(time.perf_counter() - inicio) * 1000:8.1f} ms")
+    assert [cantidad for _, _, cantidad in principales] == [cantidad for _, cantidad in mayores]
+    
+    matriz.conectar_repositorio(repositorio)
+    alumnos = aleatorio.sample(repositorio.obtener_todos(), min(10000, cantidad))
+    inicio = time.perf_counter()
+    for alumno in alumnos:
+        alumno.matricular_asignatura("ASG0000")
+        repositorio.actualizar(alumno.id, alumno)
+    print(f"{len(alumnos)} matrículas incrementales:          {(time.perf_counter() - inicio) * 1000:8.0f} ms")
+    print(f"Par principal: {principales[0]}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
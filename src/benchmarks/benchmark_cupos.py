@@ -0,0 +1,84 @@
+"""
+Benchmark: ráfaga de solicitudes de matrícula concurrentes sobre asignaturas populares.
+
+Varios hilos envían solicitudes (solicitar_matricula) a pocas asignaturas con cupo limitado.
+Se mide el throughput de solicitudes y de matrículas aceptadas, la latencia (p50/p99/máx)
+y se verifica que ninguna asignatura quede sobrevendida.
+
+Uso (desde src/):  python -m benchmarks.benchmark_cupos [solicitudes] [hilos] [asignaturas] [cupo]
+"""
+
+import random
+import sys
+import threading
+import time
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from interfaces.IGestorMatriculas import IGestorMatriculas
+from services.FabricaGestores import crear_gestores
+
+def percentil(valores: list, p: float) -> float:
+    return valores[min(int(len(valores) * p), len(valores) - 1)]
+
+def main():
+    cantidad_solicitudes = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    cantidad_hilos = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    cantidad_asignaturas = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    cupo = int(sys.argv[4]) if len(sys.argv) > 4 else 2000
+    
+    repo_alumnos = RepositorioAlumnos()
+    repo_asignaturas = RepositorioAsignaturas()
+    gestores = crear_gestores(repo_alumnos, repo_asignaturas)
+    for i in range(cantidad_asignaturas):
+        gestores.asignaturas.crear_asignatura(f"POP{i:02d}", f"Asignatura popular {i}", 6, 1, "PROF001", cupo)
+    for i in range(cantidad_solicitudes):
+        gestores.alumnos.crear_estudiante_pregrado(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", "Informática")
+    
+    solicitudes = [(f"EST{i:07d}", f"POP{random.randrange(cantidad_asignaturas):02d}") for i in range(cantidad_solicitudes)]
+    porciones = [solicitudes[i::cantidad_hilos] for i in range(cantidad_hilos)]
+    latencias = [[] for _ in range(cantidad_hilos)]
+    resultados = [[] for _ in range(cantidad_hilos)]
+    barrera = threading.Barrier(cantidad_hilos)
+    
+    def trabajador(indice: int) -> None:
+        barrera.wait()
+        for alumno_id, asignatura_id in porciones[indice]:
+            inicio = time.perf_counter()
+            resultado = gestores.matriculas.solicitar_matricula(alumno_id, asignatura_id)
+            latencias[indice].append(time.perf_counter() - inicio)
+            resultados[indice].append(resultado)
+    
+    hilos = [threading.Thread(target=trabajador, args=(i,)) for i in range(cantidad_hilos)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    
+    todas = sorted(latencia for lista in latencias for latencia in lista)
+    aceptadas = sum(resultado == IGestorMatriculas.MATRICULADO for lista in resultados for resultado in lista)
+    en_espera = sum(resultado == IGestorMatriculas.EN_ESPERA for lista in resultados for resultado in lista)
+    sobrevendidas = [asignatura.id for asignatura in repo_asignaturas.obtener_todos()
+                     if asignatura.obtener_cantidad_estudiantes() > asignatura.cupo]
+    
+    print(f"=== Ráfaga de matrícula: {cantidad_solicitudes} solicitudes, {cantidad_hilos} hilos, "
+          f"{cantidad_asignaturas} asignaturas con cupo {cupo} ===")
+    print(f"Duración: {duracion:.2f}s")
+    print(f"Solicitudes/s: {cantidad_solicitudes / duracion:.0f}")
+    print(f"Matrículas aceptadas: {aceptadas} ({aceptadas / duracion:.0f}/s), en lista de espera: {en_espera}")
+    print(f"Latencia p50: {percentil(todas, 0.50) * 1e6:.0f} µs, p99: {percentil(todas, 0.99) * 1e6:.0f} µs, "
+          f"máx: {todas[-1] * 1e3:.1f} ms")
+    print(f"Asignaturas sobrevendidas: {len(sobrevendidas)}")
+    
+    # Las bajas promueven automáticamente desde la lista de espera
+    asignatura = repo_asignaturas.obtener_por_id("POP00")
+    retirados = asignatura.estudiantes_matriculados[:100]
+    espera_antes = len(asignatura.lista_espera)
+    for alumno_id in retirados:
+        gestores.matriculas.desmatricular_alumno(alumno_id, "POP00")
+    print(f"POP00 tras {len(retirados)} bajas: {asignatura.obtener_cantidad_estudiantes()}/{asignatura.cupo} matriculados, "
+          f"lista de espera {espera_antes} -> {len(asignatura.lista_espera)}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Benchmark: nóminas a una fecha pasada con checkpoints + cambios vs reproducir todo el historial.
+
+Se simulan 'años' años de dos semestres: al inicio de cada semestre cada alumno toma 5 de 400
+asignaturas, durante el semestre un 20% cambia alguna (baja y alta) y al cierre se dan de baja
+todas. Luego se consultan nóminas en fechas al azar con HistorialMatriculas (checkpoint más
+cercano + cambios de esa asignatura) y reproduciendo todos los cambios desde el inicio, se
+verifica que coincidan y se miden también las líneas de tiempo por alumno.
+
+Uso (desde src/):  python -m benchmarks.benchmark_historial_matriculas [alumnos] [años] [consultas] [intervalo]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from services.HistorialMatriculas import HistorialMatriculas
+
+def generar_cambios(alumnos: int, anos: int, aleatorio: random.Random):
+    """Cambios (fecha, alumno_id, asignatura_id, alta) de todos los semestres, en orden de fecha."""
+    asignaturas = [f"ASIG{i:03d}" for i in range(400)]
+    for ano in range(anos):
+        for inicio_semestre in (datetime(2020 + ano, 3, 1), datetime(2020 + ano, 8, 1)):
+            eventos = []
+            tomadas = {}
+            for alumno in range(alumnos):
+                alumno_id = f"EST{alumno:06d}"
+                tomadas[alumno_id] = aleatorio.sample(asignaturas, 5)
+                for asignatura_id in tomadas[alumno_id]:
+                    eventos.append((inicio_semestre + timedelta(seconds=aleatorio.randrange(14 * 86400)), alumno_id, asignatura_id, True))
+            for alumno_id in aleatorio.sample(list(tomadas), alumnos // 5):
+                fecha = inicio_semestre + timedelta(days=15, seconds=aleatorio.randrange(90 * 86400))
+                anterior = tomadas[alumno_id].pop(aleatorio.randrange(5))
+                nueva = aleatorio.choice([asignatura_id for asignatura_id in asignaturas if asignatura_id not in tomadas[alumno_id]])
+                tomadas[alumno_id].append(nueva)
+                eventos.append((fecha, alumno_id, anterior, False))
+                eventos.append((fecha, alumno_id, nueva, True))
+            cierre = inicio_semestre + timedelta(days=140)
+            for alumno_id, tomadas_alumno in tomadas.items():
+                for asignatura_id in tomadas_alumno:
+                    eventos.append((cierre, alumno_id, asignatura_id, False))
+            # Dentro de una misma fecha, la baja del cambio va antes que el alta
+            eventos.sort(key=lambda evento: (evento[0], evento[3]))
+            yield from eventos
+
+def main():
+    alumnos = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    anos = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    total_consultas = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    intervalo = int(sys.argv[4]) if len(sys.argv) > 4 else 50000
+    aleatorio = random.Random(50)
+    print(f"=== Benchmark historial de matrículas: {alumnos} alumnos, {anos} años, intervalo {intervalo} ===")
+    
+    historial = HistorialMatriculas(intervalo_checkpoint=intervalo)
+    inicio = time.perf_counter()
+    for fecha, alumno_id, asignatura_id, alta in generar_cambios(alumnos, anos, aleatorio):
+        historial.registrar(alumno_id, asignatura_id, alta, fecha)
+    duracion = time.perf_counter() - inicio
+    estadisticas = historial.obtener_estadisticas()
+    print(f"Registro: {estadisticas['cambios']} cambios en {duracion:.1f} s "
+          f"({estadisticas['cambios'] / duracion:.0f} cambios/s, incluye generarlos), {estadisticas['checkpoints']} checkpoints")
+    print(f"Memoria: cambios {estadisticas['bytes_cambios'] / 1e6:.1f} MB, índices {estadisticas['bytes_indices'] / 1e6:.1f} MB, "
+          f"checkpoints {estadisticas['bytes_checkpoints'] / 1e6:.1f} MB")
+    
+    desde, hasta = estadisticas['desde'].timestamp(), estadisticas['hasta'].timestamp()
+    consultas = [(f"ASIG{aleatorio.randrange(400):03d}", datetime.fromtimestamp(aleatorio.uniform(desde, hasta)))
+                 for _ in range(total_consultas)]
+    inicio = time.perf_counter()
+    nominas = [historial.obtener_nomina(asignatura_id, fecha) for asignatura_id, fecha in consultas]
+    duracion = time.perf_counter() - inicio
+    estadisticas = historial.obtener_estadisticas()
+    print(f"Nómina a una fecha (checkpoints): {duracion * 1e3 / total_consultas:8.3f} ms/consulta, cambios aplicados "
+          f"promedio {estadisticas['aplicados_promedio']}, máximo {estadisticas['aplicados_maximo']}")
+    
+    muestra = max(1, total_consultas // 50)
+    inicio = time.perf_counter()
+    completas = [historial.reconstruir_nomina_completa(asignatura_id, fecha) for asignatura_id, fecha in consultas[:muestra]]
+    duracion = time.perf_counter() - inicio
+    print(f"Nómina a una fecha (reproducir todo): {duracion * 1e3 / muestra:8.3f} ms/consulta ({muestra} consultas)")
+    print(f"Resultados iguales: {completas == nominas[:muestra]}")
+    
+    ids = [f"EST{aleatorio.randrange(alumnos):06d}" for _ in range(total_consultas)]
+    inicio = time.perf_counter()
+    tramos = sum(len(historial.obtener_linea_tiempo(alumno_id)) for alumno_id in ids)
+    duracion = time.perf_counter() - inicio
+    print(f"Línea de tiempo por alumno: {duracion * 1e3 / total_consultas:8.3f} ms/consulta ({tramos / total_consultas:.0f} tramos)")
+
+if __name__ == "__main__":
+    main()
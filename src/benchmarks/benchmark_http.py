@@ -0,0 +1,133 @@
+"""
+Benchmark: cliente de carga para ServicioHTTP (conexiones persistentes, solicitudes concurrentes).
+
+El servicio corre en un proceso aparte con datos sembrados; el cliente abre varias conexiones
+keep-alive y reparte entre ellas una mezcla de lecturas (alumno, asignatura, nómina) con un 5%
+de matrículas. Se mide la misma carga dos veces: sin enviar If-None-Match y reenviando el último
+ETag visto de cada ruta (las lecturas repetidas se responden 304). Reporta solicitudes por
+segundo y percentiles de latencia. Cliente y servidor comparten la CPU si la máquina tiene un
+solo núcleo, así que las cifras son relativas entre sí.
+
+Uso (desde src/):  python -m benchmarks.benchmark_http [solicitudes] [conexiones] [alumnos]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import random
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from services.FabricaGestores import crear_gestores
+from services.ServicioHTTP import ServicioHTTP
+
+def _sembrar_y_servir(puerto: int, alumnos: int, listo) -> None:
+    repositorio_alumnos, repositorio_asignaturas = RepositorioAlumnos(), RepositorioAsignaturas()
+    gestores = crear_gestores(repositorio_alumnos, repositorio_asignaturas)
+    for i in range(200):
+        gestores.asignaturas.crear_asignatura(f"ASIG{i:03d}", f"Asignatura {i}", 5, i % 8 + 1, f"PROF{i % 20:02d}", cupo=alumnos)
+    aleatorio = random.Random(44)
+    for i in range(alumnos):
+        gestores.alumnos.crear_estudiante_pregrado(f"EST{i:06d}", "Nombre", "Apellido", f"est{i}@uv.cl", "Ingeniería")
+        for asignatura in aleatorio.sample(range(200), 4):
+            gestores.matriculas.matricular_alumno(f"EST{i:06d}", f"ASIG{asignatura:03d}")
+    servicio = ServicioHTTP(gestores.alumnos, gestores.asignaturas, gestores.matriculas, gestores.reportes,
+                            repositorio_alumnos, repositorio_asignaturas)
+    
+    async def servir():
+        servidor = await servicio.iniciar(puerto=puerto)
+        listo.set()
+        async with servidor:
+            await servidor.serve_forever()
+    asyncio.run(servir())
+
+def generar_solicitudes(cantidad: int, alumnos: int, aleatorio: random.Random) -> List[Tuple[str, str, Optional[bytes]]]:
+    """Mezcla sesgada hacia pocas entidades populares: 60% alumno, 20% asignatura, 15% nómina, 5% matrícula."""
+    populares = [f"EST{aleatorio.randrange(alumnos):06d}" for _ in range(500)]
+    solicitudes = []
+    for _ in range(cantidad):
+        tirada = aleatorio.random()
+        asignatura = f"ASIG{min(int(aleatorio.expovariate(0.05)), 199):03d}"
+        if tirada < 0.60:
+            solicitudes.append(('GET', f"/alumnos/{aleatorio.choice(populares)}", None))
+        elif tirada < 0.80:
+            solicitudes.append(('GET', f"/asignaturas/{asignatura}", None))
+        elif tirada < 0.95:
+            solicitudes.append(('GET', f"/asignaturas/{asignatura}/estudiantes", None))
+        else:
+            cuerpo = json.dumps({'alumno_id': aleatorio.choice(populares), 'asignatura_id': asignatura}).encode()
+            solicitudes.append(('POST', "/matriculas", cuerpo))
+    return solicitudes
+
+async def _conexion(puerto: int, solicitudes, latencias: List[float], estados: Dict[int, int],
+                    etags: Optional[Dict[str, str]]) -> None:
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    try:
+        for metodo, ruta, cuerpo in solicitudes:
+            encabezados = f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\n"
+            if cuerpo is not None:
+                encabezados += f"Content-Type: application/json\r\nContent-Length: {len(cuerpo)}\r\n"
+            if etags is not None and ruta in etags:
+                encabezados += f"If-None-Match: {etags[ruta]}\r\n"
+            inicio = time.perf_counter()
+            escritor.write((encabezados + "\r\n").encode('latin-1') + (cuerpo or b''))
+            cabecera = (await lector.readuntil(b'\r\n\r\n')).decode('latin-1')
+            largo, etag = 0, None
+            for linea in cabecera.split('\r\n')[1:]:
+                nombre, _, valor = linea.partition(':')
+                if nombre.lower() == 'content-length':
+                    largo = int(valor)
+                elif nombre.lower() == 'etag':
+                    etag = valor.strip()
+            if largo:
+                await lector.readexactly(largo)
+            latencias.append(time.perf_counter() - inicio)
+            estado = int(cabecera.split(' ', 2)[1])
+            estados[estado] = estados.get(estado, 0) + 1
+            if etags is not None and etag is not None:
+                etags[ruta] = etag
+    finally:
+        escritor.close()
+
+async def ejecutar(nombre: str, puerto: int, solicitudes, conexiones: int, con_etag: bool) -> None:
+    latencias: List[float] = []
+    estados: Dict[int, int] = {}
+    # Cada conexión recuerda los ETags que vio, como lo haría la caché de un cliente
+    tramos = [solicitudes[i::conexiones] for i in range(conexiones)]
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_conexion(puerto, tramo, latencias, estados, {} if con_etag else None) for tramo in tramos))
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+    print(f"{nombre:<16} {len(latencias) / duracion:8.0f} req/s  p50 {percentil(0.50):6.2f} ms  "
+          f"p90 {percentil(0.90):6.2f} ms  p99 {percentil(0.99):6.2f} ms  estados {dict(sorted(estados.items()))}")
+
+def _puerto_libre() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    conexiones = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    alumnos = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+    print(f"=== Benchmark servicio HTTP: {cantidad} solicitudes, {conexiones} conexiones, {alumnos} alumnos ===")
+    puerto = _puerto_libre()
+    listo = multiprocessing.Event()
+    servidor = multiprocessing.Process(target=_sembrar_y_servir, args=(puerto, alumnos, listo), daemon=True)
+    servidor.start()
+    try:
+        if not listo.wait(300):
+            raise RuntimeError("El servicio no alcanzó a iniciar")
+        aleatorio = random.Random(7)
+        asyncio.run(ejecutar("Sin ETag", puerto, generar_solicitudes(cantidad, alumnos, aleatorio), conexiones, False))
+        asyncio.run(ejecutar("Con If-None-Match", puerto, generar_solicitudes(cantidad, alumnos, aleatorio), conexiones, True))
+    finally:
+        servidor.terminate()
+        servidor.join()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+Benchmark: consultas de conjuntos sobre matrículas con IndiceMatriculas (mapas de bits).
+
+Crea N alumnos matriculados en asignaturas de tamaños muy distintos (unas pocas masivas y
+muchas pequeñas), construye el índice y compara intersecciones, uniones, diferencias y conteos
+contra el enfoque anterior de recorrer copias de Asignatura.estudiantes_matriculados.
+
+Uso (desde src/):  python -m benchmarks.benchmark_matriculas [alumnos] [asignaturas]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from models.Asignatura import Asignatura
+from models.TiposEstudiante.Estudiante import Estudiante
+from services.IndiceMatriculas import IndiceMatriculas
+
+def crear_datos(cantidad: int, asignaturas: int, aleatorio: random.Random):
+    repositorio_alumnos = RepositorioAlumnos()
+    repositorio_asignaturas = RepositorioAsignaturas()
+    for j in range(asignaturas):
+        repositorio_asignaturas.agregar(Asignatura(f"ASG{j:04d}", "Asignatura", 6, j % 10 + 1, "PROF001"))
+    # Las primeras asignaturas son masivas (ej. cursos comunes de primer año)
+    pesos = [50.0 if j < 5 else 1.0 for j in range(asignaturas)]
+    ids_asignaturas = [f"ASG{j:04d}" for j in range(asignaturas)]
+    for i in range(cantidad):
+        alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2024, 3, 1), "Ingeniería")
+        for asignatura_id in set(aleatorio.choices(ids_asignaturas, pesos, k=5)):
+            alumno.matricular_asignatura(asignatura_id)
+            repositorio_asignaturas.obtener_por_id(asignatura_id).agregar_estudiante(alumno.id)
+        repositorio_alumnos.agregar(alumno)
+    return repositorio_alumnos, repositorio_asignaturas
+
+def medir(nombre: str, consulta, repeticiones: int = 20):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = consulta()
+    duracion = (time.perf_counter() - inicio) / repeticiones
+    print(f"{nombre:<58} {duracion * 1000:9.3f} ms -> {resultado if isinstance(resultado, int) else len(resultado)}")
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    asignaturas = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    if asignaturas < 8:
+        raise ValueError("Se necesitan al menos 8 asignaturas: 5 masivas y las pequeñas ASG0005-ASG0007")
+    # Una asignatura pequeña que siempre existe (ASG0100 con las 500 por defecto)
+    pequena = f"ASG{max(6, asignaturas // 5):04d}"
+    aleatorio = random.Random(5)
+    print(f"=== Benchmark consultas de matrículas: {cantidad} alumnos, {asignaturas} asignaturas ===")
+    repositorio_alumnos, repositorio_asignaturas = crear_datos(cantidad, asignaturas, aleatorio)
+    
+    inicio = time.perf_counter()
+    indice = IndiceMatriculas()
+    indice.conectar(repositorio_alumnos, repositorio_asignaturas)
+    print(f"Construcción del índice: {(time.perf_counter() - inicio) * 1000:.0f} ms, {indice.obtener_estadisticas()}")
+    
+    def roster(asignatura_id):
+        return repositorio_asignaturas.obtener_por_id(asignatura_id).estudiantes_matriculados
+    
+    print("\n--- Enfoque anterior (copias de estudiantes_matriculados) ---")
+    def interseccion(primera, segunda):
+        otros = set(roster(segunda))
+        return [id for id in roster(primera) if id in otros]
+    
+    medir("Masivas ASG0000 y ASG0001 (lista de IDs)", lambda: interseccion("ASG0000", "ASG0001"))
+    medir(f"Masiva ASG0000 y pequeña {pequena} (lista de IDs)", lambda: interseccion(pequena, "ASG0000"))
+    medir("Alguna de ASG0000-ASG0004 y no ASG0005",
+          lambda: set().union(*(roster(f"ASG{j:04d}") for j in range(5))) - set(roster("ASG0005")))
+    
+    print("\n--- IndiceMatriculas ---")
+    medir("Masivas ASG0000 y ASG0001 (solo conteo)", lambda: indice.contar(['ASG0000', 'ASG0001']))
+    medir("Masivas ASG0000 y ASG0001 (lista de IDs)", lambda: indice.a_ids(indice.consultar(['ASG0000', 'ASG0001'])))
+    medir(f"Masiva ASG0000 y pequeña {pequena} (lista de IDs)", lambda: indice.a_ids(indice.consultar(['ASG0000', pequena])))
+    medir("Alguna de ASG0000-ASG0004 y no ASG0005 (solo conteo)",
+          lambda: indice.contar(alguna=[f"ASG{j:04d}" for j in range(5)], ninguna=['ASG0005']))
+    medir("Asignaturas compartidas por dos alumnos", lambda: indice.asignaturas_compartidas('EST0000001', 'EST0000002'), 1000)
+    
+    # Mantenimiento incremental: matricular y desmatricular vía notificaciones del repositorio
+    alumnos = aleatorio.sample(repositorio_alumnos.obtener_todos(), min(10000, cantidad))
+    inicio = time.perf_counter()
+    for alumno in alumnos:
+        alumno.matricular_asignatura("ASG0007")
+        repositorio_alumnos.actualizar(alumno.id, alumno)
+    print(f"\n{len(alumnos)} matrículas propagadas al índice: {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
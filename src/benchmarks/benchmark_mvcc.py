@@ -0,0 +1,108 @@
+"""
+Benchmark: throughput de escritores (matrículas) mientras corren reportes pesados.
+
+Compara tres escenarios durante el mismo intervalo de tiempo:
+1. Solo escritores (línea base).
+2. Reportes sobre los repositorios vivos, con un lock global compartido con los escritores.
+3. Reportes sobre instantáneas MVCC (AlmacenVersiones con un reloj compartido, ambas abiertas
+   en la misma versión), sin bloquear a los escritores.
+
+Uso (desde src/):  python -m benchmarks.benchmark_mvcc [alumnos] [asignaturas] [segundos]
+"""
+
+import random
+import sys
+import threading
+import time
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from repositories.AlmacenVersiones import AlmacenVersiones, RelojVersiones
+from services.GestorAsignaturas import GestorAsignaturas
+from services.GestorMatriculas import GestorMatriculas
+from services.GestorReportes import GestorReportes
+from services.FabricaGestores import crear_gestores
+from services.ControlHorarios import ControlHorarios
+from services.ControlCreditos import ControlCreditos
+
+def crear_sistema(cantidad_alumnos: int, cantidad_asignaturas: int):
+    repo_alumnos = RepositorioAlumnos()
+    repo_asignaturas = RepositorioAsignaturas()
+    gestores = crear_gestores(repo_alumnos, repo_asignaturas)
+    for i in range(cantidad_asignaturas):
+        gestores.asignaturas.crear_asignatura(f"ASG{i:04d}", f"Asignatura {i}", 6, i % 10 + 1, f"PROF{i % 50:03d}")
+    for i in range(cantidad_alumnos):
+        gestores.alumnos.crear_estudiante_pregrado(f"EST{i:06d}", "Nombre", "Apellido", f"est{i}@uv.cl", "Informática")
+    return repo_alumnos, repo_asignaturas, gestores
+
+def escritor(gestor_matriculas: GestorMatriculas, cantidad_alumnos: int, cantidad_asignaturas: int,
+             fin: float, lock, latencias_totales: list) -> None:
+    aleatorio = random.Random(1)
+    latencias = []
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        alumno_id = f"EST{aleatorio.randrange(cantidad_alumnos):06d}"
+        asignatura_id = f"ASG{aleatorio.randrange(cantidad_asignaturas):04d}"
+        if lock is not None:
+            with lock:
+                if not gestor_matriculas.matricular_alumno(alumno_id, asignatura_id):
+                    gestor_matriculas.desmatricular_alumno(alumno_id, asignatura_id)
+        else:
+            if not gestor_matriculas.matricular_alumno(alumno_id, asignatura_id):
+                gestor_matriculas.desmatricular_alumno(alumno_id, asignatura_id)
+        latencias.append(time.perf_counter() - inicio)
+    latencias_totales.extend(latencias)
+
+def ejecutar(nombre: str, cantidad_alumnos: int, cantidad_asignaturas: int, segundos: float, modo: str) -> None:
+    repo_alumnos, repo_asignaturas, gestores = crear_sistema(cantidad_alumnos, cantidad_asignaturas)
+    almacen_alumnos = almacen_asignaturas = None
+    if modo == 'mvcc':
+        reloj = RelojVersiones()
+        almacen_alumnos = AlmacenVersiones(repo_alumnos, reloj=reloj)
+        almacen_asignaturas = AlmacenVersiones(repo_asignaturas, reloj=reloj)
+    lock = threading.Lock() if modo == 'lock' else None
+    latencias_totales: list = []
+    reportes = [0]
+    # Las estadísticas de asignaturas no consultan el estado de matrícula: se inyecta vacío para no reconstruirlo
+    vacios = {'control_horarios': ControlHorarios(), 'control_creditos': ControlCreditos()}
+    fin = time.perf_counter() + segundos
+    
+    def lector() -> None:
+        while time.perf_counter() < fin:
+            if modo == 'lock':
+                with lock:
+                    gestores.asignaturas.obtener_estadisticas_generales()
+                    gestores.reportes.obtener_estadisticas()
+            else:
+                asignaturas, alumnos = reloj.abrir_instantaneas(almacen_asignaturas, almacen_alumnos)
+                with asignaturas, alumnos:
+                    GestorAsignaturas(asignaturas, alumnos, **vacios).obtener_estadisticas_generales()
+                    GestorReportes(alumnos, asignaturas).obtener_estadisticas()
+            reportes[0] += 1
+    
+    hilos = [threading.Thread(target=escritor, args=(gestores.matriculas, cantidad_alumnos, cantidad_asignaturas, fin, lock, latencias_totales))]
+    if modo != 'base':
+        hilos.append(threading.Thread(target=lector))
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    
+    detalle = f", reportes completados: {reportes[0]}" if modo != 'base' else ""
+    latencias = sorted(latencias_totales)
+    p99 = latencias[int(len(latencias) * 0.99)] * 1000
+    print(f"{nombre:<32} {len(latencias) / segundos:>10.0f} escrituras/s, p99 {p99:.3f} ms, "
+          f"máx {latencias[-1] * 1000:.1f} ms{detalle}")
+    if almacen_alumnos is not None:
+        print(f"{'':<32} versiones retenidas al final: {almacen_asignaturas.obtener_estadisticas()['versiones_retenidas']}")
+
+def main():
+    cantidad_alumnos = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cantidad_asignaturas = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    segundos = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    print(f"=== Benchmark MVCC: {cantidad_alumnos} alumnos, {cantidad_asignaturas} asignaturas, {segundos}s ===")
+    ejecutar("Solo escritores", cantidad_alumnos, cantidad_asignaturas, segundos, 'base')
+    ejecutar("Reportes con lock global", cantidad_alumnos, cantidad_asignaturas, segundos, 'lock')
+    ejecutar("Reportes sobre instantáneas", cantidad_alumnos, cantidad_asignaturas, segundos, 'mvcc')
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Benchmark: RepositorioAlumnosNiveles (memoria + disco) vs RepositorioAlumnos (todo en memoria).
+
+Se cargan 'alumnos' estudiantes con algunas matrículas y se mide la memoria retenida
+(tracemalloc) por cada repositorio. Luego se hacen 'accesos' lecturas por ID donde el 90% va a
+un 2% de alumnos activos y el resto a alumnos al azar (egresados o inactivos), y se reportan
+la tasa de aciertos, las expulsiones y la latencia de cargar un alumno desde disco. Al final se
+recorre el repositorio completo (buscar por email), que lee del disco sin promover.
+
+Uso (desde src/):  python -m benchmarks.benchmark_niveles [alumnos] [accesos] [presupuesto_mb]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAlumnosNiveles import RepositorioAlumnosNiveles
+from models.TiposEstudiante.Estudiante import Estudiante
+
+def cargar(repositorio, cantidad: int, aleatorio: random.Random) -> float:
+    """Agrega los alumnos y retorna los MB retenidos por el repositorio."""
+    gc.collect()
+    tracemalloc.start()
+    for i in range(cantidad):
+        alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2020, 3, 1), "Ingeniería")
+        for asignatura in aleatorio.sample(range(400), 5):
+            alumno.matricular_asignatura(f"ING{asignatura:03d}")
+        repositorio.agregar(alumno)
+    del alumno
+    gc.collect()
+    memoria = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return memoria
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    total_accesos = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    presupuesto = int(float(sys.argv[3]) * 1024 * 1024) if len(sys.argv) > 3 else 8 * 1024 * 1024
+    aleatorio = random.Random(49)
+    print(f"=== Benchmark niveles: {cantidad} alumnos, {total_accesos} accesos, "
+          f"presupuesto {presupuesto / 1024 / 1024:.0f} MB ===")
+    
+    activos = [f"EST{i:07d}" for i in aleatorio.sample(range(cantidad), max(1, cantidad // 50))]
+    accesos = [aleatorio.choice(activos) if aleatorio.random() < 0.9 else f"EST{aleatorio.randrange(cantidad):07d}"
+               for _ in range(total_accesos)]
+    
+    for nombre, repositorio in (("En memoria", RepositorioAlumnos()),
+                                ("Niveles", RepositorioAlumnosNiveles(presupuesto))):
+        inicio = time.perf_counter()
+        memoria = cargar(repositorio, cantidad, random.Random(1))
+        carga = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for id in accesos:
+            repositorio.obtener_por_id(id)
+        lecturas = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        encontrados = repositorio.buscar({'email': 'est12345@'})
+        recorrido = time.perf_counter() - inicio
+        print(f"{nombre:<11} memoria {memoria:7.1f} MB  carga {carga:6.2f} s  "
+              f"lecturas {lecturas * 1e6 / total_accesos:6.2f} µs/op  recorrido {recorrido:6.2f} s ({len(encontrados)})")
+        if isinstance(repositorio, RepositorioAlumnosNiveles):
+            metricas = repositorio.obtener_metricas()
+            print(f"            tasa de aciertos {metricas['tasa_aciertos']:.3f}, expulsiones {metricas['expulsiones']}, "
+                  f"residentes {metricas['residentes']}, en disco {metricas['en_disco']}, "
+                  f"archivo {metricas['bytes_archivo'] / 1e6:.1f} MB")
+            print(f"            carga desde disco: promedio {metricas.get('latencia_fallo_promedio_us', 0)} µs, "
+                  f"p99 {metricas.get('latencia_fallo_p99_us', 0)} µs, máxima {metricas.get('latencia_fallo_maxima_us', 0)} µs")
+            repositorio.cerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: registro de notas en arreglos con promedios incrementales vs lista de registros.
+
+Se cargan 'notas_por_alumno' notas por alumno sobre 500 asignaturas y 8 períodos, por lote y
+una a una, y se mide la memoria (tracemalloc) contra guardar cada nota como tupla en una lista.
+Después se compara consultar el promedio ponderado y la distribución de una asignatura con los
+agregados mantenidos frente a recorrer la lista, y se mide recalcular/auditar desde las columnas.
+
+Uso (desde src/):  python -m benchmarks.benchmark_notas [alumnos] [notas_por_alumno] [consultas]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from services.RegistroNotas import RegistroNotas
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    notas_por_alumno = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    total_consultas = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    aleatorio = random.Random(48)
+    creditos = {f"ASIG{i:04d}": aleatorio.randint(2, 10) for i in range(500)}
+    asignaturas = list(creditos)
+    notas = [(f"EST{alumno:07d}", asignatura_id, f"202{indice % 8 // 2}-{indice % 2 + 1}", aleatorio.randint(10, 70) / 10)
+             for alumno in range(cantidad)
+             for indice, asignatura_id in enumerate(aleatorio.sample(asignaturas, notas_por_alumno))]
+    print(f"=== Benchmark notas: {cantidad} alumnos, {len(notas)} notas ===")
+    
+    inicio = time.perf_counter()
+    registro = RegistroNotas()
+    registro.registrar_lote(notas, creditos)
+    duracion = time.perf_counter() - inicio
+    print(f"{'registrar_lote':<28} {duracion * 1000:8.0f} ms  ({len(notas) / duracion:9.0f} notas/s)")
+    
+    muestra = notas[:100000]
+    inicio = time.perf_counter()
+    individual = RegistroNotas()
+    for alumno_id, asignatura_id, periodo, nota in muestra:
+        individual.registrar(alumno_id, asignatura_id, periodo, nota, creditos[asignatura_id])
+    duracion = time.perf_counter() - inicio
+    print(f"{'registrar (una a una)':<28} {duracion * 1000:8.0f} ms  ({len(muestra) / duracion:9.0f} notas/s, {len(muestra)} notas)")
+    
+    # La memoria se mide en una carga aparte: tracemalloc distorsiona los tiempos
+    tracemalloc.start()
+    medido = RegistroNotas()
+    medido.registrar_lote(notas, creditos)
+    memoria_registro = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del medido
+    tracemalloc.start()
+    lista = [(alumno_id, asignatura_id, periodo, nota, creditos[asignatura_id]) for alumno_id, asignatura_id, periodo, nota in notas]
+    memoria_lista = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Memoria: registro {memoria_registro / 1e6:.1f} MB (incluye los ids) vs lista de tuplas {memoria_lista / 1e6:.1f} MB "
+          f"(sin contar las cadenas compartidas)")
+    
+    alumnos = [f"EST{aleatorio.randrange(cantidad):07d}" for _ in range(total_consultas)]
+    inicio = time.perf_counter()
+    for alumno_id in alumnos:
+        filas = [(nota, creditos_nota) for id, _, _, nota, creditos_nota in lista if id == alumno_id]
+        sum(nota * creditos_nota for nota, creditos_nota in filas) / sum(creditos_nota for _, creditos_nota in filas)
+    duracion_lista = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for alumno_id in alumnos:
+        registro.obtener_promedio(alumno_id)
+    duracion_registro = time.perf_counter() - inicio
+    print(f"Promedio ({total_consultas} consultas): recorrer la lista {duracion_lista * 1000:.0f} ms vs "
+          f"incremental {duracion_registro * 1000:.2f} ms")
+    
+    inicio = time.perf_counter()
+    [nota for _, asignatura_id, _, nota, _ in lista if asignatura_id == "ASIG0007"]
+    duracion_lista = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    registro.obtener_distribucion("ASIG0007")
+    duracion_registro = time.perf_counter() - inicio
+    print(f"Distribución de una asignatura: recorrer la lista {duracion_lista * 1000:.0f} ms vs "
+          f"histograma {duracion_registro * 1000:.3f} ms")
+    
+    inicio = time.perf_counter()
+    diferencias = registro.auditar()
+    print(f"{'auditar':<28} {(time.perf_counter() - inicio) * 1000:8.0f} ms  ({len(diferencias)} diferencias)")
+    inicio = time.perf_counter()
+    cambiadas = registro.recalcular({asignatura_id: valor + 1 for asignatura_id, valor in creditos.items()})
+    print(f"{'recalcular (reponderando)':<28} {(time.perf_counter() - inicio) * 1000:8.0f} ms  ({cambiadas} notas reponderadas)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
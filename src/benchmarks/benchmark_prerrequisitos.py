@@ -0,0 +1,84 @@
+"""
+Benchmark: verificación de prerrequisitos con cierre transitivo en máscaras vs recorrido del grafo.
+
+Malla de 'semestres' niveles con 'por_semestre' asignaturas; cada asignatura exige 3 del nivel
+anterior, así que la cadena completa crece con la profundidad. Cada alumno tiene aprobados
+todos los niveles hasta uno al azar. Se compara GrafoPrerrequisitos.cumple con un recorrido en
+profundidad por consulta (lo que haría una verificación sin caché), y validar_lote con el lote completo.
+
+Uso (desde src/):  python -m benchmarks.benchmark_prerrequisitos [semestres] [por_semestre] [consultas]
+"""
+
+import random
+import sys
+import time
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+
+def cumple_recorriendo(prerrequisitos, aprobadas, asignatura_id: str) -> bool:
+    visitadas = set()
+    pila = list(prerrequisitos.get(asignatura_id, ()))
+    while pila:
+        actual = pila.pop()
+        if actual in visitadas:
+            continue
+        if actual not in aprobadas:
+            return False
+        visitadas.add(actual)
+        pila.extend(prerrequisitos.get(actual, ()))
+    return True
+
+def main():
+    semestres = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    por_semestre = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    total_consultas = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+    aleatorio = random.Random(47)
+    print(f"=== Benchmark prerrequisitos: {semestres} niveles x {por_semestre} asignaturas, {total_consultas} consultas ===")
+    niveles = [[f"S{nivel:02d}A{i:03d}" for i in range(por_semestre)] for nivel in range(semestres)]
+    grafo = GrafoPrerrequisitos()
+    prerrequisitos = {}
+    inicio = time.perf_counter()
+    for nivel in range(1, semestres):
+        for asignatura_id in niveles[nivel]:
+            for prerrequisito_id in aleatorio.sample(niveles[nivel - 1], 3):
+                grafo.agregar_prerrequisito(asignatura_id, prerrequisito_id)
+                prerrequisitos.setdefault(asignatura_id, []).append(prerrequisito_id)
+    print(f"Construcción del grafo ({grafo.obtener_estadisticas()['prerrequisitos']} aristas): "
+          f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+    
+    aprobadas = {}
+    for i in range(1000):
+        alumno_id = f"EST{i:04d}"
+        hasta = aleatorio.randrange(semestres)
+        aprobadas[alumno_id] = {asignatura_id for nivel in niveles[:hasta] for asignatura_id in nivel}
+        for asignatura_id in aprobadas[alumno_id]:
+            grafo.registrar_aprobacion(alumno_id, asignatura_id)
+    todas = [asignatura_id for nivel in niveles for asignatura_id in nivel]
+    consultas = [(aleatorio.choice(list(aprobadas)), aleatorio.choice(todas)) for _ in range(total_consultas)]
+    
+    inicio = time.perf_counter()
+    esperados = [cumple_recorriendo(prerrequisitos, aprobadas[alumno_id], asignatura_id) for alumno_id, asignatura_id in consultas]
+    duracion_recorrido = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    obtenidos = [grafo.cumple(alumno_id, asignatura_id) for alumno_id, asignatura_id in consultas]
+    duracion_cierre = time.perf_counter() - inicio
+    if obtenidos != esperados:
+        raise AssertionError("El cierre transitivo no coincide con el recorrido")
+    print(f"{'Recorrido por consulta':<26} {duracion_recorrido * 1000:8.0f} ms")
+    print(f"{'Cierre en máscaras':<26} {duracion_cierre * 1000:8.0f} ms  ({duracion_recorrido / duracion_cierre:.1f}x)")
+    inicio = time.perf_counter()
+    rechazadas = grafo.validar_lote(consultas)
+    print(f"{'validar_lote (con faltantes)':<26} {(time.perf_counter() - inicio) * 1000:8.0f} ms  ({len(rechazadas)} rechazadas)")
+    
+    # Profundidad: la misma consulta sobre la última asignatura de cadenas cada vez más largas
+    for profundidad in (10, 100, 1000):
+        cadena = GrafoPrerrequisitos()
+        for i in range(1, profundidad + 1):
+            cadena.agregar_prerrequisito(f"C{i}", f"C{i - 1}")
+        cadena.cumple("EST", f"C{profundidad}")
+        inicio = time.perf_counter()
+        for _ in range(10000):
+            cadena.cumple("EST", f"C{profundidad}")
+        print(f"Cadena de profundidad {profundidad:<5} {(time.perf_counter() - inicio) * 100:6.2f} µs por consulta")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Benchmark: memoria de las publicaciones con contenido en línea vs. almacén de blobs.
+
+Publica el mismo conjunto de artículos (con una fracción de textos repetidos) de dos formas:
+1. En línea: diccionarios con el contenido completo en memoria (almacenamiento anterior).
+2. Publicacion + AlmacenBlobs: solo hash y metadatos en memoria, contenido en disco con caché LRU.
+
+Luego mide la lectura de contenidos con un patrón de acceso sesgado (artículos "calientes").
+
+Uso (desde src/):  python -m benchmarks.benchmark_publicaciones [articulos] [tamano_texto]
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from models.Publicacion import Publicacion
+from utils.AlmacenBlobs import AlmacenBlobs
+
+def crear_textos(cantidad: int, tamano: int, aleatorio: random.Random) -> list:
+    palabras = ["investigación", "educación", "datos", "modelo", "sistema", "análisis", "red", "aprendizaje"]
+    unicos = [" ".join(aleatorio.choice(palabras) for _ in range(tamano // 8)) for _ in range(max(cantidad * 7 // 10, 1))]
+    # ~30% de los artículos repiten un texto ya publicado (ej. reediciones, preprints)
+    return [unicos[i] if i < len(unicos) else aleatorio.choice(unicos) for i in range(cantidad)]
+
+def medir(nombre: str, construir) -> list:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    publicaciones = construir()
+    duracion = time.perf_counter() - inicio
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<28} {memoria / 1024 / 1024:8.1f} MB en memoria, publicación {duracion:.2f} s")
+    return publicaciones
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    tamano = int(sys.argv[2]) if len(sys.argv) > 2 else 4000
+    aleatorio = random.Random(3)
+    print(f"=== Benchmark publicaciones: {cantidad} artículos de ~{tamano} caracteres ===")
+    fecha = datetime.now().isoformat()
+    
+    textos = crear_textos(cantidad, tamano, aleatorio)
+    # Copias independientes, como llegarían desde fuera del sistema
+    en_linea = medir("En línea (diccionarios)", lambda: [
+        {'titulo': f"Artículo {i}", 'contenido': "".join(list(texto)), 'autor': "Autor", 'fecha': fecha}
+        for i, texto in enumerate(textos)
+    ])
+    del en_linea
+    
+    directorio = tempfile.mkdtemp(prefix="benchmark_blobs_")
+    try:
+        almacen = AlmacenBlobs(directorio, capacidad_cache=4 * 1024 * 1024)
+        publicaciones = medir("Almacén de blobs + LRU", lambda: [
+            Publicacion(f"Artículo {i}", "".join(list(texto)), {'autor': "Autor", 'fecha': fecha}, almacen)
+            for i, texto in enumerate(textos)
+        ])
+        estadisticas = almacen.obtener_estadisticas()
+        print(f"{'':<28} {estadisticas['blobs']} blobs en disco, {estadisticas['deduplicados']} deduplicados")
+        
+        almacen.vaciar_cache()
+        # 90% de las lecturas sobre el 5% de artículos más consultados
+        calientes = max(len(publicaciones) // 20, 1)
+        inicio = time.perf_counter()
+        lecturas = 20000
+        for _ in range(lecturas):
+            indice = aleatorio.randrange(calientes) if aleatorio.random() < 0.9 else aleatorio.randrange(len(publicaciones))
+            publicaciones[indice]['contenido']
+        duracion = time.perf_counter() - inicio
+        estadisticas = almacen.obtener_estadisticas()
+        tasa = estadisticas['aciertos_cache'] / lecturas * 100
+        print(f"{'Lectura diferida':<28} {duracion / lecturas * 1e6:8.1f} µs por lectura, "
+              f"{tasa:.1f}% aciertos de caché, {estadisticas['lecturas_disco']} lecturas de disco")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
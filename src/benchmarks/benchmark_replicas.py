@@ -0,0 +1,119 @@
+"""
+Benchmark: consultas de lectura sobre réplicas en memoria compartida vs el proceso principal.
+
+Se publica una instantánea de los repositorios con PublicadorReplica y se reparte una mezcla de
+consultas (70% alumno por ID, 20% nómina de asignatura, 10% búsqueda por email) entre procesos
+trabajadores que leen con ReplicaLectura. Como referencia, la misma mezcla se responde en el
+proceso principal con los repositorios y gestores. El rendimiento agregado solo puede crecer con
+los trabajadores si hay más de un núcleo: el benchmark informa os.cpu_count().
+
+Uso (desde src/):  python -m benchmarks.benchmark_replicas [alumnos] [consultas] [trabajadores]
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+from repositories.PublicadorReplica import PublicadorReplica
+from repositories.ReplicaLectura import ReplicaLectura
+from services.FabricaGestores import crear_gestores
+from models.Asignatura import Asignatura
+from models.TiposEstudiante.Estudiante import Estudiante
+
+NOMBRE = f"bench_replica_{os.getpid()}"
+
+def generar_consultas(cantidad: int, alumnos: int, asignaturas: int, aleatorio: random.Random):
+    consultas = []
+    for _ in range(cantidad):
+        tirada = aleatorio.random()
+        if tirada < 0.7:
+            consultas.append(('id', f"EST{aleatorio.randrange(alumnos):07d}"))
+        elif tirada < 0.9:
+            consultas.append(('nomina', f"ASIG{aleatorio.randrange(asignaturas):04d}"))
+        else:
+            consultas.append(('email', f"est{aleatorio.randrange(alumnos)}@"))
+    return consultas
+
+def responder_replica(replica: ReplicaLectura, consultas) -> int:
+    resultados = 0
+    for tipo, valor in consultas:
+        if tipo == 'id':
+            resultados += replica.obtener_alumno(valor) is not None
+        elif tipo == 'nomina':
+            resultados += len(replica.obtener_estudiantes_asignatura(valor))
+        else:
+            resultados += len(replica.buscar_alumnos({'email': valor}))
+    return resultados
+
+def _trabajador(consultas, cola) -> None:
+    replica = ReplicaLectura(NOMBRE, max_antiguedad=0.5)
+    inicio = time.perf_counter()
+    resultados = responder_replica(replica, consultas)
+    cola.put((time.perf_counter() - inicio, resultados))
+    replica.cerrar()
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    total_consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    trabajadores = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    asignaturas = 500
+    aleatorio = random.Random(46)
+    print(f"=== Benchmark réplicas: {cantidad} alumnos, {total_consultas} consultas, "
+          f"{trabajadores} trabajadores, {os.cpu_count()} núcleo(s) ===")
+    repositorio_alumnos, repositorio_asignaturas = RepositorioAlumnos(), RepositorioAsignaturas()
+    for i in range(asignaturas):
+        repositorio_asignaturas.agregar(Asignatura(f"ASIG{i:04d}", f"Asignatura {i}", 5, i % 10 + 1, f"PROF{i % 50:03d}"))
+    for i in range(cantidad):
+        alumno = Estudiante(f"EST{i:07d}", "Nombre", "Apellido", f"est{i}@uv.cl", datetime(2024, 3, 1), "Ingeniería")
+        for asignatura in aleatorio.sample(range(asignaturas), 5):
+            alumno.matricular_asignatura(f"ASIG{asignatura:04d}")
+            repositorio_asignaturas.obtener_por_id(f"ASIG{asignatura:04d}").agregar_estudiante(alumno.id)
+        repositorio_alumnos.agregar(alumno)
+    gestor_asignaturas = crear_gestores(repositorio_alumnos, repositorio_asignaturas).asignaturas
+    consultas = generar_consultas(total_consultas, cantidad, asignaturas, aleatorio)
+    
+    publicador = PublicadorReplica(repositorio_alumnos, repositorio_asignaturas, NOMBRE)
+    try:
+        publicador.publicar()
+        metricas = publicador.obtener_estadisticas()
+        print(f"Publicación: {metricas['duracion_ms']:.0f} ms, {metricas['bytes'] / 1e6:.1f} MB")
+        
+        inicio = time.perf_counter()
+        for tipo, valor in consultas:
+            if tipo == 'id':
+                repositorio_alumnos.obtener_por_id(valor)
+            elif tipo == 'nomina':
+                gestor_asignaturas.obtener_estudiantes_asignatura(valor)
+            else:
+                repositorio_alumnos.buscar({'email': valor})
+        duracion = time.perf_counter() - inicio
+        print(f"{'Proceso principal':<24} {total_consultas / duracion:9.0f} consultas/s")
+        
+        replica = ReplicaLectura(NOMBRE)
+        inicio = time.perf_counter()
+        responder_replica(replica, consultas)
+        duracion = time.perf_counter() - inicio
+        replica.cerrar()
+        print(f"{'Réplica (mismo proceso)':<24} {total_consultas / duracion:9.0f} consultas/s")
+        
+        cola = multiprocessing.Queue()
+        procesos = [multiprocessing.Process(target=_trabajador, args=(consultas[i::trabajadores], cola))
+                    for i in range(trabajadores)]
+        inicio = time.perf_counter()
+        for proceso in procesos:
+            proceso.start()
+        tiempos = [cola.get()[0] for _ in procesos]
+        duracion = time.perf_counter() - inicio
+        for proceso in procesos:
+            proceso.join()
+        print(f"{f'{trabajadores} trabajadores':<24} {total_consultas / duracion:9.0f} consultas/s agregadas "
+              f"(cada trabajador {min(tiempos) * 1000:.0f}-{max(tiempos) * 1000:.0f} ms)")
+    finally:
+        publicador.cerrar()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
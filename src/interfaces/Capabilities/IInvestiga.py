@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List
+from models.Publicacion import Publicacion
 
 class IInvestiga(ABC):
     """Interfaz que define la capacidad de investigar.
@@ -16,7 +17,7 @@ class IInvestiga(ABC):
         pass
     
     @abstractmethod
-    def obtener_publicaciones(self) -> List[Dict[str, str]]:
+    def obtener_publicaciones(self) -> List[Publicacion]:
         """Obtiene la lista de publicaciones realizadas."""
         pass
     
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from models.Asignatura import Asignatura
+from services.UnidadDeTrabajo import UnidadDeTrabajo
+
+class IDesvinculadorAsignaturas(ABC):
+    """Interfaz del dueño de las matrículas ante una asignatura que se elimina.
+    Principio DIP: GestorAsignaturas depende de esta abstracción, no del servicio que matricula.
+    Principio ISP: Solo expone lo necesario para eliminar una asignatura con alumnos vinculados."""
+    
+    @abstractmethod
+    def transaccion(self) -> UnidadDeTrabajo:
+        """Abre una unidad de trabajo que confirma con los locks de las entidades que modifica."""
+        pass
+    
+    @abstractmethod
+    def desvincular_asignatura(self, uow: UnidadDeTrabajo, asignatura: Asignatura, omitir=()) -> None:
+        """Registra en la transacción la eliminación de la asignatura junto con las bajas de sus
+        alumnos (salvo los de omitir), sus esperas y el estado derivado de esas matrículas."""
+        pass
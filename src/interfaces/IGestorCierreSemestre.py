@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Dict, List, Any, Optional
+
+class IGestorCierreSemestre(ABC):
+    """Interfaz del cierre de período y de las consultas sobre períodos pasados.
+    Principio ISP: Separada de las matrículas del período en curso y de la gestión de alumnos."""
+    
+    @abstractmethod
+    def cerrar_semestre(self, periodo: str, progreso: Optional[Callable[[int, int], None]] = None,
+                        tamano_lote: int = 10000) -> Dict[str, int]:
+        """Cierra el período: avanza semestres, archiva y vacía las matrículas."""
+        pass
+    
+    @abstractmethod
+    def obtener_historial_matriculas(self, alumno_id: str) -> Dict[str, List[str]]:
+        """Obtiene las asignaturas cursadas por el alumno en cada período cerrado."""
+        pass
+    
+    @abstractmethod
+    def obtener_nomina_en(self, asignatura_id: str, fecha: datetime) -> List[str]:
+        """Obtiene los alumnos matriculados en la asignatura en una fecha pasada."""
+        pass
+    
+    @abstractmethod
+    def obtener_matriculas_en(self, alumno_id: str, fecha: datetime) -> List[str]:
+        """Obtiene las asignaturas del alumno en una fecha pasada."""
+        pass
+    
+    @abstractmethod
+    def obtener_linea_tiempo_matriculas(self, alumno_id: str) -> List[Dict[str, Any]]:
+        """Obtiene los tramos de matrícula del alumno."""
+        pass
\ No newline at end of file
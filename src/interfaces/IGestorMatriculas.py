@@ -0,0 +1,58 @@
+from abc import abstractmethod
+from contextlib import ExitStack
+from typing import Dict, Iterable, Optional
+from interfaces.IDesvinculadorAsignaturas import IDesvinculadorAsignaturas
+from models.Alumno import Alumno
+from services.UnidadDeTrabajo import UnidadDeTrabajo
+
+class IGestorMatriculas(IDesvinculadorAsignaturas):
+    """Interfaz del servicio de matrículas.
+    Principio DIP: GestorAlumnos y GestorCierreSemestre dependen de esta abstracción, no de GestorMatriculas.
+    Principio ISP: Además de matricular, solo expone lo que necesitan quienes eliminan alumnos
+    o asignaturas y quien cierra el período."""
+    
+    # Resultados de solicitar_matricula
+    MATRICULADO = 'matriculado'
+    EN_ESPERA = 'en_espera'
+    RECHAZADO = 'rechazado'
+    
+    @abstractmethod
+    def matricular_alumno(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> bool:
+        """Matricula un alumno en una asignatura si queda cupo."""
+        pass
+    
+    @abstractmethod
+    def solicitar_matricula(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> str:
+        """Matricula o deja en lista de espera; retorna MATRICULADO, EN_ESPERA o RECHAZADO."""
+        pass
+    
+    @abstractmethod
+    def desmatricular_alumno(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> bool:
+        """Desmatricula un alumno de una asignatura y promueve la lista de espera."""
+        pass
+    
+    @abstractmethod
+    def tiene_esperas(self, alumno_id: str) -> bool:
+        """Indica si el alumno está en alguna lista de espera."""
+        pass
+    
+    @abstractmethod
+    def desvincular_alumnos(self, uow: UnidadDeTrabajo, salientes: Dict[str, Alumno], sin_promover: Iterable[str] = ()) -> None:
+        """Registra en la transacción las bajas de matrícula y de lista de espera de alumnos que se eliminan."""
+        pass
+    
+    @abstractmethod
+    def olvidar_alumno(self, alumno_id: str) -> None:
+        """Descarta el estado de matrícula derivado de un alumno eliminado."""
+        pass
+    
+    @abstractmethod
+    def pausar_matriculas(self) -> ExitStack:
+        """Detiene todas las matrículas, bajas y confirmaciones de transacciones hasta salir del contexto."""
+        pass
+    
+    @abstractmethod
+    def reiniciar_periodo(self) -> None:
+        """Descarta el estado de matrícula derivado tras vaciar todas las matrículas al cerrar el
+        período (requiere pausar_matriculas)."""
+        pass
\ No newline at end of file
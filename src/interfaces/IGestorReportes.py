@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Any, Optional
+
+class IGestorReportes(ABC):
+    """Interfaz de los reportes de solo lectura sobre alumnos y matrículas.
+    Principio ISP: Quien solo reporta no depende de las operaciones que modifican datos.
+    Principio LSP: Puede construirse sobre cualquier IRepositorio, incluidas instantáneas MVCC."""
+    
+    @abstractmethod
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene estadísticas generales de alumnos."""
+        pass
+    
+    @abstractmethod
+    def obtener_reporte_cohortes(self, por: List[str], medida: Optional[str] = None,
+                                 filtros: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Reporte agrupado por atributos de los alumnos."""
+        pass
+    
+    @abstractmethod
+    def verificar_integridad(self, incluir_profesores: bool = True) -> List[Dict[str, Any]]:
+        """Busca referencias colgantes entre alumnos y asignaturas."""
+        pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Callable
 
 class IRepositorio(ABC):
     """Interfaz genérica para repositorios.
@@ -33,4 +33,10 @@ class IRepositorio(ABC):
     @abstractmethod
     def buscar(self, criterio: dict) -> List[Any]:
         """Busca elementos según un criterio específico."""
+        pass
+    
+    @abstractmethod
+    def suscribir_cambios(self, observador: Callable[[str, str, Optional[Any]], None]) -> None:
+        """Registra un observador que se invoca tras cada mutación (operacion, id, elemento).
+        El observador no debe lanzar: la mutación ya está aplicada cuando se le notifica."""
         pass
\ No newline at end of file
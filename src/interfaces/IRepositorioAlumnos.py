@@ -0,0 +1,33 @@
+from typing import List, Dict
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IEstudiante import IEstudiante
+from models.Alumno import Alumno
+
+class IRepositorioAlumnos(IRepositorio):
+    """Interfaz para repositorios de alumnos: agrega consultas por tipo y por capacidad.
+    Principio ISP: IRepositorio sigue siendo genérica; solo los repositorios de alumnos la extienden.
+    Principio DIP: GestorAlumnos y GestorReportes dependen de esta abstracción, no de RepositorioAlumnos.
+    Las implementaciones por defecto recorren obtener_todos, por lo que cualquier backend
+    funciona; los repositorios con índices las sobrescriben."""
+    
+    def existe_alumno(self, id: str) -> bool:
+        """Verifica si existe un alumno con el ID dado."""
+        return self.obtener_por_id(id) is not None
+    
+    def listar_por_tipo(self, tipo: str) -> List[Alumno]:
+        """Lista los alumnos de un tipo (según obtener_tipo_estudiante)."""
+        return [alumno for alumno in self.obtener_todos()
+                if isinstance(alumno, IEstudiante) and alumno.obtener_tipo_estudiante() == tipo]
+    
+    def listar_por_capacidad(self, capacidad: type) -> List[Alumno]:
+        """Lista los alumnos que implementan una interfaz de capacidad (IEstudia, IHaceClases, IInvestiga)."""
+        return [alumno for alumno in self.obtener_todos() if isinstance(alumno, capacidad)]
+    
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Obtiene la cantidad de alumnos por tipo."""
+        conteo: Dict[str, int] = {}
+        for alumno in self.obtener_todos():
+            if isinstance(alumno, IEstudiante):
+                tipo = alumno.obtener_tipo_estudiante()
+                conteo[tipo] = conteo.get(tipo, 0) + 1
+        return conteo
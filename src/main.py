@@ -15,6 +15,15 @@ from repositories.RepositorioAlumnos import RepositorioAlumnos
 from repositories.RepositorioAsignaturas import RepositorioAsignaturas
 from services.GestorAlumnos import GestorAlumnos
 from services.GestorAsignaturas import GestorAsignaturas
+from services.GestorMatriculas import GestorMatriculas
+from services.GestorCierreSemestre import GestorCierreSemestre
+from services.GestorReportes import GestorReportes
+from services.ControlCupos import ControlCupos
+from services.ControlHorarios import ControlHorarios
+from services.ControlCreditos import ControlCreditos
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+from interfaces.Capabilities.IHaceClases import IHaceClases
+from interfaces.Capabilities.IInvestiga import IInvestiga
 
 def main():
     print("=== Sistema de Gestión de Aula Virtual UV ===")
@@ -25,8 +34,21 @@ def main():
     repo_asignaturas = RepositorioAsignaturas()
     
     # Inicializar gestores con inyección de dependencias (DIP)
-    gestor_alumnos = GestorAlumnos(repo_alumnos, repo_asignaturas)
-    gestor_asignaturas = GestorAsignaturas(repo_asignaturas, repo_alumnos)
+    # Los gestores comparten el estado que se consulta al matricular
+    control_cupos = ControlCupos()
+    control_horarios = ControlHorarios()
+    control_creditos = ControlCreditos({"Estudiante Pregrado": 30, "Estudiante Ayudante": 30}, limite_por_defecto=20)
+    grafo_prerrequisitos = GrafoPrerrequisitos()
+    gestor_matriculas = GestorMatriculas(repo_alumnos, repo_asignaturas, control_cupos=control_cupos,
+                                         control_horarios=control_horarios, control_creditos=control_creditos,
+                                         grafo_prerrequisitos=grafo_prerrequisitos)
+    gestor_alumnos = GestorAlumnos(repo_alumnos, repo_asignaturas, matriculas=gestor_matriculas,
+                                   grafo_prerrequisitos=grafo_prerrequisitos)
+    gestor_asignaturas = GestorAsignaturas(repo_asignaturas, repo_alumnos, control_cupos=control_cupos,
+                                           control_horarios=control_horarios, control_creditos=control_creditos,
+                                           grafo_prerrequisitos=grafo_prerrequisitos, desvinculador=gestor_matriculas)
+    gestor_cierre = GestorCierreSemestre(repo_alumnos, repo_asignaturas, gestor_matriculas)
+    gestor_reportes = GestorReportes(repo_alumnos, repo_asignaturas)
     
     # === Demostración de los principios SOLID ===
     
@@ -35,6 +57,9 @@ def main():
     gestor_asignaturas.crear_asignatura("ING001", "Programación I", 6, 1, "PROF001")
     gestor_asignaturas.crear_asignatura("ING002", "Matemáticas I", 8, 1, "PROF002")
     gestor_asignaturas.crear_asignatura("ING003", "Física I", 6, 2, "PROF003")
+    gestor_asignaturas.agregar_bloque_horario("ING001", 0, "08:30", "10:00")
+    gestor_asignaturas.agregar_bloque_horario("ING002", 0, "10:15", "11:45")
+    gestor_asignaturas.agregar_bloque_horario("ING003", 0, "09:00", "10:30")
     
     print("2. Creando diferentes tipos de estudiantes...")
     # OCP: Nuevos tipos de estudiantes sin modificar código existente
@@ -46,10 +71,20 @@ def main():
     gestor_alumnos.crear_titulado("PROF001", "Dr. Pedro", "Martínez", "pedro.martinez@uv.cl", "Doctor en Ciencias", "Programación")
     
     print("3. Matriculando estudiantes en asignaturas...")
-    gestor_alumnos.matricular_alumno("EST001", "ING001")
-    gestor_alumnos.matricular_alumno("EST001", "ING002")
-    gestor_alumnos.matricular_alumno("EST002", "ING002")
-    gestor_alumnos.matricular_alumno("EST003", "ING003")
+    gestor_matriculas.matricular_alumno("EST001", "ING001")
+    gestor_matriculas.matricular_alumno("EST001", "ING002")
+    gestor_matriculas.matricular_alumno("EST002", "ING002")
+    gestor_matriculas.matricular_alumno("EST003", "ING003")
+    choque = gestor_matriculas.verificar_choque_horario("EST001", "ING003")
+    print(f"   ING003 choca en horario para EST001 con: {choque}")
+    carga = gestor_matriculas.obtener_carga_creditos("EST001")
+    print(f"   Carga de EST001: {carga['creditos']} de {carga['limite']} créditos")
+    semestre_1 = [asignatura.id for asignatura in gestor_asignaturas.listar_asignaturas_por_semestre(1)]
+    print(f"   En ING001 y ING002: {gestor_matriculas.consultar_matriculas(todas=['ING001', 'ING002'])}")
+    print(f"   En alguna de semestre 1 y no en ING003: {gestor_matriculas.contar_matriculas(alguna=semestre_1, ninguna=['ING003'])} alumnos")
+    print(f"   Compartidas por EST001 y EST002: {gestor_matriculas.obtener_asignaturas_compartidas('EST001', 'EST002')}")
+    par = gestor_asignaturas.obtener_pares_mas_compartidos(1)[0]
+    print(f"   Par con más alumnos en común: {' y '.join(par['asignaturas'])} ({par['alumnos_en_comun']})")
     
     print("\n=== Demostración de las capacidades específicas (ISP) ===")
     
@@ -84,6 +119,26 @@ def main():
     if hasattr(profesor, 'publicar_articulo'):
         profesor.publicar_articulo("Nuevos Paradigmas en Programación", "Artículo sobre tendencias en programación")
     
+    print("\n--- Consultas por Capacidad (índices del repositorio) ---")
+    docentes = gestor_alumnos.listar_por_capacidad(IHaceClases)
+    print(f"- Pueden hacer clases: {', '.join(alumno.nombre for alumno in docentes)}")
+    investigadores = gestor_alumnos.listar_por_capacidad(IInvestiga)
+    print(f"- Pueden investigar: {', '.join(alumno.nombre for alumno in investigadores)}")
+    doctorandos = gestor_alumnos.listar_por_tipo("Estudiante Doctorado")
+    print(f"- Estudiantes de doctorado: {', '.join(alumno.nombre for alumno in doctorandos)}")
+    
+    print("\n--- Búsqueda de Publicaciones (BM25) ---")
+    gestor_alumnos.publicar_articulo("EST004", "Redes neuronales y educación", "Aprendizaje automático con redes neuronales en el aula")
+    for resultado in gestor_alumnos.buscar_publicaciones("aprendizaje automatico educacion", k=3):
+        print(f"- {resultado['titulo']} ({resultado['autor']}) puntaje {resultado['puntaje']}")
+    
+    print("\n--- Dirección de Tesis (grafo de supervisión) ---")
+    gestor_alumnos.asignar_director_tesis("PROF001", "EST004", "IA en Sistemas Educativos")
+    gestor_alumnos.asignar_director_tesis("EST004", "EST003", "Machine Learning en Educación")
+    linaje = gestor_alumnos.obtener_linaje_academico("EST003")
+    print(f"- Linaje de EST003: {' <- '.join(persona_id for persona_id, _ in linaje['ancestros'])}")
+    print(f"- Tesis dirigidas por PROF001: {gestor_alumnos.obtener_carga_supervision('PROF001')['total_tesis']}")
+    
     print("\n=== Estadísticas del Sistema ===")
     
     # Mostrar estadísticas usando polimorfismo (LSP)
@@ -95,7 +150,7 @@ def main():
             print(f"- {info['nombre']} {info['apellido']} ({info['tipo']})")
     
     print("\n--- Estadísticas Generales ---")
-    stats_alumnos = gestor_alumnos.obtener_estadisticas()
+    stats_alumnos = gestor_reportes.obtener_estadisticas()
     print(f"Total de alumnos: {stats_alumnos['total_alumnos']}")
     print(f"Total de matrículas: {stats_alumnos['total_matriculas']}")
     print("Distribución por tipo:")
@@ -114,6 +169,35 @@ def main():
     print(f"  - Créditos: {carga_prof['total_creditos']}")
     print(f"  - Estudiantes: {carga_prof['total_estudiantes']}")
     
+    print("\n--- Prerrequisitos ---")
+    gestor_asignaturas.agregar_prerrequisito("ING003", "ING002")
+    print(f"ING003 requiere: {gestor_asignaturas.obtener_prerrequisitos('ING003')}")
+    print(f"ING002 requiere ING003 (ciclo): {gestor_asignaturas.agregar_prerrequisito('ING002', 'ING003')}")
+    print(f"Faltan a EST002 para ING003: {gestor_matriculas.verificar_prerrequisitos('EST002', 'ING003')}")
+    gestor_alumnos.registrar_aprobacion("EST002", "ING002")
+    rechazadas = gestor_matriculas.validar_lote_matriculas([("EST001", "ING003"), ("EST002", "ING003")])
+    print(f"Lote rechazado por prerrequisitos: {[(r['alumno_id'], r['asignatura_id']) for r in rechazadas]}")
+    
+    print("\n--- Notas ---")
+    gestor_alumnos.registrar_notas_lote([("EST001", "ING001", "2025-1", 6.2), ("EST001", "ING002", "2025-1", 3.5),
+                                         ("EST002", "ING002", "2025-1", 4.8)])
+    gestor_alumnos.registrar_nota("EST001", "ING002", "2025-1", 4.5)
+    print(f"Promedio de EST001: {gestor_alumnos.obtener_promedio('EST001')}")
+    print(f"Faltan a EST001 para ING003 (tras aprobar ING002): {gestor_matriculas.verificar_prerrequisitos('EST001', 'ING003')}")
+    distribucion = gestor_alumnos.obtener_distribucion_notas("ING002")
+    print(f"Notas de ING002: promedio {distribucion['promedio']}, aprobados {distribucion['aprobados']}/{distribucion['cantidad']}")
+    print(f"Auditoría de promedios: {len(gestor_alumnos.auditar_promedios())} diferencias")
+    
+    print("\n--- Cierre de Semestre ---")
+    antes_del_cierre = datetime.now()
+    resumen = gestor_cierre.cerrar_semestre("2025-1")
+    print(f"Semestres avanzados: {resumen['semestres_avanzados']}, matrículas archivadas: {resumen['matriculas_archivadas']}")
+    print(f"Historial de EST001: {gestor_cierre.obtener_historial_matriculas('EST001')}")
+    print(f"Nómina de ING001 antes del cierre: {gestor_cierre.obtener_nomina_en('ING001', antes_del_cierre)}, "
+          f"ahora: {gestor_cierre.obtener_nomina_en('ING001', datetime.now())}")
+    tramos = gestor_cierre.obtener_linea_tiempo_matriculas('EST001')
+    print(f"Tramos de matrícula de EST001: {[(tramo['asignatura_id'], tramo['hasta'] is not None) for tramo in tramos]}")
+    
     print("\n=== Resumen de Principios SOLID Implementados ===")
     print("✓ SRP: Cada clase tiene una sola responsabilidad")
     print("  - Alumno: maneja datos básicos")
@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from datetime import datetime
+from utils.Trazador import trazado
 
 class Alumno:
     """Clase que representa un alumno en el sistema.
@@ -37,6 +38,7 @@ class Alumno:
     def asignaturas_matriculadas(self) -> List[str]:
         return self._asignaturas_matriculadas.copy()
     
+    @trazado("modelo")
     def matricular_asignatura(self, asignatura_id: str) -> bool:
         """Matricula al alumno en una asignatura."""
         if asignatura_id not in self._asignaturas_matriculadas:
@@ -44,6 +46,7 @@ class Alumno:
             return True
         return False
     
+    @trazado("modelo")
     def desmatricular_asignatura(self, asignatura_id: str) -> bool:
         """Desmatricula al alumno de una asignatura."""
         if asignatura_id in self._asignaturas_matriculadas:
@@ -51,6 +54,14 @@ class Alumno:
             return True
         return False
     
+    def vaciar_matriculas(self) -> List[str]:
+        """Quita todas las matrículas (ej. al cerrar el período) y retorna las que tenía.
+        Vacía la lista en sitio y retorna una copia temporal: en un cierre masivo no deja un
+        objeto nuevo por alumno que el GC deba promover y recorrer."""
+        anteriores = list(self._asignaturas_matriculadas)
+        self._asignaturas_matriculadas.clear()
+        return anteriores
+    
     def obtener_info_completa(self) -> Dict[str, Any]:
         """Obtiene toda la información del alumno."""
         return {
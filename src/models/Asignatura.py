@@ -1,17 +1,28 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from collections import deque
 from datetime import datetime
+from models.BloqueHorario import BloqueHorario
+from utils.Trazador import trazado
+
+# Campos que pueden modificarse con aplicar_cambios
+CAMPOS_MODIFICABLES = ('nombre', 'creditos', 'semestre', 'profesor_id')
 
 class Asignatura:
     """Clase que representa una asignatura en el sistema.
     Principio SRP: Se encarga únicamente de los datos de la asignatura."""
     
-    def __init__(self, id: str, nombre: str, creditos: int, semestre: int, profesor_id: str):
+    def __init__(self, id: str, nombre: str, creditos: int, semestre: int, profesor_id: str, cupo: Optional[int] = None):
         self._id = id
         self._nombre = nombre
         self._creditos = creditos
         self._semestre = semestre
         self._profesor_id = profesor_id
-        self._estudiantes_matriculados: List[str] = []
+        # Diccionario con orden de inserción: pertenencia O(1) conservando el orden de matrícula
+        self._estudiantes_matriculados: Dict[str, None] = {}
+        self._cupo = cupo
+        self._lista_espera: deque = deque()
+        self._en_espera: set = set()
+        self._horario: List[BloqueHorario] = []
         self._fecha_creacion = datetime.now()
     
     @property
@@ -36,26 +47,150 @@ class Asignatura:
     
     @property
     def estudiantes_matriculados(self) -> List[str]:
-        return self._estudiantes_matriculados.copy()
+        return list(self._estudiantes_matriculados)
     
     @property
     def fecha_creacion(self) -> datetime:
         return self._fecha_creacion
     
+    @property
+    def cupo(self) -> Optional[int]:
+        """Cantidad máxima de estudiantes (None = sin límite)."""
+        return self._cupo
+    
+    @property
+    def lista_espera(self) -> List[str]:
+        return list(self._lista_espera)
+    
+    @property
+    def horario(self) -> List[BloqueHorario]:
+        return self._horario.copy()
+    
+    def agregar_bloque_horario(self, bloque: BloqueHorario) -> bool:
+        """Agrega un bloque semanal de clases si no se superpone con los existentes."""
+        if any(bloque.se_superpone(existente) for existente in self._horario):
+            return False
+        self._horario.append(bloque)
+        return True
+    
+    def quitar_bloque_horario(self, bloque: BloqueHorario) -> bool:
+        """Quita un bloque del horario."""
+        if bloque in self._horario:
+            self._horario.remove(bloque)
+            return True
+        return False
+    
+    def obtener_mascara_horario(self) -> int:
+        """Obtiene el horario completo como máscara de bits semanal."""
+        mascara = 0
+        for bloque in self._horario:
+            mascara |= bloque.obtener_mascara()
+        return mascara
+    
+    def establecer_cupo(self, cupo: Optional[int]) -> bool:
+        """Establece el cupo; no puede quedar bajo la cantidad de estudiantes ya matriculados."""
+        if cupo is not None and (cupo < 0 or cupo < len(self._estudiantes_matriculados)):
+            return False
+        self._cupo = cupo
+        return True
+    
+    def cupos_disponibles(self) -> Optional[int]:
+        """Obtiene los cupos libres (None si la asignatura no tiene límite)."""
+        if self._cupo is None:
+            return None
+        return self._cupo - len(self._estudiantes_matriculados)
+    
+    def tiene_cupo_disponible(self) -> bool:
+        """Indica si se puede matricular un estudiante más."""
+        return self._cupo is None or len(self._estudiantes_matriculados) < self._cupo
+    
+    def agregar_a_lista_espera(self, estudiante_id: str) -> bool:
+        """Agrega un estudiante al final de la lista de espera (FIFO)."""
+        if estudiante_id in self._en_espera or estudiante_id in self._estudiantes_matriculados:
+            return False
+        self._lista_espera.append(estudiante_id)
+        self._en_espera.add(estudiante_id)
+        return True
+    
+    def retirar_de_lista_espera(self, estudiante_id: str) -> bool:
+        """Retira a un estudiante de la lista de espera."""
+        if estudiante_id in self._en_espera:
+            self._lista_espera.remove(estudiante_id)
+            self._en_espera.discard(estudiante_id)
+            return True
+        return False
+    
+    def esta_en_espera(self, estudiante_id: str) -> bool:
+        """Indica si el estudiante está en la lista de espera."""
+        return estudiante_id in self._en_espera
+    
+    def devolver_a_lista_espera(self, estudiante_id: str) -> None:
+        """Reinserta a un estudiante al inicio de la lista de espera (al revertir una promoción)."""
+        if estudiante_id not in self._en_espera:
+            self._lista_espera.appendleft(estudiante_id)
+            self._en_espera.add(estudiante_id)
+    
+    def siguiente_en_espera(self) -> Optional[str]:
+        """Saca y retorna el primer estudiante de la lista de espera."""
+        if self._lista_espera:
+            estudiante_id = self._lista_espera.popleft()
+            self._en_espera.discard(estudiante_id)
+            return estudiante_id
+        return None
+    
+    @trazado("modelo")
     def agregar_estudiante(self, estudiante_id: str) -> bool:
-        """Agrega un estudiante a la asignatura."""
+        """Agrega un estudiante a la asignatura si queda cupo."""
+        if not self.tiene_cupo_disponible():
+            return False
         if estudiante_id not in self._estudiantes_matriculados:
-            self._estudiantes_matriculados.append(estudiante_id)
+            self._estudiantes_matriculados[estudiante_id] = None
             return True
         return False
     
+    @trazado("modelo")
     def remover_estudiante(self, estudiante_id: str) -> bool:
         """Remueve un estudiante de la asignatura."""
         if estudiante_id in self._estudiantes_matriculados:
-            self._estudiantes_matriculados.remove(estudiante_id)
+            del self._estudiantes_matriculados[estudiante_id]
             return True
         return False
     
+    def remover_estudiantes(self, estudiantes_ids: set) -> List[str]:
+        """Remueve varios estudiantes y retorna los que estaban matriculados."""
+        removidos = [estudiante_id for estudiante_id in estudiantes_ids if estudiante_id in self._estudiantes_matriculados]
+        for estudiante_id in removidos:
+            del self._estudiantes_matriculados[estudiante_id]
+        return removidos
+    
+    def vaciar_estudiantes(self) -> int:
+        """Quita a todos los matriculados y la lista de espera (al cerrar el período).
+        Retorna cuántos estudiantes estaban matriculados."""
+        cantidad = len(self._estudiantes_matriculados)
+        self._estudiantes_matriculados = {}
+        self._lista_espera.clear()
+        self._en_espera.clear()
+        return cantidad
+    
+    def aplicar_cambios(self, cambios: Dict[str, Any]) -> Dict[str, Any]:
+        """Modifica en su lugar los campos indicados (nombre, creditos, semestre, profesor_id).
+        Conserva matrículas, lista de espera, horario y fecha de creación.
+        Retorna los valores anteriores de los campos que realmente cambiaron."""
+        desconocidos = set(cambios) - set(CAMPOS_MODIFICABLES)
+        if desconocidos:
+            raise ValueError(f"Campos no modificables: {', '.join(sorted(desconocidos))}")
+        anteriores = {}
+        for campo, valor in cambios.items():
+            actual = getattr(self, '_' + campo)
+            if valor != actual:
+                anteriores[campo] = actual
+                setattr(self, '_' + campo, valor)
+        return anteriores
+    
+    def asignar_profesor(self, profesor_id: Optional[str]) -> None:
+        """Cambia el profesor a cargo (None = asignatura sin profesor asignado)."""
+        self._profesor_id = profesor_id
+    
     def obtener_cantidad_estudiantes(self) -> int:
         """Obtiene la cantidad de estudiantes matriculados."""
         return len(self._estudiantes_matriculados)
@@ -68,8 +203,11 @@ class Asignatura:
             'creditos': self._creditos,
             'semestre': self._semestre,
             'profesor_id': self._profesor_id,
-            'estudiantes_matriculados': self._estudiantes_matriculados.copy(),
+            'estudiantes_matriculados': list(self._estudiantes_matriculados),
             'cantidad_estudiantes': len(self._estudiantes_matriculados),
+            'cupo': self._cupo,
+            'lista_espera': list(self._lista_espera),
+            'horario': [bloque.obtener_info_completa() for bloque in self._horario],
             'fecha_creacion': self._fecha_creacion.isoformat()
         }
     
@@ -0,0 +1,70 @@
+from typing import Dict, Any
+
+DIAS_SEMANA = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
+
+class BloqueHorario:
+    """Bloque semanal de clases (día y rango horario).
+    Principio SRP: Solo representa un intervalo de tiempo dentro de la semana.
+    Las horas se alinean a módulos de 5 minutos para poder representarse como bits."""
+    
+    MINUTOS_POR_MODULO = 5
+    MODULOS_POR_DIA = 24 * 60 // MINUTOS_POR_MODULO
+    
+    def __init__(self, dia: int, inicio: str, fin: str):
+        if dia < 0 or dia >= len(DIAS_SEMANA):
+            raise ValueError(f"Día inválido: {dia}")
+        self._dia = dia
+        self._inicio = self._a_minutos(inicio)
+        self._fin = self._a_minutos(fin)
+        if self._fin <= self._inicio:
+            raise ValueError(f"El bloque debe terminar después de empezar: {inicio}-{fin}")
+    
+    @staticmethod
+    def _a_minutos(hora: str) -> int:
+        horas, minutos = hora.split(':')
+        total = int(horas) * 60 + int(minutos)
+        if total < 0 or total > 24 * 60 or total % BloqueHorario.MINUTOS_POR_MODULO != 0:
+            raise ValueError(f"Hora inválida (debe ser HH:MM en múltiplos de {BloqueHorario.MINUTOS_POR_MODULO} min): {hora}")
+        return total
+    
+    @property
+    def dia(self) -> int:
+        return self._dia
+    
+    @property
+    def inicio(self) -> int:
+        """Minuto del día en que empieza el bloque."""
+        return self._inicio
+    
+    @property
+    def fin(self) -> int:
+        """Minuto del día en que termina el bloque."""
+        return self._fin
+    
+    def se_superpone(self, otro: 'BloqueHorario') -> bool:
+        """Indica si dos bloques se superponen en el tiempo."""
+        return self._dia == otro._dia and self._inicio < otro._fin and otro._inicio < self._fin
+    
+    def obtener_mascara(self) -> int:
+        """Obtiene el bloque como máscara de bits sobre los módulos de la semana."""
+        desde = self._dia * self.MODULOS_POR_DIA + self._inicio // self.MINUTOS_POR_MODULO
+        hasta = self._dia * self.MODULOS_POR_DIA + self._fin // self.MINUTOS_POR_MODULO
+        return ((1 << (hasta - desde)) - 1) << desde
+    
+    def obtener_info_completa(self) -> Dict[str, Any]:
+        """Obtiene toda la información del bloque."""
+        return {
+            'dia': self._dia,
+            'inicio': f"{self._inicio // 60:02d}:{self._inicio % 60:02d}",
+            'fin': f"{self._fin // 60:02d}:{self._fin % 60:02d}"
+        }
+    
+    def __eq__(self, otro) -> bool:
+        return isinstance(otro, BloqueHorario) and (self._dia, self._inicio, self._fin) == (otro._dia, otro._inicio, otro._fin)
+    
+    def __hash__(self) -> int:
+        return hash((self._dia, self._inicio, self._fin))
+    
+    def __str__(self) -> str:
+        info = self.obtener_info_completa()
+        return f"{DIAS_SEMANA[self._dia]} {info['inicio']}-{info['fin']}"
\ No newline at end of file
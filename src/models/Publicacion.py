@@ -0,0 +1,55 @@
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional
+from utils.AlmacenBlobs import AlmacenBlobs, obtener_almacen_predeterminado
+
+class Publicacion(Mapping):
+    """Artículo de investigación publicado.
+    Principio SRP: Solo representa el artículo; el texto lo guarda un AlmacenBlobs.
+    En memoria quedan los metadatos y el hash del contenido; el texto se carga de forma
+    diferida al leer 'contenido'. Se comporta como un diccionario de solo lectura con las
+    mismas claves que antes ('titulo', 'contenido', 'autor', 'fecha', ...).
+    Sin 'almacen' se usa el almacén predeterminado del proceso, que es temporal: los textos se
+    borran al terminar el proceso. Para conservarlos entre ejecuciones hay que configurar un
+    directorio con establecer_almacen_predeterminado o pasar un AlmacenBlobs propio."""
+    
+    __slots__ = ('_metadatos', '_contenido_hash', '_almacen')
+    
+    def __init__(self, titulo: str, contenido: str, metadatos: Dict[str, str], almacen: Optional[AlmacenBlobs] = None):
+        self._almacen = almacen if almacen is not None else obtener_almacen_predeterminado()
+        self._contenido_hash = self._almacen.guardar(contenido)
+        self._metadatos = {'titulo': titulo, **metadatos}
+    
+    @property
+    def titulo(self) -> str:
+        return self._metadatos['titulo']
+    
+    @property
+    def contenido_hash(self) -> str:
+        return self._contenido_hash
+    
+    @property
+    def contenido(self) -> str:
+        """Texto del artículo, leído desde el almacén (o su caché)."""
+        return self._almacen.obtener(self._contenido_hash)
+    
+    def obtener_metadatos(self) -> Dict[str, Any]:
+        """Obtiene los datos del artículo sin cargar el contenido."""
+        return dict(self._metadatos, contenido_hash=self._contenido_hash)
+    
+    def __getitem__(self, clave: str) -> Any:
+        if clave == 'contenido':
+            return self.contenido
+        return self._metadatos[clave]
+    
+    def __iter__(self) -> Iterator[str]:
+        yield 'titulo'
+        yield 'contenido'
+        for clave in self._metadatos:
+            if clave != 'titulo':
+                yield clave
+    
+    def __len__(self) -> int:
+        return len(self._metadatos) + 1
+    
+    def __repr__(self) -> str:
+        return f"Publicacion({self.titulo!r}, {self._contenido_hash[:12]})"
\ No newline at end of file
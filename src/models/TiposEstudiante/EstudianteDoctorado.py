@@ -50,9 +50,17 @@ class EstudianteDoctorado(EstudianteMagister, IHaceClases):
     # Override de IInvestiga para doctorado
     def dirigir_tesis(self, estudiante: str, tema: str) -> str:
         """Dirige una tesis de estudiante (los doctorantes sí pueden)."""
-        self._estudiantes_dirigidos.append(estudiante)
+        if estudiante not in self._estudiantes_dirigidos:
+            self._estudiantes_dirigidos.append(estudiante)
         return f"El doctorando {self._nombre} está dirigiendo la tesis de {estudiante} sobre: {tema}"
     
+    def dejar_de_dirigir(self, estudiante: str) -> bool:
+        """Deja de dirigir la tesis de un estudiante (ej. porque dejó el sistema)."""
+        if estudiante in self._estudiantes_dirigidos:
+            self._estudiantes_dirigidos.remove(estudiante)
+            return True
+        return False
+    
     # Implementación de IHaceClases
     def dictar_clase(self, asignatura: str, tema: str) -> str:
         """Método para dictar una clase como doctorando."""
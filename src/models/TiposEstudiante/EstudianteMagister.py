@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from datetime import datetime
+from models.Publicacion import Publicacion
 from models.TiposEstudiante.Estudiante import Estudiante
 from interfaces.Capabilities.IInvestiga import IInvestiga
 
@@ -10,7 +11,7 @@ class EstudianteMagister(Estudiante, IInvestiga):
     def __init__(self, id: str, nombre: str, apellido: str, email: str, fecha_ingreso: datetime, carrera: str, tema_tesis: str):
         super().__init__(id, nombre, apellido, email, fecha_ingreso, carrera)
         self._tema_tesis = tema_tesis
-        self._publicaciones: List[Dict[str, str]] = []
+        self._publicaciones: List[Publicacion] = []
         self._director_tesis = ""
     
     @property
@@ -47,17 +48,16 @@ class EstudianteMagister(Estudiante, IInvestiga):
     
     def publicar_articulo(self, titulo: str, contenido: str) -> bool:
         """Publica un artículo de investigación."""
-        articulo = {
-            'titulo': titulo,
-            'contenido': contenido,
+        # El contenido va al almacén de blobs; en memoria quedan el hash y los metadatos
+        articulo = Publicacion(titulo, contenido, {
             'autor': f"{self._nombre} {self._apellido}",
             'fecha': datetime.now().isoformat()
-        }
+        })
         self._publicaciones.append(articulo)
         return True
     
-    def obtener_publicaciones(self) -> List[Dict[str, str]]:
-        """Obtiene la lista de publicaciones realizadas."""
+    def obtener_publicaciones(self) -> List[Publicacion]:
+        """Obtiene la lista de publicaciones realizadas (el contenido se carga al leerlo)."""
         return self._publicaciones.copy()
     
     def dirigir_tesis(self, estudiante: str, tema: str) -> str:
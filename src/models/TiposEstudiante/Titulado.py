@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
 from datetime import datetime
+from models.Publicacion import Publicacion
 from models.Alumno import Alumno
 from interfaces.IEstudiante import IEstudiante
 from interfaces.Capabilities.IHaceClases import IHaceClases
@@ -14,7 +15,7 @@ class Titulado(Alumno, IEstudiante, IHaceClases, IInvestiga):
         self._titulo = titulo
         self._especialidad = especialidad
         self._experiencia_anos = 0
-        self._publicaciones: List[Dict[str, str]] = []
+        self._publicaciones: List[Publicacion] = []
         self._asignaturas_docencia: List[str] = []
         self._estudiantes_dirigidos: List[str] = []
     
@@ -30,6 +31,10 @@ class Titulado(Alumno, IEstudiante, IHaceClases, IInvestiga):
     def experiencia_anos(self) -> int:
         return self._experiencia_anos
     
+    @property
+    def estudiantes_dirigidos(self) -> List[str]:
+        return self._estudiantes_dirigidos.copy()
+    
     def aumentar_experiencia(self, anos: int) -> None:
         """Aumenta los años de experiencia."""
         self._experiencia_anos += anos
@@ -92,24 +97,31 @@ class Titulado(Alumno, IEstudiante, IHaceClases, IInvestiga):
     
     def publicar_articulo(self, titulo: str, contenido: str) -> bool:
         """Publica un artículo de investigación."""
-        articulo = {
-            'titulo': titulo,
-            'contenido': contenido,
+        # El contenido va al almacén de blobs; en memoria quedan el hash y los metadatos
+        articulo = Publicacion(titulo, contenido, {
             'autor': f"{self._titulo} {self._nombre} {self._apellido}",
             'especialidad': self._especialidad,
             'fecha': datetime.now().isoformat()
-        }
+        })
         self._publicaciones.append(articulo)
         return True
     
-    def obtener_publicaciones(self) -> List[Dict[str, str]]:
-        """Obtiene la lista de publicaciones realizadas."""
+    def obtener_publicaciones(self) -> List[Publicacion]:
+        """Obtiene la lista de publicaciones realizadas (el contenido se carga al leerlo)."""
         return self._publicaciones.copy()
     
     def dirigir_tesis(self, estudiante: str, tema: str) -> str:
         """Dirige una tesis de estudiante."""
-        self._estudiantes_dirigidos.append(estudiante)
+        if estudiante not in self._estudiantes_dirigidos:
+            self._estudiantes_dirigidos.append(estudiante)
         return f"El {self._titulo} {self._nombre} está dirigiendo la tesis de {estudiante} sobre: {tema}"
     
+    def dejar_de_dirigir(self, estudiante: str) -> bool:
+        """Deja de dirigir la tesis de un estudiante (ej. porque dejó el sistema)."""
+        if estudiante in self._estudiantes_dirigidos:
+            self._estudiantes_dirigidos.remove(estudiante)
+            return True
+        return False
+    
     def __str__(self) -> str:
         return f"{self._titulo}: {self._nombre} {self._apellido} - {self._especialidad} ({self._experiencia_anos} años exp.)"
\ No newline at end of file
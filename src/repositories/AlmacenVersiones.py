@@ -0,0 +1,259 @@
+import threading
+from bisect import bisect_right
+from collections import Counter, deque
+from typing import List, Optional, Any, Dict, Tuple, Callable
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+
+# Campos que buscar() compara por subcadena (igual que los repositorios concretos)
+CAMPOS_TEXTO = ('nombre', 'apellido', 'email')
+
+def congelar(entidad: Any) -> Any:
+    """Crea una copia de la entidad con sus colecciones copiadas, inmune a mutaciones posteriores."""
+    copia = object.__new__(type(entidad))
+    vars(copia).update({
+        clave: valor.copy() if isinstance(valor, (list, dict, set, deque)) else valor
+        for clave, valor in vars(entidad).items()
+    })
+    return copia
+
+class RelojVersiones:
+    """Reloj de versiones compartido por los almacenes de varios repositorios.
+    Principio SRP: Solo numera los cambios y lleva la cuenta de los lectores activos.
+    Todos los almacenes de un mismo reloj numeran sus cambios en una única secuencia bajo un
+    único lock, por lo que la misma versión representa el mismo corte en todos ellos y
+    abrir_instantaneas puede abrir vistas de varios repositorios en un solo paso."""
+    
+    def __init__(self):
+        self._version = 0
+        self._lectores: Counter = Counter()
+        self._lock = threading.Lock()
+        self._almacenes: List['AlmacenVersiones'] = []
+    
+    @property
+    def version_actual(self) -> int:
+        return self._version
+    
+    def abrir_instantaneas(self, *almacenes: 'AlmacenVersiones') -> Tuple['Instantanea', ...]:
+        """Abre, de forma atómica, una instantánea de cada almacén en la misma versión."""
+        for almacen in almacenes:
+            if almacen._reloj is not self:
+                raise ValueError("Todos los almacenes deben compartir este reloj")
+        with self._lock:
+            version = self._version
+            self._lectores[version] += len(almacenes)
+        return tuple(almacen._crear_instantanea(version) for almacen in almacenes)
+
+class AlmacenVersiones:
+    """Almacén multiversión (MVCC) de un repositorio.
+    Principio SRP: Solo conserva versiones; el repositorio sigue siendo el dueño de los datos.
+    Cada mutación notificada por el repositorio registra una versión congelada de la entidad
+    (se copian sus colecciones en el momento de la notificación). Los lectores abren una
+    Instantanea en una versión fija y nunca bloquean a los escritores; las versiones que ningún
+    lector puede ver se reemplazan o se liberan al cerrar instantáneas.
+    Una instantánea solo ve estados notificados: una entidad modificada en memoria pero aún no
+    notificada (ej. dentro de una transacción sin confirmar) se sigue leyendo en su última versión.
+    Para cortes consistentes entre repositorios, sus almacenes deben compartir un RelojVersiones."""
+    
+    def __init__(self, repositorio: IRepositorio, intervalo_limpieza: int = 1000,
+                 reloj: Optional[RelojVersiones] = None):
+        self._reloj = reloj if reloj is not None else RelojVersiones()
+        # id -> lista ordenada de (version, entidad congelada o None si fue eliminada)
+        self._historial: Dict[str, List[Tuple[int, Optional[Any]]]] = {}
+        self._ids_con_historial: set = set()
+        self._lock = self._reloj._lock
+        self._lectores = self._reloj._lectores
+        self._intervalo_limpieza = intervalo_limpieza
+        self._escrituras_desde_limpieza = 0
+        self._es_de_alumnos = isinstance(repositorio, IRepositorioAlumnos)
+        with self._lock:
+            self._reloj._almacenes.append(self)
+            for entidad in repositorio.obtener_todos():
+                self._historial[entidad.id] = [(self._reloj._version, congelar(entidad))]
+        repositorio.suscribir_cambios(self._registrar_cambio)
+    
+    @property
+    def reloj(self) -> RelojVersiones:
+        return self._reloj
+    
+    @property
+    def version_actual(self) -> int:
+        return self._reloj._version
+    
+    def _registrar_cambio(self, operacion: str, id: str, entidad: Optional[Any]) -> None:
+        with self._lock:
+            # Se congela bajo el lock para que la última versión nunca sea más antigua que la anterior
+            congelada = congelar(entidad) if entidad is not None else None
+            self._reloj._version += 1
+            version = self._reloj._version
+            versiones = self._historial.get(id)
+            if versiones is None:
+                if congelada is not None or self._lectores:
+                    self._historial[id] = [(version, congelada)]
+            elif not self._lectores or versiones[-1][0] > max(self._lectores):
+                # Ningún lector abierto ve la última versión: se reemplaza en lugar de conservarla
+                if congelada is None and not self._lectores:
+                    del self._historial[id]
+                else:
+                    versiones[-1] = (version, congelada)
+                    if len(versiones) > 1:
+                        self._ids_con_historial.add(id)
+            else:
+                versiones.append((version, congelada))
+                self._ids_con_historial.add(id)
+            self._escrituras_desde_limpieza += 1
+            if self._escrituras_desde_limpieza >= self._intervalo_limpieza:
+                self._limpiar()
+    
+    def abrir_instantanea(self) -> 'Instantanea':
+        """Abre una vista de solo lectura consistente en la versión actual."""
+        return self._reloj.abrir_instantaneas(self)[0]
+    
+    def _crear_instantanea(self, version: int) -> 'Instantanea':
+        if self._es_de_alumnos:
+            return InstantaneaAlumnos(self, version)
+        return Instantanea(self, version)
+    
+    def _cerrar_instantanea(self, version: int) -> None:
+        with self._lock:
+            self._lectores[version] -= 1
+            if self._lectores[version] <= 0:
+                del self._lectores[version]
+            # El lector más antiguo es común a todo el reloj: se limpian todos sus almacenes
+            for almacen in self._reloj._almacenes:
+                almacen._limpiar()
+    
+    def _limpiar(self) -> None:
+        """Libera las versiones que ningún lector activo puede ver (requiere el lock)."""
+        self._escrituras_desde_limpieza = 0
+        minima = min(self._lectores) if self._lectores else self._reloj._version
+        for id in list(self._ids_con_historial):
+            versiones = self._historial[id]
+            # Se conserva la última versión visible para el lector más antiguo
+            corte = bisect_right(versiones, minima, key=lambda version: version[0]) - 1
+            if corte > 0:
+                versiones = versiones[corte:]
+            if len(versiones) == 1:
+                self._ids_con_historial.discard(id)
+                if versiones[0][1] is None and not self._lectores:
+                    del self._historial[id]
+                    continue
+            self._historial[id] = versiones
+    
+    def _leer(self, id: str, version: int) -> Optional[Any]:
+        versiones = self._historial.get(id)
+        if not versiones:
+            return None
+        ultima = versiones[-1]
+        if ultima[0] <= version:
+            return ultima[1]
+        posicion = bisect_right(versiones, version, key=lambda item: item[0]) - 1
+        if posicion < 0:
+            return None
+        return versiones[posicion][1]
+    
+    def _leer_todos(self, version: int) -> List[Any]:
+        resultado = []
+        # list() copia los valores de una vez, aunque un escritor agregue entidades mientras tanto
+        for versiones in list(self._historial.values()):
+            ultima = versiones[-1]
+            if ultima[0] > version:
+                posicion = bisect_right(versiones, version, key=lambda item: item[0]) - 1
+                ultima = versiones[posicion] if posicion >= 0 else (0, None)
+            if ultima[1] is not None:
+                resultado.append(ultima[1])
+        return resultado
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del almacén: versión, lectores activos y versiones retenidas."""
+        with self._lock:
+            return {
+                'version_actual': self._reloj._version,
+                'lectores_activos': sum(self._lectores.values()),
+                'entidades': len(self._historial),
+                'versiones_retenidas': sum(len(versiones) for versiones in self._historial.values())
+            }
+
+class Instantanea(IRepositorio):
+    """Vista de solo lectura de un repositorio en una versión fija.
+    Principio LSP: Puede usarse donde se espera un IRepositorio de lectura (ej. un gestor de reportes)."""
+    
+    def __init__(self, almacen: AlmacenVersiones, version: int):
+        self._almacen = almacen
+        self._version = version
+        self._abierta = True
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def cerrar(self) -> None:
+        """Libera la instantánea para que sus versiones puedan recolectarse."""
+        if self._abierta:
+            self._abierta = False
+            self._almacen._cerrar_instantanea(self._version)
+    
+    def __enter__(self) -> 'Instantanea':
+        return self
+    
+    def __exit__(self, tipo_error, error, traza) -> bool:
+        self.cerrar()
+        return False
+    
+    # Escrituras: la instantánea es inmutable
+    def agregar(self, item: Any) -> bool:
+        return False
+    
+    def actualizar(self, id: str, item: Any) -> bool:
+        return False
+    
+    def eliminar(self, id: str) -> bool:
+        return False
+    
+    def suscribir_cambios(self, observador: Callable[[str, str, Optional[Any]], None]) -> None:
+        """Una instantánea nunca cambia: no hay nada que notificar."""
+        pass
+    
+    # Lecturas
+    def obtener_por_id(self, id: str) -> Optional[Any]:
+        """Obtiene la entidad tal como estaba en la versión de la instantánea."""
+        return self._almacen._leer(id, self._version)
+    
+    def obtener_todos(self) -> List[Any]:
+        """Obtiene todas las entidades visibles en la versión de la instantánea."""
+        return self._almacen._leer_todos(self._version)
+    
+    def buscar(self, criterio: dict) -> List[Any]:
+        """Busca entidades según un criterio (texto por subcadena, otros campos por igualdad)."""
+        resultado = []
+        for entidad in self.obtener_todos():
+            cumple_criterio = True
+            for campo, valor in criterio.items():
+                actual = getattr(entidad, campo, None)
+                if campo in CAMPOS_TEXTO:
+                    if actual is None or valor.lower() not in actual.lower():
+                        cumple_criterio = False
+                elif actual != valor:
+                    cumple_criterio = False
+            if cumple_criterio:
+                resultado.append(entidad)
+        return resultado
+    
+    def buscar_por_semestre(self, semestre: int) -> List[Any]:
+        return [entidad for entidad in self.obtener_todos() if getattr(entidad, 'semestre', None) == semestre]
+    
+    def buscar_por_profesor(self, profesor_id: str) -> List[Any]:
+        return [entidad for entidad in self.obtener_todos() if getattr(entidad, 'profesor_id', None) == profesor_id]
+    
+    def buscar_por_asignatura(self, asignatura_id: str) -> List[Any]:
+        return [entidad for entidad in self.obtener_todos()
+                if asignatura_id in getattr(entidad, 'asignaturas_matriculadas', ())]
+    
+    def obtener_cantidad_total(self) -> int:
+        return len(self.obtener_todos())
+
+class InstantaneaAlumnos(Instantanea, IRepositorioAlumnos):
+    """Instantánea de un repositorio de alumnos.
+    Principio LSP: Agrega las consultas de IRepositorioAlumnos (existe_alumno, listar_por_tipo,
+    listar_por_capacidad, contar_por_tipo) sobre la versión fija, así puede respaldar a un
+    GestorReportes."""
\ No newline at end of file
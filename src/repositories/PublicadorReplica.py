@@ -0,0 +1,277 @@
+import json
+import logging
+import struct
+import threading
+import time
+from array import array
+from collections import deque
+from itertools import accumulate
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Any, Dict, Callable, Tuple
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IEstudiante import IEstudiante
+from repositories.AlmacenVersiones import AlmacenVersiones, RelojVersiones
+
+# Segmento de control: secuencia (8 bytes) y luego [versión][instante de publicación][latido][nombre del segmento].
+# La secuencia es impar mientras se escribe (seqlock): el lector reintenta si cambió durante su lectura.
+# El latido es el último instante en que el publicador en segundo plano confirmó que la versión
+# vigente está al día (0 si no hay publicación en segundo plano)
+FORMATO_CONTROL = '<Qdd64s'
+TAMANO_CONTROL = 8 + struct.calcsize(FORMATO_CONTROL)
+
+registro = logging.getLogger(__name__)
+
+# Segmentos creados por publicadores de este proceso (ReplicaLectura no debe quitarlos del resource_tracker)
+SEGMENTOS_PROPIOS = set()
+
+def nombre_control(nombre: str) -> str:
+    return f"{nombre}_control"
+
+def _tabla(partes: List[bytes]) -> Tuple[bytes, array]:
+    """Concatena las partes y retorna (datos, inicio de cada parte + largo total)."""
+    return b''.join(partes), array('I', accumulate(map(len, partes), initial=0))
+
+def _columna(textos: List[str]) -> Tuple[bytes, array]:
+    """Columna de búsqueda: textos en minúsculas terminados en salto de línea, para buscar subcadenas sobre todo el bloque."""
+    return _tabla([texto.lower().replace('\n', ' ').encode('utf-8') + b'\n' for texto in textos])
+
+def _crear_segmento(nombre: str, tamano: int) -> SharedMemory:
+    """Crea un segmento; si quedó uno con ese nombre de un publicador que terminó sin cerrar, lo reemplaza."""
+    try:
+        return SharedMemory(name=nombre, create=True, size=tamano)
+    except FileExistsError:
+        registro.warning("Se reemplaza el segmento huérfano '%s'", nombre)
+        huerfano = SharedMemory(name=nombre)
+        huerfano.close()
+        huerfano.unlink()
+        return SharedMemory(name=nombre, create=True, size=tamano)
+
+def _info_alumno(alumno: Any) -> Dict[str, Any]:
+    info = alumno.obtener_info_completa()
+    return {**alumno.obtener_info_basica(), **info} if isinstance(alumno, IEstudiante) else info
+
+class PublicadorReplica:
+    """Publica en memoria compartida instantáneas de solo lectura, versionadas, de los repositorios.
+    Principio SRP: Solo serializa y publica; las consultas las responde ReplicaLectura en otros procesos.
+    Cada versión va en un segmento propio que no se modifica después de escrito; el segmento de
+    control apunta a la versión vigente, así que cambiar de versión es una sola escritura. Se
+    retienen las últimas 'retener' versiones para que los lectores que aún usan una anterior
+    terminen sus consultas (en Linux un segmento borrado sigue válido mientras esté mapeado).
+    Cada versión se serializa desde instantáneas de ambos repositorios abiertas en la misma
+    versión (AlmacenVersiones con un reloj compartido), así que es un corte consistente aunque
+    haya escrituras durante la serialización. En segundo plano, los errores de una publicación
+    se registran y se reintenta en el ciclo siguiente; el latido solo avanza mientras la versión
+    publicada está al día, para que los lectores detecten un publicador caído o atascado."""
+    
+    def __init__(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio,
+                 nombre: str = 'uv_replica', retener: int = 2,
+                 estadisticas: Optional[Callable[[List[Any], List[Any]], Dict[str, Any]]] = None):
+        if retener < 1:
+            raise ValueError("Se debe retener al menos una versión")
+        self._repositorio_alumnos = repositorio_alumnos
+        self._repositorio_asignaturas = repositorio_asignaturas
+        self._nombre = nombre
+        self._retener = retener
+        # estadisticas(alumnos, asignaturas) recibe las entidades del mismo corte que se publica, para
+        # que no difieran de los registros; si no se indica, se publican conteos básicos de ese corte
+        self._estadisticas = estadisticas
+        reloj = RelojVersiones()
+        self._almacen_alumnos = AlmacenVersiones(repositorio_alumnos, reloj=reloj)
+        self._almacen_asignaturas = AlmacenVersiones(repositorio_asignaturas, reloj=reloj)
+        self._control = _crear_segmento(nombre_control(nombre), TAMANO_CONTROL)
+        self._control.buf[:TAMANO_CONTROL] = bytes(TAMANO_CONTROL)
+        SEGMENTOS_PROPIOS.add(self._control.name.lstrip('/'))
+        self._segmentos: deque = deque()
+        self._version = 0
+        self._cambios = 0
+        self._cambios_publicados = -1
+        self._ultima = {'bytes': 0, 'duracion_ms': 0.0}
+        self._publicado = 0.0
+        self._latido = 0.0
+        self._errores = 0
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+        self._detener = threading.Event()
+        for repositorio in (repositorio_alumnos, repositorio_asignaturas):
+            repositorio.suscribir_cambios(self._registrar_cambio)
+    
+    @property
+    def nombre(self) -> str:
+        return self._nombre
+    
+    @property
+    def version(self) -> int:
+        return self._version
+    
+    def _registrar_cambio(self, operacion: str, id: str, entidad: Optional[Any]) -> None:
+        self._cambios += 1
+    
+    def _serializar(self) -> bytes:
+        """Construye la instantánea: un directorio JSON seguido de secciones alineadas a 8 bytes."""
+        instantanea_alumnos, instantanea_asignaturas = self._almacen_alumnos.reloj.abrir_instantaneas(
+            self._almacen_alumnos, self._almacen_asignaturas)
+        with instantanea_alumnos, instantanea_asignaturas:
+            return self._serializar_corte(instantanea_alumnos.obtener_todos(), instantanea_asignaturas.obtener_todos())
+    
+    def _serializar_corte(self, alumnos: List[Any], asignaturas: List[Any]) -> bytes:
+        alumnos = sorted(alumnos, key=lambda alumno: alumno.id.encode('utf-8'))
+        asignaturas = sorted(asignaturas, key=lambda asignatura: asignatura.id.encode('utf-8'))
+        posicion_alumno = {alumno.id: indice for indice, alumno in enumerate(alumnos)}
+        secciones: Dict[str, Any] = {}
+        
+        infos = [_info_alumno(alumno) for alumno in alumnos]
+        secciones['alumnos.ids'], secciones['alumnos.ids_inicios'] = _tabla([alumno.id.encode('utf-8') for alumno in alumnos])
+        secciones['alumnos.registros'], secciones['alumnos.registros_inicios'] = _tabla(
+            [json.dumps(info, ensure_ascii=False, default=str).encode('utf-8') for info in infos])
+        for campo in ('nombre', 'apellido', 'email'):
+            secciones[f'alumnos.{campo}'], secciones[f'alumnos.{campo}_inicios'] = _columna([info[campo] for info in infos])
+        por_tipo: Dict[str, List[int]] = {}
+        for indice, alumno in enumerate(alumnos):
+            if isinstance(alumno, IEstudiante):
+                por_tipo.setdefault(alumno.obtener_tipo_estudiante(), []).append(indice)
+        tipos = list(por_tipo)
+        secciones['alumnos.por_tipo'] = array('I', [indice for tipo in tipos for indice in por_tipo[tipo]])
+        secciones['alumnos.por_tipo_inicios'] = array('I', accumulate((len(por_tipo[tipo]) for tipo in tipos), initial=0))
+        
+        infos_asignaturas = [asignatura.obtener_info_completa() for asignatura in asignaturas]
+        secciones['asignaturas.ids'], secciones['asignaturas.ids_inicios'] = _tabla(
+            [asignatura.id.encode('utf-8') for asignatura in asignaturas])
+        secciones['asignaturas.registros'], secciones['asignaturas.registros_inicios'] = _tabla(
+            [json.dumps(info, ensure_ascii=False, default=str).encode('utf-8') for info in infos_asignaturas])
+        secciones['asignaturas.nombre'], secciones['asignaturas.nombre_inicios'] = _columna([info['nombre'] for info in infos_asignaturas])
+        secciones['asignaturas.creditos'] = array('i', [info['creditos'] for info in infos_asignaturas])
+        secciones['asignaturas.semestre'] = array('i', [info['semestre'] for info in infos_asignaturas])
+        profesores = list(dict.fromkeys(info['profesor_id'] for info in infos_asignaturas))
+        codigo_profesor = {profesor_id: codigo for codigo, profesor_id in enumerate(profesores)}
+        secciones['asignaturas.profesor'] = array('I', [codigo_profesor[info['profesor_id']] for info in infos_asignaturas])
+        # Nómina de cada asignatura como posiciones de alumnos (CSR)
+        nominas = [[posicion_alumno[alumno_id] for alumno_id in info['estudiantes_matriculados'] if alumno_id in posicion_alumno]
+                   for info in infos_asignaturas]
+        secciones['asignaturas.nomina'] = array('I', [posicion for nomina in nominas for posicion in nomina])
+        secciones['asignaturas.nomina_inicios'] = array('I', accumulate(map(len, nominas), initial=0))
+        
+        if self._estadisticas is not None:
+            estadisticas = self._estadisticas(alumnos, asignaturas)
+        else:
+            estadisticas = {
+                'total_alumnos': len(alumnos),
+                'tipos_estudiantes': {tipo: len(indices) for tipo, indices in por_tipo.items()},
+                'total_matriculas': sum(len(info['asignaturas_matriculadas']) for info in infos),
+                'total_asignaturas': len(asignaturas),
+                'total_estudiantes_matriculados': sum(info['cantidad_estudiantes'] for info in infos_asignaturas)
+            }
+        
+        # Directorio: (inicio relativo al fin de la cabecera, largo, formato para memoryview.cast o '' si son bytes)
+        directorio = {'version': self._version + 1, 'tipos': tipos, 'profesores': profesores,
+                      'estadisticas': estadisticas, 'secciones': {}}
+        partes, posicion = [], 0
+        for nombre, seccion in secciones.items():
+            datos = seccion.tobytes() if isinstance(seccion, array) else seccion
+            directorio['secciones'][nombre] = [posicion, len(datos), seccion.typecode if isinstance(seccion, array) else '']
+            partes.append(datos + bytes(-len(datos) % 8))
+            posicion += len(partes[-1])
+        cabecera = json.dumps(directorio, ensure_ascii=False, default=str).encode('utf-8')
+        # Relleno con espacios (válidos al final de un JSON) para que las secciones queden alineadas
+        cabecera += b' ' * (-len(cabecera) % 8)
+        return struct.pack('<Q', len(cabecera)) + cabecera + b''.join(partes)
+    
+    def _escribir_control(self, version: int, segmento: str) -> None:
+        buf = self._control.buf
+        secuencia = struct.unpack_from('<Q', buf, 0)[0]
+        struct.pack_into('<Q', buf, 0, secuencia + 1)
+        struct.pack_into(FORMATO_CONTROL, buf, 8, version, self._publicado, self._latido, segmento.encode('ascii'))
+        struct.pack_into('<Q', buf, 0, secuencia + 2)
+    
+    def _latir(self, latido: float) -> None:
+        """Actualiza el latido en el control sin cambiar de versión (requiere el lock)."""
+        if self._control is None:
+            return
+        self._latido = latido
+        if self._segmentos:
+            self._escribir_control(self._version, self._segmentos[-1].name.lstrip('/'))
+    
+    def publicar(self) -> int:
+        """Publica una nueva versión con el estado actual de los repositorios y retorna su número."""
+        with self._lock:
+            inicio = time.perf_counter()
+            cambios = self._cambios
+            datos = self._serializar()
+            version = self._version + 1
+            segmento = _crear_segmento(f"{self._nombre}_v{version}", len(datos))
+            segmento.buf[:len(datos)] = datos
+            SEGMENTOS_PROPIOS.add(segmento.name.lstrip('/'))
+            self._publicado = time.time()
+            if self._hilo is not None:
+                self._latido = self._publicado
+            self._escribir_control(version, segmento.name.lstrip('/'))
+            self._version = version
+            self._cambios_publicados = cambios
+            self._segmentos.append(segmento)
+            while len(self._segmentos) > self._retener:
+                antiguo = self._segmentos.popleft()
+                antiguo.close()
+                antiguo.unlink()
+                SEGMENTOS_PROPIOS.discard(antiguo.name.lstrip('/'))
+            self._ultima = {'bytes': len(datos), 'duracion_ms': round((time.perf_counter() - inicio) * 1000, 2)}
+            return version
+    
+    def publicar_si_hay_cambios(self) -> bool:
+        """Publica solo si los repositorios cambiaron desde la última versión."""
+        if self._cambios == self._cambios_publicados:
+            return False
+        self.publicar()
+        return True
+    
+    def iniciar(self, intervalo: float = 0.5) -> None:
+        """Republica en segundo plano cada 'intervalo' segundos si hubo cambios y, si la versión
+        vigente queda al día, avanza el latido. Junto con la verificación de los lectores, acota la
+        antigüedad de lo que responden ('intervalo' debe ser menor que su max_antiguedad).
+        Un error al publicar (ej. al serializar) se registra y se reintenta en el ciclo siguiente."""
+        if self._hilo is not None:
+            return
+        self._detener.clear()
+        
+        def ciclo():
+            while not self._detener.wait(intervalo):
+                try:
+                    self.publicar_si_hay_cambios()
+                except Exception:
+                    self._errores += 1
+                    registro.exception("Falló la publicación de '%s'; se reintenta en %.1f s", self._nombre, intervalo)
+                    continue
+                with self._lock:
+                    self._latir(time.time())
+        
+        self._hilo = threading.Thread(target=ciclo, name=f"publicador-{self._nombre}", daemon=True)
+        self._hilo.start()
+    
+    def detener(self) -> None:
+        """Detiene la publicación en segundo plano (los lectores dejan de verificar el latido)."""
+        if self._hilo is not None:
+            self._detener.set()
+            self._hilo.join()
+            self._hilo = None
+            with self._lock:
+                self._latir(0.0)
+    
+    def cerrar(self) -> None:
+        """Detiene la publicación y borra todos los segmentos (los lectores dejan de ver nuevas versiones)."""
+        self.detener()
+        with self._lock:
+            while self._segmentos:
+                segmento = self._segmentos.popleft()
+                segmento.close()
+                segmento.unlink()
+                SEGMENTOS_PROPIOS.discard(segmento.name.lstrip('/'))
+            if self._control is not None:
+                self._control.close()
+                self._control.unlink()
+                SEGMENTOS_PROPIOS.discard(self._control.name.lstrip('/'))
+                self._control = None
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene métricas del publicador: versión, tamaño y duración de la última publicación."""
+        return {'version': self._version, 'bytes': self._ultima['bytes'], 'duracion_ms': self._ultima['duracion_ms'],
+                'segmentos_retenidos': len(self._segmentos),
+                'cambios_sin_publicar': self._cambios != self._cambios_publicados,
+                'errores': self._errores}
\ No newline at end of file
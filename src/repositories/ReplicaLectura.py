@@ -0,0 +1,304 @@
+import json
+import multiprocessing
+import re
+import struct
+import time
+from bisect import bisect_right
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Any, Dict
+from repositories.PublicadorReplica import FORMATO_CONTROL, SEGMENTOS_PROPIOS, nombre_control
+
+def _adjuntar(nombre: str) -> SharedMemory:
+    """Adjunta un segmento existente sin que este proceso pase a ser responsable de borrarlo."""
+    try:
+        return SharedMemory(name=nombre, track=False)
+    except TypeError:
+        # Antes de Python 3.13 adjuntar también registra el segmento en el resource_tracker. Un proceso
+        # independiente tiene su propio tracker, que lo borraría al terminar: se quita el registro.
+        # El proceso del publicador y los creados con multiprocessing comparten su tracker y no lo necesitan
+        segmento = SharedMemory(name=nombre)
+        if multiprocessing.parent_process() is None and nombre not in SEGMENTOS_PROPIOS:
+            resource_tracker.unregister(segmento._name, 'shared_memory')
+        return segmento
+
+class ReplicaDesactualizada(RuntimeError):
+    """El publicador dejó de latir: la réplica ya no puede garantizar la antigüedad máxima."""
+    pass
+
+class _Instantanea:
+    """Una versión publicada, leída directamente desde su segmento de memoria compartida."""
+    
+    def __init__(self, segmento: str, version: int, publicado: float):
+        self.version = version
+        self.publicado = publicado
+        self._segmento = _adjuntar(segmento)
+        buf = self._segmento.buf
+        largo = struct.unpack_from('<Q', buf, 0)[0]
+        self.directorio = json.loads(bytes(buf[8:8 + largo]))
+        base = 8 + largo
+        self._vistas: Dict[str, memoryview] = {}
+        for nombre, (inicio, largo_seccion, formato) in self.directorio['secciones'].items():
+            vista = buf[base + inicio:base + inicio + largo_seccion]
+            self._vistas[nombre] = vista.cast(formato) if formato else vista
+        self._tipos = {tipo: posicion for posicion, tipo in enumerate(self.directorio['tipos'])}
+        self._profesores = {profesor_id: codigo for codigo, profesor_id in enumerate(self.directorio['profesores'])}
+    
+    def cantidad(self, coleccion: str) -> int:
+        return len(self._vistas[f'{coleccion}.ids_inicios']) - 1
+    
+    def id(self, coleccion: str, posicion: int) -> str:
+        inicios = self._vistas[f'{coleccion}.ids_inicios']
+        return bytes(self._vistas[f'{coleccion}.ids'][inicios[posicion]:inicios[posicion + 1]]).decode('utf-8')
+    
+    def posicion(self, coleccion: str, id: str) -> int:
+        """Búsqueda binaria del ID sobre la tabla ordenada; -1 si no existe."""
+        clave = id.encode('utf-8')
+        datos, inicios = self._vistas[f'{coleccion}.ids'], self._vistas[f'{coleccion}.ids_inicios']
+        bajo, alto = 0, len(inicios) - 1
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if bytes(datos[inicios[medio]:inicios[medio + 1]]) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        if bajo < len(inicios) - 1 and datos[inicios[bajo]:inicios[bajo + 1]] == clave:
+            return bajo
+        return -1
+    
+    def registro(self, coleccion: str, posicion: int) -> Dict[str, Any]:
+        inicios = self._vistas[f'{coleccion}.registros_inicios']
+        return json.loads(bytes(self._vistas[f'{coleccion}.registros'][inicios[posicion]:inicios[posicion + 1]]))
+    
+    def coincidencias(self, columna: str, termino: str) -> List[int]:
+        """Posiciones cuyo texto contiene el término (sin distinguir mayúsculas), buscando sobre el bloque compartido."""
+        datos, inicios = self._vistas[columna], self._vistas[f'{columna}_inicios']
+        if not termino:
+            return list(range(len(inicios) - 1))
+        patron = re.compile(re.escape(termino.lower().encode('utf-8')))
+        posiciones, desde = [], 0
+        while True:
+            coincidencia = patron.search(datos, desde)
+            if coincidencia is None:
+                return posiciones
+            fila = bisect_right(inicios, coincidencia.start()) - 1
+            # Se descartan coincidencias que cruzan al texto siguiente
+            if coincidencia.end() < inicios[fila + 1]:
+                posiciones.append(fila)
+            desde = inicios[fila + 1]
+    
+    def enteros(self, seccion: str) -> memoryview:
+        return self._vistas[seccion]
+    
+    def tramo(self, seccion: str, fila: int) -> memoryview:
+        inicios = self._vistas[f'{seccion}_inicios']
+        return self._vistas[seccion][inicios[fila]:inicios[fila + 1]]
+    
+    def posicion_tipo(self, tipo: str) -> Optional[int]:
+        return self._tipos.get(tipo)
+    
+    def codigo_profesor(self, profesor_id: str) -> Optional[int]:
+        return self._profesores.get(profesor_id)
+    
+    def cerrar(self) -> bool:
+        """Libera el segmento; retorna False si aún hay vistas en uso (se reintenta más tarde)."""
+        try:
+            for vista in self._vistas.values():
+                vista.release()
+            self._segmento.close()
+            return True
+        except BufferError:
+            return False
+
+class ReplicaLectura:
+    """Réplica de solo lectura de los repositorios para procesos trabajadores.
+    Principio ISP: Expone solo las consultas de los repositorios (por ID, búsquedas, nóminas y estadísticas).
+    Las consultas se responden sobre el segmento compartido publicado por PublicadorReplica, sin
+    copiarlo: búsqueda binaria de IDs, búsqueda de subcadenas sobre columnas de texto y nóminas
+    como arreglos de posiciones; solo se decodifican los registros que se retornan (como dict).
+    Antigüedad acotada: a lo más cada 'max_antiguedad' segundos se revisa el segmento de control y,
+    si hay una versión nueva, se cambia a ella de una vez (las consultas en curso terminan sobre la
+    anterior). Los resultados se entregan ordenados por ID.
+    Si el publicador publica en segundo plano, en cada revisión se verifica además su latido: si
+    tiene más de 'max_antiguedad' segundos (publicador caído, atascado o fallando), las consultas
+    lanzan ReplicaDesactualizada en lugar de responder con datos de antigüedad desconocida."""
+    
+    def __init__(self, nombre: str = 'uv_replica', max_antiguedad: float = 1.0):
+        self._nombre = nombre
+        self._max_antiguedad = max_antiguedad
+        self._control = _adjuntar(nombre_control(nombre))
+        self._actual: Optional[_Instantanea] = None
+        self._anteriores: List[_Instantanea] = []
+        self._ultima_revision = 0.0
+        self._latido = 0.0
+        self._cambios_version = 0
+        self._refrescar()
+        if self._actual is None:
+            raise ValueError(f"No hay versiones publicadas en '{nombre}'")
+    
+    @property
+    def version(self) -> int:
+        return self._actual.version
+    
+    @property
+    def antiguedad(self) -> float:
+        """Segundos desde que se publicó la versión con que se está respondiendo."""
+        return time.time() - self._actual.publicado
+    
+    def _leer_control(self):
+        buf = self._control.buf
+        while True:
+            secuencia = struct.unpack_from('<Q', buf, 0)[0]
+            if secuencia & 1:
+                time.sleep(0)
+                continue
+            version, publicado, latido, segmento = struct.unpack_from(FORMATO_CONTROL, buf, 8)
+            if struct.unpack_from('<Q', buf, 0)[0] == secuencia:
+                return version, publicado, latido, segmento.rstrip(b'\0').decode('ascii')
+    
+    def _refrescar(self) -> None:
+        self._ultima_revision = time.monotonic()
+        for _ in range(3):
+            version, publicado, self._latido, segmento = self._leer_control()
+            if version == 0 or (self._actual is not None and version == self._actual.version):
+                return
+            try:
+                nueva = _Instantanea(segmento, version, publicado)
+            except FileNotFoundError:
+                # El segmento se retiró entre la lectura del control y la apertura: hay una versión más nueva
+                continue
+            anterior, self._actual = self._actual, nueva
+            self._cambios_version += 1
+            if anterior is not None:
+                self._anteriores.append(anterior)
+            self._anteriores = [instantanea for instantanea in self._anteriores if not instantanea.cerrar()]
+            return
+    
+    def _vigente(self) -> _Instantanea:
+        if time.monotonic() - self._ultima_revision >= self._max_antiguedad:
+            self._refrescar()
+        if self._latido and time.time() - self._latido > self._max_antiguedad:
+            self._verificar_latido()
+        return self._actual
+    
+    def _verificar_latido(self) -> None:
+        # El latido guardado puede ser de la revisión anterior: se relee antes de rechazar
+        self._refrescar()
+        if self._latido and time.time() - self._latido > self._max_antiguedad:
+            raise ReplicaDesactualizada(f"El publicador de '{self._nombre}' no late hace "
+                                        f"{time.time() - self._latido:.1f} s (máximo {self._max_antiguedad} s)")
+    
+    def refrescar(self) -> int:
+        """Cambia a la última versión publicada sin esperar el intervalo y retorna la versión vigente."""
+        self._refrescar()
+        return self._actual.version
+    
+    # --- Alumnos ---
+    
+    def obtener_alumno(self, id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene la información de un alumno por su ID."""
+        instantanea = self._vigente()
+        posicion = instantanea.posicion('alumnos', id)
+        return instantanea.registro('alumnos', posicion) if posicion >= 0 else None
+    
+    def existe_alumno(self, id: str) -> bool:
+        """Verifica si existe un alumno con el ID dado (sin decodificar su registro)."""
+        return self._vigente().posicion('alumnos', id) >= 0
+    
+    def buscar_alumnos(self, criterio: dict) -> List[Dict[str, Any]]:
+        """Busca alumnos por subcadenas de nombre, apellido y/o email, como RepositorioAlumnos.buscar."""
+        instantanea = self._vigente()
+        posiciones = None
+        for campo in ('nombre', 'apellido', 'email'):
+            if campo in criterio:
+                encontradas = instantanea.coincidencias(f'alumnos.{campo}', criterio[campo])
+                posiciones = encontradas if posiciones is None else sorted(set(posiciones).intersection(encontradas))
+        if posiciones is None:
+            posiciones = range(instantanea.cantidad('alumnos'))
+        return [instantanea.registro('alumnos', posicion) for posicion in posiciones]
+    
+    def buscar_por_asignatura(self, asignatura_id: str) -> List[Dict[str, Any]]:
+        """Obtiene la información de los alumnos matriculados en una asignatura."""
+        instantanea = self._vigente()
+        posicion = instantanea.posicion('asignaturas', asignatura_id)
+        if posicion < 0:
+            return []
+        return [instantanea.registro('alumnos', alumno) for alumno in sorted(instantanea.tramo('asignaturas.nomina', posicion))]
+    
+    def obtener_estudiantes_asignatura(self, asignatura_id: str) -> List[str]:
+        """Obtiene los IDs matriculados en una asignatura (sin decodificar registros)."""
+        instantanea = self._vigente()
+        posicion = instantanea.posicion('asignaturas', asignatura_id)
+        if posicion < 0:
+            return []
+        return [instantanea.id('alumnos', alumno) for alumno in sorted(instantanea.tramo('asignaturas.nomina', posicion))]
+    
+    def listar_por_tipo(self, tipo: str) -> List[Dict[str, Any]]:
+        """Lista los alumnos de un tipo (según obtener_tipo_estudiante)."""
+        instantanea = self._vigente()
+        posicion = instantanea.posicion_tipo(tipo)
+        if posicion is None:
+            return []
+        return [instantanea.registro('alumnos', alumno) for alumno in instantanea.tramo('alumnos.por_tipo', posicion)]
+    
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Obtiene la cantidad de alumnos por tipo."""
+        instantanea = self._vigente()
+        return {tipo: len(instantanea.tramo('alumnos.por_tipo', posicion))
+                for posicion, tipo in enumerate(instantanea.directorio['tipos'])}
+    
+    def obtener_cantidad_alumnos(self) -> int:
+        return self._vigente().cantidad('alumnos')
+    
+    # --- Asignaturas ---
+    
+    def obtener_asignatura(self, id: str) -> Optional[Dict[str, Any]]:
+        """Obtiene la información de una asignatura por su ID."""
+        instantanea = self._vigente()
+        posicion = instantanea.posicion('asignaturas', id)
+        return instantanea.registro('asignaturas', posicion) if posicion >= 0 else None
+    
+    def buscar_asignaturas(self, criterio: dict) -> List[Dict[str, Any]]:
+        """Busca asignaturas por nombre, créditos, semestre y/o profesor, como RepositorioAsignaturas.buscar."""
+        instantanea = self._vigente()
+        if 'nombre' in criterio:
+            posiciones = instantanea.coincidencias('asignaturas.nombre', criterio['nombre'])
+        else:
+            posiciones = range(instantanea.cantidad('asignaturas'))
+        filtros = []
+        if 'creditos' in criterio:
+            filtros.append((instantanea.enteros('asignaturas.creditos'), criterio['creditos']))
+        if 'semestre' in criterio:
+            filtros.append((instantanea.enteros('asignaturas.semestre'), criterio['semestre']))
+        if 'profesor_id' in criterio:
+            codigo = instantanea.codigo_profesor(criterio['profesor_id'])
+            if codigo is None:
+                return []
+            filtros.append((instantanea.enteros('asignaturas.profesor'), codigo))
+        return [instantanea.registro('asignaturas', posicion) for posicion in posiciones
+                if all(columna[posicion] == valor for columna, valor in filtros)]
+    
+    def buscar_por_semestre(self, semestre: int) -> List[Dict[str, Any]]:
+        return self.buscar_asignaturas({'semestre': semestre})
+    
+    def buscar_por_profesor(self, profesor_id: str) -> List[Dict[str, Any]]:
+        return self.buscar_asignaturas({'profesor_id': profesor_id})
+    
+    # --- Estadísticas ---
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene las estadísticas calculadas al publicar la versión vigente."""
+        return self._vigente().directorio['estadisticas']
+    
+    def obtener_metricas(self) -> Dict[str, Any]:
+        """Obtiene métricas de la réplica: versión, antigüedad y cambios de versión realizados."""
+        return {'version': self._actual.version, 'antiguedad_s': round(self.antiguedad, 3),
+                'cambios_version': self._cambios_version, 'versiones_por_liberar': len(self._anteriores)}
+    
+    def cerrar(self) -> None:
+        """Libera los segmentos adjuntados por este proceso (no los borra)."""
+        for instantanea in [self._actual] + self._anteriores:
+            if instantanea is not None:
+                instantanea.cerrar()
+        self._anteriores = []
+        self._control.close()
\ No newline at end of file
@@ -1,14 +1,55 @@
-from typing import List, Optional, Any, Dict
-from interfaces.IRepositorio import IRepositorio
+from typing import List, Optional, Any, Dict, Callable, Tuple
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IEstudiante import IEstudiante
+from interfaces.Capabilities.IEstudia import IEstudia
+from interfaces.Capabilities.IHaceClases import IHaceClases
+from interfaces.Capabilities.IInvestiga import IInvestiga
 from models.Alumno import Alumno
+from utils.Trazador import trazado
 
-class RepositorioAlumnos(IRepositorio):
+# Interfaces de capacidad indexadas por el repositorio (ISP)
+CAPACIDADES = (IEstudia, IHaceClases, IInvestiga)
+
+class RepositorioAlumnos(IRepositorioAlumnos):
     """Repositorio concreto para manejar alumnos.
-    Principio DIP: Implementa la abstracción IRepositorio."""
+    Principio DIP: Implementa la abstracción IRepositorioAlumnos (sus consultas usan índices)."""
     
     def __init__(self):
         self._alumnos: Dict[str, Alumno] = {}
+        self._observadores: List[Callable[[str, str, Optional[Alumno]], None]] = []
+        # Índices secundarios: tipo/capacidad -> {id: alumno}
+        self._por_tipo: Dict[str, Dict[str, Alumno]] = {}
+        self._por_capacidad: Dict[type, Dict[str, Alumno]] = {capacidad: {} for capacidad in CAPACIDADES}
+    
+    def _indexar(self, id: str, alumno: Alumno) -> None:
+        """Registra al alumno en los índices por tipo y por capacidad."""
+        if isinstance(alumno, IEstudiante):
+            self._por_tipo.setdefault(alumno.obtener_tipo_estudiante(), {})[id] = alumno
+        for capacidad, indice in self._por_capacidad.items():
+            if isinstance(alumno, capacidad):
+                indice[id] = alumno
+    
+    def _desindexar(self, id: str, alumno: Alumno) -> None:
+        """Quita al alumno de los índices por tipo y por capacidad."""
+        if isinstance(alumno, IEstudiante):
+            tipo = alumno.obtener_tipo_estudiante()
+            indice_tipo = self._por_tipo.get(tipo)
+            if indice_tipo is not None:
+                indice_tipo.pop(id, None)
+                if not indice_tipo:
+                    del self._por_tipo[tipo]
+        for indice in self._por_capacidad.values():
+            indice.pop(id, None)
+    
+    def suscribir_cambios(self, observador: Callable[[str, str, Optional[Alumno]], None]) -> None:
+        """Registra un observador que se invoca tras cada mutación (operacion, id, alumno)."""
+        self._observadores.append(observador)
+    
+    def _notificar(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        for observador in self._observadores:
+            observador(operacion, id, alumno)
     
+    @trazado("repositorio")
     def agregar(self, alumno: Alumno) -> bool:
         """Agrega un alumno al repositorio."""
         if not isinstance(alumno, Alumno):
@@ -16,31 +57,76 @@ class RepositorioAlumnos(IRepositorio):
         
         if alumno.id not in self._alumnos:
             self._alumnos[alumno.id] = alumno
+            self._indexar(alumno.id, alumno)
+            self._notificar('agregar', alumno.id, alumno)
             return True
         return False
     
+    @trazado("repositorio")
     def obtener_por_id(self, id: str) -> Optional[Alumno]:
         """Obtiene un alumno por su ID."""
         return self._alumnos.get(id)
     
+    @trazado("repositorio")
     def obtener_todos(self) -> List[Alumno]:
         """Obtiene todos los alumnos del repositorio."""
         return list(self._alumnos.values())
     
+    @trazado("repositorio")
     def actualizar(self, id: str, alumno: Alumno) -> bool:
         """Actualiza un alumno en el repositorio."""
         if id in self._alumnos and isinstance(alumno, Alumno):
-            self._alumnos[id] = alumno
+            anterior = self._alumnos[id]
+            if anterior is not alumno:
+                # El tipo y las capacidades solo cambian si se reemplaza el objeto
+                self._desindexar(id, anterior)
+                self._alumnos[id] = alumno
+                self._indexar(id, alumno)
+            self._notificar('actualizar', id, alumno)
             return True
         return False
     
+    @trazado("repositorio")
     def eliminar(self, id: str) -> bool:
         """Elimina un alumno del repositorio."""
         if id in self._alumnos:
-            del self._alumnos[id]
+            self._desindexar(id, self._alumnos.pop(id))
+            self._notificar('eliminar', id, None)
             return True
         return False
     
+    @trazado("repositorio")
+    def aplicar_lote(self, operaciones: List[Tuple[str, str, Optional[Alumno]]]) -> bool:
+        """Aplica un lote de operaciones (operacion, id, alumno) de forma atómica.
+        Valida el lote completo antes de modificar el repositorio; si alguna operación
+        no es válida no se aplica ninguna."""
+        presentes: Dict[str, bool] = {}
+        for operacion, id, alumno in operaciones:
+            existe = presentes.get(id, id in self._alumnos)
+            if operacion == 'agregar':
+                if existe or not isinstance(alumno, Alumno):
+                    return False
+                presentes[id] = True
+            elif operacion == 'actualizar':
+                if not existe or not isinstance(alumno, Alumno):
+                    return False
+            elif operacion == 'eliminar':
+                if not existe:
+                    return False
+                presentes[id] = False
+            else:
+                return False
+        
+        for operacion, id, alumno in operaciones:
+            if operacion == 'agregar':
+                self.agregar(alumno)
+            elif operacion == 'actualizar':
+                self.actualizar(id, alumno)
+            else:
+                self.eliminar(id)
+        return True
+    
+    @trazado("repositorio")
     def buscar(self, criterio: dict) -> List[Alumno]:
         """Busca alumnos según un criterio específico."""
         resultado = []
@@ -65,6 +151,7 @@ class RepositorioAlumnos(IRepositorio):
         
         return resultado
     
+    @trazado("repositorio")
     def buscar_por_asignatura(self, asignatura_id: str) -> List[Alumno]:
         """Busca alumnos matriculados en una asignatura específica."""
         resultado = []
@@ -73,6 +160,23 @@ class RepositorioAlumnos(IRepositorio):
                 resultado.append(alumno)
         return resultado
     
+    @trazado("repositorio")
+    def listar_por_tipo(self, tipo: str) -> List[Alumno]:
+        """Lista los alumnos de un tipo (según obtener_tipo_estudiante) usando el índice."""
+        return list(self._por_tipo.get(tipo, {}).values())
+    
+    @trazado("repositorio")
+    def listar_por_capacidad(self, capacidad: type) -> List[Alumno]:
+        """Lista los alumnos que implementan una interfaz de capacidad (IEstudia, IHaceClases, IInvestiga)."""
+        indice = self._por_capacidad.get(capacidad)
+        if indice is None:
+            raise ValueError(f"Capacidad no indexada: {capacidad.__name__}")
+        return list(indice.values())
+    
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Obtiene la cantidad de alumnos por tipo sin recorrer el repositorio."""
+        return {tipo: len(indice) for tipo, indice in self._por_tipo.items()}
+    
     def obtener_cantidad_total(self) -> int:
         """Obtiene la cantidad total de alumnos."""
         return len(self._alumnos)
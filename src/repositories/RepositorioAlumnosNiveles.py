@@ -0,0 +1,346 @@
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+import weakref
+import zlib
+from collections import OrderedDict, deque
+from typing import List, Optional, Any, Dict, Iterator
+from repositories.RepositorioAlumnos import RepositorioAlumnos
+from interfaces.IEstudiante import IEstudiante
+from models.Alumno import Alumno
+from utils.Trazador import trazado
+
+# Ubicación de un registro en disco, en un solo entero: [desplazamiento][longitud (24 bits)][crc32 (32 bits)]
+BITS_CRC = 32
+BITS_LONGITUD = 24
+MASCARA_CRC = (1 << BITS_CRC) - 1
+MASCARA_LONGITUD_CRC = (1 << (BITS_CRC + BITS_LONGITUD)) - 1
+MAXIMO_REGISTRO = (1 << BITS_LONGITUD) - 1
+# Se compacta el archivo cuando lo obsoleto supera la mitad y este mínimo
+UMBRAL_COMPACTACION = 4 * 1024 * 1024
+MUESTRAS_LATENCIA = 1024
+
+def estimar_tamano(entidad: Any) -> int:
+    """Estimación de los bytes que ocupa una entidad en memoria: el objeto, su __dict__, cada
+    atributo y los elementos de sus colecciones (un nivel). Los textos compartidos se cuentan
+    en cada entidad, así que tiende a sobrestimar."""
+    atributos = vars(entidad)
+    tamano = sys.getsizeof(entidad) + sys.getsizeof(atributos)
+    for valor in atributos.values():
+        tamano += sys.getsizeof(valor)
+        if isinstance(valor, (list, tuple, set, frozenset)):
+            tamano += sum(map(sys.getsizeof, valor))
+        elif isinstance(valor, dict):
+            tamano += sum(sys.getsizeof(clave) + sys.getsizeof(elemento) for clave, elemento in valor.items())
+    return tamano
+
+def _longitud(ubicacion: int) -> int:
+    return (ubicacion >> BITS_CRC) & MAXIMO_REGISTRO
+
+def _desplazamiento(ubicacion: int) -> int:
+    return ubicacion >> (BITS_CRC + BITS_LONGITUD)
+
+class _AlmacenNiveles:
+    """Mapa id -> alumno en dos niveles, con la parte de dict que usa RepositorioAlumnos.
+    Las entidades calientes viven en un OrderedDict en orden de uso (LRU) mientras su tamaño
+    estimado quepa en el presupuesto; las que se expulsan se serializan (pickle) al final de un
+    archivo de solo anexado y en memoria queda únicamente su ubicación. get() las trae de vuelta
+    al nivel caliente; values() las lee sin promoverlas, para que un recorrido no expulse a las
+    que sí se usan. Si una entidad no cambió desde su última copia en disco (mismo crc32) al
+    expulsarla no se vuelve a escribir.
+    Una entidad expulsada que alguien más sigue referenciando queda en un WeakValueDictionary:
+    mientras viva se entrega ese mismo objeto (con sus cambios) en vez de leer la copia del disco."""
+    
+    def __init__(self, ruta: str, presupuesto: int):
+        self._ruta = ruta
+        self._archivo = open(ruta, 'w+b')
+        self._fin = 0
+        self._bytes_obsoletos = 0
+        self._por_vaciar = False
+        self._presupuesto = presupuesto
+        self._calientes: OrderedDict = OrderedDict()
+        self._tamanos: Dict[str, int] = {}
+        self._bytes_residentes = 0
+        # id -> ubicación de su última copia en disco (None si nunca bajó); define pertenencia y orden
+        self._ubicaciones: Dict[str, Optional[int]] = {}
+        # Expulsadas que siguen vivas porque otro objeto las referencia
+        self._expulsadas_vivas: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._lock = threading.RLock()
+        self._latencias = deque(maxlen=MUESTRAS_LATENCIA)
+        self._metricas = {'aciertos': 0, 'fallos': 0, 'recuperadas_vivas': 0, 'expulsiones': 0, 'escrituras_disco': 0,
+                          'escrituras_omitidas': 0, 'lecturas_sin_promover': 0, 'compactaciones': 0}
+    
+    def __contains__(self, id: str) -> bool:
+        return id in self._ubicaciones
+    
+    def __len__(self) -> int:
+        return len(self._ubicaciones)
+    
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._ubicaciones))
+    
+    def _leer(self, ubicacion: int) -> Any:
+        """Deserializa el registro de una ubicación (requiere el lock)."""
+        if self._por_vaciar:
+            self._archivo.flush()
+            self._por_vaciar = False
+        self._archivo.seek(_desplazamiento(ubicacion))
+        return pickle.loads(self._archivo.read(_longitud(ubicacion)))
+    
+    def _escribir(self, id: str, entidad: Any) -> None:
+        """Anexa la entidad al archivo si cambió desde su última copia (requiere el lock)."""
+        datos = pickle.dumps(entidad, pickle.HIGHEST_PROTOCOL)
+        crc = zlib.crc32(datos)
+        anterior = self._ubicaciones.get(id)
+        if anterior is not None and anterior & MASCARA_CRC == crc and _longitud(anterior) == len(datos):
+            self._metricas['escrituras_omitidas'] += 1
+            return
+        if len(datos) > MAXIMO_REGISTRO:
+            raise ValueError(f"La entidad {id} ocupa {len(datos)} bytes serializada (máximo {MAXIMO_REGISTRO})")
+        if anterior is not None:
+            self._bytes_obsoletos += _longitud(anterior)
+        self._archivo.seek(self._fin)
+        self._archivo.write(datos)
+        self._ubicaciones[id] = self._fin << (BITS_CRC + BITS_LONGITUD) | len(datos) << BITS_CRC | crc
+        self._fin += len(datos)
+        self._por_vaciar = True
+        self._metricas['escrituras_disco'] += 1
+        if self._bytes_obsoletos > UMBRAL_COMPACTACION and self._bytes_obsoletos * 2 > self._fin:
+            self.compactar()
+    
+    def _residir(self, id: str, entidad: Any) -> None:
+        """Deja la entidad en el nivel caliente como la más reciente y expulsa hasta caber (requiere el lock)."""
+        tamano = estimar_tamano(entidad)
+        self._bytes_residentes += tamano - self._tamanos.get(id, 0)
+        self._tamanos[id] = tamano
+        self._calientes[id] = entidad
+        self._calientes.move_to_end(id)
+        self._expulsar()
+    
+    def _expulsar(self) -> None:
+        """Baja a disco las entidades menos usadas hasta respetar el presupuesto (requiere el lock)."""
+        while self._bytes_residentes > self._presupuesto and self._calientes:
+            id, entidad = self._calientes.popitem(last=False)
+            self._escribir(id, entidad)
+            self._expulsadas_vivas[id] = entidad
+            self._bytes_residentes -= self._tamanos.pop(id)
+            self._metricas['expulsiones'] += 1
+    
+    def __setitem__(self, id: str, entidad: Any) -> None:
+        with self._lock:
+            self._ubicaciones.setdefault(id, None)
+            self._residir(id, entidad)
+    
+    def get(self, id: str, predeterminado: Any = None) -> Any:
+        """Obtiene una entidad; si está en disco la trae al nivel caliente (fallo)."""
+        with self._lock:
+            entidad = self._calientes.get(id)
+            if entidad is not None:
+                self._calientes.move_to_end(id)
+                self._metricas['aciertos'] += 1
+                return entidad
+            ubicacion = self._ubicaciones.get(id)
+            if ubicacion is None:
+                return predeterminado
+            entidad = self._expulsadas_vivas.pop(id, None)
+            if entidad is not None:
+                self._metricas['recuperadas_vivas'] += 1
+                self._residir(id, entidad)
+                return entidad
+            inicio = time.perf_counter()
+            entidad = self._leer(ubicacion)
+            self._latencias.append(time.perf_counter() - inicio)
+            self._metricas['fallos'] += 1
+            self._residir(id, entidad)
+            return entidad
+    
+    def __getitem__(self, id: str) -> Any:
+        entidad = self.get(id)
+        if entidad is None:
+            raise KeyError(id)
+        return entidad
+    
+    def obtener_sin_promover(self, ids: List[str]) -> List[Any]:
+        """Obtiene varias entidades; las que están en disco se leen sin pasar al nivel caliente."""
+        with self._lock:
+            resultado = []
+            for id in ids:
+                entidad = self._calientes.get(id)
+                if entidad is None:
+                    entidad = self._expulsadas_vivas.get(id)
+                if entidad is None:
+                    entidad = self._leer(self._ubicaciones[id])
+                    self._metricas['lecturas_sin_promover'] += 1
+                resultado.append(entidad)
+            return resultado
+    
+    def values(self) -> List[Any]:
+        """Todas las entidades en orden de inserción, sin alterar el nivel caliente."""
+        with self._lock:
+            return self.obtener_sin_promover(list(self._ubicaciones))
+    
+    def reemplazar(self, id: str, entidad: Any) -> None:
+        """Reemplaza una entidad existente: en memoria si está caliente, o directo en disco si no."""
+        with self._lock:
+            if id in self._calientes:
+                self._residir(id, entidad)
+            else:
+                self._escribir(id, entidad)
+                self._expulsadas_vivas[id] = entidad
+    
+    def pop(self, id: str) -> Optional[Any]:
+        """Quita una entidad; retorna el objeto solo si estaba en memoria (no se lee del disco)."""
+        with self._lock:
+            ubicacion = self._ubicaciones.pop(id)
+            self._expulsadas_vivas.pop(id, None)
+            if ubicacion is not None:
+                self._bytes_obsoletos += _longitud(ubicacion)
+            entidad = self._calientes.pop(id, None)
+            if entidad is not None:
+                self._bytes_residentes -= self._tamanos.pop(id)
+            return entidad
+    
+    def ajustar_presupuesto(self, presupuesto: int) -> None:
+        with self._lock:
+            self._presupuesto = presupuesto
+            self._expulsar()
+    
+    def compactar(self) -> int:
+        """Reescribe el archivo solo con las copias vigentes y retorna los bytes recuperados."""
+        with self._lock:
+            self._archivo.flush()
+            temporal = self._ruta + '.compactando'
+            fin = 0
+            ubicaciones = {}
+            with open(temporal, 'wb') as nuevo:
+                # Se copia en orden de desplazamiento para leer el archivo viejo de forma secuencial
+                for id, ubicacion in sorted(((id, ubicacion) for id, ubicacion in self._ubicaciones.items() if ubicacion is not None),
+                                            key=lambda par: par[1]):
+                    self._archivo.seek(_desplazamiento(ubicacion))
+                    nuevo.write(self._archivo.read(_longitud(ubicacion)))
+                    ubicaciones[id] = fin << (BITS_CRC + BITS_LONGITUD) | ubicacion & MASCARA_LONGITUD_CRC
+                    fin += _longitud(ubicacion)
+            self._archivo.close()
+            os.replace(temporal, self._ruta)
+            self._archivo = open(self._ruta, 'r+b')
+            self._ubicaciones.update(ubicaciones)
+            recuperados = self._fin - fin
+            self._fin = fin
+            self._bytes_obsoletos = 0
+            self._por_vaciar = False
+            self._metricas['compactaciones'] += 1
+            return recuperados
+    
+    def cerrar(self) -> None:
+        with self._lock:
+            if not self._archivo.closed:
+                self._archivo.close()
+                os.remove(self._ruta)
+    
+    def obtener_metricas(self) -> Dict[str, Any]:
+        with self._lock:
+            metricas = dict(self._metricas)
+            accesos = metricas['aciertos'] + metricas['fallos']
+            metricas['tasa_aciertos'] = round(metricas['aciertos'] / accesos, 4) if accesos else 0.0
+            latencias = sorted(self._latencias)
+            if latencias:
+                metricas['latencia_fallo_promedio_us'] = round(sum(latencias) / len(latencias) * 1e6, 1)
+                metricas['latencia_fallo_p99_us'] = round(latencias[min(len(latencias) - 1, len(latencias) * 99 // 100)] * 1e6, 1)
+                metricas['latencia_fallo_maxima_us'] = round(latencias[-1] * 1e6, 1)
+            metricas['residentes'] = len(self._calientes)
+            metricas['expulsadas_vivas'] = len(self._expulsadas_vivas)
+            metricas['en_disco'] = len(self._ubicaciones) - len(self._calientes)
+            metricas['bytes_residentes'] = self._bytes_residentes
+            metricas['presupuesto_bytes'] = self._presupuesto
+            metricas['bytes_archivo'] = self._fin
+            metricas['bytes_obsoletos'] = self._bytes_obsoletos
+            return metricas
+
+class RepositorioAlumnosNiveles(RepositorioAlumnos):
+    """Repositorio de alumnos que mantiene en memoria solo los usados recientemente.
+    Principio LSP: Sustituye a RepositorioAlumnos con la misma API (índices, lotes, observadores).
+    Principio OCP: Reutiliza su lógica cambiando solo dónde viven los alumnos.
+    Los alumnos calientes se guardan en memoria hasta 'presupuesto_bytes' (tamaño estimado);
+    los menos usados bajan a un archivo local y obtener_por_id los vuelve a cargar de forma
+    transparente. Los índices por tipo y capacidad guardan solo IDs, así que no retienen
+    alumnos en memoria. Los recorridos (obtener_todos, buscar, listar_por_*) leen del disco sin
+    promover, y actualizar un alumno frío lo escribe directo en disco.
+    Un alumno expulsado mientras alguien conserva una referencia sigue siendo válido, pero sus
+    cambios solo se guardan al pasarlo por actualizar (como ya hacen los gestores)."""
+    
+    def __init__(self, presupuesto_bytes: int = 64 * 1024 * 1024, directorio: Optional[str] = None):
+        super().__init__()
+        descriptor, ruta = tempfile.mkstemp(prefix='alumnos_', suffix='.niveles', dir=directorio)
+        os.close(descriptor)
+        self._alumnos = _AlmacenNiveles(ruta, presupuesto_bytes)
+    
+    def _indexar(self, id: str, alumno: Alumno) -> None:
+        """Registra el ID del alumno en los índices por tipo y por capacidad."""
+        if isinstance(alumno, IEstudiante):
+            self._por_tipo.setdefault(alumno.obtener_tipo_estudiante(), {})[id] = None
+        for capacidad, indice in self._por_capacidad.items():
+            if isinstance(alumno, capacidad):
+                indice[id] = None
+    
+    def _desindexar(self, id: str, alumno: Optional[Alumno]) -> None:
+        """Quita el ID de todos los índices, sin necesitar el alumno (que puede estar en disco)."""
+        for tipo, indice in self._por_tipo.items():
+            if id in indice:
+                del indice[id]
+                if not indice:
+                    del self._por_tipo[tipo]
+                break
+        for indice in self._por_capacidad.values():
+            indice.pop(id, None)
+    
+    def _indexado_igual(self, id: str, alumno: Alumno) -> bool:
+        """Indica si los índices ya reflejan el tipo y las capacidades del alumno (no hay que moverlo)."""
+        if not isinstance(alumno, IEstudiante) or id not in self._por_tipo.get(alumno.obtener_tipo_estudiante(), ()):
+            return False
+        return all((id in indice) == isinstance(alumno, capacidad) for capacidad, indice in self._por_capacidad.items())
+    
+    @trazado("repositorio")
+    def actualizar(self, id: str, alumno: Alumno) -> bool:
+        """Actualiza un alumno; si no está en memoria se escribe en disco sin promoverlo."""
+        if id in self._alumnos and isinstance(alumno, Alumno):
+            if not self._indexado_igual(id, alumno):
+                self._desindexar(id, None)
+                self._indexar(id, alumno)
+            self._alumnos.reemplazar(id, alumno)
+            self._notificar('actualizar', id, alumno)
+            return True
+        return False
+    
+    @trazado("repositorio")
+    def listar_por_tipo(self, tipo: str) -> List[Alumno]:
+        """Lista los alumnos de un tipo usando el índice (sin promover los que están en disco)."""
+        return self._alumnos.obtener_sin_promover(list(self._por_tipo.get(tipo, {})))
+    
+    @trazado("repositorio")
+    def listar_por_capacidad(self, capacidad: type) -> List[Alumno]:
+        """Lista los alumnos que implementan una interfaz de capacidad (sin promover los que están en disco)."""
+        indice = self._por_capacidad.get(capacidad)
+        if indice is None:
+            raise ValueError(f"Capacidad no indexada: {capacidad.__name__}")
+        return self._alumnos.obtener_sin_promover(list(indice))
+    
+    def ajustar_presupuesto(self, presupuesto_bytes: int) -> None:
+        """Cambia el presupuesto de memoria; si baja, expulsa en el acto a los menos usados."""
+        self._alumnos.ajustar_presupuesto(presupuesto_bytes)
+    
+    def compactar(self) -> int:
+        """Quita del archivo las copias obsoletas y retorna los bytes recuperados."""
+        return self._alumnos.compactar()
+    
+    def cerrar(self) -> None:
+        """Cierra y borra el archivo de alumnos fríos (el repositorio deja de poder usarse)."""
+        self._alumnos.cerrar()
+    
+    def obtener_metricas(self) -> Dict[str, Any]:
+        """Obtiene métricas de los niveles: aciertos, fallos, tasa de aciertos, expulsiones,
+        latencia de carga desde disco (promedio, p99 y máxima de las últimas cargas) y ocupación."""
+        return self._alumnos.obtener_metricas()
@@ -1,6 +1,7 @@
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Callable, Tuple
 from interfaces.IRepositorio import IRepositorio
 from models.Asignatura import Asignatura
+from utils.Trazador import trazado
 
 class RepositorioAsignaturas(IRepositorio):
     """Repositorio concreto para manejar asignaturas.
@@ -8,7 +9,34 @@ class RepositorioAsignaturas(IRepositorio):
     
     def __init__(self):
         self._asignaturas: Dict[str, Asignatura] = {}
+        self._observadores: List[Callable[[str, str, Optional[Asignatura]], None]] = []
+        # Índice inverso: profesor_id -> {id: asignatura}, y el profesor con que se indexó cada asignatura
+        self._por_profesor: Dict[str, Dict[str, Asignatura]] = {}
+        self._profesor_indexado: Dict[str, str] = {}
     
+    def _indexar(self, id: str, asignatura: Asignatura) -> None:
+        """Registra la asignatura en el índice por profesor."""
+        self._por_profesor.setdefault(asignatura.profesor_id, {})[id] = asignatura
+        self._profesor_indexado[id] = asignatura.profesor_id
+    
+    def _desindexar(self, id: str) -> None:
+        """Quita la asignatura del índice por profesor."""
+        profesor_id = self._profesor_indexado.pop(id, None)
+        indice = self._por_profesor.get(profesor_id)
+        if indice is not None:
+            indice.pop(id, None)
+            if not indice:
+                del self._por_profesor[profesor_id]
+    
+    def suscribir_cambios(self, observador: Callable[[str, str, Optional[Asignatura]], None]) -> None:
+        """Registra un observador que se invoca tras cada mutación (operacion, id, asignatura)."""
+        self._observadores.append(observador)
+    
+    def _notificar(self, operacion: str, id: str, asignatura: Optional[Asignatura]) -> None:
+        for observador in self._observadores:
+            observador(operacion, id, asignatura)
+    
+    @trazado("repositorio")
     def agregar(self, asignatura: Asignatura) -> bool:
         """Agrega una asignatura al repositorio."""
         if not isinstance(asignatura, Asignatura):
@@ -16,31 +44,79 @@ class RepositorioAsignaturas(IRepositorio):
         
         if asignatura.id not in self._asignaturas:
             self._asignaturas[asignatura.id] = asignatura
+            self._indexar(asignatura.id, asignatura)
+            self._notificar('agregar', asignatura.id, asignatura)
             return True
         return False
     
+    @trazado("repositorio")
     def obtener_por_id(self, id: str) -> Optional[Asignatura]:
         """Obtiene una asignatura por su ID."""
         return self._asignaturas.get(id)
     
+    @trazado("repositorio")
     def obtener_todos(self) -> List[Asignatura]:
         """Obtiene todas las asignaturas del repositorio."""
         return list(self._asignaturas.values())
     
+    @trazado("repositorio")
     def actualizar(self, id: str, asignatura: Asignatura) -> bool:
         """Actualiza una asignatura en el repositorio."""
         if id in self._asignaturas and isinstance(asignatura, Asignatura):
+            profesor_anterior = self._profesor_indexado[id]
+            if profesor_anterior != asignatura.profesor_id:
+                # El profesor puede cambiar al reemplazar el objeto o al modificarlo en su lugar
+                self._desindexar(id)
+                self._indexar(id, asignatura)
+            else:
+                self._por_profesor[profesor_anterior][id] = asignatura
             self._asignaturas[id] = asignatura
+            self._notificar('actualizar', id, asignatura)
             return True
         return False
     
+    @trazado("repositorio")
     def eliminar(self, id: str) -> bool:
         """Elimina una asignatura del repositorio."""
         if id in self._asignaturas:
             del self._asignaturas[id]
+            self._desindexar(id)
+            self._notificar('eliminar', id, None)
             return True
         return False
     
+    @trazado("repositorio")
+    def aplicar_lote(self, operaciones: List[Tuple[str, str, Optional[Asignatura]]]) -> bool:
+        """Aplica un lote de operaciones (operacion, id, asignatura) de forma atómica.
+        Valida el lote completo antes de modificar el repositorio; si alguna operación
+        no es válida no se aplica ninguna."""
+        presentes: Dict[str, bool] = {}
+        for operacion, id, asignatura in operaciones:
+            existe = presentes.get(id, id in self._asignaturas)
+            if operacion == 'agregar':
+                if existe or not isinstance(asignatura, Asignatura):
+                    return False
+                presentes[id] = True
+            elif operacion == 'actualizar':
+                if not existe or not isinstance(asignatura, Asignatura):
+                    return False
+            elif operacion == 'eliminar':
+                if not existe:
+                    return False
+                presentes[id] = False
+            else:
+                return False
+        
+        for operacion, id, asignatura in operaciones:
+            if operacion == 'agregar':
+                self.agregar(asignatura)
+            elif operacion == 'actualizar':
+                self.actualizar(id, asignatura)
+            else:
+                self.eliminar(id)
+        return True
+    
+    @trazado("repositorio")
     def buscar(self, criterio: dict) -> List[Asignatura]:
         """Busca asignaturas según un criterio específico."""
         resultado = []
@@ -69,14 +145,12 @@ class RepositorioAsignaturas(IRepositorio):
         
         return resultado
     
+    @trazado("repositorio")
     def buscar_por_profesor(self, profesor_id: str) -> List[Asignatura]:
-        """Busca asignaturas de un profesor específico."""
-        resultado = []
-        for asignatura in self._asignaturas.values():
-            if asignatura.profesor_id == profesor_id:
-                resultado.append(asignatura)
-        return resultado
+        """Busca asignaturas de un profesor específico usando el índice inverso."""
+        return list(self._por_profesor.get(profesor_id, {}).values())
     
+    @trazado("repositorio")
     def buscar_por_semestre(self, semestre: int) -> List[Asignatura]:
         """Busca asignaturas de un semestre específico."""
         resultado = []
@@ -85,6 +159,7 @@ class RepositorioAsignaturas(IRepositorio):
                 resultado.append(asignatura)
         return resultado
     
+    @trazado("repositorio")
     def obtener_total_creditos_semestre(self, semestre: int) -> int:
         """Obtiene el total de créditos de un semestre."""
         total = 0
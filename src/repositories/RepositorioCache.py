@@ -0,0 +1,382 @@
+import atexit
+import functools
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from typing import List, Optional, Any, Dict, Tuple, Callable
+from interfaces.IRepositorio import IRepositorio
+
+# Políticas de expulsión y de escritura
+LRU = 'lru'
+TINYLFU = 'tinylfu'
+ESCRITURA_DIRECTA = 'write_through'
+ESCRITURA_DIFERIDA = 'write_behind'
+
+# Tabla para reducir todos los contadores a la mitad con bytes.translate
+_MITADES = bytes(valor >> 1 for valor in range(256))
+
+class _BosquejoFrecuencias:
+    """Estimador aproximado de frecuencias (count-min sketch de 4 filas con contadores de 4 bits).
+    Cada 10 accesos por entrada de la caché los contadores se reducen a la mitad, para que la
+    popularidad antigua se olvide (envejecimiento de TinyLFU)."""
+    
+    def __init__(self, capacidad: int):
+        self._ancho = 1 << max(4, (capacidad * 4 - 1).bit_length())
+        self._mascara = self._ancho - 1
+        self._contadores = array('B', bytes(4 * self._ancho))
+        self._muestra = 10 * capacidad
+        self._accesos = 0
+    
+    def _posiciones(self, clave: str):
+        valor = hash(clave)
+        for fila in range(4):
+            yield fila * self._ancho + (((valor >> (fila * 16)) ^ (valor * (2 * fila + 1))) & self._mascara)
+    
+    def registrar(self, clave: str) -> None:
+        for posicion in self._posiciones(clave):
+            if self._contadores[posicion] < 15:
+                self._contadores[posicion] += 1
+        self._accesos += 1
+        if self._accesos >= self._muestra:
+            self._contadores = array('B', self._contadores.tobytes().translate(_MITADES))
+            self._accesos //= 2
+    
+    def estimar(self, clave: str) -> int:
+        return min(self._contadores[posicion] for posicion in self._posiciones(clave))
+
+class _CargaEnCurso:
+    """Lectura de un ID que está haciendo un hilo en el repositorio envuelto; los demás hilos que
+    piden el mismo ID esperan su resultado en vez de repetir la consulta."""
+    
+    def __init__(self):
+        self.lista = threading.Event()
+        self.entidad: Optional[Any] = None
+        self.error: Optional[BaseException] = None
+        # Pasa a False si el ID cambia mientras se lee: el resultado se entrega pero no se guarda
+        self.vigente = True
+
+class RepositorioCache(IRepositorio):
+    """Decorador de caché para cualquier IRepositorio (ej. uno respaldado en disco o remoto).
+    Principio OCP: Agrega caché sin modificar el repositorio envuelto.
+    Principio LSP: Puede usarse en cualquier lugar donde se espere un IRepositorio.
+    obtener_por_id se sirve desde una caché acotada (LRU o TinyLFU) y los IDs inexistentes se
+    recuerdan en una caché negativa. Las escrituras pueden ser directas (write-through) o, para
+    actualizar, diferidas (write-behind) hasta completar un lote o llamar a sincronizar().
+    Ni los fallos ni las escrituras retienen el lock de la caché mientras usan el repositorio
+    envuelto, de modo que una operación lenta no bloquea los aciertos de otros hilos; las
+    lecturas simultáneas de un mismo ID se resuelven con una sola consulta, y las escrituras se
+    serializan entre sí para llegar al repositorio en orden. Toda consulta que no sea por ID
+    (incluidas las delegadas, como buscar_por_profesor) escribe antes lo pendiente, y lo
+    pendiente también se escribe con cerrar() y al terminar el proceso."""
+    
+    def __init__(self, repositorio: IRepositorio, capacidad: int = 10000, politica: str = LRU,
+                 escritura: str = ESCRITURA_DIRECTA, capacidad_negativa: Optional[int] = None,
+                 tamano_lote_diferido: int = 100):
+        if politica not in (LRU, TINYLFU):
+            raise ValueError(f"Política de expulsión desconocida: {politica}")
+        if escritura not in (ESCRITURA_DIRECTA, ESCRITURA_DIFERIDA):
+            raise ValueError(f"Política de escritura desconocida: {escritura}")
+        self._repositorio = repositorio
+        self._capacidad = capacidad
+        self._politica = politica
+        self._escritura = escritura
+        self._entradas: OrderedDict = OrderedDict()
+        # IDs que el repositorio reportó como inexistentes (caché negativa, también LRU)
+        self._ausentes: OrderedDict = OrderedDict()
+        self._capacidad_negativa = capacidad_negativa if capacidad_negativa is not None else capacidad
+        # id -> entidad con actualizaciones aún no escritas (write-behind)
+        self._pendientes: Dict[str, Any] = {}
+        # id -> lectura en curso en el repositorio envuelto
+        self._en_curso: Dict[str, _CargaEnCurso] = {}
+        self._tamano_lote_diferido = tamano_lote_diferido
+        self._frecuencias = _BosquejoFrecuencias(capacidad) if politica == TINYLFU else None
+        self._lock = threading.RLock()
+        # Se toma antes que _lock: ordena las escrituras en el repositorio sin bloquear las lecturas
+        self._lock_escritura = threading.RLock()
+        self._metricas = {'aciertos': 0, 'fallos': 0, 'aciertos_negativos': 0, 'expulsiones': 0,
+                          'rechazos_admision': 0, 'escrituras_diferidas': 0, 'lotes_escritos': 0,
+                          'lecturas_compartidas': 0}
+        # Cambios hechos por otros caminos (ej. otro gestor sobre el mismo repositorio) invalidan la caché
+        repositorio.suscribir_cambios(self._registrar_cambio)
+        if escritura == ESCRITURA_DIFERIDA:
+            _caches_diferidas.add(self)
+    
+    @property
+    def repositorio(self) -> IRepositorio:
+        return self._repositorio
+    
+    def __getattr__(self, nombre: str) -> Any:
+        """Delega los métodos propios del repositorio envuelto (buscar_por_*, listar_por_*, ...),
+        escribiendo antes lo pendiente para que vean las actualizaciones diferidas.
+        Los existe_* se responden con la caché."""
+        if nombre.startswith('_'):
+            raise AttributeError(nombre)
+        if nombre.startswith('existe_'):
+            return self.existe
+        atributo = getattr(self._repositorio, nombre)
+        if not callable(atributo):
+            return atributo
+        
+        @functools.wraps(atributo)
+        def delegado(*args, **kwargs):
+            self.sincronizar()
+            return atributo(*args, **kwargs)
+        return delegado
+    
+    def suscribir_cambios(self, observador: Callable[[str, str, Optional[Any]], None]) -> None:
+        """Los cambios se notifican desde el repositorio envuelto, cuando llegan a él."""
+        self._repositorio.suscribir_cambios(observador)
+    
+    def _guardar_en_cache(self, id: str, entidad: Any) -> None:
+        """Agrega o refresca una entrada aplicando la política de expulsión (requiere el lock)."""
+        self._ausentes.pop(id, None)
+        if id in self._entradas:
+            self._entradas[id] = entidad
+            self._entradas.move_to_end(id)
+            return
+        if len(self._entradas) >= self._capacidad:
+            victima = next(iter(self._entradas))
+            # TinyLFU: solo se admite la nueva entrada si es más frecuente que la víctima
+            if self._frecuencias is not None and self._frecuencias.estimar(id) <= self._frecuencias.estimar(victima):
+                self._metricas['rechazos_admision'] += 1
+                return
+            # Una víctima con escritura pendiente sigue en _pendientes (y se lee de ahí) hasta el próximo lote
+            del self._entradas[victima]
+            self._metricas['expulsiones'] += 1
+        self._entradas[id] = entidad
+    
+    def _descartar_carga(self, id: str) -> None:
+        """Evita que una lectura en curso guarde un valor anterior a un cambio (requiere el lock).
+        Las consultas posteriores al cambio inician una lectura nueva."""
+        carga = self._en_curso.pop(id, None)
+        if carga is not None:
+            carga.vigente = False
+    
+    def _registrar_cambio(self, operacion: str, id: str, entidad: Optional[Any]) -> None:
+        with self._lock:
+            self._descartar_carga(id)
+            if operacion == 'eliminar':
+                self._entradas.pop(id, None)
+                self._pendientes.pop(id, None)
+                self._recordar_ausente(id)
+            else:
+                self._ausentes.pop(id, None)
+                if id in self._entradas and id not in self._pendientes:
+                    self._entradas[id] = entidad
+    
+    def _recordar_ausente(self, id: str) -> None:
+        self._ausentes[id] = None
+        self._ausentes.move_to_end(id)
+        if len(self._ausentes) > self._capacidad_negativa:
+            self._ausentes.popitem(last=False)
+    
+    def obtener_por_id(self, id: str) -> Optional[Any]:
+        """Obtiene un elemento por su ID, desde la caché si está disponible."""
+        with self._lock:
+            if self._frecuencias is not None:
+                self._frecuencias.registrar(id)
+            entidad = self._entradas.get(id)
+            if entidad is not None:
+                self._entradas.move_to_end(id)
+                self._metricas['aciertos'] += 1
+                return entidad
+            # Una actualización diferida que no está (o ya no está) en la caché es más nueva que el repositorio
+            entidad = self._pendientes.get(id)
+            if entidad is not None:
+                self._metricas['aciertos'] += 1
+                return entidad
+            if id in self._ausentes:
+                self._ausentes.move_to_end(id)
+                self._metricas['aciertos_negativos'] += 1
+                return None
+            espera = self._en_curso.get(id)
+            if espera is not None:
+                self._metricas['lecturas_compartidas'] += 1
+            else:
+                self._metricas['fallos'] += 1
+                carga = self._en_curso[id] = _CargaEnCurso()
+        if espera is not None:
+            espera.lista.wait()
+            if espera.error is not None:
+                raise espera.error
+            return espera.entidad
+        
+        # Fallo: se consulta el repositorio envuelto sin retener el lock
+        try:
+            entidad = self._repositorio.obtener_por_id(id)
+        except BaseException as error:
+            with self._lock:
+                if self._en_curso.get(id) is carga:
+                    del self._en_curso[id]
+            carga.error = error
+            carga.lista.set()
+            raise
+        with self._lock:
+            if self._en_curso.get(id) is carga:
+                del self._en_curso[id]
+            if carga.vigente:
+                if entidad is None:
+                    self._recordar_ausente(id)
+                else:
+                    self._guardar_en_cache(id, entidad)
+        carga.entidad = entidad
+        carga.lista.set()
+        return entidad
+    
+    def existe(self, id: str) -> bool:
+        """Indica si existe un elemento con el ID dado (usa la caché positiva y la negativa)."""
+        return self.obtener_por_id(id) is not None
+    
+    def obtener_todos(self) -> List[Any]:
+        """Obtiene todos los elementos del repositorio (escribe antes lo pendiente)."""
+        self.sincronizar()
+        return self._repositorio.obtener_todos()
+    
+    def buscar(self, criterio: dict) -> List[Any]:
+        """Busca en el repositorio (escribe antes lo pendiente)."""
+        self.sincronizar()
+        return self._repositorio.buscar(criterio)
+    
+    def agregar(self, item: Any) -> bool:
+        """Agrega un elemento; siempre se escribe directamente porque su resultado depende del repositorio."""
+        with self._lock_escritura:
+            with self._lock:
+                self._descartar_carga(item.id)
+            if not self._repositorio.agregar(item):
+                return False
+            with self._lock:
+                self._descartar_carga(item.id)
+                self._guardar_en_cache(item.id, item)
+            return True
+    
+    def actualizar(self, id: str, item: Any) -> bool:
+        """Actualiza un elemento. En write-behind queda pendiente hasta completar un lote."""
+        with self._lock_escritura:
+            with self._lock:
+                self._descartar_carga(id)
+                diferida = self._escritura == ESCRITURA_DIFERIDA and (id in self._entradas or id in self._pendientes)
+                if diferida:
+                    self._pendientes[id] = item
+                    self._guardar_en_cache(id, item)
+                    self._metricas['escrituras_diferidas'] += 1
+                    lote_completo = len(self._pendientes) >= self._tamano_lote_diferido
+            if diferida:
+                if lote_completo:
+                    self._escribir_pendientes()
+                return True
+            if not self._repositorio.actualizar(id, item):
+                with self._lock:
+                    self._entradas.pop(id, None)
+                return False
+            with self._lock:
+                self._descartar_carga(id)
+                self._guardar_en_cache(id, item)
+            return True
+    
+    def eliminar(self, id: str) -> bool:
+        """Elimina un elemento e invalida su entrada en la caché."""
+        with self._lock_escritura:
+            with self._lock:
+                self._descartar_carga(id)
+                self._pendientes.pop(id, None)
+                self._entradas.pop(id, None)
+            eliminado = self._repositorio.eliminar(id)
+            with self._lock:
+                # Una lectura que terminó durante la eliminación pudo guardar la entidad
+                self._descartar_carga(id)
+                self._entradas.pop(id, None)
+                self._recordar_ausente(id)
+            return eliminado
+    
+    def aplicar_lote(self, operaciones: List[Tuple[str, str, Optional[Any]]]) -> bool:
+        """Aplica un lote en el repositorio envuelto e invalida las entradas afectadas."""
+        with self._lock_escritura:
+            self._escribir_pendientes()
+            aplicar_lote = getattr(self._repositorio, 'aplicar_lote', None)
+            if aplicar_lote is not None:
+                resultado = aplicar_lote(operaciones)
+            else:
+                resultado = all([self._aplicar(operacion, id, entidad) for operacion, id, entidad in operaciones])
+            with self._lock:
+                for _, id, _ in operaciones:
+                    self._descartar_carga(id)
+                    self._entradas.pop(id, None)
+                    self._ausentes.pop(id, None)
+            return resultado
+    
+    def _aplicar(self, operacion: str, id: str, entidad: Optional[Any]) -> bool:
+        if operacion == 'agregar':
+            return self._repositorio.agregar(entidad)
+        if operacion == 'actualizar':
+            return self._repositorio.actualizar(id, entidad)
+        return self._repositorio.eliminar(id)
+    
+    def _escribir_pendientes(self) -> None:
+        """Escribe las actualizaciones diferidas en un solo lote (requiere el lock de escritura).
+        Siguen en _pendientes mientras se escriben, para que una lectura que no esté en la caché
+        no lea del repositorio la versión anterior."""
+        with self._lock:
+            if not self._pendientes:
+                return
+            operaciones = [('actualizar', id, entidad) for id, entidad in self._pendientes.items()]
+        aplicar_lote = getattr(self._repositorio, 'aplicar_lote', None)
+        if aplicar_lote is not None:
+            aplicar_lote(operaciones)
+        else:
+            for _, id, entidad in operaciones:
+                self._repositorio.actualizar(id, entidad)
+        with self._lock:
+            for _, id, entidad in operaciones:
+                if self._pendientes.get(id) is entidad:
+                    del self._pendientes[id]
+            self._metricas['lotes_escritos'] += 1
+    
+    def sincronizar(self) -> None:
+        """Escribe en el repositorio todas las actualizaciones diferidas."""
+        if not self._pendientes:
+            return
+        with self._lock_escritura:
+            self._escribir_pendientes()
+    
+    def cerrar(self) -> None:
+        """Escribe lo pendiente y cierra el repositorio envuelto, si este se puede cerrar."""
+        self.sincronizar()
+        _caches_diferidas.discard(self)
+        cerrar = getattr(self._repositorio, 'cerrar', None)
+        if cerrar is not None:
+            cerrar()
+    
+    def invalidar(self, id: Optional[str] = None) -> None:
+        """Descarta una entrada (o toda la caché) tras un cambio hecho directamente en el repositorio."""
+        self.sincronizar()
+        with self._lock:
+            if id is None:
+                for carga in self._en_curso.values():
+                    carga.vigente = False
+                self._en_curso.clear()
+                self._entradas.clear()
+                self._ausentes.clear()
+            else:
+                self._descartar_carga(id)
+                self._entradas.pop(id, None)
+                self._ausentes.pop(id, None)
+    
+    def obtener_metricas(self) -> Dict[str, Any]:
+        """Obtiene métricas de la caché: aciertos, fallos, expulsiones y tasa de aciertos."""
+        with self._lock:
+            metricas = dict(self._metricas)
+            consultas = metricas['aciertos'] + metricas['aciertos_negativos'] + metricas['fallos']
+            metricas['tasa_aciertos'] = round((metricas['aciertos'] + metricas['aciertos_negativos']) / consultas, 4) if consultas else 0.0
+            metricas['entradas'] = len(self._entradas)
+            metricas['ausentes'] = len(self._ausentes)
+            metricas['pendientes'] = len(self._pendientes)
+            return metricas
+
+# Cachés write-behind vivas: lo que tengan pendiente se escribe al terminar el proceso
+_caches_diferidas: weakref.WeakSet = weakref.WeakSet()
+
+@atexit.register
+def _sincronizar_al_salir() -> None:
+    for cache in list(_caches_diferidas):
+        cache.sincronizar()
\ No newline at end of file
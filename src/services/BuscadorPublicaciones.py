@@ -0,0 +1,253 @@
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from array import array
+from operator import itemgetter
+from typing import List, Optional, Dict, Any, Tuple
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IEstudiante import IEstudiante
+from interfaces.Capabilities.IInvestiga import IInvestiga
+from models.Alumno import Alumno
+
+# Palabras vacías del español (ya sin tildes, igual que los términos indexados)
+PALABRAS_VACIAS = frozenset("""
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante e el ella
+ellas ellos en entre era es esa esas ese eso esos esta estas este esto estos fue ha hay la las le les lo
+los mas me mi mucho muy nada ni no nos o otra otras otro otros para pero poco por porque que quien se
+sea segun ser si sin sobre su sus tambien tiene todo todos tu un una uno unos y ya
+""".split())
+
+_PATRON_TERMINO = re.compile(r"[a-z0-9]+")
+
+# Documento de un artículo que un hilo está indexando (reservado, aún sin número)
+_RESERVADO = -1
+
+def normalizar(texto: str) -> str:
+    """Pasa el texto a minúsculas y elimina tildes y diéresis (ej. 'Educación' -> 'educacion')."""
+    return unicodedata.normalize('NFD', texto.lower()).encode('ascii', 'ignore').decode('ascii')
+
+def _reducir(termino: str) -> str:
+    """Reducción simple de plurales: 'redes' -> 'red', 'clases' -> 'clase'."""
+    if len(termino) > 4 and termino.endswith('es') and termino[-3] in 'lrnd':
+        return termino[:-2]
+    if len(termino) > 3 and termino.endswith('s'):
+        return termino[:-1]
+    return termino
+
+def tokenizar(texto: str) -> List[str]:
+    """Convierte un texto en términos indexables: normaliza, separa, quita palabras vacías y plurales."""
+    return [_reducir(termino) for termino in _PATRON_TERMINO.findall(normalizar(texto))
+            if termino not in PALABRAS_VACIAS]
+
+class BuscadorPublicaciones:
+    """Motor de búsqueda de texto completo sobre las publicaciones de todos los investigadores.
+    Principio SRP: Solo indexa y busca artículos; publicarlos sigue siendo tarea de cada investigador.
+    Principio DIP: Se conecta a cualquier IRepositorio que notifique cambios.
+    Usa un índice invertido que se actualiza de forma incremental (cada término guarda arreglos
+    compactos de documentos y frecuencias) y ordena los resultados con BM25."""
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self._k1 = k1
+        self._b = b
+        # termino -> (documentos, frecuencias), arreglos paralelos ordenados por documento
+        self._indice: Dict[str, Tuple[array, array]] = {}
+        # Datos por documento, indexados por su número
+        self._largos = array('I')
+        self._tipos = array('B')
+        self._especialidades = array('H')
+        self._autores: List[str] = []
+        # (titulo, autor) por documento: los resultados no cargan el contenido del almacén de blobs
+        self._articulos: List[Optional[Tuple[str, str]]] = []
+        # Tablas de códigos para los filtros (0 = sin valor)
+        self._codigos_tipo: Dict[str, int] = {}
+        self._codigos_especialidad: Dict[str, int] = {}
+        # autor_id -> clave de cada artículo indexado -> documento (o _RESERVADO)
+        self._por_autor: Dict[str, Dict[Tuple[Any, ...], int]] = {}
+        self._eliminados: set = set()
+        self._cantidad = 0
+        self._largo_total = 0
+        self._lock = threading.Lock()
+    
+    def conectar_repositorio(self, repositorio: IRepositorio) -> None:
+        """Indexa las publicaciones existentes y se suscribe a los cambios del repositorio."""
+        for alumno in repositorio.obtener_todos():
+            self.indexar_autor(alumno)
+        repositorio.suscribir_cambios(self._registrar_cambio)
+    
+    def _registrar_cambio(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        if operacion == 'eliminar':
+            self.eliminar_autor(id)
+        else:
+            self.indexar_autor(alumno)
+    
+    @staticmethod
+    def _codigo(tabla: Dict[str, int], valor: Optional[str]) -> int:
+        if not valor:
+            return 0
+        clave = normalizar(valor)
+        if clave not in tabla:
+            tabla[clave] = len(tabla) + 1
+        return tabla[clave]
+    
+    @staticmethod
+    def _clave(articulo: Dict[str, str]) -> Tuple[Any, ...]:
+        """Identifica un artículo de un autor sin depender de su posición en la lista de publicaciones."""
+        contenido_hash = getattr(articulo, 'contenido_hash', None)
+        if contenido_hash is None:
+            contenido_hash = hash(articulo.get('contenido', ''))
+        return articulo.get('titulo', ''), articulo.get('fecha'), contenido_hash
+    
+    def indexar_autor(self, autor: Alumno) -> int:
+        """Sincroniza el índice con las publicaciones actuales del autor: agrega las que faltan y
+        quita las que ya no tiene. Retorna cuántas se agregaron."""
+        if not isinstance(autor, IInvestiga):
+            return 0
+        publicaciones = {self._clave(articulo): articulo for articulo in autor.obtener_publicaciones()}
+        with self._lock:
+            indexadas = self._por_autor.get(autor.id)
+            if indexadas is None:
+                if not publicaciones:
+                    return 0
+                indexadas = self._por_autor[autor.id] = {}
+            for clave in [clave for clave in indexadas if clave not in publicaciones]:
+                self._descartar(indexadas.pop(clave))
+            self._compactar_si_conviene()
+            # Se reservan bajo el lock: otra notificación del mismo autor no las vuelve a indexar
+            nuevas = [(clave, articulo) for clave, articulo in publicaciones.items() if clave not in indexadas]
+            for clave, _ in nuevas:
+                indexadas[clave] = _RESERVADO
+        for clave, articulo in nuevas:
+            self._indexar_reservado(autor, clave, articulo)
+        return len(nuevas)
+    
+    def indexar_articulo(self, autor: Alumno, articulo: Dict[str, str]) -> int:
+        """Agrega un artículo al índice y retorna su número de documento (el existente si ya
+        estaba indexado, o _RESERVADO si otro hilo lo está indexando)."""
+        clave = self._clave(articulo)
+        with self._lock:
+            indexadas = self._por_autor.setdefault(autor.id, {})
+            if clave in indexadas:
+                return indexadas[clave]
+            indexadas[clave] = _RESERVADO
+        return self._indexar_reservado(autor, clave, articulo)
+    
+    def _indexar_reservado(self, autor: Alumno, clave: Tuple[Any, ...], articulo: Dict[str, str]) -> int:
+        """Tokeniza fuera del lock (puede leer el contenido del almacén) e inserta el artículo si su
+        reserva sigue vigente; si el autor o el artículo se quitaron entretanto, no lo inserta."""
+        terminos = tokenizar(f"{articulo.get('titulo', '')} {articulo.get('contenido', '')}")
+        frecuencias: Dict[str, int] = {}
+        for termino in terminos:
+            frecuencias[termino] = frecuencias.get(termino, 0) + 1
+        tipo = autor.obtener_tipo_estudiante() if isinstance(autor, IEstudiante) else None
+        especialidad = articulo.get('especialidad') or getattr(autor, 'especialidad', None)
+        
+        with self._lock:
+            indexadas = self._por_autor.get(autor.id)
+            if indexadas is None or indexadas.get(clave) != _RESERVADO:
+                return _RESERVADO
+            documento = len(self._articulos)
+            indexadas[clave] = documento
+            self._largos.append(len(terminos))
+            self._tipos.append(self._codigo(self._codigos_tipo, tipo))
+            self._especialidades.append(self._codigo(self._codigos_especialidad, especialidad))
+            self._autores.append(autor.id)
+            self._articulos.append((articulo.get('titulo', ''), articulo.get('autor', '')))
+            self._cantidad += 1
+            self._largo_total += len(terminos)
+            for termino, frecuencia in frecuencias.items():
+                entrada = self._indice.get(termino)
+                if entrada is None:
+                    entrada = self._indice[termino] = (array('I'), array('I'))
+                entrada[0].append(documento)
+                entrada[1].append(frecuencia)
+        return documento
+    
+    def _descartar(self, documento: int) -> None:
+        """Marca un documento como eliminado (requiere el lock). Una reserva no tiene nada que descartar."""
+        if documento == _RESERVADO:
+            return
+        self._eliminados.add(documento)
+        self._cantidad -= 1
+        self._largo_total -= self._largos[documento]
+        self._articulos[documento] = None
+    
+    def eliminar_autor(self, autor_id: str) -> int:
+        """Quita del índice todas las publicaciones de un autor. Retorna cuántas se quitaron."""
+        with self._lock:
+            documentos = [documento for documento in self._por_autor.pop(autor_id, {}).values() if documento != _RESERVADO]
+            for documento in documentos:
+                self._descartar(documento)
+            self._compactar_si_conviene()
+        return len(documentos)
+    
+    def _compactar_si_conviene(self) -> None:
+        """Compacta los arreglos cuando los documentos eliminados pesan demasiado (requiere el lock)."""
+        if len(self._eliminados) > 1000 and len(self._eliminados) * 4 > self._cantidad:
+            self._compactar()
+    
+    def _compactar(self) -> None:
+        """Quita los documentos eliminados de las listas de cada término (requiere el lock)."""
+        eliminados = self._eliminados
+        for termino in list(self._indice):
+            documentos, frecuencias = self._indice[termino]
+            vivos = [(documento, frecuencia) for documento, frecuencia in zip(documentos, frecuencias)
+                     if documento not in eliminados]
+            if vivos:
+                self._indice[termino] = (array('I', map(itemgetter(0), vivos)), array('I', map(itemgetter(1), vivos)))
+            else:
+                del self._indice[termino]
+        self._eliminados = set()
+    
+    def buscar(self, consulta: str, k: int = 10, tipo: Optional[str] = None,
+               especialidad: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retorna los k artículos más relevantes para la consulta según BM25, con título, autor y
+        puntaje (el contenido no se carga; se lee desde la publicación del autor si hace falta).
+        Se puede filtrar por tipo de autor (ej. 'Titulado/Profesor') o por especialidad."""
+        terminos = set(tokenizar(consulta))
+        with self._lock:
+            cantidad = self._cantidad
+            if not terminos or cantidad <= 0:
+                return []
+            codigo_tipo = self._codigos_tipo.get(normalizar(tipo)) if tipo else None
+            codigo_especialidad = self._codigos_especialidad.get(normalizar(especialidad)) if especialidad else None
+            if (tipo and codigo_tipo is None) or (especialidad and codigo_especialidad is None):
+                return []
+            
+            # BM25: denominador tf + k1 * (1 - b + b * largo / largo_promedio)
+            largo_promedio = self._largo_total / cantidad or 1.0
+            constante = self._k1 * (1 - self._b)
+            pendiente = self._k1 * self._b / largo_promedio
+            largos = self._largos
+            puntajes: Dict[int, float] = {}
+            for termino in terminos:
+                entrada = self._indice.get(termino)
+                if entrada is None:
+                    continue
+                documentos, frecuencias = entrada
+                frecuencia_documental = len(documentos)
+                idf = math.log(1 + (cantidad - frecuencia_documental + 0.5) / (frecuencia_documental + 0.5))
+                peso = idf * (self._k1 + 1)
+                for documento, frecuencia in zip(documentos, frecuencias):
+                    puntajes[documento] = puntajes.get(documento, 0.0) + \
+                        peso * frecuencia / (frecuencia + constante + pendiente * largos[documento])
+            
+            if self._eliminados or codigo_tipo is not None or codigo_especialidad is not None:
+                puntajes = {documento: puntaje for documento, puntaje in puntajes.items()
+                            if documento not in self._eliminados
+                            and (codigo_tipo is None or self._tipos[documento] == codigo_tipo)
+                            and (codigo_especialidad is None or self._especialidades[documento] == codigo_especialidad)}
+            mejores = heapq.nlargest(k, puntajes.items(), key=itemgetter(1))
+            return [{'titulo': self._articulos[documento][0], 'autor': self._articulos[documento][1],
+                     'autor_id': self._autores[documento], 'puntaje': round(puntaje, 4)}
+                    for documento, puntaje in mejores]
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del índice: documentos, términos y entradas de las listas invertidas."""
+        with self._lock:
+            return {
+                'documentos': self._cantidad,
+                'terminos': len(self._indice),
+                'entradas': sum(len(documentos) for documentos, _ in self._indice.values())
+            }
\ No newline at end of file
@@ -0,0 +1,123 @@
+import threading
+from contextlib import ExitStack
+from typing import List, Optional, Dict, Any
+from interfaces.IRepositorio import IRepositorio
+from models.Alumno import Alumno
+
+class ControlCreditos:
+    """Mantiene la carga de créditos matriculados de cada alumno y sus límites por tipo.
+    Principio SRP: Solo lleva la contabilidad de créditos; las reglas de matrícula quedan en el gestor.
+    La carga se actualiza de forma incremental en cada matrícula, baja o cambio de créditos de
+    una asignatura, por lo que verificar el límite al matricular es O(1).
+    Verificar y sumar deben ocurrir bajo bloqueo(alumno_id): dos matrículas del mismo alumno en
+    asignaturas distintas toman locks de asignatura distintos y, sin él, ambas pasarían la
+    verificación. Orden fijo: primero el lock de la asignatura y luego el del alumno."""
+    
+    def __init__(self, limites_por_tipo: Optional[Dict[str, int]] = None, limite_por_defecto: Optional[int] = None,
+                 segmentos: int = 64):
+        self._limites: Dict[str, int] = dict(limites_por_tipo or {})
+        self._limite_por_defecto = limite_por_defecto
+        self._carga: Dict[str, int] = {}
+        self._tipos: Dict[str, Optional[str]] = {}
+        # alumno_id -> límite excedido; se mantiene junto con la carga
+        self._sobrecargados: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Locks segmentados por alumno, como los de asignatura en ControlCupos
+        self._locks_alumnos = [threading.RLock() for _ in range(segmentos)]
+    
+    def bloqueo(self, alumno_id: str) -> threading.RLock:
+        """Obtiene el lock del segmento que corresponde al alumno."""
+        return self._locks_alumnos[hash(alumno_id) % len(self._locks_alumnos)]
+    
+    def bloquear_todos(self) -> ExitStack:
+        """Toma todos los segmentos de alumno, en el orden de UnidadDeTrabajo al confirmar (por id del lock)."""
+        pila = ExitStack()
+        with pila:
+            for lock in sorted(self._locks_alumnos, key=id):
+                pila.enter_context(lock)
+            return pila.pop_all()
+    
+    @staticmethod
+    def _tipo(alumno: Alumno) -> Optional[str]:
+        obtener_tipo = getattr(alumno, 'obtener_tipo_estudiante', None)
+        return obtener_tipo() if obtener_tipo is not None else None
+    
+    def obtener_limite(self, tipo: Optional[str]) -> Optional[int]:
+        """Obtiene el máximo de créditos para un tipo de estudiante (None = sin límite)."""
+        return self._limites.get(tipo, self._limite_por_defecto)
+    
+    def establecer_limite(self, tipo: str, limite: Optional[int]) -> None:
+        """Cambia el límite de un tipo y recalcula qué alumnos quedan sobrecargados."""
+        with self._lock:
+            if limite is None:
+                self._limites.pop(tipo, None)
+            else:
+                self._limites[tipo] = limite
+            for alumno_id, tipo_alumno in self._tipos.items():
+                if tipo_alumno == tipo:
+                    self._evaluar(alumno_id)
+    
+    def obtener_carga(self, alumno_id: str) -> int:
+        """Obtiene los créditos matriculados actualmente por el alumno."""
+        return self._carga.get(alumno_id, 0)
+    
+    def puede_agregar(self, alumno: Alumno, creditos: int) -> bool:
+        """Indica si el alumno puede sumar esos créditos sin exceder su límite."""
+        limite = self.obtener_limite(self._tipo(alumno))
+        return limite is None or self._carga.get(alumno.id, 0) + creditos <= limite
+    
+    def sumar(self, alumno: Alumno, creditos: int) -> None:
+        """Suma (o resta, con créditos negativos) créditos a la carga del alumno."""
+        with self._lock:
+            self._tipos[alumno.id] = self._tipo(alumno)
+            self._carga[alumno.id] = self._carga.get(alumno.id, 0) + creditos
+            self._evaluar(alumno.id)
+    
+    def ajustar_asignatura(self, estudiantes: List[str], diferencia: int) -> None:
+        """Aplica un cambio de créditos de una asignatura a todos sus matriculados."""
+        if diferencia == 0:
+            return
+        with self._lock:
+            for alumno_id in estudiantes:
+                self._carga[alumno_id] = self._carga.get(alumno_id, 0) + diferencia
+                self._evaluar(alumno_id)
+    
+    def eliminar_alumno(self, alumno_id: str) -> None:
+        """Descarta la carga de un alumno."""
+        with self._lock:
+            self._carga.pop(alumno_id, None)
+            self._tipos.pop(alumno_id, None)
+            self._sobrecargados.pop(alumno_id, None)
+    
+    def vaciar(self) -> None:
+        """Deja a todos los alumnos sin carga (al cerrar el período)."""
+        with self._lock:
+            self._carga.clear()
+            self._sobrecargados.clear()
+    
+    def _evaluar(self, alumno_id: str) -> None:
+        limite = self.obtener_limite(self._tipos.get(alumno_id))
+        if limite is not None and self._carga.get(alumno_id, 0) > limite:
+            self._sobrecargados[alumno_id] = limite
+        else:
+            self._sobrecargados.pop(alumno_id, None)
+    
+    def obtener_sobrecargados(self) -> List[Dict[str, Any]]:
+        """Lista los alumnos cuya carga supera su límite (ej. tras subir los créditos de una asignatura)."""
+        with self._lock:
+            return [
+                {'alumno_id': alumno_id, 'creditos': self._carga[alumno_id], 'limite': limite}
+                for alumno_id, limite in self._sobrecargados.items()
+            ]
+    
+    def reconstruir(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio) -> None:
+        """Recalcula la carga de todos los alumnos a partir de sus matrículas."""
+        creditos = {asignatura.id: asignatura.creditos for asignatura in repositorio_asignaturas.obtener_todos()}
+        with self._lock:
+            self._carga.clear()
+            self._tipos.clear()
+            self._sobrecargados.clear()
+            for alumno in repositorio_alumnos.obtener_todos():
+                self._tipos[alumno.id] = self._tipo(alumno)
+                self._carga[alumno.id] = sum(creditos.get(asignatura_id, 0) for asignatura_id in alumno.asignaturas_matriculadas)
+                self._evaluar(alumno.id)
\ No newline at end of file
@@ -0,0 +1,38 @@
+import threading
+from contextlib import ExitStack
+from typing import Dict
+
+class ControlCupos:
+    """Serializa la asignación de cupos por asignatura mediante locks segmentados.
+    Principio SRP: Solo coordina la concurrencia; el cupo y la lista de espera viven en Asignatura.
+    Las solicitudes a una misma asignatura se atienden de a una (sin sobreventa), mientras que
+    asignaturas distintas usan en general locks distintos y no se bloquean entre sí."""
+    
+    def __init__(self, segmentos: int = 64):
+        # RLock: la promoción desde la lista de espera vuelve a tomar el lock de la misma asignatura
+        self._locks = [threading.RLock() for _ in range(segmentos)]
+        self._contadores_lock = threading.Lock()
+        self._contadores: Dict[str, int] = {'matriculados': 0, 'en_espera': 0, 'rechazados': 0, 'promovidos': 0, 'no_promovidos': 0}
+    
+    def bloqueo(self, asignatura_id: str) -> threading.RLock:
+        """Obtiene el lock del segmento que corresponde a la asignatura."""
+        return self._locks[hash(asignatura_id) % len(self._locks)]
+    
+    def bloquear_todos(self) -> ExitStack:
+        """Toma todos los segmentos, en el orden de UnidadDeTrabajo al confirmar (por id del lock),
+        para detener toda asignación de cupos (ej. durante el cierre de período)."""
+        pila = ExitStack()
+        with pila:
+            for lock in sorted(self._locks, key=id):
+                pila.enter_context(lock)
+            return pila.pop_all()
+    
+    def registrar(self, resultado: str) -> None:
+        """Incrementa el contador de un resultado de admisión."""
+        with self._contadores_lock:
+            self._contadores[resultado] = self._contadores.get(resultado, 0) + 1
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene los contadores de admisión acumulados."""
+        with self._contadores_lock:
+            return dict(self._contadores)
\ No newline at end of file
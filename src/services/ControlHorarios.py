@@ -0,0 +1,123 @@
+import threading
+from typing import List, Optional, Dict, Any, Set, Tuple
+from interfaces.IRepositorio import IRepositorio
+from models.Asignatura import Asignatura
+
+class ControlHorarios:
+    """Detecta choques de horario entre las asignaturas de cada alumno.
+    Principio SRP: Solo mantiene la ocupación semanal de los alumnos.
+    Cada alumno tiene una máscara de bits de la semana (módulos de 5 minutos), por lo que
+    verificar un choque es una operación AND de tamaño fijo, independiente de cuántas
+    asignaturas tenga el alumno."""
+    
+    def __init__(self):
+        # alumno_id -> unión de las máscaras de sus asignaturas
+        self._ocupacion: Dict[str, int] = {}
+        # alumno_id -> {asignatura_id: máscara}, para identificar el choque y liberar horario
+        self._por_alumno: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+    
+    def buscar_choque(self, alumno_id: str, asignatura: Asignatura) -> Optional[str]:
+        """Retorna el ID de una asignatura del alumno que choca con la dada, o None."""
+        mascara = asignatura.obtener_mascara_horario()
+        if not mascara or not (self._ocupacion.get(alumno_id, 0) & mascara):
+            return None
+        for asignatura_id, mascara_existente in self._por_alumno.get(alumno_id, {}).items():
+            if asignatura_id != asignatura.id and mascara_existente & mascara:
+                return asignatura_id
+        return None
+    
+    def registrar(self, alumno_id: str, asignatura: Asignatura) -> None:
+        """Agrega el horario de la asignatura a la ocupación del alumno."""
+        mascara = asignatura.obtener_mascara_horario()
+        with self._lock:
+            self._por_alumno.setdefault(alumno_id, {})[asignatura.id] = mascara
+            self._ocupacion[alumno_id] = self._ocupacion.get(alumno_id, 0) | mascara
+    
+    def liberar(self, alumno_id: str, asignatura_id: str) -> None:
+        """Quita el horario de una asignatura de la ocupación del alumno."""
+        with self._lock:
+            asignaturas = self._por_alumno.get(alumno_id)
+            if not asignaturas or asignatura_id not in asignaturas:
+                return
+            del asignaturas[asignatura_id]
+            self._recalcular(alumno_id)
+    
+    def actualizar_asignatura(self, asignatura: Asignatura) -> None:
+        """Propaga un cambio de horario a los alumnos matriculados en la asignatura."""
+        mascara = asignatura.obtener_mascara_horario()
+        with self._lock:
+            for alumno_id in asignatura.estudiantes_matriculados:
+                asignaturas = self._por_alumno.setdefault(alumno_id, {})
+                asignaturas[asignatura.id] = mascara
+                self._recalcular(alumno_id)
+    
+    def eliminar_alumno(self, alumno_id: str) -> None:
+        """Descarta la ocupación de un alumno."""
+        with self._lock:
+            self._por_alumno.pop(alumno_id, None)
+            self._ocupacion.pop(alumno_id, None)
+    
+    def vaciar(self) -> None:
+        """Deja a todos los alumnos sin horario ocupado (al cerrar el período)."""
+        with self._lock:
+            self._ocupacion.clear()
+            self._por_alumno.clear()
+    
+    def _recalcular(self, alumno_id: str) -> None:
+        ocupacion = 0
+        for mascara in self._por_alumno.get(alumno_id, {}).values():
+            ocupacion |= mascara
+        if ocupacion or alumno_id in self._por_alumno:
+            self._ocupacion[alumno_id] = ocupacion
+    
+    def reconstruir(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio) -> None:
+        """Reconstruye la ocupación de todos los alumnos a partir de sus matrículas."""
+        mascaras = {asignatura.id: asignatura.obtener_mascara_horario() for asignatura in repositorio_asignaturas.obtener_todos()}
+        with self._lock:
+            self._ocupacion.clear()
+            self._por_alumno.clear()
+            for alumno in repositorio_alumnos.obtener_todos():
+                asignaturas = {asignatura_id: mascaras.get(asignatura_id, 0) for asignatura_id in alumno.asignaturas_matriculadas}
+                self._por_alumno[alumno.id] = asignaturas
+                self._recalcular(alumno.id)
+    
+    @staticmethod
+    def calcular_pares_en_conflicto(asignaturas: List[Asignatura]) -> Dict[str, Set[str]]:
+        """Obtiene, para cada asignatura, las asignaturas cuyo horario se superpone con el suyo.
+        Usa un barrido sobre los bloques ordenados por inicio: O(B log B + conflictos)."""
+        eventos: List[Tuple[int, int, str]] = []
+        for asignatura in asignaturas:
+            for bloque in asignatura.horario:
+                base = bloque.dia * 24 * 60
+                eventos.append((base + bloque.inicio, base + bloque.fin, asignatura.id))
+        eventos.sort()
+        conflictos: Dict[str, Set[str]] = {}
+        activos: List[Tuple[int, str]] = []
+        for inicio, fin, asignatura_id in eventos:
+            activos = [(fin_activo, id_activo) for fin_activo, id_activo in activos if fin_activo > inicio]
+            for _, id_activo in activos:
+                if id_activo != asignatura_id:
+                    conflictos.setdefault(asignatura_id, set()).add(id_activo)
+                    conflictos.setdefault(id_activo, set()).add(asignatura_id)
+            activos.append((fin, asignatura_id))
+        return conflictos
+    
+    def auditar(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio) -> List[Dict[str, Any]]:
+        """Encuentra todas las matrículas en conflicto de horario de todos los alumnos.
+        Primero calcula los pares de asignaturas que chocan y luego revisa a cada alumno
+        solo contra esos pares, en una pasada."""
+        conflictos = self.calcular_pares_en_conflicto(repositorio_asignaturas.obtener_todos())
+        if not conflictos:
+            return []
+        resultado = []
+        for alumno in repositorio_alumnos.obtener_todos():
+            matriculadas = alumno.asignaturas_matriculadas
+            if len(matriculadas) < 2:
+                continue
+            conjunto = set(matriculadas)
+            for asignatura_id in matriculadas:
+                for otra_id in conflictos.get(asignatura_id, ()):
+                    if asignatura_id < otra_id and otra_id in conjunto:
+                        resultado.append({'alumno_id': alumno.id, 'asignatura_a': asignatura_id, 'asignatura_b': otra_id})
+        return resultado
\ No newline at end of file
@@ -0,0 +1,48 @@
+from typing import NamedTuple, Optional
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IRepositorio import IRepositorio
+from services.ControlCupos import ControlCupos
+from services.ControlHorarios import ControlHorarios
+from services.ControlCreditos import ControlCreditos
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+from services.GestorAlumnos import GestorAlumnos
+from services.GestorAsignaturas import GestorAsignaturas
+from services.GestorMatriculas import GestorMatriculas
+from services.GestorCierreSemestre import GestorCierreSemestre
+from services.GestorReportes import GestorReportes
+
+class Gestores(NamedTuple):
+    """Servicios creados por crear_gestores sobre un mismo par de repositorios."""
+    alumnos: GestorAlumnos
+    asignaturas: GestorAsignaturas
+    matriculas: GestorMatriculas
+    cierre: GestorCierreSemestre
+    reportes: GestorReportes
+
+def crear_gestores(repositorio_alumnos: IRepositorioAlumnos, repositorio_asignaturas: IRepositorio,
+                   control_horarios: Optional[ControlHorarios] = None,
+                   control_creditos: Optional[ControlCreditos] = None,
+                   grafo_prerrequisitos: Optional[GrafoPrerrequisitos] = None) -> Gestores:
+    """Crea los gestores sobre los repositorios dados, compartiendo el estado que se consulta al
+    matricular (cupos, horarios, créditos y prerrequisitos) para que ninguno vea una copia desfasada.
+    Los controles que no se inyectan se crean y se reconstruyen desde los repositorios."""
+    control_cupos = ControlCupos()
+    if control_horarios is None:
+        control_horarios = ControlHorarios()
+        control_horarios.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+    if control_creditos is None:
+        control_creditos = ControlCreditos()
+        control_creditos.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+    if grafo_prerrequisitos is None:
+        grafo_prerrequisitos = GrafoPrerrequisitos()
+    gestor_matriculas = GestorMatriculas(repositorio_alumnos, repositorio_asignaturas, control_cupos=control_cupos,
+                                         control_horarios=control_horarios, control_creditos=control_creditos,
+                                         grafo_prerrequisitos=grafo_prerrequisitos)
+    gestor_alumnos = GestorAlumnos(repositorio_alumnos, repositorio_asignaturas, matriculas=gestor_matriculas,
+                                   grafo_prerrequisitos=grafo_prerrequisitos)
+    gestor_asignaturas = GestorAsignaturas(repositorio_asignaturas, repositorio_alumnos, control_cupos=control_cupos,
+                                           control_horarios=control_horarios, control_creditos=control_creditos,
+                                           grafo_prerrequisitos=grafo_prerrequisitos, desvinculador=gestor_matriculas)
+    gestor_cierre = GestorCierreSemestre(repositorio_alumnos, repositorio_asignaturas, gestor_matriculas)
+    gestor_reportes = GestorReportes(repositorio_alumnos, repositorio_asignaturas)
+    return Gestores(gestor_alumnos, gestor_asignaturas, gestor_matriculas, gestor_cierre, gestor_reportes)
\ No newline at end of file
@@ -0,0 +1,334 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import List, Optional, Dict, Any, Callable
+
+registro = logging.getLogger(__name__)
+
+class EventoCambio:
+    """Evento de cambio (CDC) con número de secuencia global."""
+    
+    __slots__ = ('_secuencia', '_entidad', '_operacion', '_id', '_datos', '_timestamp')
+    
+    def __init__(self, secuencia: int, entidad: str, operacion: str, id: str, datos: Optional[Dict[str, Any]]):
+        self._secuencia = secuencia
+        self._entidad = entidad
+        self._operacion = operacion
+        self._id = id
+        self._datos = datos
+        self._timestamp = time.time()
+    
+    @property
+    def secuencia(self) -> int:
+        return self._secuencia
+    
+    @property
+    def entidad(self) -> str:
+        return self._entidad
+    
+    @property
+    def operacion(self) -> str:
+        return self._operacion
+    
+    @property
+    def id(self) -> str:
+        return self._id
+    
+    @property
+    def datos(self) -> Optional[Dict[str, Any]]:
+        return self._datos
+    
+    @property
+    def timestamp(self) -> float:
+        return self._timestamp
+    
+    def obtener_info_completa(self) -> Dict[str, Any]:
+        """Obtiene el evento como diccionario."""
+        return {
+            'secuencia': self._secuencia,
+            'entidad': self._entidad,
+            'operacion': self._operacion,
+            'id': self._id,
+            'datos': self._datos,
+            'timestamp': self._timestamp
+        }
+    
+    def __str__(self) -> str:
+        return f"Evento #{self._secuencia}: {self._operacion} {self._entidad} {self._id}"
+
+class Suscripcion:
+    """Posición de un consumidor dentro del flujo de cambios.
+    Con callback la entrega es push por lotes; sin callback el consumidor lee con leer_lote().
+    Los lotes push se entregan de a uno y en orden; si el callback lanza, el error se registra
+    en la suscripción y el lote se da por entregado."""
+    
+    def __init__(self, flujo: 'FlujoCambios', nombre: str, siguiente: int, tamano_lote: int,
+                 callback: Optional[Callable[[List[EventoCambio]], None]]):
+        self._flujo = flujo
+        self._nombre = nombre
+        self._siguiente = siguiente
+        self._tamano_lote = tamano_lote
+        self._callback = callback
+        self._desfasada = False
+        self._activa = True
+        # Se toma desde que se saca un lote hasta que el callback termina: un solo hilo entrega a la vez
+        self._entrega = threading.Lock()
+        self._hilo_entrega: Optional[int] = None
+        self._errores = 0
+        self._ultimo_error: Optional[str] = None
+    
+    @property
+    def nombre(self) -> str:
+        return self._nombre
+    
+    @property
+    def ultima_secuencia(self) -> int:
+        """Última secuencia entregada; sirve para reanudar con suscribir(desde_secuencia=...)."""
+        return self._siguiente - 1
+    
+    @property
+    def desfasada(self) -> bool:
+        """Indica si se descartaron eventos que esta suscripción no alcanzó a leer."""
+        return self._desfasada
+    
+    @property
+    def activa(self) -> bool:
+        return self._activa
+    
+    @property
+    def errores(self) -> int:
+        """Cantidad de lotes cuyo callback lanzó una excepción."""
+        return self._errores
+    
+    @property
+    def ultimo_error(self) -> Optional[str]:
+        return self._ultimo_error
+    
+    def leer_lote(self, maximo: Optional[int] = None) -> List[EventoCambio]:
+        """Lee el siguiente lote de eventos pendientes y avanza la posición."""
+        return self._flujo._leer(self, maximo or self._tamano_lote)
+    
+    def pendientes(self) -> int:
+        """Cantidad de eventos pendientes de entregar."""
+        return self._flujo.ultima_secuencia - self.ultima_secuencia
+    
+    def cancelar(self) -> None:
+        """Cancela la suscripción y libera los eventos que retenía."""
+        self._flujo._cancelar(self)
+
+class FlujoCambios:
+    """Flujo ordenado de eventos de cambio sobre repositorios y matrículas.
+    Principio SRP: Solo secuencia, retiene y entrega eventos; no conoce a los consumidores.
+    Principio OCP: Los consumidores mantienen su estado derivado sin modificar repositorios ni gestores.
+    publicar nunca lanza: se invoca después de aplicar la mutación (desde los observadores de los
+    repositorios o al confirmar una transacción), cuando ya no se puede rechazar. Con el buffer
+    lleno, POLITICA_BLOQUEAR espera hasta tiempo_espera a que los consumidores avancen y, si no
+    lo hacen, descarta como POLITICA_DESCARTAR: los atrasados quedan desfasados y se cuentan en
+    'descartados'."""
+    
+    POLITICA_BLOQUEAR = 'bloquear'
+    POLITICA_DESCARTAR = 'descartar'
+    
+    def __init__(self, capacidad: int = 10000, politica: str = POLITICA_BLOQUEAR, tiempo_espera: float = 5.0):
+        if politica not in (self.POLITICA_BLOQUEAR, self.POLITICA_DESCARTAR):
+            raise ValueError(f"Política desconocida: {politica}")
+        self._capacidad = capacidad
+        self._politica = politica
+        self._tiempo_espera = tiempo_espera
+        self._buffer: deque = deque()
+        self._siguiente_secuencia = 1
+        self._suscripciones: List[Suscripcion] = []
+        self._condicion = threading.Condition()
+        self._descartados = 0
+    
+    @property
+    def ultima_secuencia(self) -> int:
+        return self._siguiente_secuencia - 1
+    
+    @property
+    def primera_secuencia_retenida(self) -> int:
+        """Secuencia más antigua aún disponible en el buffer."""
+        with self._condicion:
+            return self._buffer[0].secuencia if self._buffer else self._siguiente_secuencia
+    
+    def conectar_repositorio(self, repositorio, entidad: str) -> None:
+        """Publica en el flujo cada mutación del repositorio (agregar, actualizar, eliminar)."""
+        def observador(operacion: str, id: str, item) -> None:
+            datos = item.obtener_info_completa() if item is not None else None
+            self.publicar(entidad, operacion, id, datos)
+        repositorio.suscribir_cambios(observador)
+    
+    def publicar(self, entidad: str, operacion: str, id: str, datos: Optional[Dict[str, Any]] = None) -> int:
+        """Publica un evento y retorna su número de secuencia.
+        Si el buffer está lleno aplica la política de contrapresión configurada."""
+        with self._condicion:
+            lleno = len(self._buffer) >= self._capacidad
+        if lleno:
+            # Los consumidores push se drenan (fuera del lock) antes de aplicar contrapresión
+            self._entregar_push(forzar=True)
+        with self._condicion:
+            if len(self._buffer) >= self._capacidad:
+                self._liberar_espacio()
+            evento = EventoCambio(self._siguiente_secuencia, entidad, operacion, id, datos)
+            self._siguiente_secuencia += 1
+            self._buffer.append(evento)
+            self._condicion.notify_all()
+        if self._hay_lote_push_listo():
+            self._entregar_push()
+        return evento.secuencia
+    
+    def suscribir(self, nombre: str, callback: Optional[Callable[[List[EventoCambio]], None]] = None,
+                  tamano_lote: int = 100, desde_secuencia: Optional[int] = None) -> Suscripcion:
+        """Crea una suscripción. Sin desde_secuencia recibe solo eventos futuros;
+        con desde_secuencia reanuda entregando los eventos posteriores a esa secuencia."""
+        with self._condicion:
+            if desde_secuencia is None:
+                siguiente = self._siguiente_secuencia
+            else:
+                siguiente = desde_secuencia + 1
+                primera = self._buffer[0].secuencia if self._buffer else self._siguiente_secuencia
+                if siguiente < primera:
+                    raise ValueError(f"La secuencia {desde_secuencia} ya no está retenida (primera: {primera})")
+                if siguiente > self._siguiente_secuencia:
+                    raise ValueError(f"La secuencia {desde_secuencia} aún no existe")
+            suscripcion = Suscripcion(self, nombre, siguiente, tamano_lote, callback)
+            self._suscripciones.append(suscripcion)
+        return suscripcion
+    
+    def vaciar(self) -> int:
+        """Entrega todos los eventos pendientes a las suscripciones push. Retorna los eventos entregados."""
+        return self._entregar_push(forzar=True)
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene el estado del buffer y el retraso de cada suscripción."""
+        with self._condicion:
+            return {
+                'ultima_secuencia': self.ultima_secuencia,
+                'eventos_retenidos': len(self._buffer),
+                'capacidad': self._capacidad,
+                'descartados': self._descartados,
+                'suscripciones': {
+                    suscripcion.nombre: {
+                        'ultima_secuencia': suscripcion.ultima_secuencia,
+                        'pendientes': self.ultima_secuencia - suscripcion.ultima_secuencia,
+                        'desfasada': suscripcion.desfasada,
+                        'errores': suscripcion.errores
+                    }
+                    for suscripcion in self._suscripciones
+                }
+            }
+    
+    # Métodos internos (requieren o toman el lock)
+    
+    def _leer(self, suscripcion: Suscripcion, maximo: int) -> List[EventoCambio]:
+        with self._condicion:
+            lote = self._tomar_lote(suscripcion, maximo)
+            if lote:
+                self._recortar()
+            return lote
+    
+    def _tomar_lote(self, suscripcion: Suscripcion, maximo: int) -> List[EventoCambio]:
+        if not self._buffer:
+            return []
+        primera = self._buffer[0].secuencia
+        if suscripcion._siguiente < primera:
+            # Se descartaron eventos que no leyó: continúa desde el más antiguo retenido
+            suscripcion._desfasada = True
+            suscripcion._siguiente = primera
+        inicio = suscripcion._siguiente - primera
+        fin = min(inicio + maximo, len(self._buffer))
+        lote = [self._buffer[i] for i in range(inicio, fin)]
+        suscripcion._siguiente += len(lote)
+        return lote
+    
+    def _recortar(self) -> None:
+        """Descarta del buffer los eventos ya leídos por todas las suscripciones."""
+        if not self._suscripciones:
+            return
+        minimo = min(suscripcion._siguiente for suscripcion in self._suscripciones)
+        while self._buffer and self._buffer[0].secuencia < minimo:
+            self._buffer.popleft()
+        self._condicion.notify_all()
+    
+    def _liberar_espacio(self) -> None:
+        if not self._suscripciones:
+            # Sin consumidores el buffer funciona como ventana de reanudación
+            self._buffer.popleft()
+            return
+        if self._politica == self.POLITICA_BLOQUEAR:
+            limite = time.monotonic() + self._tiempo_espera
+            while len(self._buffer) >= self._capacidad:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                self._condicion.wait(restante)
+            if len(self._buffer) < self._capacidad:
+                return
+        # Se descarta el evento más antiguo; los consumidores atrasados quedan desfasados
+        descartado = self._buffer.popleft()
+        self._descartados += 1
+        for suscripcion in self._suscripciones:
+            if suscripcion._siguiente <= descartado.secuencia:
+                suscripcion._desfasada = True
+    
+    def _hay_lote_push_listo(self) -> bool:
+        ultima = self.ultima_secuencia
+        return any(suscripcion._callback is not None and ultima - suscripcion.ultima_secuencia >= suscripcion._tamano_lote
+                   for suscripcion in self._suscripciones)
+    
+    def _entregar_push(self, forzar: bool = False) -> int:
+        entregados = 0
+        for suscripcion in list(self._suscripciones):
+            if suscripcion._callback is not None:
+                entregados += self._entregar_a(suscripcion, forzar)
+        return entregados
+    
+    def _lote_listo(self, suscripcion: Suscripcion, forzar: bool) -> bool:
+        pendientes = self.ultima_secuencia - suscripcion.ultima_secuencia
+        return pendientes > 0 and (forzar or pendientes >= suscripcion._tamano_lote)
+    
+    def _entregar_a(self, suscripcion: Suscripcion, forzar: bool) -> int:
+        """Entrega los lotes listos de una suscripción push. Si otro hilo ya le está entregando,
+        una publicación no espera (ese hilo vuelve a revisar al terminar) y vaciar sí; un callback
+        que publica no se entrega a sí mismo (su lote sigue en curso)."""
+        if suscripcion._hilo_entrega == threading.get_ident():
+            return 0
+        entregados = 0
+        while True:
+            if not suscripcion._entrega.acquire(blocking=forzar):
+                return entregados
+            suscripcion._hilo_entrega = threading.get_ident()
+            try:
+                while True:
+                    with self._condicion:
+                        if not self._lote_listo(suscripcion, forzar):
+                            break
+                        lote = self._tomar_lote(suscripcion, suscripcion._tamano_lote)
+                    if not lote:
+                        break
+                    try:
+                        suscripcion._callback(lote)
+                    except Exception as error:
+                        # El evento ya se aplicó: un consumidor que falla no puede hacer fallar la mutación
+                        suscripcion._errores += 1
+                        suscripcion._ultimo_error = repr(error)
+                        registro.exception("Falló la entrega a la suscripción '%s' (secuencias %d-%d)",
+                                           suscripcion.nombre, lote[0].secuencia, lote[-1].secuencia)
+                    entregados += len(lote)
+                    with self._condicion:
+                        self._recortar()
+            finally:
+                suscripcion._hilo_entrega = None
+                suscripcion._entrega.release()
+            # Un publicador que no tomó el lock mientras se entregaba pudo dejar otro lote listo
+            with self._condicion:
+                if not self._lote_listo(suscripcion, forzar):
+                    return entregados
+    
+    def _cancelar(self, suscripcion: Suscripcion) -> None:
+        with self._condicion:
+            if suscripcion in self._suscripciones:
+                self._suscripciones.remove(suscripcion)
+                suscripcion._activa = False
+                self._recortar()
\ No newline at end of file
@@ -1,22 +1,62 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from interfaces.IRepositorio import IRepositorio
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IGestorMatriculas import IGestorMatriculas
 from models.Alumno import Alumno
+from models.Asignatura import Asignatura
 from models.TiposEstudiante.Estudiante import Estudiante
 from models.TiposEstudiante.EstudianteAyudante import EstudianteAyudante
 from models.TiposEstudiante.EstudianteMagister import EstudianteMagister
 from models.TiposEstudiante.EstudianteDoctorado import EstudianteDoctorado
 from models.TiposEstudiante.Titulado import Titulado
+from services.UnidadDeTrabajo import UnidadDeTrabajo
+from services.BuscadorPublicaciones import BuscadorPublicaciones
+from services.GrafoSupervision import GrafoSupervision
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+from services.GestorMatriculas import GestorMatriculas
+from services.RegistroNotas import RegistroNotas, NOTA_APROBACION
+from interfaces.Capabilities.IInvestiga import IInvestiga
+from utils.Trazador import trazado
 
 class GestorAlumnos:
     """Servicio para gestionar alumnos.
-    Principio SRP: Se encarga únicamente de la lógica de negocio de alumnos.
-    Principio DIP: Depende de abstracciones (IRepositorio), no de implementaciones concretas."""
+    Principio SRP: Se encarga únicamente de la lógica de negocio de alumnos (altas, notas,
+    publicaciones, supervisión y bajas); las matrículas, el cierre de período y los reportes
+    viven en GestorMatriculas, GestorCierreSemestre y GestorReportes.
+    Principio DIP: Depende de abstracciones (IRepositorioAlumnos, IRepositorio, IGestorMatriculas), no de implementaciones concretas.
+    El grafo de prerrequisitos debe ser la misma instancia que reciben GestorMatriculas y
+    GestorAsignaturas (ver FabricaGestores.crear_gestores)."""
     
-    def __init__(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio):
+    # Modos de eliminación de alumnos
+    RESTRINGIR = 'restringir'
+    DESVINCULAR = 'desvincular'
+    CASCADA = 'cascada'
+    
+    def __init__(self, repositorio_alumnos: IRepositorioAlumnos, repositorio_asignaturas: IRepositorio,
+                 matriculas: Optional[IGestorMatriculas] = None,
+                 buscador_publicaciones: Optional[BuscadorPublicaciones] = None,
+                 grafo_supervision: Optional[GrafoSupervision] = None,
+                 grafo_prerrequisitos: Optional[GrafoPrerrequisitos] = None,
+                 registro_notas: Optional[RegistroNotas] = None):
         self._repositorio_alumnos = repositorio_alumnos
         self._repositorio_asignaturas = repositorio_asignaturas
+        # GestorAsignaturas registra los prerrequisitos en este mismo grafo si se le inyecta
+        self._grafo_prerrequisitos = grafo_prerrequisitos if grafo_prerrequisitos is not None else GrafoPrerrequisitos()
+        # Las bajas de alumnos desmatriculan a través del servicio de matrículas
+        if matriculas is None:
+            matriculas = GestorMatriculas(repositorio_alumnos, repositorio_asignaturas,
+                                          grafo_prerrequisitos=self._grafo_prerrequisitos)
+        self._matriculas = matriculas
+        # Se crea y conecta al repositorio en la primera búsqueda si no se inyecta uno
+        self._buscador_publicaciones = buscador_publicaciones
+        self._registro_notas = registro_notas if registro_notas is not None else RegistroNotas()
+        if grafo_supervision is None:
+            grafo_supervision = GrafoSupervision()
+            grafo_supervision.reconstruir(repositorio_alumnos)
+        self._grafo_supervision = grafo_supervision
     
+    @trazado("gestor")
     def crear_estudiante_pregrado(self, id: str, nombre: str, apellido: str, email: str, carrera: str) -> bool:
         """Crea un nuevo estudiante de pregrado."""
         if self._repositorio_alumnos.existe_alumno(id):
@@ -25,6 +65,7 @@ class GestorAlumnos:
         estudiante = Estudiante(id, nombre, apellido, email, datetime.now(), carrera)
         return self._repositorio_alumnos.agregar(estudiante)
     
+    @trazado("gestor")
     def crear_estudiante_ayudante(self, id: str, nombre: str, apellido: str, email: str, carrera: str, asignaturas_ayudantia: List[str] = None) -> bool:
         """Crea un nuevo estudiante ayudante."""
         if self._repositorio_alumnos.existe_alumno(id):
@@ -33,6 +74,7 @@ class GestorAlumnos:
         ayudante = EstudianteAyudante(id, nombre, apellido, email, datetime.now(), carrera, asignaturas_ayudantia)
         return self._repositorio_alumnos.agregar(ayudante)
     
+    @trazado("gestor")
     def crear_estudiante_magister(self, id: str, nombre: str, apellido: str, email: str, carrera: str, tema_tesis: str) -> bool:
         """Crea un nuevo estudiante de magíster."""
         if self._repositorio_alumnos.existe_alumno(id):
@@ -41,6 +83,7 @@ class GestorAlumnos:
         magister = EstudianteMagister(id, nombre, apellido, email, datetime.now(), carrera, tema_tesis)
         return self._repositorio_alumnos.agregar(magister)
     
+    @trazado("gestor")
     def crear_estudiante_doctorado(self, id: str, nombre: str, apellido: str, email: str, carrera: str, tema_tesis: str, linea_investigacion: str) -> bool:
         """Crea un nuevo estudiante de doctorado."""
         if self._repositorio_alumnos.existe_alumno(id):
@@ -49,6 +92,7 @@ class GestorAlumnos:
         doctorado = EstudianteDoctorado(id, nombre, apellido, email, datetime.now(), carrera, tema_tesis, linea_investigacion)
         return self._repositorio_alumnos.agregar(doctorado)
     
+    @trazado("gestor")
     def crear_titulado(self, id: str, nombre: str, apellido: str, email: str, titulo: str, especialidad: str) -> bool:
         """Crea un nuevo titulado/profesor."""
         if self._repositorio_alumnos.existe_alumno(id):
@@ -57,79 +101,238 @@ class GestorAlumnos:
         titulado = Titulado(id, nombre, apellido, email, datetime.now(), titulo, especialidad)
         return self._repositorio_alumnos.agregar(titulado)
     
-    def matricular_alumno(self, alumno_id: str, asignatura_id: str) -> bool:
-        """Matricula un alumno en una asignatura."""
-        alumno = self._repositorio_alumnos.obtener_por_id(alumno_id)
+    @trazado("gestor")
+    def registrar_aprobacion(self, alumno_id: str, asignatura_id: str) -> bool:
+        """Registra que un alumno aprobó una asignatura (habilita las que la tienen como prerrequisito)."""
+        if not self._repositorio_alumnos.obtener_por_id(alumno_id) or not self._repositorio_asignaturas.obtener_por_id(asignatura_id):
+            return False
+        return self._grafo_prerrequisitos.registrar_aprobacion(alumno_id, asignatura_id)
+    
+    def obtener_asignaturas_aprobadas(self, alumno_id: str) -> List[str]:
+        """Obtiene las asignaturas aprobadas por un alumno."""
+        return self._grafo_prerrequisitos.obtener_aprobadas(alumno_id)
+    
+    def _actualizar_aprobacion(self, alumno_id: str, asignatura_id: str) -> None:
+        """La aprobación sigue a la mejor nota registrada del alumno en la asignatura."""
+        mejor = self._registro_notas.obtener_mejor_nota(alumno_id, asignatura_id)
+        if mejor is not None and mejor >= NOTA_APROBACION:
+            self._grafo_prerrequisitos.registrar_aprobacion(alumno_id, asignatura_id)
+        else:
+            self._grafo_prerrequisitos.anular_aprobacion(alumno_id, asignatura_id)
+    
+    @trazado("gestor")
+    def registrar_nota(self, alumno_id: str, asignatura_id: str, periodo: str, nota: float) -> bool:
+        """Registra (o corrige) la nota de un alumno en una asignatura y período.
+        Con nota de aprobación la asignatura cuenta como aprobada para los prerrequisitos."""
         asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
-        
-        if not alumno or not asignatura:
+        if not self._repositorio_alumnos.obtener_por_id(alumno_id) or not asignatura:
             return False
-        
-        # Matricular en ambos lados
-        exito_alumno = alumno.matricular_asignatura(asignatura_id)
-        exito_asignatura = asignatura.agregar_estudiante(alumno_id)
-        
-        if exito_alumno and exito_asignatura:
-            # Actualizar en los repositorios
-            self._repositorio_alumnos.actualizar(alumno_id, alumno)
-            self._repositorio_asignaturas.actualizar(asignatura_id, asignatura)
-            return True
-        
-        return False
+        self._registro_notas.registrar(alumno_id, asignatura_id, periodo, nota, asignatura.creditos)
+        self._actualizar_aprobacion(alumno_id, asignatura_id)
+        return True
     
-    def desmatricular_alumno(self, alumno_id: str, asignatura_id: str) -> bool:
-        """Desmatricula un alumno de una asignatura."""
+    @trazado("gestor")
+    def registrar_notas_lote(self, notas: List[Tuple[str, str, str, float]]) -> int:
+        """Registra un lote de notas (alumno_id, asignatura_id, periodo, nota) y retorna cuántas se guardaron.
+        Omite las de alumnos o asignaturas inexistentes; una nota fuera de escala lanza ValueError sin guardar nada."""
+        creditos = {}
+        validas = []
+        for alumno_id, asignatura_id, periodo, nota in notas:
+            if asignatura_id not in creditos:
+                asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
+                creditos[asignatura_id] = asignatura.creditos if asignatura else None
+            if creditos[asignatura_id] is not None and self._repositorio_alumnos.existe_alumno(alumno_id):
+                validas.append((alumno_id, asignatura_id, periodo, nota))
+        guardadas = self._registro_notas.registrar_lote(validas, creditos)
+        for alumno_id, asignatura_id in dict.fromkeys((alumno_id, asignatura_id) for alumno_id, asignatura_id, _, _ in validas):
+            self._actualizar_aprobacion(alumno_id, asignatura_id)
+        return guardadas
+    
+    def obtener_notas(self, alumno_id: str) -> List[Dict[str, Any]]:
+        """Obtiene las notas de un alumno por período y asignatura."""
+        return self._registro_notas.obtener_notas(alumno_id)
+    
+    def obtener_promedio(self, alumno_id: str) -> Dict[str, Any]:
+        """Obtiene el promedio ponderado por créditos de un alumno y los créditos en que se basa."""
+        return {
+            'alumno_id': alumno_id,
+            'promedio': self._registro_notas.obtener_promedio(alumno_id),
+            'creditos': self._registro_notas.obtener_creditos_calificados(alumno_id)
+        }
+    
+    def obtener_distribucion_notas(self, asignatura_id: str) -> Dict[str, Any]:
+        """Obtiene la distribución de notas de una asignatura."""
+        return self._registro_notas.obtener_distribucion(asignatura_id)
+    
+    @trazado("gestor")
+    def auditar_promedios(self) -> List[Dict[str, Any]]:
+        """Recalcula promedios y distribuciones desde las notas y retorna las diferencias con los mantenidos."""
+        return self._registro_notas.auditar()
+    
+    @trazado("gestor")
+    def recalcular_promedios(self) -> int:
+        """Repondera todas las notas con los créditos actuales de las asignaturas (ej. tras modificarlos).
+        Retorna cuántas notas cambiaron de créditos."""
+        creditos = {asignatura.id: asignatura.creditos for asignatura in self._repositorio_asignaturas.obtener_todos()}
+        return self._registro_notas.recalcular(creditos)
+    
+    @trazado("gestor")
+    def publicar_articulo(self, alumno_id: str, titulo: str, contenido: str) -> bool:
+        """Publica un artículo de un investigador y lo deja disponible para la búsqueda."""
         alumno = self._repositorio_alumnos.obtener_por_id(alumno_id)
-        asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
-        
-        if not alumno or not asignatura:
+        if not isinstance(alumno, IInvestiga):
+            return False
+        if not alumno.publicar_articulo(titulo, contenido):
+            return False
+        # La actualización notifica al buscador, que indexa solo el artículo nuevo
+        return self._repositorio_alumnos.actualizar(alumno_id, alumno)
+    
+    @trazado("gestor")
+    def buscar_publicaciones(self, consulta: str, k: int = 10, tipo: Optional[str] = None,
+                             especialidad: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Busca artículos de todos los investigadores, ordenados por relevancia (BM25)."""
+        if self._buscador_publicaciones is None:
+            self._buscador_publicaciones = BuscadorPublicaciones()
+            self._buscador_publicaciones.conectar_repositorio(self._repositorio_alumnos)
+        return self._buscador_publicaciones.buscar(consulta, k, tipo, especialidad)
+    
+    @trazado("gestor")
+    def asignar_director_tesis(self, director_id: str, estudiante_id: str, tema: str = "") -> bool:
+        """Registra que un doctorando o titulado dirige la tesis de un estudiante."""
+        director = self._repositorio_alumnos.obtener_por_id(director_id)
+        estudiante = self._repositorio_alumnos.obtener_por_id(estudiante_id)
+        # Solo doctorandos y titulados pueden dirigir tesis
+        if not isinstance(director, (EstudianteDoctorado, Titulado)) or estudiante is None:
+            return False
+        if not self._grafo_supervision.agregar(director_id, estudiante_id, tema):
             return False
         
-        # Desmatricular en ambos lados
-        exito_alumno = alumno.desmatricular_asignatura(asignatura_id)
-        exito_asignatura = asignatura.remover_estudiante(alumno_id)
-        
-        if exito_alumno and exito_asignatura:
-            # Actualizar en los repositorios
-            self._repositorio_alumnos.actualizar(alumno_id, alumno)
-            self._repositorio_asignaturas.actualizar(asignatura_id, asignatura)
-            return True
-        
-        return False
+        director.dirigir_tesis(estudiante_id, tema)
+        self._repositorio_alumnos.actualizar(director_id, director)
+        if isinstance(estudiante, EstudianteMagister) and not estudiante.director_tesis:
+            estudiante.asignar_director_tesis(director_id)
+            self._repositorio_alumnos.actualizar(estudiante_id, estudiante)
+        return True
+    
+    @trazado("gestor")
+    def obtener_directores_tesis(self, estudiante_id: str) -> List[str]:
+        """Obtiene quién dirige la tesis de un estudiante."""
+        return self._grafo_supervision.obtener_directores(estudiante_id)
+    
+    @trazado("gestor")
+    def obtener_linaje_academico(self, persona_id: str, profundidad: Optional[int] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """Obtiene ancestros (directores) y descendientes (tesistas) hasta la profundidad indicada."""
+        return {
+            'ancestros': self._grafo_supervision.ancestros(persona_id, profundidad),
+            'descendientes': self._grafo_supervision.descendientes(persona_id, profundidad)
+        }
+    
+    @trazado("gestor")
+    def obtener_carga_supervision(self, director_id: str) -> Dict[str, Any]:
+        """Obtiene la cantidad de tesis que dirige una persona y sus tesistas."""
+        dirigidos = self._grafo_supervision.obtener_dirigidos(director_id)
+        return {'director_id': director_id, 'total_tesis': len(dirigidos), 'tesistas': dirigidos}
     
+    @trazado("gestor")
     def obtener_alumno(self, id: str) -> Optional[Alumno]:
         """Obtiene un alumno por su ID."""
         return self._repositorio_alumnos.obtener_por_id(id)
     
+    @trazado("gestor")
     def listar_todos_alumnos(self) -> List[Alumno]:
         """Lista todos los alumnos."""
         return self._repositorio_alumnos.obtener_todos()
     
+    @trazado("gestor")
     def buscar_alumnos(self, criterio: dict) -> List[Alumno]:
         """Busca alumnos según criterios específicos."""
         return self._repositorio_alumnos.buscar(criterio)
     
-    def obtener_estadisticas(self) -> Dict[str, Any]:
-        """Obtiene estadísticas generales de alumnos."""
-        alumnos = self._repositorio_alumnos.obtener_todos()
+    @trazado("gestor")
+    def listar_por_tipo(self, tipo: str) -> List[Alumno]:
+        """Lista los alumnos de un tipo específico (ej. 'Estudiante Doctorado')."""
+        return self._repositorio_alumnos.listar_por_tipo(tipo)
+    
+    @trazado("gestor")
+    def listar_por_capacidad(self, capacidad: type) -> List[Alumno]:
+        """Lista los alumnos que implementan una capacidad (IEstudia, IHaceClases, IInvestiga)."""
+        return self._repositorio_alumnos.listar_por_capacidad(capacidad)
+    
+    def _tiene_referencias(self, alumno: Alumno) -> bool:
+        """Indica si el alumno tiene matrículas, esperas o asignaturas a su cargo."""
+        if alumno.asignaturas_matriculadas or self._matriculas.tiene_esperas(alumno.id):
+            return True
+        return bool(self._repositorio_asignaturas.buscar_por_profesor(alumno.id))
+    
+    def _olvidar_alumno(self, alumno_id: str) -> None:
+        """Descarta el estado derivado de un alumno eliminado."""
+        self._matriculas.olvidar_alumno(alumno_id)
+        self._grafo_supervision.eliminar_persona(alumno_id)
+        self._grafo_prerrequisitos.eliminar_alumno(alumno_id)
+        self._registro_notas.eliminar_alumno(alumno_id)
+    
+    def _desvincular_supervision(self, uow: UnidadDeTrabajo, persona_id: str, omitir=()) -> None:
+        """Quita de los modelos que permanecen (salvo los de omitir) las direcciones de tesis con una
+        persona que se elimina; si no, GrafoSupervision.reconstruir volvería a crear esas relaciones."""
+        for director_id in self._grafo_supervision.obtener_directores(persona_id):
+            director = None if director_id in omitir else uow.obtener(self._repositorio_alumnos, director_id)
+            if isinstance(director, (EstudianteDoctorado, Titulado)) and director.dejar_de_dirigir(persona_id):
+                uow.registrar_modificacion(self._repositorio_alumnos, director)
+        for estudiante_id in self._grafo_supervision.obtener_dirigidos(persona_id):
+            estudiante = None if estudiante_id in omitir else uow.obtener(self._repositorio_alumnos, estudiante_id)
+            if isinstance(estudiante, EstudianteMagister) and estudiante.director_tesis == persona_id:
+                estudiante.asignar_director_tesis("")
+                uow.registrar_modificacion(self._repositorio_alumnos, estudiante)
+    
+    @trazado("gestor")
+    def retirar_alumnos(self, ids: List[str], modo: str = DESVINCULAR) -> int:
+        """Elimina un conjunto de alumnos (ej. egreso o retiro masivo) según el modo:
+        RESTRINGIR omite a quienes aún tienen matrículas, esperas o asignaturas a su cargo;
+        DESVINCULAR quita esas referencias (sus asignaturas quedan sin profesor);
+        CASCADA además elimina las asignaturas que dictan.
+        Confirma todo en una sola transacción con los locks de las entidades que modifica.
+        Retorna la cantidad de alumnos eliminados."""
+        if modo not in (self.RESTRINGIR, self.DESVINCULAR, self.CASCADA):
+            raise ValueError(f"Modo de eliminación desconocido: {modo}")
         
-        stats = {
-            'total_alumnos': len(alumnos),
-            'tipos_estudiantes': {},
-            'total_matriculas': 0
-        }
+        salientes: Dict[str, Alumno] = {}
+        for alumno_id in ids:
+            alumno = self._repositorio_alumnos.obtener_por_id(alumno_id)
+            if alumno is None or alumno_id in salientes:
+                continue
+            if modo == self.RESTRINGIR and self._tiene_referencias(alumno):
+                continue
+            salientes[alumno_id] = alumno
+        if not salientes:
+            return 0
         
-        for alumno in alumnos:
-            # Contar por tipo
-            if hasattr(alumno, 'obtener_tipo_estudiante'):
-                tipo = alumno.obtener_tipo_estudiante()
-                stats['tipos_estudiantes'][tipo] = stats['tipos_estudiantes'].get(tipo, 0) + 1
-            
-            # Contar matrículas
-            stats['total_matriculas'] += len(alumno.asignaturas_matriculadas)
+        dictadas: Dict[str, Asignatura] = {}
+        for alumno in salientes.values():
+            for asignatura in self._repositorio_asignaturas.buscar_por_profesor(alumno.id):
+                dictadas[asignatura.id] = asignatura
         
-        return stats
+        with self._matriculas.transaccion() as uow:
+            # En CASCADA no se promueve en las asignaturas que se eliminan junto con sus profesores
+            self._matriculas.desvincular_alumnos(uow, salientes, dictadas.keys() if modo == self.CASCADA else ())
+            
+            for asignatura in dictadas.values():
+                if modo == self.CASCADA:
+                    self._matriculas.desvincular_asignatura(uow, asignatura, salientes)
+                else:
+                    asignatura = uow.obtener(self._repositorio_asignaturas, asignatura.id)
+                    asignatura.asignar_profesor(None)
+                    uow.registrar_modificacion(self._repositorio_asignaturas, asignatura)
+            
+            for alumno_id in salientes:
+                self._desvincular_supervision(uow, alumno_id, salientes)
+                uow.registrar_eliminacion(self._repositorio_alumnos, alumno_id)
+                uow.al_confirmar(lambda alumno_id=alumno_id: self._olvidar_alumno(alumno_id))
+            if not uow.confirmar():
+                return 0
+        return len(salientes)
     
-    def eliminar_alumno(self, id: str) -> bool:
-        """Elimina un alumno del sistema."""
-        return self._repositorio_alumnos.eliminar(id)
\ No newline at end of file
+    @trazado("gestor")
+    def eliminar_alumno(self, id: str, modo: str = DESVINCULAR) -> bool:
+        """Elimina un alumno del sistema sin dejar su ID en asignaturas ni listas de espera
+        (ver retirar_alumnos para los modos RESTRINGIR, DESVINCULAR y CASCADA)."""
+        return self.retirar_alumnos([id], modo) == 1
\ No newline at end of file
@@ -1,72 +1,175 @@
-from typing import List, Optional, Dict, Any
+from contextlib import ExitStack
+from typing import List, Optional, Dict, Any, Tuple
 from interfaces.IRepositorio import IRepositorio
 from models.Asignatura import Asignatura
+from models.BloqueHorario import BloqueHorario
+from interfaces.IDesvinculadorAsignaturas import IDesvinculadorAsignaturas
+from services.MatrizCoMatricula import MatrizCoMatricula
+from services.ControlCupos import ControlCupos
+from services.ControlHorarios import ControlHorarios
+from services.ControlCreditos import ControlCreditos
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+from utils.Trazador import trazado
 
 class GestorAsignaturas:
     """Servicio para gestionar asignaturas.
     Principio SRP: Se encarga únicamente de la lógica de negocio de asignaturas.
-    Principio DIP: Depende de abstracciones (IRepositorio), no de implementaciones concretas."""
+    Principio DIP: Depende de abstracciones (IRepositorio, IDesvinculadorAsignaturas), no de implementaciones concretas.
+    El estado que se consulta al matricular (cupos, créditos, horarios y prerrequisitos) debe inyectarse
+    con las mismas instancias que usa GestorMatriculas; si no se inyecta, se crea uno propio."""
     
-    def __init__(self, repositorio_asignaturas: IRepositorio, repositorio_alumnos: IRepositorio):
+    # Modos de eliminación de asignaturas
+    RESTRINGIR = 'restringir'
+    DESVINCULAR = 'desvincular'
+    CASCADA = 'cascada'
+    
+    def __init__(self, repositorio_asignaturas: IRepositorio, repositorio_alumnos: IRepositorio,
+                 matriz_co_matricula: Optional[MatrizCoMatricula] = None,
+                 control_cupos: Optional[ControlCupos] = None,
+                 control_horarios: Optional[ControlHorarios] = None,
+                 control_creditos: Optional[ControlCreditos] = None,
+                 grafo_prerrequisitos: Optional[GrafoPrerrequisitos] = None,
+                 desvinculador: Optional[IDesvinculadorAsignaturas] = None):
         self._repositorio_asignaturas = repositorio_asignaturas
         self._repositorio_alumnos = repositorio_alumnos
+        # Se construye y conecta al repositorio de alumnos en la primera consulta si no se inyecta
+        self._matriz_co_matricula = matriz_co_matricula
+        self._control_cupos = control_cupos if control_cupos is not None else ControlCupos()
+        if control_horarios is None:
+            control_horarios = ControlHorarios()
+            control_horarios.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+        self._control_horarios = control_horarios
+        if control_creditos is None:
+            control_creditos = ControlCreditos()
+            control_creditos.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+        self._control_creditos = control_creditos
+        self._grafo_prerrequisitos = grafo_prerrequisitos if grafo_prerrequisitos is not None else GrafoPrerrequisitos()
+        # Dueño de las matrículas: sin él solo se eliminan asignaturas sin alumnos vinculados
+        self._desvinculador = desvinculador
     
-    def crear_asignatura(self, id: str, nombre: str, creditos: int, semestre: int, profesor_id: str) -> bool:
-        """Crea una nueva asignatura."""
+    @trazado("gestor")
+    def crear_asignatura(self, id: str, nombre: str, creditos: int, semestre: int, profesor_id: str, cupo: Optional[int] = None) -> bool:
+        """Crea una nueva asignatura (cupo None = sin límite de estudiantes)."""
         if self._repositorio_asignaturas.existe_asignatura(id):
             return False
         
         # Validaciones de negocio
-        if creditos <= 0 or creditos > 12:
+        if not self._es_entero(creditos) or creditos <= 0 or creditos > 12:
+            return False
+        
+        if not self._es_entero(semestre) or semestre < 1 or semestre > 10:
             return False
         
-        if semestre < 1 or semestre > 10:
+        if cupo is not None and cupo <= 0:
             return False
         
-        asignatura = Asignatura(id, nombre, creditos, semestre, profesor_id)
+        asignatura = Asignatura(id, nombre, creditos, semestre, profesor_id, cupo)
         return self._repositorio_asignaturas.agregar(asignatura)
     
+    @staticmethod
+    def _es_entero(valor: Any) -> bool:
+        """Créditos y semestre deben ser enteros (bool no cuenta, aunque herede de int)."""
+        return isinstance(valor, int) and not isinstance(valor, bool)
+    
+    @trazado("gestor")
     def obtener_asignatura(self, id: str) -> Optional[Asignatura]:
         """Obtiene una asignatura por su ID."""
         return self._repositorio_asignaturas.obtener_por_id(id)
     
+    @trazado("gestor")
     def listar_todas_asignaturas(self) -> List[Asignatura]:
         """Lista todas las asignaturas."""
         return self._repositorio_asignaturas.obtener_todos()
     
+    @trazado("gestor")
     def listar_asignaturas_por_semestre(self, semestre: int) -> List[Asignatura]:
         """Lista asignaturas de un semestre específico."""
         return self._repositorio_asignaturas.buscar_por_semestre(semestre)
     
+    @trazado("gestor")
     def listar_asignaturas_por_profesor(self, profesor_id: str) -> List[Asignatura]:
         """Lista asignaturas de un profesor específico."""
         return self._repositorio_asignaturas.buscar_por_profesor(profesor_id)
     
+    @trazado("gestor")
     def buscar_asignaturas(self, criterio: dict) -> List[Asignatura]:
         """Busca asignaturas según criterios específicos."""
         return self._repositorio_asignaturas.buscar(criterio)
     
+    @trazado("gestor")
     def actualizar_asignatura(self, id: str, nombre: str = None, creditos: int = None, semestre: int = None, profesor_id: str = None) -> bool:
-        """Actualiza los datos de una asignatura."""
-        asignatura = self._repositorio_asignaturas.obtener_por_id(id)
-        if not asignatura:
+        """Actualiza los datos de una asignatura (solo los campos indicados)."""
+        cambios = {campo: valor for campo, valor in
+                   (('nombre', nombre), ('creditos', creditos), ('semestre', semestre), ('profesor_id', profesor_id))
+                   if valor is not None}
+        return self.modificar_asignatura(id, cambios)
+    
+    @trazado("gestor")
+    def modificar_asignatura(self, id: str, cambios: Dict[str, Any]) -> bool:
+        """Aplica un parche a la asignatura, modificándola en su lugar.
+        Conserva matrículas, lista de espera, horario y fecha de creación, y solo actualiza
+        los índices y la carga de créditos si el campo correspondiente cambió.
+        Se aplica con el lock de la asignatura, igual que una matrícula, para que la carga de
+        créditos se ajuste sobre los matriculados que efectivamente tiene."""
+        # Validaciones de negocio (las mismas que al crear)
+        if 'creditos' in cambios and (not self._es_entero(cambios['creditos'])
+                                      or cambios['creditos'] <= 0 or cambios['creditos'] > 12):
             return False
         
-        # Crear nueva instancia con datos actualizados
-        nueva_asignatura = Asignatura(
-            id,
-            nombre if nombre is not None else asignatura.nombre,
-            creditos if creditos is not None else asignatura.creditos,
-            semestre if semestre is not None else asignatura.semestre,
-            profesor_id if profesor_id is not None else asignatura.profesor_id
-        )
+        if 'semestre' in cambios and (not self._es_entero(cambios['semestre'])
+                                      or cambios['semestre'] < 1 or cambios['semestre'] > 10):
+            return False
         
-        # Mantener los estudiantes matriculados
-        for estudiante_id in asignatura.estudiantes_matriculados:
-            nueva_asignatura.agregar_estudiante(estudiante_id)
+        with self._control_cupos.bloqueo(id):
+            asignatura = self._repositorio_asignaturas.obtener_por_id(id)
+            if not asignatura:
+                return False
+            
+            try:
+                anteriores = asignatura.aplicar_cambios(cambios)
+            except ValueError:
+                return False
+            if not anteriores:
+                return True
+            
+            if 'creditos' in anteriores:
+                self._control_creditos.ajustar_asignatura(asignatura.estudiantes_matriculados,
+                                                          asignatura.creditos - anteriores['creditos'])
+            
+            # El repositorio reindexa por profesor solo si profesor_id cambió
+            return self._repositorio_asignaturas.actualizar(id, asignatura)
+    
+    @trazado("gestor")
+    def establecer_cupo(self, id: str, cupo: Optional[int]) -> bool:
+        """Cambia el cupo de una asignatura (no puede quedar bajo los matriculados actuales)."""
+        with self._control_cupos.bloqueo(id):
+            asignatura = self._repositorio_asignaturas.obtener_por_id(id)
+            if not asignatura or (cupo is not None and cupo <= 0):
+                return False
+            if not asignatura.establecer_cupo(cupo):
+                return False
+            return self._repositorio_asignaturas.actualizar(id, asignatura)
+    
+    @trazado("gestor")
+    def agregar_bloque_horario(self, id: str, dia: int, inicio: str, fin: str) -> bool:
+        """Agrega un bloque semanal (día 0=lunes, horas 'HH:MM') al horario de una asignatura."""
+        try:
+            bloque = BloqueHorario(dia, inicio, fin)
+        except ValueError:
+            return False
         
-        return self._repositorio_asignaturas.actualizar(id, nueva_asignatura)
+        with self._control_cupos.bloqueo(id):
+            asignatura = self._repositorio_asignaturas.obtener_por_id(id)
+            if not asignatura:
+                return False
+            
+            if not asignatura.agregar_bloque_horario(bloque):
+                return False
+            
+            self._control_horarios.actualizar_asignatura(asignatura)
+            return self._repositorio_asignaturas.actualizar(id, asignatura)
     
+    @trazado("gestor")
     def obtener_estudiantes_asignatura(self, asignatura_id: str) -> List[str]:
         """Obtiene la lista de estudiantes matriculados en una asignatura."""
         asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
@@ -74,6 +177,51 @@ class GestorAsignaturas:
             return asignatura.estudiantes_matriculados
         return []
     
+    @trazado("gestor")
+    def agregar_prerrequisito(self, asignatura_id: str, prerrequisito_id: str) -> bool:
+        """Registra que para matricular asignatura_id hay que haber aprobado prerrequisito_id.
+        Rechaza asignaturas inexistentes, duplicados y prerrequisitos que formarían un ciclo.
+        Retiene los locks de ambas asignaturas para que ninguna se elimine entre la verificación y el registro."""
+        with self._bloquear_asignaturas(asignatura_id, prerrequisito_id):
+            if not self._repositorio_asignaturas.obtener_por_id(asignatura_id) or not self._repositorio_asignaturas.obtener_por_id(prerrequisito_id):
+                return False
+            return self._grafo_prerrequisitos.agregar_prerrequisito(asignatura_id, prerrequisito_id)
+    
+    def _bloquear_asignaturas(self, *ids: str) -> ExitStack:
+        """Toma los locks de varias asignaturas sin duplicados y en el mismo orden que UnidadDeTrabajo al confirmar."""
+        locks = {id(bloqueo): bloqueo for bloqueo in map(self._control_cupos.bloqueo, ids)}
+        pila = ExitStack()
+        for clave in sorted(locks):
+            pila.enter_context(locks[clave])
+        return pila
+    
+    @trazado("gestor")
+    def quitar_prerrequisito(self, asignatura_id: str, prerrequisito_id: str) -> bool:
+        """Quita un prerrequisito directo de una asignatura."""
+        return self._grafo_prerrequisitos.quitar_prerrequisito(asignatura_id, prerrequisito_id)
+    
+    def obtener_prerrequisitos(self, asignatura_id: str, transitivos: bool = False) -> List[str]:
+        """Obtiene los prerrequisitos directos de una asignatura o, con transitivos, toda la cadena."""
+        return self._grafo_prerrequisitos.obtener_prerrequisitos(asignatura_id, transitivos)
+    
+    def _obtener_matriz_co_matricula(self) -> MatrizCoMatricula:
+        if self._matriz_co_matricula is None:
+            self._matriz_co_matricula = MatrizCoMatricula()
+            self._matriz_co_matricula.conectar_repositorio(self._repositorio_alumnos)
+        return self._matriz_co_matricula
+    
+    @trazado("gestor")
+    def obtener_pares_mas_compartidos(self, k: int = 10) -> List[Dict[str, Any]]:
+        """Obtiene los k pares de asignaturas con más alumnos en común (conviene no hacerlas coincidir en horario)."""
+        return [{'asignaturas': (asignatura_id, otra_id), 'alumnos_en_comun': cantidad}
+                for asignatura_id, otra_id, cantidad in self._obtener_matriz_co_matricula().obtener_pares_principales(k)]
+    
+    @trazado("gestor")
+    def obtener_asignaturas_relacionadas(self, asignatura_id: str, k: int = 10) -> List[Tuple[str, int]]:
+        """Obtiene las k asignaturas que más alumnos comparten con la indicada."""
+        return self._obtener_matriz_co_matricula().obtener_asignaturas_relacionadas(asignatura_id, k)
+    
+    @trazado("gestor")
     def obtener_carga_profesor(self, profesor_id: str) -> Dict[str, Any]:
         """Obtiene la carga académica de un profesor."""
         asignaturas = self._repositorio_asignaturas.buscar_por_profesor(profesor_id)
@@ -89,6 +237,7 @@ class GestorAsignaturas:
             'asignaturas': [asig.obtener_info_completa() for asig in asignaturas]
         }
     
+    @trazado("gestor")
     def obtener_estadisticas_semestre(self, semestre: int) -> Dict[str, Any]:
         """Obtiene estadísticas de un semestre específico."""
         asignaturas = self._repositorio_asignaturas.buscar_por_semestre(semestre)
@@ -112,6 +261,7 @@ class GestorAsignaturas:
             'asignaturas': [asig.nombre for asig in asignaturas]
         }
     
+    @trazado("gestor")
     def obtener_estadisticas_generales(self) -> Dict[str, Any]:
         """Obtiene estadísticas generales del sistema de asignaturas."""
         asignaturas = self._repositorio_asignaturas.obtener_todos()
@@ -141,11 +291,36 @@ class GestorAsignaturas:
             'estadisticas_por_semestre': semestres
         }
     
-    def eliminar_asignatura(self, id: str) -> bool:
-        """Elimina una asignatura del sistema."""
-        # Verificar si hay estudiantes matriculados
-        asignatura = self._repositorio_asignaturas.obtener_por_id(id)
-        if asignatura and len(asignatura.estudiantes_matriculados) > 0:
-            return False  # No se puede eliminar si hay estudiantes matriculados
+    @trazado("gestor")
+    def eliminar_asignatura(self, id: str, modo: str = RESTRINGIR) -> bool:
+        """Elimina una asignatura del sistema según el modo:
+        RESTRINGIR no elimina si hay estudiantes matriculados o asignaturas que la tienen como prerrequisito;
+        DESVINCULAR y CASCADA desmatriculan primero a sus estudiantes (los alumnos no dependen
+        de la asignatura, por lo que la cascada no elimina alumnos).
+        Sin desvinculador, ningún modo elimina una asignatura con matriculados o lista de espera."""
+        if modo not in (self.RESTRINGIR, self.DESVINCULAR, self.CASCADA):
+            raise ValueError(f"Modo de eliminación desconocido: {modo}")
         
-        return self._repositorio_asignaturas.eliminar(id)
\ No newline at end of file
+        # El lock de la asignatura se retiene desde la verificación hasta confirmar, para que
+        # nadie se matricule ni la agregue como prerrequisito entre medio
+        with self._control_cupos.bloqueo(id):
+            asignatura = self._repositorio_asignaturas.obtener_por_id(id)
+            if not asignatura:
+                return False
+            # Verificar si hay estudiantes matriculados o asignaturas que dependen de ella
+            if modo == self.RESTRINGIR and (len(asignatura.estudiantes_matriculados) > 0
+                                            or self._grafo_prerrequisitos.obtener_dependientes(id)):
+                return False
+            
+            if self._desvinculador is None:
+                if asignatura.estudiantes_matriculados or asignatura.lista_espera:
+                    return False
+                if not self._repositorio_asignaturas.eliminar(id):
+                    return False
+                self._grafo_prerrequisitos.eliminar_asignatura(id)
+                return True
+            
+            # Las bajas, esperas y estado derivado los resuelve el dueño de las matrículas
+            with self._desvinculador.transaccion() as uow:
+                self._desvinculador.desvincular_asignatura(uow, asignatura)
+                return uow.confirmar()
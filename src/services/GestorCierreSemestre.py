@@ -0,0 +1,108 @@
+from typing import List, Optional, Dict, Any, Tuple, Callable, Iterator
+from datetime import datetime
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IGestorCierreSemestre import IGestorCierreSemestre
+from interfaces.IGestorMatriculas import IGestorMatriculas
+from models.TiposEstudiante.Estudiante import Estudiante
+from services.FlujoCambios import FlujoCambios
+from services.HistorialSemestres import HistorialSemestres
+from services.HistorialMatriculas import HistorialMatriculas
+from utils.Trazador import trazado
+
+class GestorCierreSemestre(IGestorCierreSemestre):
+    """Servicio para cerrar el período académico y consultar los períodos pasados.
+    Principio SRP: Se encarga únicamente del cambio de período y del historial de matrículas.
+    Principio DIP: Depende de IGestorMatriculas para descartar el estado de matrícula del período cerrado."""
+    
+    def __init__(self, repositorio_alumnos: IRepositorioAlumnos, repositorio_asignaturas: IRepositorio,
+                 matriculas: IGestorMatriculas, flujo_cambios: Optional[FlujoCambios] = None,
+                 historial_semestres: Optional[HistorialSemestres] = None,
+                 historial_matriculas: Optional[HistorialMatriculas] = None):
+        self._repositorio_alumnos = repositorio_alumnos
+        self._repositorio_asignaturas = repositorio_asignaturas
+        self._matriculas = matriculas
+        self._flujo_cambios = flujo_cambios
+        self._historial_semestres = historial_semestres if historial_semestres is not None else HistorialSemestres()
+        # A diferencia de los índices perezosos, debe conectarse ya: solo registra los cambios que observa
+        if historial_matriculas is None:
+            historial_matriculas = HistorialMatriculas()
+            historial_matriculas.conectar(repositorio_alumnos, repositorio_asignaturas)
+        self._historial_matriculas = historial_matriculas
+    
+    @trazado("gestor")
+    def cerrar_semestre(self, periodo: str, progreso: Optional[Callable[[int, int], None]] = None,
+                        tamano_lote: int = 10000) -> Dict[str, int]:
+        """Cierra el período académico: avanza el semestre de todos los estudiantes, archiva sus
+        matrículas en el historial bajo 'periodo' y deja vacías las matrículas de alumnos y
+        asignaturas (incluidas las listas de espera).
+        Recorre a los alumnos una sola vez, confirmando cada lote con aplicar_lote, y llama a
+        progreso(procesados, total) tras cada lote. No es transaccional, pero retiene todas las
+        matrículas mientras dura (pausar_matriculas): las solicitudes concurrentes esperan y se
+        aplican sobre el período nuevo, y las transacciones abiertas antes del cierre se rechazan.
+        Los repositorios notifican cada alumno y asignatura guardados, como en cualquier otra
+        actualización, para que sus observadores (índices, caché, réplica, flujo de cambios)
+        sigan coherentes; al final se publica además un evento 'periodo' con el resumen."""
+        with self._matriculas.pausar_matriculas():
+            # Bajo la pausa: dos cierres concurrentes del mismo período no pueden pasar ambos
+            if periodo in self._historial_semestres.obtener_periodos():
+                raise ValueError(f"El período ya fue cerrado: {periodo}")
+            alumnos = self._repositorio_alumnos.obtener_todos()
+            resumen = {'alumnos': len(alumnos), 'semestres_avanzados': 0, 'matriculas_archivadas': 0, 'asignaturas': 0}
+            
+            def vaciar_por_lotes() -> Iterator[Tuple[str, List[str]]]:
+                for inicio in range(0, len(alumnos), tamano_lote):
+                    lote = alumnos[inicio:inicio + tamano_lote]
+                    for alumno in lote:
+                        if isinstance(alumno, Estudiante):
+                            alumno.avanzar_semestre()
+                            resumen['semestres_avanzados'] += 1
+                        asignaturas = alumno.vaciar_matriculas()
+                        if asignaturas:
+                            yield alumno.id, asignaturas
+                    self._guardar_lote(self._repositorio_alumnos, lote)
+                    if progreso is not None:
+                        progreso(inicio + len(lote), len(alumnos))
+            
+            resumen['matriculas_archivadas'] = self._historial_semestres.archivar_periodo(periodo, vaciar_por_lotes())
+            
+            asignaturas = self._repositorio_asignaturas.obtener_todos()
+            for asignatura in asignaturas:
+                asignatura.vaciar_estudiantes()
+            self._guardar_lote(self._repositorio_asignaturas, asignaturas)
+            resumen['asignaturas'] = len(asignaturas)
+            
+            self._matriculas.reiniciar_periodo()
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.publicar('periodo', 'cerrar', periodo, dict(resumen))
+        return resumen
+    
+    @staticmethod
+    def _guardar_lote(repositorio: IRepositorio, entidades: List[Any]) -> None:
+        """Guarda entidades modificadas en un solo lote si el repositorio lo permite."""
+        aplicar_lote = getattr(repositorio, 'aplicar_lote', None)
+        if aplicar_lote is not None:
+            aplicar_lote([('actualizar', entidad.id, entidad) for entidad in entidades])
+        else:
+            for entidad in entidades:
+                repositorio.actualizar(entidad.id, entidad)
+    
+    @trazado("gestor")
+    def obtener_historial_matriculas(self, alumno_id: str) -> Dict[str, List[str]]:
+        """Obtiene las asignaturas cursadas por el alumno en cada período cerrado."""
+        return self._historial_semestres.obtener_trayectoria(alumno_id)
+    
+    @trazado("gestor")
+    def obtener_nomina_en(self, asignatura_id: str, fecha: datetime) -> List[str]:
+        """Obtiene los alumnos que estaban matriculados en la asignatura en una fecha pasada."""
+        return self._historial_matriculas.obtener_nomina(asignatura_id, fecha)
+    
+    @trazado("gestor")
+    def obtener_matriculas_en(self, alumno_id: str, fecha: datetime) -> List[str]:
+        """Obtiene las asignaturas en que estaba matriculado el alumno en una fecha pasada."""
+        return self._historial_matriculas.obtener_matriculas(alumno_id, fecha)
+    
+    @trazado("gestor")
+    def obtener_linea_tiempo_matriculas(self, alumno_id: str) -> List[Dict[str, Any]]:
+        """Obtiene los tramos de matrícula del alumno (asignatura, desde, hasta), incluidos los ya cerrados."""
+        return self._historial_matriculas.obtener_linea_tiempo(alumno_id)
\ No newline at end of file
@@ -0,0 +1,410 @@
+from contextlib import ExitStack
+from typing import List, Optional, Dict, Any, Tuple, Set, Iterable, Callable
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IEstudiante import IEstudiante
+from interfaces.IGestorMatriculas import IGestorMatriculas
+from models.Alumno import Alumno
+from models.Asignatura import Asignatura
+from services.FlujoCambios import FlujoCambios
+from services.ControlCupos import ControlCupos
+from services.ControlHorarios import ControlHorarios
+from services.ControlCreditos import ControlCreditos
+from services.UnidadDeTrabajo import UnidadDeTrabajo
+from services.IndiceMatriculas import IndiceMatriculas
+from services.GrafoPrerrequisitos import GrafoPrerrequisitos
+from utils.Trazador import trazado
+
+class GestorMatriculas(IGestorMatriculas):
+    """Servicio para gestionar las matrículas del período en curso.
+    Principio SRP: Se encarga únicamente de matricular, desmatricular y las listas de espera,
+    y del estado derivado de las matrículas (cupos, horarios y créditos).
+    Principio DIP: Depende de abstracciones (IRepositorioAlumnos, IRepositorio), no de implementaciones concretas.
+    Los controles de cupos, horarios, créditos y prerrequisitos deben ser las mismas instancias que
+    recibe GestorAsignaturas (ver FabricaGestores.crear_gestores)."""
+    
+    def __init__(self, repositorio_alumnos: IRepositorioAlumnos, repositorio_asignaturas: IRepositorio,
+                 flujo_cambios: Optional[FlujoCambios] = None, control_cupos: Optional[ControlCupos] = None,
+                 control_horarios: Optional[ControlHorarios] = None, control_creditos: Optional[ControlCreditos] = None,
+                 grafo_prerrequisitos: Optional[GrafoPrerrequisitos] = None,
+                 indice_matriculas: Optional[IndiceMatriculas] = None):
+        self._repositorio_alumnos = repositorio_alumnos
+        self._repositorio_asignaturas = repositorio_asignaturas
+        self._flujo_cambios = flujo_cambios
+        self._control_cupos = control_cupos if control_cupos is not None else ControlCupos()
+        if control_horarios is None:
+            control_horarios = ControlHorarios()
+            control_horarios.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+        self._control_horarios = control_horarios
+        if control_creditos is None:
+            control_creditos = ControlCreditos()
+            control_creditos.reconstruir(repositorio_alumnos, repositorio_asignaturas)
+        self._control_creditos = control_creditos
+        # GestorAsignaturas registra los prerrequisitos en este mismo grafo si se le inyecta
+        self._grafo_prerrequisitos = grafo_prerrequisitos if grafo_prerrequisitos is not None else GrafoPrerrequisitos()
+        # Mapas de bits de matrículas: se conectan a los repositorios en la primera consulta
+        self._indice_matriculas = indice_matriculas
+        # Cambia en cada cierre de período: una transacción abierta antes del cierre ya no puede confirmarse
+        self._periodo = 0
+        # Índice inverso alumno_id -> asignaturas en cuya lista de espera entró. Puede contener
+        # entradas obsoletas (ej. tras una promoción); se confirman con esta_en_espera al usarlo
+        self._esperas: Dict[str, Set[str]] = {}
+        for asignatura in repositorio_asignaturas.obtener_todos():
+            for alumno_id in asignatura.lista_espera:
+                self._esperas.setdefault(alumno_id, set()).add(asignatura.id)
+    
+    def _publicar_matricula(self, operacion: str, alumno_id: str, asignatura_id: str) -> None:
+        """Publica un evento de matrícula en el flujo de cambios, si está configurado."""
+        if self._flujo_cambios is not None:
+            self._flujo_cambios.publicar('matricula', operacion, f"{alumno_id}:{asignatura_id}",
+                                         {'alumno_id': alumno_id, 'asignatura_id': asignatura_id})
+    
+    def transaccion(self) -> UnidadDeTrabajo:
+        """Abre una unidad de trabajo para agrupar varias operaciones en un solo commit.
+        Confirma con los locks de asignatura y de alumno de las entidades que modifica, y se
+        rechaza si entretanto se cerró el período (sus matrículas y créditos ya no valen)."""
+        uow = UnidadDeTrabajo(bloqueos=self._bloqueo_entidad)
+        periodo = self._periodo
+        uow.registrar_validacion(lambda: self._periodo == periodo)
+        return uow
+    
+    def _bloqueo_entidad(self, repositorio: IRepositorio, id: str) -> Optional[Tuple[int, Any]]:
+        """Lock que protege a una entidad: primero las asignaturas y luego los alumnos, el mismo
+        orden en que los anidan matricular y desmatricular."""
+        if repositorio is self._repositorio_asignaturas:
+            return 0, self._control_cupos.bloqueo(id)
+        if repositorio is self._repositorio_alumnos:
+            return 1, self._control_creditos.bloqueo(id)
+        return None
+    
+    @staticmethod
+    def _finalizar(uow: UnidadDeTrabajo, exito: bool) -> bool:
+        """Confirma una transacción propia si la operación tuvo éxito; si no, la revierte."""
+        if exito:
+            return uow.confirmar()
+        uow.revertir()
+        return False
+    
+    def _modificar_matricula(self, uow: UnidadDeTrabajo, alumno: Alumno, asignatura: Asignatura,
+                             matricular: bool) -> bool:
+        """Matricula o desmatricula en ambos lados, sobre las entidades obtenidas de la transacción.
+        Si uno de los lados falla se deshace el otro, de modo que alumno y asignatura nunca
+        quedan inconsistentes. Requiere el lock de la asignatura; toma el del alumno para que
+        verificar y reservar créditos y horario sea atómico."""
+        with self._control_creditos.bloqueo(alumno.id):
+            return self._modificar_matricula_bloqueado(uow, alumno, asignatura, matricular)
+    
+    def _modificar_matricula_bloqueado(self, uow: UnidadDeTrabajo, alumno: Alumno, asignatura: Asignatura,
+                                       matricular: bool) -> bool:
+        if matricular:
+            if not self._control_creditos.puede_agregar(alumno, asignatura.creditos):
+                return False
+            if self._control_horarios.buscar_choque(alumno.id, asignatura) is not None:
+                return False
+            if not self._grafo_prerrequisitos.cumple(alumno.id, asignatura.id):
+                return False
+        
+        if matricular:
+            exito_alumno = alumno.matricular_asignatura(asignatura.id)
+            exito_asignatura = asignatura.agregar_estudiante(alumno.id)
+        else:
+            exito_alumno = alumno.desmatricular_asignatura(asignatura.id)
+            exito_asignatura = asignatura.remover_estudiante(alumno.id)
+        
+        if not (exito_alumno and exito_asignatura):
+            # Compensar el lado que sí cambió (la copia sigue en uso dentro de la transacción)
+            if exito_alumno:
+                (alumno.desmatricular_asignatura if matricular else alumno.matricular_asignatura)(asignatura.id)
+            if exito_asignatura:
+                (asignatura.remover_estudiante if matricular else asignatura.agregar_estudiante)(alumno.id)
+            return False
+        
+        if matricular:
+            deshacer_alumno = lambda: alumno.desmatricular_asignatura(asignatura.id)
+            deshacer_asignatura = lambda: asignatura.remover_estudiante(alumno.id)
+        else:
+            deshacer_alumno = lambda: alumno.matricular_asignatura(asignatura.id)
+            deshacer_asignatura = lambda: asignatura.agregar_estudiante(alumno.id)
+        uow.registrar_modificacion(self._repositorio_alumnos, alumno, deshacer_alumno)
+        uow.registrar_modificacion(self._repositorio_asignaturas, asignatura, deshacer_asignatura)
+        self._actualizar_estado_derivado(uow, alumno, asignatura, matricular)
+        operacion = 'matricular' if matricular else 'desmatricular'
+        uow.al_confirmar(lambda: self._publicar_matricula(operacion, alumno.id, asignatura.id))
+        return True
+    
+    def _actualizar_estado_derivado(self, uow: UnidadDeTrabajo, alumno: Alumno, asignatura: Asignatura, matricular: bool) -> None:
+        """Mantiene los controles derivados de las matrículas y registra cómo deshacer cada cambio."""
+        creditos = asignatura.creditos if matricular else -asignatura.creditos
+        self._control_creditos.sumar(alumno, creditos)
+        self._registrar_compensacion(uow, lambda: self._control_creditos.sumar(alumno, -creditos))
+        if matricular:
+            self._control_horarios.registrar(alumno.id, asignatura)
+            self._registrar_compensacion(uow, lambda: self._control_horarios.liberar(alumno.id, asignatura.id))
+        else:
+            self._control_horarios.liberar(alumno.id, asignatura.id)
+            self._registrar_compensacion(uow, lambda: self._control_horarios.registrar(alumno.id, asignatura))
+    
+    def _registrar_compensacion(self, uow: UnidadDeTrabajo, deshacer: Callable[[], None]) -> None:
+        """Registra cómo deshacer un cambio del estado derivado. Si la transacción se revierte
+        después de un cierre de período, ese estado ya se vació y no hay nada que deshacer."""
+        periodo = self._periodo
+        
+        def compensar() -> None:
+            if self._periodo == periodo:
+                deshacer()
+        uow.registrar_compensacion(compensar)
+    
+    @trazado("gestor")
+    def matricular_alumno(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> bool:
+        """Matricula un alumno en una asignatura si queda cupo.
+        Con una transacción abierta los repositorios se actualizan al confirmarla."""
+        uow = transaccion if transaccion is not None else UnidadDeTrabajo(aislada=False)
+        with self._control_cupos.bloqueo(asignatura_id):
+            alumno = uow.obtener(self._repositorio_alumnos, alumno_id)
+            asignatura = uow.obtener(self._repositorio_asignaturas, asignatura_id)
+            exito = alumno is not None and asignatura is not None and self._modificar_matricula(uow, alumno, asignatura, True)
+            if transaccion is None:
+                exito = self._finalizar(uow, exito)
+        self._control_cupos.registrar('matriculados' if exito else 'rechazados')
+        return exito
+    
+    @trazado("gestor")
+    def solicitar_matricula(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> str:
+        """Solicita matrícula: matricula si hay cupo o deja al alumno en la lista de espera (FIFO).
+        Retorna MATRICULADO, EN_ESPERA o RECHAZADO."""
+        uow = transaccion if transaccion is not None else UnidadDeTrabajo(aislada=False)
+        with self._control_cupos.bloqueo(asignatura_id):
+            alumno = uow.obtener(self._repositorio_alumnos, alumno_id)
+            asignatura = uow.obtener(self._repositorio_asignaturas, asignatura_id)
+            exito = False
+            if alumno is None or asignatura is None:
+                resultado = self.RECHAZADO
+            elif asignatura.tiene_cupo_disponible():
+                exito = self._modificar_matricula(uow, alumno, asignatura, True)
+                resultado = self.MATRICULADO
+            elif asignatura.agregar_a_lista_espera(alumno_id):
+                uow.registrar_modificacion(self._repositorio_asignaturas, asignatura,
+                                           lambda: asignatura.retirar_de_lista_espera(alumno_id))
+                uow.al_confirmar(lambda: self._esperas.setdefault(alumno_id, set()).add(asignatura_id))
+                exito = True
+                resultado = self.EN_ESPERA
+            else:
+                resultado = self.RECHAZADO
+            if transaccion is None:
+                exito = self._finalizar(uow, exito)
+            if not exito:
+                resultado = self.RECHAZADO
+        self._control_cupos.registrar({self.MATRICULADO: 'matriculados', self.EN_ESPERA: 'en_espera'}.get(resultado, 'rechazados'))
+        return resultado
+    
+    @trazado("gestor")
+    def desmatricular_alumno(self, alumno_id: str, asignatura_id: str, transaccion: Optional[UnidadDeTrabajo] = None) -> bool:
+        """Desmatricula un alumno de una asignatura y promueve al primero de la lista de espera.
+        Con una transacción abierta los repositorios se actualizan al confirmarla."""
+        uow = transaccion if transaccion is not None else UnidadDeTrabajo(aislada=False)
+        with self._control_cupos.bloqueo(asignatura_id):
+            alumno = uow.obtener(self._repositorio_alumnos, alumno_id)
+            asignatura = uow.obtener(self._repositorio_asignaturas, asignatura_id)
+            exito = alumno is not None and asignatura is not None and self._modificar_matricula(uow, alumno, asignatura, False)
+            if exito:
+                self._promover_lista_espera(uow, asignatura)
+            if transaccion is None:
+                exito = self._finalizar(uow, exito)
+        return exito
+    
+    def _promover_lista_espera(self, uow: UnidadDeTrabajo, asignatura: Asignatura) -> None:
+        """Matricula a los primeros de la lista de espera mientras quede cupo (requiere el lock de la asignatura).
+        Quien no puede matricularse (créditos, horario o prerrequisitos) conserva su lugar en la
+        lista y se cuenta como 'no_promovidos'; solo se descarta a los alumnos que ya no existen."""
+        omitidos: List[str] = []
+        while asignatura.tiene_cupo_disponible():
+            siguiente_id = asignatura.siguiente_en_espera()
+            if siguiente_id is None:
+                break
+            uow.registrar_modificacion(self._repositorio_asignaturas, asignatura,
+                                       lambda siguiente_id=siguiente_id: asignatura.devolver_a_lista_espera(siguiente_id))
+            siguiente = uow.obtener(self._repositorio_alumnos, siguiente_id)
+            if siguiente is None or self._modificar_matricula(uow, siguiente, asignatura, True):
+                uow.al_confirmar(lambda siguiente_id=siguiente_id: self._olvidar_espera(siguiente_id, asignatura.id))
+                if siguiente is not None:
+                    uow.al_confirmar(lambda: self._control_cupos.registrar('promovidos'))
+            else:
+                omitidos.append(siguiente_id)
+        # Los omitidos vuelven al inicio, en su orden original
+        for alumno_id in reversed(omitidos):
+            asignatura.devolver_a_lista_espera(alumno_id)
+            uow.registrar_modificacion(self._repositorio_asignaturas, asignatura,
+                                       lambda alumno_id=alumno_id: asignatura.retirar_de_lista_espera(alumno_id))
+            uow.al_confirmar(lambda: self._control_cupos.registrar('no_promovidos'))
+    
+    @trazado("gestor")
+    def matricular_lote(self, matriculas: List[Tuple[str, str]], todo_o_nada: bool = False) -> int:
+        """Matricula un lote de pares (alumno_id, asignatura_id) en una sola transacción.
+        Cada repositorio recibe un único commit por lotes. Con todo_o_nada, cualquier
+        matrícula rechazada revierte el lote completo. Retorna la cantidad de matrículas aplicadas."""
+        with self.transaccion() as uow:
+            exitosas = 0
+            for alumno_id, asignatura_id in matriculas:
+                if self.matricular_alumno(alumno_id, asignatura_id, uow):
+                    exitosas += 1
+                elif todo_o_nada:
+                    uow.revertir()
+                    return 0
+            if not uow.confirmar():
+                return 0
+        return exitosas
+    
+    def verificar_prerrequisitos(self, alumno_id: str, asignatura_id: str) -> List[str]:
+        """Obtiene los prerrequisitos que le faltan al alumno para matricular la asignatura (vacío si cumple)."""
+        return self._grafo_prerrequisitos.obtener_faltantes(alumno_id, asignatura_id)
+    
+    @trazado("gestor")
+    def validar_lote_matriculas(self, matriculas: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Valida un lote de pares (alumno_id, asignatura_id) antes de matricularlo, sin modificar nada.
+        Retorna los pares que no cumplen los prerrequisitos, con los que faltan."""
+        return self._grafo_prerrequisitos.validar_lote(matriculas)
+    
+    @trazado("gestor")
+    def verificar_choque_horario(self, alumno_id: str, asignatura_id: str) -> Optional[str]:
+        """Retorna la asignatura del alumno que choca en horario con la indicada, o None."""
+        asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
+        if not asignatura:
+            return None
+        return self._control_horarios.buscar_choque(alumno_id, asignatura)
+    
+    @trazado("gestor")
+    def auditar_choques_horario(self) -> List[Dict[str, Any]]:
+        """Encuentra todas las matrículas en conflicto de horario (ej. tras cambios de horario)."""
+        return self._control_horarios.auditar(self._repositorio_alumnos, self._repositorio_asignaturas)
+    
+    @trazado("gestor")
+    def obtener_carga_creditos(self, alumno_id: str) -> Dict[str, Any]:
+        """Obtiene los créditos matriculados de un alumno y su límite."""
+        alumno = self._repositorio_alumnos.obtener_por_id(alumno_id)
+        tipo = alumno.obtener_tipo_estudiante() if isinstance(alumno, IEstudiante) else None
+        return {
+            'alumno_id': alumno_id,
+            'creditos': self._control_creditos.obtener_carga(alumno_id),
+            'limite': self._control_creditos.obtener_limite(tipo)
+        }
+    
+    @trazado("gestor")
+    def listar_sobrecargados(self) -> List[Dict[str, Any]]:
+        """Lista los alumnos que superan su límite de créditos."""
+        return self._control_creditos.obtener_sobrecargados()
+    
+    def _obtener_indice_matriculas(self) -> IndiceMatriculas:
+        if self._indice_matriculas is None:
+            self._indice_matriculas = IndiceMatriculas()
+            self._indice_matriculas.conectar(self._repositorio_alumnos, self._repositorio_asignaturas)
+        return self._indice_matriculas
+    
+    @trazado("gestor")
+    def consultar_matriculas(self, todas: Optional[List[str]] = None, alguna: Optional[List[str]] = None,
+                             ninguna: Optional[List[str]] = None) -> List[str]:
+        """Alumnos matriculados en todas las asignaturas de 'todas', en alguna de 'alguna' y en
+        ninguna de 'ninguna' (ej. todas=['ING001', 'ING002'] o alguna=[...], ninguna=['ING003'])."""
+        indice = self._obtener_indice_matriculas()
+        return indice.a_ids(indice.consultar(todas or (), alguna or (), ninguna or ()))
+    
+    @trazado("gestor")
+    def contar_matriculas(self, todas: Optional[List[str]] = None, alguna: Optional[List[str]] = None,
+                          ninguna: Optional[List[str]] = None) -> int:
+        """Igual que consultar_matriculas, pero solo cuenta (no construye la lista de IDs)."""
+        return self._obtener_indice_matriculas().contar(todas or (), alguna or (), ninguna or ())
+    
+    @trazado("gestor")
+    def obtener_asignaturas_compartidas(self, alumno_id: str, otro_id: str) -> List[str]:
+        """Obtiene las asignaturas que cursan en común dos alumnos."""
+        return self._obtener_indice_matriculas().asignaturas_compartidas(alumno_id, otro_id)
+    
+    def tiene_esperas(self, alumno_id: str) -> bool:
+        """Indica si el alumno está en alguna lista de espera."""
+        for asignatura_id in self._esperas.get(alumno_id, ()):
+            asignatura = self._repositorio_asignaturas.obtener_por_id(asignatura_id)
+            if asignatura is not None and asignatura.esta_en_espera(alumno_id):
+                return True
+        return False
+    
+    def desvincular_alumnos(self, uow: UnidadDeTrabajo, salientes: Dict[str, Alumno], sin_promover: Iterable[str] = ()) -> None:
+        """Registra en la transacción las bajas de matrícula y de lista de espera de alumnos que se
+        eliminan. Usa los índices inversos para tocar solo las asignaturas afectadas, una vez cada
+        una, y promueve sus listas de espera salvo en las asignaturas de sin_promover."""
+        # Agrupar por asignatura las bajas de matrícula y de lista de espera
+        bajas: Dict[str, Set[str]] = {}
+        esperas: Dict[str, Set[str]] = {}
+        for alumno in salientes.values():
+            for asignatura_id in alumno.asignaturas_matriculadas:
+                bajas.setdefault(asignatura_id, set()).add(alumno.id)
+            for asignatura_id in self._esperas.get(alumno.id, ()):
+                esperas.setdefault(asignatura_id, set()).add(alumno.id)
+        
+        for asignatura_id in bajas.keys() | esperas.keys():
+            with self._control_cupos.bloqueo(asignatura_id):
+                asignatura = uow.obtener(self._repositorio_asignaturas, asignatura_id)
+                if asignatura is None:
+                    continue
+                uow.registrar_modificacion(self._repositorio_asignaturas, asignatura)
+                # Primero las esperas, para no promover a un alumno que se está retirando
+                for alumno_id in esperas.get(asignatura_id, ()):
+                    asignatura.retirar_de_lista_espera(alumno_id)
+                removidos = asignatura.remover_estudiantes(bajas.get(asignatura_id, set()))
+                for alumno_id in removidos:
+                    uow.al_confirmar(lambda alumno_id=alumno_id, asignatura_id=asignatura_id:
+                                     self._publicar_matricula('desmatricular', alumno_id, asignatura_id))
+                if removidos and asignatura_id not in sin_promover:
+                    self._promover_lista_espera(uow, asignatura)
+    
+    def olvidar_alumno(self, alumno_id: str) -> None:
+        """Descarta los créditos, el horario y las esperas de un alumno eliminado."""
+        self._control_creditos.eliminar_alumno(alumno_id)
+        self._control_horarios.eliminar_alumno(alumno_id)
+        self._esperas.pop(alumno_id, None)
+    
+    def pausar_matriculas(self) -> ExitStack:
+        """Toma todos los locks de asignatura y luego todos los de alumno, en el orden global de
+        UnidadDeTrabajo: mientras dure, ninguna matrícula, baja ni confirmación de transacción avanza."""
+        pila = ExitStack()
+        with pila:
+            pila.enter_context(self._control_cupos.bloquear_todos())
+            pila.enter_context(self._control_creditos.bloquear_todos())
+            return pila.pop_all()
+    
+    def reiniciar_periodo(self) -> None:
+        """Descarta las esperas, créditos y horarios tras vaciar todas las matrículas al cerrar el
+        período. Requiere pausar_matriculas: las transacciones abiertas antes ya no confirman."""
+        self._periodo += 1
+        self._esperas.clear()
+        self._control_creditos.vaciar()
+        self._control_horarios.vaciar()
+    
+    def desvincular_asignatura(self, uow: UnidadDeTrabajo, asignatura: Asignatura, omitir=()) -> None:
+        """Registra en la transacción la eliminación de una asignatura: desmatricula a sus alumnos
+        (salvo los de omitir, que se están eliminando), publica esas bajas y la quita de las listas
+        de espera y del grafo de prerrequisitos. Es el único camino de eliminación con alumnos
+        vinculados; GestorAsignaturas.eliminar_asignatura lo usa en todos sus modos."""
+        asignatura = uow.obtener(self._repositorio_asignaturas, asignatura.id) or asignatura
+        for alumno_id in asignatura.estudiantes_matriculados:
+            alumno = None if alumno_id in omitir else uow.obtener(self._repositorio_alumnos, alumno_id)
+            if alumno is None or not alumno.desmatricular_asignatura(asignatura.id):
+                continue
+            uow.registrar_modificacion(self._repositorio_alumnos, alumno)
+            uow.al_confirmar(lambda alumno=alumno: self._liberar_matricula(alumno, asignatura))
+        for alumno_id in asignatura.lista_espera:
+            uow.al_confirmar(lambda alumno_id=alumno_id: self._olvidar_espera(alumno_id, asignatura.id))
+        uow.registrar_eliminacion(self._repositorio_asignaturas, asignatura.id)
+        uow.al_confirmar(lambda: self._grafo_prerrequisitos.eliminar_asignatura(asignatura.id))
+    
+    def _olvidar_espera(self, alumno_id: str, asignatura_id: str) -> None:
+        """Quita una asignatura del índice inverso de esperas del alumno."""
+        esperas = self._esperas.get(alumno_id)
+        if esperas is not None:
+            esperas.discard(asignatura_id)
+            if not esperas:
+                del self._esperas[alumno_id]
+    
+    def _liberar_matricula(self, alumno: Alumno, asignatura: Asignatura) -> None:
+        """Actualiza créditos y horario de un alumno que perdió una matrícula, y lo publica."""
+        self._control_creditos.sumar(alumno, -asignatura.creditos)
+        self._control_horarios.liberar(alumno.id, asignatura.id)
+        self._publicar_matricula('desmatricular', alumno.id, asignatura.id)
\ No newline at end of file
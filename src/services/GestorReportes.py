@@ -0,0 +1,50 @@
+from typing import List, Optional, Dict, Any
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IRepositorioAlumnos import IRepositorioAlumnos
+from interfaces.IGestorReportes import IGestorReportes
+from services.VerificadorIntegridad import VerificadorIntegridad
+from services.MotorAnaliticas import MotorAnaliticas
+from utils.Trazador import trazado
+
+class GestorReportes(IGestorReportes):
+    """Servicio de reportes de solo lectura sobre alumnos y matrículas.
+    Principio SRP: Se encarga únicamente de consultar; nunca modifica los repositorios.
+    Principio LSP: Funciona igual sobre los repositorios vivos o sobre instantáneas MVCC."""
+    
+    def __init__(self, repositorio_alumnos: IRepositorioAlumnos, repositorio_asignaturas: IRepositorio):
+        self._repositorio_alumnos = repositorio_alumnos
+        self._repositorio_asignaturas = repositorio_asignaturas
+        # Se proyecta en el primer reporte de cohortes
+        self._motor_analiticas: Optional[MotorAnaliticas] = None
+    
+    @trazado("gestor")
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene estadísticas generales de alumnos."""
+        alumnos = self._repositorio_alumnos.obtener_todos()
+        
+        stats = {
+            'total_alumnos': len(alumnos),
+            'tipos_estudiantes': self._repositorio_alumnos.contar_por_tipo(),
+            'total_matriculas': 0
+        }
+        
+        for alumno in alumnos:
+            # Contar matrículas
+            stats['total_matriculas'] += len(alumno.asignaturas_matriculadas)
+        
+        return stats
+    
+    @trazado("gestor")
+    def obtener_reporte_cohortes(self, por: List[str], medida: Optional[str] = None,
+                                 filtros: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Reporte agrupado por carrera, semestre_actual, tipo, anio_ingreso o matriculas, con
+        cantidad y, si se indica una medida numérica, promedio y percentiles por grupo."""
+        if self._motor_analiticas is None:
+            self._motor_analiticas = MotorAnaliticas(self._repositorio_alumnos)
+        return self._motor_analiticas.agrupar(por, medida, filtros=filtros)
+    
+    @trazado("gestor")
+    def verificar_integridad(self, incluir_profesores: bool = True) -> List[Dict[str, Any]]:
+        """Busca referencias colgantes entre alumnos y asignaturas en una pasada."""
+        verificador = VerificadorIntegridad(self._repositorio_alumnos, self._repositorio_asignaturas)
+        return verificador.verificar(incluir_profesores)
\ No newline at end of file
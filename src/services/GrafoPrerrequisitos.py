@@ -0,0 +1,207 @@
+import threading
+from collections import deque
+from typing import List, Dict, Set, Tuple, Iterable
+
+class GrafoPrerrequisitos:
+    """Grafo dirigido acíclico de prerrequisitos entre asignaturas y registro de asignaturas aprobadas.
+    Principio SRP: Solo decide si un alumno cumple los prerrequisitos; la matrícula sigue en los gestores.
+    Cada asignatura tiene un código de bit. El cierre transitivo de prerrequisitos de cada asignatura
+    se guarda como máscara de bits (entero) y las aprobadas de cada alumno también, así que verificar
+    una matrícula es una operación de máscaras, sin importar la profundidad del grafo. Al agregar una
+    arista se actualizan los cierres afectados con una unión; al quitarla solo se descartan los de la
+    asignatura y las que dependen de ella, que se recalculan al consultarlos."""
+    
+    def __init__(self):
+        self._codigos: Dict[str, int] = {}
+        self._ids: List[str] = []
+        # asignatura_id -> prerrequisitos directos / asignaturas que la tienen como prerrequisito directo
+        self._prerrequisitos: Dict[str, Set[str]] = {}
+        self._dependientes: Dict[str, Set[str]] = {}
+        # Caché: asignatura_id -> máscara con todos sus prerrequisitos (directos e indirectos)
+        self._cierres: Dict[str, int] = {}
+        # alumno_id -> máscara de asignaturas aprobadas
+        self._aprobadas: Dict[str, int] = {}
+        self._lock = threading.RLock()
+    
+    def _codigo(self, asignatura_id: str) -> int:
+        codigo = self._codigos.get(asignatura_id)
+        if codigo is None:
+            codigo = self._codigos[asignatura_id] = len(self._ids)
+            self._ids.append(asignatura_id)
+        return codigo
+    
+    def _decodificar(self, mascara: int) -> List[str]:
+        ids = []
+        while mascara:
+            bit = mascara & -mascara
+            ids.append(self._ids[bit.bit_length() - 1])
+            mascara ^= bit
+        return ids
+    
+    def _cierre(self, asignatura_id: str) -> int:
+        """Cierre transitivo de una asignatura, calculando (y guardando) los que falten (requiere el lock)."""
+        cierre = self._cierres.get(asignatura_id)
+        if cierre is not None:
+            return cierre
+        pila = [asignatura_id]
+        while pila:
+            actual = pila[-1]
+            if actual in self._cierres:
+                pila.pop()
+                continue
+            directos = self._prerrequisitos.get(actual, ())
+            pendientes = [prerrequisito for prerrequisito in directos if prerrequisito not in self._cierres]
+            if pendientes:
+                pila.extend(pendientes)
+                continue
+            mascara = 0
+            for prerrequisito in directos:
+                mascara |= (1 << self._codigo(prerrequisito)) | self._cierres[prerrequisito]
+            self._cierres[actual] = mascara
+            pila.pop()
+        return self._cierres[asignatura_id]
+    
+    def _dependientes_transitivos(self, asignatura_id: str) -> List[str]:
+        """La asignatura y todas las que la requieren directa o indirectamente (requiere el lock)."""
+        visitadas = {asignatura_id}
+        pendientes = deque([asignatura_id])
+        while pendientes:
+            for dependiente in self._dependientes.get(pendientes.popleft(), ()):
+                if dependiente not in visitadas:
+                    visitadas.add(dependiente)
+                    pendientes.append(dependiente)
+        return list(visitadas)
+    
+    def agregar_prerrequisito(self, asignatura_id: str, prerrequisito_id: str) -> bool:
+        """Registra que para cursar asignatura_id hay que aprobar prerrequisito_id.
+        Rechaza duplicados y aristas que formarían un ciclo."""
+        if asignatura_id == prerrequisito_id:
+            return False
+        with self._lock:
+            if prerrequisito_id in self._prerrequisitos.get(asignatura_id, ()):
+                return False
+            cierre_prerrequisito = self._cierre(prerrequisito_id)
+            # Un ciclo aparece si la asignatura ya es prerrequisito (directo o indirecto) del nuevo prerrequisito
+            if asignatura_id in self._codigos and cierre_prerrequisito >> self._codigos[asignatura_id] & 1:
+                return False
+            self._codigo(asignatura_id)
+            self._prerrequisitos.setdefault(asignatura_id, set()).add(prerrequisito_id)
+            self._dependientes.setdefault(prerrequisito_id, set()).add(asignatura_id)
+            nuevos = (1 << self._codigo(prerrequisito_id)) | cierre_prerrequisito
+            for afectada in self._dependientes_transitivos(asignatura_id):
+                if afectada in self._cierres:
+                    self._cierres[afectada] |= nuevos
+        return True
+    
+    def quitar_prerrequisito(self, asignatura_id: str, prerrequisito_id: str) -> bool:
+        """Quita un prerrequisito directo."""
+        with self._lock:
+            directos = self._prerrequisitos.get(asignatura_id)
+            if not directos or prerrequisito_id not in directos:
+                return False
+            directos.discard(prerrequisito_id)
+            if not directos:
+                del self._prerrequisitos[asignatura_id]
+            dependientes = self._dependientes[prerrequisito_id]
+            dependientes.discard(asignatura_id)
+            if not dependientes:
+                del self._dependientes[prerrequisito_id]
+            # Otro camino podría seguir aportando los mismos bits: se recalculan al consultarlos
+            for afectada in self._dependientes_transitivos(asignatura_id):
+                self._cierres.pop(afectada, None)
+        return True
+    
+    def eliminar_asignatura(self, asignatura_id: str) -> None:
+        """Quita una asignatura del grafo (sus prerrequisitos y las asignaturas que la requerían)."""
+        with self._lock:
+            for prerrequisito_id in list(self._prerrequisitos.get(asignatura_id, ())):
+                self.quitar_prerrequisito(asignatura_id, prerrequisito_id)
+            for dependiente_id in list(self._dependientes.get(asignatura_id, ())):
+                self.quitar_prerrequisito(dependiente_id, asignatura_id)
+            codigo = self._codigos.get(asignatura_id)
+            if codigo is not None:
+                # El código no se reutiliza; basta con que ningún alumno la tenga como aprobada
+                for alumno_id in list(self._aprobadas):
+                    self._aprobadas[alumno_id] &= ~(1 << codigo)
+    
+    def obtener_prerrequisitos(self, asignatura_id: str, transitivos: bool = False) -> List[str]:
+        """Obtiene los prerrequisitos directos o, con transitivos, todos los que hay que aprobar antes."""
+        with self._lock:
+            if not transitivos:
+                return sorted(self._prerrequisitos.get(asignatura_id, ()))
+            return sorted(self._decodificar(self._cierre(asignatura_id)))
+    
+    def obtener_dependientes(self, asignatura_id: str) -> List[str]:
+        """Obtiene las asignaturas que tienen a esta como prerrequisito directo."""
+        with self._lock:
+            return sorted(self._dependientes.get(asignatura_id, ()))
+    
+    def registrar_aprobacion(self, alumno_id: str, asignatura_id: str) -> bool:
+        """Registra que el alumno aprobó una asignatura. Retorna False si ya estaba registrada."""
+        with self._lock:
+            bit = 1 << self._codigo(asignatura_id)
+            aprobadas = self._aprobadas.get(alumno_id, 0)
+            if aprobadas & bit:
+                return False
+            self._aprobadas[alumno_id] = aprobadas | bit
+        return True
+    
+    def anular_aprobacion(self, alumno_id: str, asignatura_id: str) -> bool:
+        """Quita una aprobación registrada."""
+        with self._lock:
+            codigo = self._codigos.get(asignatura_id)
+            aprobadas = self._aprobadas.get(alumno_id, 0)
+            if codigo is None or not aprobadas >> codigo & 1:
+                return False
+            self._aprobadas[alumno_id] = aprobadas & ~(1 << codigo)
+        return True
+    
+    def eliminar_alumno(self, alumno_id: str) -> None:
+        """Olvida las aprobaciones de un alumno eliminado."""
+        with self._lock:
+            self._aprobadas.pop(alumno_id, None)
+    
+    def obtener_aprobadas(self, alumno_id: str) -> List[str]:
+        """Obtiene las asignaturas aprobadas por el alumno."""
+        with self._lock:
+            return sorted(self._decodificar(self._aprobadas.get(alumno_id, 0)))
+    
+    def cumple(self, alumno_id: str, asignatura_id: str) -> bool:
+        """Indica si el alumno aprobó todos los prerrequisitos (directos e indirectos) de la asignatura."""
+        with self._lock:
+            if asignatura_id not in self._prerrequisitos:
+                return True
+            return self._cierre(asignatura_id) & ~self._aprobadas.get(alumno_id, 0) == 0
+    
+    def obtener_faltantes(self, alumno_id: str, asignatura_id: str) -> List[str]:
+        """Obtiene los prerrequisitos (directos e indirectos) que el alumno aún no aprueba."""
+        with self._lock:
+            if asignatura_id not in self._prerrequisitos:
+                return []
+            return sorted(self._decodificar(self._cierre(asignatura_id) & ~self._aprobadas.get(alumno_id, 0)))
+    
+    def validar_lote(self, matriculas: Iterable[Tuple[str, str]]) -> List[Dict[str, object]]:
+        """Valida un lote de pares (alumno_id, asignatura_id) y retorna los que no cumplen, con sus faltantes.
+        Cada cierre se consulta una sola vez por asignatura distinta del lote."""
+        rechazadas = []
+        with self._lock:
+            cierres: Dict[str, int] = {}
+            for alumno_id, asignatura_id in matriculas:
+                cierre = cierres.get(asignatura_id)
+                if cierre is None:
+                    cierre = cierres[asignatura_id] = self._cierre(asignatura_id) if asignatura_id in self._prerrequisitos else 0
+                faltantes = cierre & ~self._aprobadas.get(alumno_id, 0)
+                if faltantes:
+                    rechazadas.append({'alumno_id': alumno_id, 'asignatura_id': asignatura_id,
+                                       'faltantes': sorted(self._decodificar(faltantes))})
+        return rechazadas
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del grafo: asignaturas, aristas, cierres en caché y alumnos con aprobaciones."""
+        with self._lock:
+            return {
+                'asignaturas': len(self._ids),
+                'prerrequisitos': sum(len(directos) for directos in self._prerrequisitos.values()),
+                'cierres_en_cache': len(self._cierres),
+                'alumnos_con_aprobaciones': len(self._aprobadas)
+            }
\ No newline at end of file
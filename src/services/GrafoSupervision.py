@@ -0,0 +1,116 @@
+import heapq
+import threading
+from collections import deque
+from typing import List, Optional, Dict, Tuple
+from interfaces.IRepositorio import IRepositorio
+
+class GrafoSupervision:
+    """Índice de dirección de tesis: quién dirige a quién, en ambos sentidos.
+    Principio SRP: Solo mantiene las relaciones director -> tesista; los modelos siguen
+    registrando sus propias tesis dirigidas.
+    Las listas de adyacencia hacia adelante y hacia atrás permiten responder directores,
+    linaje académico y carga de un director en tiempo proporcional a la respuesta."""
+    
+    def __init__(self):
+        # director_id -> {estudiante_id: tema}, sin duplicados y en orden de asignación
+        self._dirigidos: Dict[str, Dict[str, str]] = {}
+        # estudiante_id -> {director_id: None} (puede haber codirección)
+        self._directores: Dict[str, Dict[str, None]] = {}
+        self._lock = threading.Lock()
+    
+    def agregar(self, director_id: str, estudiante_id: str, tema: str = "") -> bool:
+        """Registra que director_id dirige la tesis de estudiante_id.
+        Rechaza duplicados y relaciones que formarían un ciclo en el linaje."""
+        if director_id == estudiante_id:
+            return False
+        with self._lock:
+            if estudiante_id in self._dirigidos.get(director_id, {}):
+                return False
+            # Un ciclo aparece si el estudiante ya es ancestro del director
+            if any(ancestro == estudiante_id for ancestro, _ in self._recorrer(self._directores, director_id, None)):
+                return False
+            self._dirigidos.setdefault(director_id, {})[estudiante_id] = tema
+            self._directores.setdefault(estudiante_id, {})[director_id] = None
+        return True
+    
+    def quitar(self, director_id: str, estudiante_id: str) -> bool:
+        """Quita una relación de dirección."""
+        with self._lock:
+            dirigidos = self._dirigidos.get(director_id)
+            if not dirigidos or estudiante_id not in dirigidos:
+                return False
+            del dirigidos[estudiante_id]
+            if not dirigidos:
+                del self._dirigidos[director_id]
+            directores = self._directores[estudiante_id]
+            del directores[director_id]
+            if not directores:
+                del self._directores[estudiante_id]
+        return True
+    
+    def eliminar_persona(self, persona_id: str) -> None:
+        """Quita todas las relaciones en que participa una persona (como director o tesista).
+        Solo actualiza el índice: al eliminar a alguien, GestorAlumnos también quita la relación de
+        los modelos que permanecen, para que reconstruir no la restaure."""
+        for estudiante_id in list(self._dirigidos.get(persona_id, ())):
+            self.quitar(persona_id, estudiante_id)
+        for director_id in list(self._directores.get(persona_id, ())):
+            self.quitar(director_id, persona_id)
+    
+    def obtener_directores(self, estudiante_id: str) -> List[str]:
+        """Obtiene quién dirige la tesis del estudiante."""
+        return list(self._directores.get(estudiante_id, ()))
+    
+    def obtener_dirigidos(self, director_id: str) -> Dict[str, str]:
+        """Obtiene los tesistas de un director con el tema de cada tesis."""
+        return dict(self._dirigidos.get(director_id, {}))
+    
+    def obtener_carga(self, director_id: str) -> int:
+        """Cantidad de tesis que dirige una persona (O(1))."""
+        return len(self._dirigidos.get(director_id, ()))
+    
+    def obtener_mayores_cargas(self, k: int = 10) -> List[Tuple[str, int]]:
+        """Obtiene los k directores con más tesis dirigidas."""
+        with self._lock:
+            return heapq.nlargest(k, ((director_id, len(dirigidos)) for director_id, dirigidos in self._dirigidos.items()),
+                                  key=lambda par: par[1])
+    
+    def ancestros(self, persona_id: str, profundidad: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Linaje hacia arriba: directores, directores de los directores, etc., con su nivel (1 = director)."""
+        with self._lock:
+            return list(self._recorrer(self._directores, persona_id, profundidad))
+    
+    def descendientes(self, persona_id: str, profundidad: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Linaje hacia abajo: tesistas, tesistas de los tesistas, etc., con su nivel (1 = tesista directo)."""
+        with self._lock:
+            return list(self._recorrer(self._dirigidos, persona_id, profundidad))
+    
+    @staticmethod
+    def _recorrer(adyacencia: Dict[str, dict], origen: str, profundidad: Optional[int]):
+        """Recorrido en anchura desde origen; solo visita los nodos alcanzables."""
+        visitados = {origen}
+        pendientes = deque([(origen, 0)])
+        while pendientes:
+            actual, nivel = pendientes.popleft()
+            if profundidad is not None and nivel >= profundidad:
+                continue
+            for vecino in adyacencia.get(actual, ()):
+                if vecino not in visitados:
+                    visitados.add(vecino)
+                    yield vecino, nivel + 1
+                    pendientes.append((vecino, nivel + 1))
+    
+    def reconstruir(self, repositorio_alumnos: IRepositorio) -> None:
+        """Reconstruye el grafo a partir de las tesis dirigidas registradas en los modelos
+        y del director de tesis de los estudiantes de magíster (si corresponde a un ID existente)."""
+        with self._lock:
+            self._dirigidos.clear()
+            self._directores.clear()
+        alumnos = repositorio_alumnos.obtener_todos()
+        ids = {alumno.id for alumno in alumnos}
+        for alumno in alumnos:
+            for estudiante_id in getattr(alumno, 'estudiantes_dirigidos', ()):
+                self.agregar(alumno.id, estudiante_id)
+            director_id = getattr(alumno, 'director_tesis', None)
+            if director_id in ids:
+                self.agregar(director_id, alumno.id)
\ No newline at end of file
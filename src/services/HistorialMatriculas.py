@@ -0,0 +1,284 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from interfaces.IRepositorio import IRepositorio
+from models.Alumno import Alumno
+from models.Asignatura import Asignatura
+
+class HistorialMatriculas:
+    """Historial de altas y bajas de matrículas para consultar nóminas en cualquier fecha pasada.
+    Principio SRP: Solo registra y reconstruye matrículas en el tiempo; las vigentes siguen en los modelos.
+    Cada cambio efectivo se anexa a columnas de arreglos (fecha, alumno, asignatura, alta/baja) y
+    se indexa por alumno y por asignatura. Cada 'intervalo_checkpoint' cambios se guarda la nómina
+    de todas las asignaturas en formato CSR. Una consulta a una fecha parte del checkpoint más
+    cercano (anterior o posterior, contando el estado actual como uno más) y aplica o deshace
+    solo los cambios de esa asignatura entre ambos, que son a lo más 'intervalo_checkpoint'."""
+    
+    def __init__(self, intervalo_checkpoint: int = 50000, reloj: Callable[[], float] = time.time):
+        if intervalo_checkpoint < 1:
+            raise ValueError("El intervalo entre checkpoints debe ser positivo")
+        self._intervalo = intervalo_checkpoint
+        self._reloj = reloj
+        self._codigos_alumnos: Dict[str, int] = {}
+        self._ids_alumnos: List[str] = []
+        self._codigos_asignaturas: Dict[str, int] = {}
+        self._ids_asignaturas: List[str] = []
+        # Cambios en orden de fecha: una fila por alta (1) o baja (0)
+        self._fechas = array('d')
+        self._alumnos = array('I')
+        self._asignaturas = array('I')
+        self._altas = array('B')
+        # Posiciones de los cambios de cada alumno y de cada asignatura (por código)
+        self._por_alumno: List[array] = []
+        self._por_asignatura: List[array] = []
+        # Estado vigente por código: asignaturas de cada alumno y nómina de cada asignatura
+        self._vigentes_alumno: List[set] = []
+        self._nominas: List[set] = []
+        # (posición, inicio de cada asignatura, alumnos): nóminas antes del cambio 'posición'
+        self._checkpoints: List[Tuple[int, array, array]] = []
+        self._posiciones_checkpoint = array('Q')
+        self._consultas = 0
+        self._cambios_aplicados = 0
+        self._maximo_aplicados = 0
+        self._lock = threading.RLock()
+    
+    def _codigo_alumno(self, alumno_id: str) -> int:
+        codigo = self._codigos_alumnos.get(alumno_id)
+        if codigo is None:
+            codigo = self._codigos_alumnos[alumno_id] = len(self._ids_alumnos)
+            self._ids_alumnos.append(alumno_id)
+            self._por_alumno.append(array('I'))
+            self._vigentes_alumno.append(set())
+        return codigo
+    
+    def _codigo_asignatura(self, asignatura_id: str) -> int:
+        codigo = self._codigos_asignaturas.get(asignatura_id)
+        if codigo is None:
+            codigo = self._codigos_asignaturas[asignatura_id] = len(self._ids_asignaturas)
+            self._ids_asignaturas.append(asignatura_id)
+            self._por_asignatura.append(array('I'))
+            self._nominas.append(set())
+        return codigo
+    
+    def _marca(self, fecha: Optional[datetime]) -> float:
+        """Marca de tiempo de un cambio: la fecha dada (no anterior al último cambio) o el reloj (requiere el lock)."""
+        ultima = self._fechas[-1] if self._fechas else float('-inf')
+        if fecha is None:
+            # Si el reloj retrocede (ej. ajuste de hora) el cambio queda con la fecha del anterior
+            return max(self._reloj(), ultima)
+        marca = fecha.timestamp()
+        if marca < ultima:
+            raise ValueError(f"Los cambios deben registrarse en orden de fecha: {fecha} es anterior al último")
+        return marca
+    
+    def _anexar(self, marca: float, alumno: int, asignatura: int, alta: bool) -> None:
+        """Anexa un cambio efectivo y toma un checkpoint si corresponde (requiere el lock)."""
+        if len(self._fechas) - (self._posiciones_checkpoint[-1] if self._checkpoints else 0) >= self._intervalo:
+            self._tomar_checkpoint()
+        posicion = len(self._fechas)
+        self._fechas.append(marca)
+        self._alumnos.append(alumno)
+        self._asignaturas.append(asignatura)
+        self._altas.append(alta)
+        self._por_alumno[alumno].append(posicion)
+        self._por_asignatura[asignatura].append(posicion)
+        if alta:
+            self._vigentes_alumno[alumno].add(asignatura)
+            self._nominas[asignatura].add(alumno)
+        else:
+            self._vigentes_alumno[alumno].discard(asignatura)
+            self._nominas[asignatura].discard(alumno)
+    
+    def _tomar_checkpoint(self) -> None:
+        """Guarda las nóminas vigentes de todas las asignaturas (requiere el lock)."""
+        inicios = array('I', [0])
+        alumnos = array('I')
+        for nomina in self._nominas:
+            alumnos.extend(sorted(nomina))
+            inicios.append(len(alumnos))
+        self._checkpoints.append((len(self._fechas), inicios, alumnos))
+        self._posiciones_checkpoint.append(len(self._fechas))
+    
+    def registrar(self, alumno_id: str, asignatura_id: str, alta: bool, fecha: Optional[datetime] = None) -> bool:
+        """Registra una matrícula (alta=True) o desmatrícula en la fecha dada (por defecto, ahora).
+        Retorna False si no cambia nada (ya estaba matriculado o no lo estaba)."""
+        with self._lock:
+            alumno = self._codigo_alumno(alumno_id)
+            asignatura = self._codigo_asignatura(asignatura_id)
+            if (asignatura in self._vigentes_alumno[alumno]) == alta:
+                return False
+            self._anexar(self._marca(fecha), alumno, asignatura, alta)
+            return True
+    
+    def conectar(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio) -> None:
+        """Registra las matrículas actuales (el historial parte desde ahora) y se suscribe a los cambios."""
+        for alumno in repositorio_alumnos.obtener_todos():
+            self.sincronizar_alumno(alumno)
+        repositorio_alumnos.suscribir_cambios(self._registrar_cambio_alumno)
+        repositorio_asignaturas.suscribir_cambios(self._registrar_cambio_asignatura)
+    
+    def sincronizar_alumno(self, alumno: Alumno, fecha: Optional[datetime] = None) -> int:
+        """Registra las diferencias entre las matrículas del alumno y las vigentes en el historial.
+        Retorna la cantidad de cambios registrados."""
+        with self._lock:
+            codigo = self._codigo_alumno(alumno.id)
+            nuevas = {self._codigo_asignatura(asignatura_id) for asignatura_id in alumno.asignaturas_matriculadas}
+            vigentes = self._vigentes_alumno[codigo]
+            if nuevas == vigentes:
+                return 0
+            marca = self._marca(fecha)
+            bajas = vigentes - nuevas
+            altas = nuevas - vigentes
+            for asignatura in sorted(bajas):
+                self._anexar(marca, codigo, asignatura, False)
+            for asignatura in sorted(altas):
+                self._anexar(marca, codigo, asignatura, True)
+            return len(bajas) + len(altas)
+    
+    def cerrar_alumno(self, alumno_id: str, fecha: Optional[datetime] = None) -> int:
+        """Da de baja todas las matrículas vigentes del alumno (ej. al eliminarlo)."""
+        with self._lock:
+            codigo = self._codigos_alumnos.get(alumno_id)
+            if codigo is None or not self._vigentes_alumno[codigo]:
+                return 0
+            marca = self._marca(fecha)
+            asignaturas = sorted(self._vigentes_alumno[codigo])
+            for asignatura in asignaturas:
+                self._anexar(marca, codigo, asignatura, False)
+            return len(asignaturas)
+    
+    def cerrar_asignatura(self, asignatura_id: str, fecha: Optional[datetime] = None) -> int:
+        """Da de baja a todos los alumnos que siguen en la asignatura (ej. al eliminarla)."""
+        with self._lock:
+            codigo = self._codigos_asignaturas.get(asignatura_id)
+            if codigo is None or not self._nominas[codigo]:
+                return 0
+            marca = self._marca(fecha)
+            alumnos = sorted(self._nominas[codigo])
+            for alumno in alumnos:
+                self._anexar(marca, alumno, codigo, False)
+            return len(alumnos)
+    
+    def _registrar_cambio_alumno(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        if operacion == 'eliminar':
+            self.cerrar_alumno(id)
+        else:
+            self.sincronizar_alumno(alumno)
+    
+    def _registrar_cambio_asignatura(self, operacion: str, id: str, asignatura: Optional[Asignatura]) -> None:
+        if operacion == 'eliminar':
+            self.cerrar_asignatura(id)
+    
+    def _nomina_en(self, asignatura: int, posicion: int) -> Tuple[set, int]:
+        """Nómina de la asignatura antes del cambio 'posición' y cuántos cambios se aplicaron (requiere el lock)."""
+        # Checkpoints candidatos: el último en o antes de la posición y el siguiente (o el estado actual)
+        indice = bisect_right(self._posiciones_checkpoint, posicion)
+        anterior = self._checkpoints[indice - 1] if indice else None
+        inicio_anterior = anterior[0] if anterior is not None else 0
+        fin_siguiente = self._checkpoints[indice][0] if indice < len(self._checkpoints) else len(self._fechas)
+        posiciones = self._por_asignatura[asignatura]
+        if fin_siguiente - posicion < posicion - inicio_anterior:
+            # Hacia atrás: desde el checkpoint siguiente se deshacen los cambios en [posicion, siguiente)
+            if indice < len(self._checkpoints):
+                nomina = self._leer_checkpoint(self._checkpoints[indice], asignatura)
+            else:
+                nomina = set(self._nominas[asignatura])
+            desde, hasta = bisect_left(posiciones, posicion), bisect_left(posiciones, fin_siguiente)
+            for cambio in reversed(posiciones[desde:hasta]):
+                (nomina.discard if self._altas[cambio] else nomina.add)(self._alumnos[cambio])
+            return nomina, hasta - desde
+        # Hacia adelante: desde el checkpoint anterior (o vacío) se aplican los cambios en [anterior, posicion)
+        nomina = self._leer_checkpoint(anterior, asignatura) if anterior is not None else set()
+        desde, hasta = bisect_left(posiciones, inicio_anterior), bisect_left(posiciones, posicion)
+        for cambio in posiciones[desde:hasta]:
+            (nomina.add if self._altas[cambio] else nomina.discard)(self._alumnos[cambio])
+        return nomina, hasta - desde
+    
+    @staticmethod
+    def _leer_checkpoint(checkpoint: Tuple[int, array, array], asignatura: int) -> set:
+        _, inicios, alumnos = checkpoint
+        if asignatura + 1 >= len(inicios):
+            # La asignatura apareció después del checkpoint
+            return set()
+        return set(alumnos[inicios[asignatura]:inicios[asignatura + 1]])
+    
+    def obtener_nomina(self, asignatura_id: str, fecha: datetime) -> List[str]:
+        """Alumnos matriculados en la asignatura en la fecha dada (incluye los cambios de ese instante)."""
+        with self._lock:
+            codigo = self._codigos_asignaturas.get(asignatura_id)
+            if codigo is None:
+                return []
+            nomina, aplicados = self._nomina_en(codigo, bisect_right(self._fechas, fecha.timestamp()))
+            self._consultas += 1
+            self._cambios_aplicados += aplicados
+            self._maximo_aplicados = max(self._maximo_aplicados, aplicados)
+            return sorted(self._ids_alumnos[alumno] for alumno in nomina)
+    
+    def obtener_matriculas(self, alumno_id: str, fecha: datetime) -> List[str]:
+        """Asignaturas en que estaba matriculado el alumno en la fecha dada."""
+        with self._lock:
+            codigo = self._codigos_alumnos.get(alumno_id)
+            if codigo is None:
+                return []
+            posiciones = self._por_alumno[codigo]
+            asignaturas = set()
+            for cambio in posiciones[:bisect_left(posiciones, bisect_right(self._fechas, fecha.timestamp()))]:
+                (asignaturas.add if self._altas[cambio] else asignaturas.discard)(self._asignaturas[cambio])
+            return sorted(self._ids_asignaturas[asignatura] for asignatura in asignaturas)
+    
+    def obtener_linea_tiempo(self, alumno_id: str) -> List[Dict[str, Any]]:
+        """Períodos de matrícula del alumno: asignatura, desde y hasta (None si sigue vigente), por fecha de alta."""
+        with self._lock:
+            codigo = self._codigos_alumnos.get(alumno_id)
+            if codigo is None:
+                return []
+            tramos = []
+            abiertos: Dict[int, Dict[str, Any]] = {}
+            for cambio in self._por_alumno[codigo]:
+                asignatura = self._asignaturas[cambio]
+                fecha = datetime.fromtimestamp(self._fechas[cambio])
+                if self._altas[cambio]:
+                    abiertos[asignatura] = {'asignatura_id': self._ids_asignaturas[asignatura], 'desde': fecha, 'hasta': None}
+                    tramos.append(abiertos[asignatura])
+                else:
+                    abiertos.pop(asignatura)['hasta'] = fecha
+            return tramos
+    
+    def reconstruir_nomina_completa(self, asignatura_id: str, fecha: datetime) -> List[str]:
+        """Igual que obtener_nomina pero reproduciendo todos los cambios desde el inicio, sin checkpoints.
+        Sirve para verificar los checkpoints y como línea base de comparación."""
+        with self._lock:
+            codigo = self._codigos_asignaturas.get(asignatura_id)
+            if codigo is None:
+                return []
+            nomina = set()
+            for posicion in range(bisect_right(self._fechas, fecha.timestamp())):
+                if self._asignaturas[posicion] == codigo:
+                    (nomina.add if self._altas[posicion] else nomina.discard)(self._alumnos[posicion])
+            return sorted(self._ids_alumnos[alumno] for alumno in nomina)
+    
+    def obtener_estadisticas(self) -> Dict[str, Any]:
+        """Obtiene métricas del historial: cambios, checkpoints, rango de fechas, bytes en arreglos
+        y cambios aplicados por consulta de nómina (promedio y máximo)."""
+        with self._lock:
+            columnas = (self._fechas, self._alumnos, self._asignaturas, self._altas)
+            indices = self._por_alumno + self._por_asignatura
+            return {
+                'cambios': len(self._fechas),
+                'checkpoints': len(self._checkpoints),
+                'intervalo_checkpoint': self._intervalo,
+                'consultas_nomina': self._consultas,
+                'aplicados_promedio': round(self._cambios_aplicados / self._consultas, 1) if self._consultas else 0.0,
+                'aplicados_maximo': self._maximo_aplicados,
+                'alumnos': len(self._ids_alumnos),
+                'asignaturas': len(self._ids_asignaturas),
+                'desde': datetime.fromtimestamp(self._fechas[0]) if self._fechas else None,
+                'hasta': datetime.fromtimestamp(self._fechas[-1]) if self._fechas else None,
+                'bytes_cambios': sum(len(columna) * columna.itemsize for columna in columnas),
+                'bytes_indices': sum(len(posiciones) * posiciones.itemsize for posiciones in indices),
+                'bytes_checkpoints': sum(len(inicios) * inicios.itemsize + len(alumnos) * alumnos.itemsize
+                                         for _, inicios, alumnos in self._checkpoints)
+            }
@@ -0,0 +1,94 @@
+import threading
+from array import array
+from typing import List, Dict, Iterable, Tuple
+
+class HistorialSemestres:
+    """Historial compacto de las matrículas de períodos ya cerrados.
+    Principio SRP: Solo archiva y consulta matrículas pasadas; las vigentes siguen en los modelos.
+    Cada período se guarda en formato CSR con arreglos de enteros: para cada alumno la posición
+    de su fila, y para cada fila el tramo de códigos de asignatura que cursó."""
+    
+    def __init__(self):
+        self._codigos_alumnos: Dict[str, int] = {}
+        self._codigos_asignaturas: Dict[str, int] = {}
+        self._ids_asignaturas: List[str] = []
+        # periodo -> (fila por código de alumno (-1 = sin matrículas), inicio de cada fila, asignaturas)
+        self._periodos: Dict[str, Tuple[array, array, array]] = {}
+        self._lock = threading.Lock()
+    
+    def _codigo_alumno(self, alumno_id: str) -> int:
+        codigo = self._codigos_alumnos.get(alumno_id)
+        if codigo is None:
+            codigo = self._codigos_alumnos[alumno_id] = len(self._codigos_alumnos)
+        return codigo
+    
+    def _codigo_asignatura(self, asignatura_id: str) -> int:
+        codigo = self._codigos_asignaturas.get(asignatura_id)
+        if codigo is None:
+            codigo = self._codigos_asignaturas[asignatura_id] = len(self._ids_asignaturas)
+            self._ids_asignaturas.append(asignatura_id)
+        return codigo
+    
+    def archivar_periodo(self, periodo: str, matriculas: Iterable[Tuple[str, List[str]]]) -> int:
+        """Archiva las matrículas (alumno_id, asignaturas) de un período y retorna cuántas se guardaron.
+        Consume 'matriculas' una sola vez, así que puede ser un generador."""
+        with self._lock:
+            if periodo in self._periodos:
+                raise ValueError(f"El período ya está archivado: {periodo}")
+            filas = array('i')
+            inicios = array('I', [0])
+            asignaturas = array('I')
+            codigo_conocido = self._codigos_asignaturas.get
+            for alumno_id, asignaturas_alumno in matriculas:
+                codigo = self._codigo_alumno(alumno_id)
+                if codigo >= len(filas):
+                    filas.extend([-1] * (codigo + 1 - len(filas)))
+                filas[codigo] = len(inicios) - 1
+                # Casi siempre las asignaturas ya tienen código: se traducen con map, sin bucle en Python
+                codigos = list(map(codigo_conocido, asignaturas_alumno))
+                if None in codigos:
+                    codigos = [self._codigo_asignatura(asignatura_id) for asignatura_id in asignaturas_alumno]
+                asignaturas.extend(codigos)
+                inicios.append(len(asignaturas))
+            self._periodos[periodo] = (filas, inicios, asignaturas)
+            return len(asignaturas)
+    
+    def _leer(self, periodo: str, alumno_id: str) -> List[str]:
+        """Asignaturas de un alumno en un período (requiere el lock)."""
+        filas, inicios, asignaturas = self._periodos[periodo]
+        codigo = self._codigos_alumnos.get(alumno_id)
+        if codigo is None or codigo >= len(filas) or filas[codigo] < 0:
+            return []
+        fila = filas[codigo]
+        return [self._ids_asignaturas[codigo_asignatura] for codigo_asignatura in asignaturas[inicios[fila]:inicios[fila + 1]]]
+    
+    def obtener_asignaturas(self, alumno_id: str, periodo: str) -> List[str]:
+        """Obtiene las asignaturas que cursó un alumno en un período archivado."""
+        with self._lock:
+            if periodo not in self._periodos:
+                return []
+            return self._leer(periodo, alumno_id)
+    
+    def obtener_trayectoria(self, alumno_id: str) -> Dict[str, List[str]]:
+        """Obtiene, por período archivado (en orden de cierre), las asignaturas que cursó el alumno."""
+        with self._lock:
+            trayectoria = {}
+            for periodo in self._periodos:
+                asignaturas = self._leer(periodo, alumno_id)
+                if asignaturas:
+                    trayectoria[periodo] = asignaturas
+            return trayectoria
+    
+    def obtener_periodos(self) -> List[str]:
+        """Lista los períodos archivados en orden de cierre."""
+        return list(self._periodos)
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del historial: períodos, matrículas archivadas y bytes en arreglos."""
+        with self._lock:
+            arreglos = [arreglo for datos in self._periodos.values() for arreglo in datos]
+            return {
+                'periodos': len(self._periodos),
+                'matriculas': sum(len(datos[2]) for datos in self._periodos.values()),
+                'bytes': sum(len(arreglo) * arreglo.itemsize for arreglo in arreglos)
+            }
\ No newline at end of file
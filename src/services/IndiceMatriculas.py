@@ -0,0 +1,175 @@
+import threading
+from typing import List, Optional, Dict, Iterable
+from interfaces.IRepositorio import IRepositorio
+from models.Alumno import Alumno
+from models.Asignatura import Asignatura
+from utils.MapaBits import MapaBits
+
+class IndiceMatriculas:
+    """Índice de matrículas como mapas de bits comprimidos, para consultas de conjuntos.
+    Principio SRP: Solo responde preguntas de pertenencia; las matrículas siguen viviendo en los modelos.
+    Cada alumno y cada asignatura reciben un índice denso; por asignatura se guarda el mapa de
+    alumnos matriculados y por alumno el mapa de sus asignaturas, de modo que intersección,
+    unión, diferencia y conteos se resuelven con operaciones de bits."""
+    
+    def __init__(self):
+        self._indices_alumnos: Dict[str, int] = {}
+        self._ids_alumnos: List[Optional[str]] = []
+        self._indices_asignaturas: Dict[str, int] = {}
+        self._ids_asignaturas: List[Optional[str]] = []
+        self._alumnos_por_asignatura: Dict[str, MapaBits] = {}
+        self._asignaturas_por_alumno: Dict[str, MapaBits] = {}
+        self._lock = threading.RLock()
+    
+    def _indice(self, indices: Dict[str, int], ids: List[Optional[str]], id: str) -> int:
+        indice = indices.get(id)
+        if indice is None:
+            indice = indices[id] = len(ids)
+            ids.append(id)
+        return indice
+    
+    def conectar(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio) -> None:
+        """Carga las matrículas actuales y se suscribe a los cambios de ambos repositorios."""
+        self.reconstruir(repositorio_alumnos)
+        repositorio_alumnos.suscribir_cambios(self._registrar_cambio_alumno)
+        repositorio_asignaturas.suscribir_cambios(self._registrar_cambio_asignatura)
+    
+    def reconstruir(self, repositorio_alumnos: IRepositorio) -> None:
+        """Reconstruye el índice desde las matrículas registradas en los alumnos."""
+        with self._lock:
+            self._alumnos_por_asignatura.clear()
+            self._asignaturas_por_alumno.clear()
+            for alumno in repositorio_alumnos.obtener_todos():
+                self.sincronizar_alumno(alumno)
+    
+    def sincronizar_alumno(self, alumno: Alumno) -> None:
+        """Aplica al índice solo las diferencias entre las matrículas del alumno y lo indexado."""
+        with self._lock:
+            indice_alumno = self._indice(self._indices_alumnos, self._ids_alumnos, alumno.id)
+            actuales = self._asignaturas_por_alumno.get(alumno.id)
+            nuevas = {self._indice(self._indices_asignaturas, self._ids_asignaturas, asignatura_id): asignatura_id
+                      for asignatura_id in alumno.asignaturas_matriculadas}
+            anteriores = list(actuales) if actuales is not None else []
+            for indice_asignatura in anteriores:
+                if indice_asignatura not in nuevas:
+                    self._quitar(indice_alumno, self._ids_asignaturas[indice_asignatura], indice_asignatura)
+            for indice_asignatura, asignatura_id in nuevas.items():
+                if actuales is None or indice_asignatura not in actuales:
+                    self._alumnos_por_asignatura.setdefault(asignatura_id, MapaBits()).agregar(indice_alumno)
+                    self._asignaturas_por_alumno.setdefault(alumno.id, MapaBits()).agregar(indice_asignatura)
+    
+    def _quitar(self, indice_alumno: int, asignatura_id: str, indice_asignatura: int) -> None:
+        """Quita una matrícula de ambos mapas (requiere el lock)."""
+        alumnos = self._alumnos_por_asignatura.get(asignatura_id)
+        if alumnos is not None:
+            alumnos.quitar(indice_alumno)
+            if not len(alumnos):
+                del self._alumnos_por_asignatura[asignatura_id]
+        alumno_id = self._ids_alumnos[indice_alumno]
+        asignaturas = self._asignaturas_por_alumno.get(alumno_id)
+        if asignaturas is not None:
+            asignaturas.quitar(indice_asignatura)
+            if not len(asignaturas):
+                del self._asignaturas_por_alumno[alumno_id]
+    
+    def eliminar_alumno(self, alumno_id: str) -> None:
+        """Quita al alumno de todas las asignaturas."""
+        with self._lock:
+            indice_alumno = self._indices_alumnos.get(alumno_id)
+            asignaturas = self._asignaturas_por_alumno.get(alumno_id)
+            if indice_alumno is None or asignaturas is None:
+                return
+            for indice_asignatura in list(asignaturas):
+                self._quitar(indice_alumno, self._ids_asignaturas[indice_asignatura], indice_asignatura)
+    
+    def eliminar_asignatura(self, asignatura_id: str) -> None:
+        """Quita a todos los alumnos de una asignatura."""
+        with self._lock:
+            indice_asignatura = self._indices_asignaturas.get(asignatura_id)
+            alumnos = self._alumnos_por_asignatura.get(asignatura_id)
+            if indice_asignatura is None or alumnos is None:
+                return
+            for indice_alumno in list(alumnos):
+                self._quitar(indice_alumno, asignatura_id, indice_asignatura)
+    
+    def _registrar_cambio_alumno(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        if operacion == 'eliminar':
+            self.eliminar_alumno(id)
+        else:
+            self.sincronizar_alumno(alumno)
+    
+    def _registrar_cambio_asignatura(self, operacion: str, id: str, asignatura: Optional[Asignatura]) -> None:
+        if operacion == 'eliminar':
+            self.eliminar_asignatura(id)
+    
+    def alumnos_de(self, asignatura_id: str) -> MapaBits:
+        """Mapa de los alumnos matriculados en la asignatura (copia; vacío si no existe)."""
+        with self._lock:
+            alumnos = self._alumnos_por_asignatura.get(asignatura_id)
+            return alumnos.copiar() if alumnos is not None else MapaBits()
+    
+    def consultar(self, todas: Iterable[str] = (), alguna: Iterable[str] = (), ninguna: Iterable[str] = ()) -> MapaBits:
+        """Alumnos matriculados en todas las asignaturas de 'todas', en al menos una de 'alguna'
+        y en ninguna de 'ninguna'. Se requiere 'todas' o 'alguna'."""
+        todas, alguna, ninguna = list(todas), list(alguna), list(ninguna)
+        if not todas and not alguna:
+            raise ValueError("Se requiere al menos una asignatura en 'todas' o 'alguna'")
+        with self._lock:
+            vacio = MapaBits()
+            mapas_todas = sorted((self._alumnos_por_asignatura.get(id, vacio) for id in todas), key=len)
+            resultado = None
+            # Se intersecta primero lo más pequeño para que los resultados intermedios se achiquen
+            for mapa in mapas_todas:
+                resultado = mapa.copiar() if resultado is None else resultado & mapa
+                if not len(resultado):
+                    return resultado
+            if alguna:
+                union = MapaBits()
+                for id in alguna:
+                    union = union | self._alumnos_por_asignatura.get(id, vacio)
+                resultado = union if resultado is None else resultado & union
+            for id in ninguna:
+                excluidos = self._alumnos_por_asignatura.get(id)
+                if excluidos is not None:
+                    resultado = resultado - excluidos
+            return resultado
+    
+    def contar(self, todas: Iterable[str] = (), alguna: Iterable[str] = (), ninguna: Iterable[str] = ()) -> int:
+        """Cantidad de alumnos que cumplen la consulta, sin construir la lista de IDs."""
+        todas, alguna, ninguna = list(todas), list(alguna), list(ninguna)
+        if len(todas) == 2 and not alguna and not ninguna:
+            with self._lock:
+                primera = self._alumnos_por_asignatura.get(todas[0])
+                segunda = self._alumnos_por_asignatura.get(todas[1])
+                return primera.contar_interseccion(segunda) if primera is not None and segunda is not None else 0
+        return len(self.consultar(todas, alguna, ninguna))
+    
+    def a_ids(self, mapa: MapaBits) -> List[str]:
+        """Traduce un mapa de alumnos a sus IDs."""
+        with self._lock:
+            return [self._ids_alumnos[indice] for indice in mapa]
+    
+    def asignaturas_compartidas(self, alumno_id: str, otro_id: str) -> List[str]:
+        """Asignaturas en que ambos alumnos están matriculados."""
+        with self._lock:
+            propias = self._asignaturas_por_alumno.get(alumno_id)
+            ajenas = self._asignaturas_por_alumno.get(otro_id)
+            if propias is None or ajenas is None:
+                return []
+            return [self._ids_asignaturas[indice] for indice in propias & ajenas]
+    
+    def contar_asignaturas_compartidas(self, alumno_id: str, otro_id: str) -> int:
+        """Cantidad de asignaturas en común entre dos alumnos."""
+        with self._lock:
+            propias = self._asignaturas_por_alumno.get(alumno_id)
+            ajenas = self._asignaturas_por_alumno.get(otro_id)
+            return propias.contar_interseccion(ajenas) if propias is not None and ajenas is not None else 0
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del índice: alumnos y asignaturas indexados y matrículas."""
+        with self._lock:
+            return {
+                'alumnos': len(self._asignaturas_por_alumno),
+                'asignaturas': len(self._alumnos_por_asignatura),
+                'matriculas': sum(len(mapa) for mapa in self._alumnos_por_asignatura.values())
+            }
\ No newline at end of file
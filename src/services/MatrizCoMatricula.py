@@ -0,0 +1,121 @@
+import heapq
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, combinations
+from typing import List, Optional, Dict, Tuple
+from interfaces.IRepositorio import IRepositorio
+from models.Alumno import Alumno
+
+def contar_pares(listas_asignaturas: List[Tuple[str, ...]]) -> Counter:
+    """Cuenta, para cada par de asignaturas, cuántas listas las contienen a ambas.
+    Las listas deben venir ordenadas y sin repetidos, para que cada par tenga una sola clave."""
+    return Counter(chain.from_iterable(combinations(asignaturas, 2) for asignaturas in listas_asignaturas))
+
+class MatrizCoMatricula:
+    """Matriz dispersa de co-matrícula: cuántos alumnos comparten cada par de asignaturas.
+    Principio SRP: Solo mantiene los conteos por par; las matrículas siguen viviendo en los modelos.
+    Solo se guardan los pares con alumnos en común, en ambos sentidos, para responder tanto
+    los pares más concurridos como las asignaturas más cercanas a una dada."""
+    
+    def __init__(self):
+        # asignatura_id -> {otra_asignatura_id: alumnos en común}
+        self._vecinos: Dict[str, Dict[str, int]] = {}
+        # Última versión indexada de las matrículas de cada alumno (tupla ordenada)
+        self._matriculas: Dict[str, Tuple[str, ...]] = {}
+        self._lock = threading.Lock()
+    
+    def conectar_repositorio(self, repositorio_alumnos: IRepositorio, procesos: int = 1) -> None:
+        """Construye la matriz y se suscribe a los cambios del repositorio de alumnos."""
+        self.reconstruir(repositorio_alumnos, procesos)
+        repositorio_alumnos.suscribir_cambios(self._registrar_cambio)
+    
+    def _sumar(self, asignatura_id: str, otra_id: str, delta: int) -> None:
+        """Ajusta un par en ambos sentidos y quita las celdas que quedan en cero (requiere el lock)."""
+        for origen, destino in ((asignatura_id, otra_id), (otra_id, asignatura_id)):
+            fila = self._vecinos.setdefault(origen, {})
+            valor = fila.get(destino, 0) + delta
+            if valor > 0:
+                fila[destino] = valor
+            else:
+                fila.pop(destino, None)
+                if not fila:
+                    del self._vecinos[origen]
+    
+    def sincronizar_alumno(self, alumno_id: str, asignaturas: List[str]) -> None:
+        """Aplica solo los pares que cambian entre las matrículas indexadas y las actuales del alumno."""
+        nuevas = frozenset(asignaturas)
+        with self._lock:
+            anteriores = frozenset(self._matriculas.get(alumno_id, ()))
+            if nuevas == anteriores:
+                return
+            quitadas, agregadas = anteriores - nuevas, nuevas - anteriores
+            # Pares que pierde: cada quitada con las que tenía; pares que gana: cada agregada con las que tiene
+            for asignatura_id in quitadas:
+                for otra_id in anteriores:
+                    if otra_id != asignatura_id and (otra_id not in quitadas or asignatura_id < otra_id):
+                        self._sumar(asignatura_id, otra_id, -1)
+            for asignatura_id in agregadas:
+                for otra_id in nuevas:
+                    if otra_id != asignatura_id and (otra_id not in agregadas or asignatura_id < otra_id):
+                        self._sumar(asignatura_id, otra_id, 1)
+            if nuevas:
+                self._matriculas[alumno_id] = tuple(sorted(nuevas))
+            else:
+                self._matriculas.pop(alumno_id, None)
+    
+    def _registrar_cambio(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        self.sincronizar_alumno(id, alumno.asignaturas_matriculadas if alumno is not None else [])
+    
+    def reconstruir(self, repositorio_alumnos: IRepositorio, procesos: int = 1) -> None:
+        """Recalcula la matriz completa. Con procesos > 1 reparte los alumnos entre varios
+        procesos (cada uno cuenta sus pares) y luego suma los resultados parciales."""
+        matriculas = {}
+        for alumno in repositorio_alumnos.obtener_todos():
+            asignaturas = alumno.asignaturas_matriculadas
+            if asignaturas:
+                matriculas[alumno.id] = tuple(sorted(set(asignaturas)))
+        listas = [asignaturas for asignaturas in matriculas.values() if len(asignaturas) > 1]
+        procesos = max(1, min(procesos, os.cpu_count() or 1, len(listas)))
+        if procesos == 1:
+            conteos = contar_pares(listas)
+        else:
+            tamano = -(-len(listas) // procesos)
+            conteos = Counter()
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                for parcial in ejecutor.map(contar_pares, [listas[i:i + tamano] for i in range(0, len(listas), tamano)]):
+                    conteos.update(parcial)
+        vecinos: Dict[str, Dict[str, int]] = {}
+        for (asignatura_id, otra_id), cantidad in conteos.items():
+            vecinos.setdefault(asignatura_id, {})[otra_id] = cantidad
+            vecinos.setdefault(otra_id, {})[asignatura_id] = cantidad
+        with self._lock:
+            self._vecinos = vecinos
+            self._matriculas = matriculas
+    
+    def obtener_conteo(self, asignatura_id: str, otra_id: str) -> int:
+        """Cantidad de alumnos matriculados en ambas asignaturas."""
+        return self._vecinos.get(asignatura_id, {}).get(otra_id, 0)
+    
+    def obtener_pares_principales(self, k: int = 10) -> List[Tuple[str, str, int]]:
+        """Obtiene los k pares de asignaturas que comparten más alumnos."""
+        with self._lock:
+            return heapq.nlargest(k, ((asignatura_id, otra_id, cantidad)
+                                      for asignatura_id, fila in self._vecinos.items()
+                                      for otra_id, cantidad in fila.items() if asignatura_id < otra_id),
+                                  key=lambda par: par[2])
+    
+    def obtener_asignaturas_relacionadas(self, asignatura_id: str, k: int = 10) -> List[Tuple[str, int]]:
+        """Obtiene las k asignaturas con más alumnos en común con la indicada."""
+        with self._lock:
+            return heapq.nlargest(k, self._vecinos.get(asignatura_id, {}).items(), key=lambda par: par[1])
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas de la matriz: asignaturas, pares no nulos y alumnos indexados."""
+        with self._lock:
+            return {
+                'asignaturas': len(self._vecinos),
+                'pares': sum(len(fila) for fila in self._vecinos.values()) // 2,
+                'alumnos': len(self._matriculas)
+            }
\ No newline at end of file
@@ -0,0 +1,208 @@
+import threading
+from array import array
+from collections import Counter
+from typing import List, Optional, Dict, Any, Tuple
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IEstudiante import IEstudiante
+from models.Alumno import Alumno
+
+# Columnas proyectadas: nombre -> (tipo de arreglo, es categórica)
+COLUMNAS = {
+    'carrera': ('H', True),
+    'tipo': ('B', True),
+    'semestre_actual': ('H', False),
+    'anio_ingreso': ('H', False),
+    'matriculas': ('H', False),
+}
+
+# Columnas numéricas donde 0 significa "sin dato" (ej. titulados sin semestre)
+SIN_DATO_CERO = ('semestre_actual', 'anio_ingreso')
+
+class MotorAnaliticas:
+    """Reportes agrupados (conteos, promedios y percentiles) sobre atributos de los alumnos.
+    Principio SRP: Solo calcula agregaciones; los datos siguen viviendo en el repositorio.
+    Proyecta una vez los atributos necesarios en arreglos por columna y los mantiene al día
+    con las notificaciones del repositorio. Los índices de grupos se guardan en caché y solo
+    se invalidan cuando cambia una de sus columnas."""
+    
+    def __init__(self, repositorio_alumnos: IRepositorio):
+        self._columnas: Dict[str, array] = {nombre: array(codigo) for nombre, (codigo, _) in COLUMNAS.items()}
+        # Diccionarios de las columnas categóricas (código 0 = sin valor)
+        self._codigos: Dict[str, Dict[str, int]] = {nombre: {} for nombre, (_, categorica) in COLUMNAS.items() if categorica}
+        self._valores: Dict[str, List[Optional[str]]] = {nombre: [None] for nombre in self._codigos}
+        self._vivas = array('B')
+        self._filas: Dict[str, int] = {}
+        self._eliminadas = 0
+        # tupla de columnas -> {clave de códigos: filas}
+        self._grupos: Dict[Tuple[str, ...], Dict[tuple, array]] = {}
+        self._lock = threading.RLock()
+        for alumno in repositorio_alumnos.obtener_todos():
+            self._agregar_fila(alumno)
+        repositorio_alumnos.suscribir_cambios(self._registrar_cambio)
+    
+    def _proyectar(self, alumno: Alumno) -> Dict[str, int]:
+        """Obtiene los valores (ya codificados) de las columnas para un alumno."""
+        tipo = alumno.obtener_tipo_estudiante() if isinstance(alumno, IEstudiante) else None
+        return {
+            'carrera': self._codificar('carrera', getattr(alumno, 'carrera', None)),
+            'tipo': self._codificar('tipo', tipo),
+            'semestre_actual': getattr(alumno, 'semestre_actual', 0) or 0,
+            'anio_ingreso': alumno.fecha_ingreso.year if alumno.fecha_ingreso else 0,
+            'matriculas': len(alumno.asignaturas_matriculadas),
+        }
+    
+    def _codificar(self, columna: str, valor: Optional[str]) -> int:
+        if valor is None:
+            return 0
+        codigos = self._codigos[columna]
+        codigo = codigos.get(valor)
+        if codigo is None:
+            codigo = codigos[valor] = len(self._valores[columna])
+            self._valores[columna].append(valor)
+        return codigo
+    
+    def _agregar_fila(self, alumno: Alumno) -> None:
+        valores = self._proyectar(alumno)
+        self._filas[alumno.id] = len(self._vivas)
+        for nombre, columna in self._columnas.items():
+            columna.append(valores[nombre])
+        self._vivas.append(1)
+    
+    def _registrar_cambio(self, operacion: str, id: str, alumno: Optional[Alumno]) -> None:
+        with self._lock:
+            fila = self._filas.get(id)
+            if operacion == 'eliminar':
+                if fila is not None:
+                    del self._filas[id]
+                    self._vivas[fila] = 0
+                    self._eliminadas += 1
+                    self._grupos.clear()
+                    if self._eliminadas * 4 > len(self._vivas):
+                        self._compactar()
+            elif fila is None:
+                self._agregar_fila(alumno)
+                self._grupos.clear()
+            else:
+                # Actualización en su lugar; solo se invalidan los grupos de las columnas que cambiaron
+                for nombre, valor in self._proyectar(alumno).items():
+                    columna = self._columnas[nombre]
+                    if columna[fila] != valor:
+                        columna[fila] = valor
+                        for clave in [clave for clave in self._grupos if nombre in clave]:
+                            del self._grupos[clave]
+    
+    def _compactar(self) -> None:
+        """Quita las filas eliminadas de todas las columnas (requiere el lock)."""
+        vivas = self._vivas
+        for nombre, columna in self._columnas.items():
+            self._columnas[nombre] = array(columna.typecode, (valor for valor, viva in zip(columna, vivas) if viva))
+        orden = sorted(self._filas.items(), key=lambda par: par[1])
+        self._filas = {id: posicion for posicion, (id, _) in enumerate(orden)}
+        self._vivas = array('B', [1]) * len(self._filas)
+        self._eliminadas = 0
+    
+    def _obtener_grupos(self, por: Tuple[str, ...]) -> Dict[tuple, array]:
+        """Índice de filas por combinación de códigos de las columnas 'por' (en caché)."""
+        grupos = self._grupos.get(por)
+        if grupos is not None:
+            return grupos
+        grupos = {}
+        claves = zip(*(self._columnas[nombre] for nombre in por)) if por else iter(lambda: (), None)
+        if self._eliminadas:
+            for fila, (clave, viva) in enumerate(zip(claves, self._vivas)):
+                if viva:
+                    filas = grupos.get(clave)
+                    if filas is None:
+                        filas = grupos[clave] = array('I')
+                    filas.append(fila)
+        else:
+            for fila, clave in zip(range(len(self._vivas)), claves):
+                filas = grupos.get(clave)
+                if filas is None:
+                    filas = grupos[clave] = array('I')
+                filas.append(fila)
+        self._grupos[por] = grupos
+        return grupos
+    
+    def _decodificar(self, columna: str, codigo: int) -> Any:
+        if columna in self._valores:
+            return self._valores[columna][codigo]
+        if columna in SIN_DATO_CERO and codigo == 0:
+            return None
+        return codigo
+    
+    def agrupar(self, por: List[str], medida: Optional[str] = None, percentiles: Tuple[int, ...] = (50, 90),
+                filtros: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Agrupa a los alumnos por las columnas indicadas y calcula, por grupo, la cantidad y,
+        si se indica una medida numérica, su promedio, mínimo, máximo y percentiles.
+        Los filtros seleccionan filas por igualdad (ej. {'tipo': 'Estudiante Pregrado'})."""
+        filtros = filtros or {}
+        for nombre in list(por) + list(filtros) + ([medida] if medida else []):
+            if nombre not in COLUMNAS:
+                raise ValueError(f"Columna desconocida: {nombre}")
+        if medida is not None and COLUMNAS[medida][1]:
+            raise ValueError(f"La medida debe ser numérica: {medida}")
+        
+        with self._lock:
+            columnas_filtro = tuple(nombre for nombre in filtros if nombre not in por)
+            clave_grupos = tuple(por) + columnas_filtro
+            grupos = self._obtener_grupos(clave_grupos)
+            # Códigos buscados por cada filtro; un valor desconocido no coincide con nada
+            buscados = {}
+            for nombre, valor in filtros.items():
+                if nombre in self._codigos:
+                    buscados[nombre] = self._codigos[nombre].get(valor, -1)
+                else:
+                    buscados[nombre] = 0 if valor is None else valor
+            posiciones = {nombre: posicion for posicion, nombre in enumerate(clave_grupos)}
+            
+            # Unir los grupos que solo difieren en las columnas de filtro
+            seleccion: Dict[tuple, List[array]] = {}
+            for clave, filas in grupos.items():
+                if all(clave[posiciones[nombre]] == codigo for nombre, codigo in buscados.items()):
+                    seleccion.setdefault(clave[:len(por)], []).append(filas)
+            
+            resultado = []
+            valores_medida = self._columnas[medida] if medida else None
+            for clave, listas_filas in seleccion.items():
+                fila_resultado = {nombre: self._decodificar(nombre, codigo) for nombre, codigo in zip(por, clave)}
+                fila_resultado['cantidad'] = sum(len(filas) for filas in listas_filas)
+                if valores_medida is not None:
+                    fila_resultado.update(self._resumir(medida, valores_medida, listas_filas, percentiles))
+                resultado.append(fila_resultado)
+        resultado.sort(key=lambda fila: tuple((valor is None, str(valor)) for valor in (fila[nombre] for nombre in por)))
+        return resultado
+    
+    @staticmethod
+    def _resumir(medida: str, columna: array, listas_filas: List[array], percentiles: Tuple[int, ...]) -> Dict[str, Any]:
+        """Calcula promedio, mínimo, máximo y percentiles (rango más cercano) de la medida.
+        Las columnas numéricas tienen pocos valores distintos, así que se usa un histograma
+        (conteo en C con Counter) en vez de ordenar todas las filas."""
+        histograma: Counter = Counter()
+        for filas in listas_filas:
+            histograma.update(map(columna.__getitem__, filas))
+        if medida in SIN_DATO_CERO:
+            histograma.pop(0, None)
+        cantidad = sum(histograma.values())
+        if not cantidad:
+            return {'promedio': None, 'minimo': None, 'maximo': None, **{f"p{p}": None for p in percentiles}}
+        valores = sorted(histograma)
+        resumen = {
+            'promedio': round(sum(valor * histograma[valor] for valor in valores) / cantidad, 4),
+            'minimo': valores[0],
+            'maximo': valores[-1]
+        }
+        for percentil in percentiles:
+            rango = max(-(-percentil * cantidad // 100), 1)
+            acumulado = 0
+            for valor in valores:
+                acumulado += histograma[valor]
+                if acumulado >= rango:
+                    resumen[f"p{percentil}"] = valor
+                    break
+        return resumen
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas de la proyección: filas vivas, eliminadas y grupos en caché."""
+        with self._lock:
+            return {'filas': len(self._filas), 'filas_eliminadas': self._eliminadas, 'agrupaciones_en_cache': len(self._grupos)}
\ No newline at end of file
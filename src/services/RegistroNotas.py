@@ -0,0 +1,354 @@
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from operator import mul
+from typing import List, Optional, Dict, Any, Tuple, Iterable
+
+# Escala de notas: de 1.0 a 7.0, se aprueba con 4.0. Se guardan en décimas (10 a 70)
+NOTA_MINIMA = 1.0
+NOTA_MAXIMA = 7.0
+NOTA_APROBACION = 4.0
+DECIMAS_MINIMA = 10
+VALORES_NOTA = 61
+MAXIMO_CREDITOS = 255
+
+# Entrada de un alumno: [código de asignatura (20 bits)][código de período (12 bits)][fila (32 bits)]
+BITS_PERIODO = 12
+BITS_FILA = 32
+MASCARA_FILA = (1 << BITS_FILA) - 1
+MAXIMO_ASIGNATURAS = 1 << 20
+MAXIMO_PERIODOS = 1 << BITS_PERIODO
+
+def _a_decimas(nota: float) -> int:
+    if not NOTA_MINIMA <= nota <= NOTA_MAXIMA:
+        raise ValueError(f"Nota fuera de la escala ({NOTA_MINIMA} a {NOTA_MAXIMA}): {nota}")
+    return round(nota * 10)
+
+def _validar_creditos(creditos: int) -> int:
+    if not 0 <= creditos <= MAXIMO_CREDITOS:
+        raise ValueError(f"Créditos inválidos: {creditos}")
+    return creditos
+
+class RegistroNotas:
+    """Notas por (alumno, asignatura, período) con promedio ponderado y distribuciones al día.
+    Principio SRP: Solo guarda notas y sus agregados; qué significa aprobar lo decide el gestor.
+    Las notas viven en columnas de arreglos (una fila por nota, en décimas) y cada alumno tiene
+    un arreglo ordenado de entradas que apuntan a sus filas. Cada escritura ajusta en O(1) la
+    suma ponderada por créditos del alumno y el histograma de la asignatura; recalcular y
+    auditar rehacen esos agregados con una pasada sobre las columnas."""
+    
+    def __init__(self):
+        self._codigos_alumnos: Dict[str, int] = {}
+        self._ids_alumnos: List[str] = []
+        self._codigos_asignaturas: Dict[str, int] = {}
+        self._ids_asignaturas: List[str] = []
+        self._codigos_periodos: Dict[str, int] = {}
+        self._periodos: List[str] = []
+        # Columnas por fila; nota y créditos 0 = fila anulada (alumno eliminado), se descartan al compactar
+        self._alumno = array('I')
+        self._asignatura = array('I')
+        self._periodo = array('H')
+        self._nota = array('B')
+        self._creditos = array('B')
+        self._anuladas = 0
+        # código de alumno -> entradas ordenadas (ver BITS_FILA), None si no tiene notas
+        self._entradas: List[Optional[array]] = []
+        # Por código de alumno: suma de décimas x créditos y créditos calificados
+        self._puntos = array('Q')
+        self._creditos_calificados = array('I')
+        # VALORES_NOTA contadores (décimas 10 a 70) por código de asignatura
+        self._histogramas = array('I')
+        self._lock = threading.RLock()
+    
+    def _codigo_alumno(self, alumno_id: str) -> int:
+        codigo = self._codigos_alumnos.get(alumno_id)
+        if codigo is None:
+            codigo = self._codigos_alumnos[alumno_id] = len(self._ids_alumnos)
+            self._ids_alumnos.append(alumno_id)
+            self._entradas.append(None)
+            self._puntos.append(0)
+            self._creditos_calificados.append(0)
+        return codigo
+    
+    def _codigo_asignatura(self, asignatura_id: str) -> int:
+        codigo = self._codigos_asignaturas.get(asignatura_id)
+        if codigo is None:
+            if len(self._ids_asignaturas) >= MAXIMO_ASIGNATURAS:
+                raise ValueError("Se alcanzó el máximo de asignaturas con notas")
+            codigo = self._codigos_asignaturas[asignatura_id] = len(self._ids_asignaturas)
+            self._ids_asignaturas.append(asignatura_id)
+            self._histogramas.extend(array('I', [0]) * VALORES_NOTA)
+        return codigo
+    
+    def _codigo_periodo(self, periodo: str) -> int:
+        codigo = self._codigos_periodos.get(periodo)
+        if codigo is None:
+            if len(self._periodos) >= MAXIMO_PERIODOS:
+                raise ValueError("Se alcanzó el máximo de períodos con notas")
+            codigo = self._codigos_periodos[periodo] = len(self._periodos)
+            self._periodos.append(periodo)
+        return codigo
+    
+    @staticmethod
+    def _buscar(entradas: array, clave: int) -> Tuple[int, int]:
+        """Posición de la clave (asignatura, período) en las entradas y su fila (-1 si no está)."""
+        posicion = bisect_left(entradas, clave << BITS_FILA)
+        if posicion < len(entradas) and entradas[posicion] >> BITS_FILA == clave:
+            return posicion, entradas[posicion] & MASCARA_FILA
+        return posicion, -1
+    
+    def _ajustar(self, alumno: int, asignatura: int, decimas: int, creditos: int, signo: int) -> None:
+        self._puntos[alumno] += signo * decimas * creditos
+        self._creditos_calificados[alumno] += signo * creditos
+        self._histogramas[asignatura * VALORES_NOTA + decimas - DECIMAS_MINIMA] += signo
+    
+    def _agregar_fila(self, alumno: int, asignatura: int, periodo: int, decimas: int, creditos: int) -> int:
+        fila = len(self._nota)
+        self._alumno.append(alumno)
+        self._asignatura.append(asignatura)
+        self._periodo.append(periodo)
+        self._nota.append(decimas)
+        self._creditos.append(creditos)
+        self._ajustar(alumno, asignatura, decimas, creditos, 1)
+        return fila
+    
+    def _reemplazar(self, fila: int, decimas: int, creditos: int) -> int:
+        """Corrige la nota de una fila existente y retorna la anterior en décimas."""
+        alumno, asignatura, anterior = self._alumno[fila], self._asignatura[fila], self._nota[fila]
+        self._ajustar(alumno, asignatura, anterior, self._creditos[fila], -1)
+        self._nota[fila] = decimas
+        self._creditos[fila] = creditos
+        self._ajustar(alumno, asignatura, decimas, creditos, 1)
+        return anterior
+    
+    def registrar(self, alumno_id: str, asignatura_id: str, periodo: str, nota: float, creditos: int) -> Optional[float]:
+        """Registra (o corrige) la nota de un alumno en una asignatura y período, ponderada por los créditos.
+        Retorna la nota anterior, o None si es nueva."""
+        decimas = _a_decimas(nota)
+        _validar_creditos(creditos)
+        with self._lock:
+            alumno = self._codigo_alumno(alumno_id)
+            clave = self._codigo_asignatura(asignatura_id) << BITS_PERIODO | self._codigo_periodo(periodo)
+            entradas = self._entradas[alumno]
+            if entradas is None:
+                entradas = self._entradas[alumno] = array('Q')
+            posicion, fila = self._buscar(entradas, clave)
+            if fila >= 0:
+                return self._reemplazar(fila, decimas, creditos) / 10
+            fila = self._agregar_fila(alumno, clave >> BITS_PERIODO, clave & (MAXIMO_PERIODOS - 1), decimas, creditos)
+            entradas.insert(posicion, clave << BITS_FILA | fila)
+            return None
+    
+    def registrar_lote(self, notas: Iterable[Tuple[str, str, str, float]], creditos: Dict[str, int]) -> int:
+        """Registra un lote de notas (alumno_id, asignatura_id, periodo, nota) con los créditos de cada
+        asignatura y retorna cuántas se escribieron. Valida todo el lote antes de escribir: una nota
+        fuera de escala o una asignatura sin créditos lanza ValueError sin modificar nada.
+        Las entradas de cada alumno se ordenan una sola vez al final, en vez de insertar una a una."""
+        validadas = []
+        for alumno_id, asignatura_id, periodo, nota in notas:
+            if asignatura_id not in creditos:
+                raise ValueError(f"Faltan los créditos de la asignatura: {asignatura_id}")
+            validadas.append((alumno_id, asignatura_id, periodo, _a_decimas(nota), _validar_creditos(creditos[asignatura_id])))
+        with self._lock:
+            # código de alumno -> {clave: fila} de las filas nuevas de este lote
+            nuevas: Dict[int, Dict[int, int]] = {}
+            for alumno_id, asignatura_id, periodo, decimas, creditos_asignatura in validadas:
+                alumno = self._codigo_alumno(alumno_id)
+                asignatura = self._codigo_asignatura(asignatura_id)
+                codigo_periodo = self._codigo_periodo(periodo)
+                clave = asignatura << BITS_PERIODO | codigo_periodo
+                nuevas_alumno = nuevas.setdefault(alumno, {})
+                fila = nuevas_alumno.get(clave, -1)
+                if fila < 0 and self._entradas[alumno]:
+                    fila = self._buscar(self._entradas[alumno], clave)[1]
+                if fila >= 0:
+                    self._reemplazar(fila, decimas, creditos_asignatura)
+                else:
+                    nuevas_alumno[clave] = self._agregar_fila(alumno, asignatura, codigo_periodo, decimas, creditos_asignatura)
+            for alumno, nuevas_alumno in nuevas.items():
+                if nuevas_alumno:
+                    agregadas = [clave << BITS_FILA | fila for clave, fila in nuevas_alumno.items()]
+                    self._entradas[alumno] = array('Q', sorted(chain(self._entradas[alumno] or (), agregadas)))
+        return len(validadas)
+    
+    def eliminar_alumno(self, alumno_id: str) -> None:
+        """Descarta las notas de un alumno eliminado (y las quita de las distribuciones)."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            if alumno is None or not self._entradas[alumno]:
+                return
+            for entrada in self._entradas[alumno]:
+                fila = entrada & MASCARA_FILA
+                self._histogramas[self._asignatura[fila] * VALORES_NOTA + self._nota[fila] - DECIMAS_MINIMA] -= 1
+                self._nota[fila] = 0
+                self._creditos[fila] = 0
+                self._anuladas += 1
+            self._entradas[alumno] = None
+            self._puntos[alumno] = 0
+            self._creditos_calificados[alumno] = 0
+            if self._anuladas * 4 > len(self._nota):
+                self._compactar()
+    
+    def _compactar(self) -> None:
+        """Quita las filas anuladas de todas las columnas y renumera las entradas (requiere el lock)."""
+        vivas = [fila for fila, nota in enumerate(self._nota) if nota]
+        nueva_fila = array('I', [0]) * len(self._nota)
+        for posicion, fila in enumerate(vivas):
+            nueva_fila[fila] = posicion
+        for nombre in ('_alumno', '_asignatura', '_periodo', '_nota', '_creditos'):
+            columna = getattr(self, nombre)
+            setattr(self, nombre, array(columna.typecode, map(columna.__getitem__, vivas)))
+        for alumno, entradas in enumerate(self._entradas):
+            if entradas:
+                self._entradas[alumno] = array('Q', [entrada & ~MASCARA_FILA | nueva_fila[entrada & MASCARA_FILA]
+                                                     for entrada in entradas])
+        self._anuladas = 0
+    
+    def obtener_nota(self, alumno_id: str, asignatura_id: str, periodo: str) -> Optional[float]:
+        """Obtiene la nota de un alumno en una asignatura y período, o None."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            asignatura = self._codigos_asignaturas.get(asignatura_id)
+            codigo_periodo = self._codigos_periodos.get(periodo)
+            if alumno is None or asignatura is None or codigo_periodo is None or not self._entradas[alumno]:
+                return None
+            fila = self._buscar(self._entradas[alumno], asignatura << BITS_PERIODO | codigo_periodo)[1]
+            return self._nota[fila] / 10 if fila >= 0 else None
+    
+    def obtener_mejor_nota(self, alumno_id: str, asignatura_id: str) -> Optional[float]:
+        """Obtiene la mejor nota del alumno en la asignatura entre todos los períodos, o None."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            asignatura = self._codigos_asignaturas.get(asignatura_id)
+            if alumno is None or asignatura is None or not self._entradas[alumno]:
+                return None
+            entradas = self._entradas[alumno]
+            # Las entradas de una asignatura son contiguas: van ordenadas por (asignatura, período)
+            posicion = bisect_left(entradas, asignatura << BITS_PERIODO << BITS_FILA)
+            fin = bisect_left(entradas, (asignatura + 1) << BITS_PERIODO << BITS_FILA, posicion)
+            if posicion == fin:
+                return None
+            return max(self._nota[entrada & MASCARA_FILA] for entrada in entradas[posicion:fin]) / 10
+    
+    def obtener_notas(self, alumno_id: str) -> List[Dict[str, Any]]:
+        """Obtiene las notas de un alumno, por período (en orden de registro) y asignatura."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            if alumno is None or not self._entradas[alumno]:
+                return []
+            filas = sorted((entrada & MASCARA_FILA for entrada in self._entradas[alumno]),
+                           key=lambda fila: (self._periodo[fila], self._ids_asignaturas[self._asignatura[fila]]))
+            return [{'asignatura_id': self._ids_asignaturas[self._asignatura[fila]], 'periodo': self._periodos[self._periodo[fila]],
+                     'nota': self._nota[fila] / 10, 'creditos': self._creditos[fila]} for fila in filas]
+    
+    def obtener_promedio(self, alumno_id: str) -> Optional[float]:
+        """Obtiene el promedio ponderado por créditos del alumno, o None si no tiene créditos calificados."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            if alumno is None or not self._creditos_calificados[alumno]:
+                return None
+            return round(self._puntos[alumno] / self._creditos_calificados[alumno] / 10, 2)
+    
+    def obtener_creditos_calificados(self, alumno_id: str) -> int:
+        """Obtiene la suma de créditos de las notas del alumno (la base de su promedio)."""
+        with self._lock:
+            alumno = self._codigos_alumnos.get(alumno_id)
+            return self._creditos_calificados[alumno] if alumno is not None else 0
+    
+    def obtener_distribucion(self, asignatura_id: str) -> Dict[str, Any]:
+        """Obtiene la distribución de notas de una asignatura: cantidad, promedio, mínimo, máximo,
+        aprobados, reprobados e histograma {nota: cantidad}. Se lee de sus contadores, sin recorrer notas."""
+        with self._lock:
+            asignatura = self._codigos_asignaturas.get(asignatura_id)
+            inicio = (asignatura or 0) * VALORES_NOTA
+            contadores = self._histogramas[inicio:inicio + VALORES_NOTA] if asignatura is not None else array('I')
+        histograma = {(indice + DECIMAS_MINIMA) / 10: cantidad for indice, cantidad in enumerate(contadores) if cantidad}
+        cantidad = sum(histograma.values())
+        if not cantidad:
+            return {'asignatura_id': asignatura_id, 'cantidad': 0, 'promedio': None, 'minimo': None, 'maximo': None,
+                    'aprobados': 0, 'reprobados': 0, 'histograma': {}}
+        aprobados = sum(veces for nota, veces in histograma.items() if nota >= NOTA_APROBACION)
+        return {
+            'asignatura_id': asignatura_id,
+            'cantidad': cantidad,
+            'promedio': round(sum(nota * veces for nota, veces in histograma.items()) / cantidad, 2),
+            'minimo': min(histograma),
+            'maximo': max(histograma),
+            'aprobados': aprobados,
+            'reprobados': cantidad - aprobados,
+            'histograma': histograma
+        }
+    
+    def _calcular_agregados(self) -> Tuple[array, array, array]:
+        """Calcula desde las columnas los puntos y créditos por alumno y los histogramas (requiere el lock).
+        Productos e histogramas se cuentan en C (map y Counter); solo la suma por alumno recorre las filas."""
+        puntos = array('Q', [0]) * len(self._ids_alumnos)
+        calificados = array('I', [0]) * len(self._ids_alumnos)
+        histogramas = array('I', [0]) * len(self._histogramas)
+        productos = array('Q', map(mul, self._nota, self._creditos))
+        for alumno, producto, creditos in zip(self._alumno, productos, self._creditos):
+            puntos[alumno] += producto
+            calificados[alumno] += creditos
+        for (asignatura, decimas), cantidad in Counter(zip(self._asignatura, self._nota)).items():
+            if decimas:
+                histogramas[asignatura * VALORES_NOTA + decimas - DECIMAS_MINIMA] = cantidad
+        return puntos, calificados, histogramas
+    
+    def recalcular(self, creditos: Optional[Dict[str, int]] = None) -> int:
+        """Recalcula todos los agregados desde las notas guardadas. Con 'creditos' (asignatura_id -> créditos)
+        antes se reponderan las notas de esas asignaturas, ej. si cambiaron sus créditos.
+        Retorna cuántas filas cambiaron de créditos."""
+        with self._lock:
+            cambiadas = 0
+            if creditos:
+                nuevos = array('B', [0]) * len(self._ids_asignaturas)
+                reponderar = array('B', [0]) * len(self._ids_asignaturas)
+                for asignatura_id, valor in creditos.items():
+                    asignatura = self._codigos_asignaturas.get(asignatura_id)
+                    if asignatura is not None:
+                        nuevos[asignatura] = _validar_creditos(valor)
+                        reponderar[asignatura] = 1
+                # Las filas anuladas se quedan en 0 créditos
+                columna = array('B', (nuevos[asignatura] if reponderar[asignatura] and nota else actual
+                                      for asignatura, actual, nota in zip(self._asignatura, self._creditos, self._nota)))
+                cambiadas = sum(map(int.__ne__, columna, self._creditos))
+                self._creditos = columna
+            self._puntos, self._creditos_calificados, self._histogramas = self._calcular_agregados()
+            return cambiadas
+    
+    def auditar(self) -> List[Dict[str, Any]]:
+        """Compara los agregados mantenidos en cada escritura con los calculados desde las notas.
+        Retorna las diferencias (vacío si todo cuadra) sin corregirlas."""
+        with self._lock:
+            puntos, calificados, histogramas = self._calcular_agregados()
+            diferencias = []
+            if puntos != self._puntos or calificados != self._creditos_calificados:
+                for alumno, id in enumerate(self._ids_alumnos):
+                    esperado = (puntos[alumno], calificados[alumno])
+                    registrado = (self._puntos[alumno], self._creditos_calificados[alumno])
+                    if esperado != registrado:
+                        diferencias.append({'tipo': 'alumno', 'id': id, 'esperado': esperado, 'registrado': registrado})
+            if histogramas != self._histogramas:
+                for asignatura, id in enumerate(self._ids_asignaturas):
+                    inicio = asignatura * VALORES_NOTA
+                    esperado, registrado = histogramas[inicio:inicio + VALORES_NOTA], self._histogramas[inicio:inicio + VALORES_NOTA]
+                    if esperado != registrado:
+                        diferencias.append({'tipo': 'asignatura', 'id': id, 'esperado': list(esperado), 'registrado': list(registrado)})
+            return diferencias
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del registro: notas, alumnos, asignaturas, períodos, filas anuladas y bytes en arreglos."""
+        with self._lock:
+            columnas = (self._alumno, self._asignatura, self._periodo, self._nota, self._creditos,
+                        self._puntos, self._creditos_calificados, self._histogramas)
+            return {
+                'notas': len(self._nota) - self._anuladas,
+                'alumnos': sum(1 for entradas in self._entradas if entradas),
+                'asignaturas': len(self._ids_asignaturas),
+                'periodos': len(self._periodos),
+                'filas_anuladas': self._anuladas,
+                'bytes': sum(len(columna) * columna.itemsize for columna in columnas)
+                         + sum(len(entradas) * entradas.itemsize for entradas in self._entradas if entradas)
+            }
\ No newline at end of file
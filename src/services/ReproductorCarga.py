@@ -0,0 +1,146 @@
+"""
+Reproduce una carga grabada con GrabadorCarga.
+
+Uso (desde src/):  python -m services.ReproductorCarga archivo.jsonl.gz [--tiempo-original]
+Compara el repositorio en memoria con el mismo repositorio detrás de RepositorioCache.
+"""
+
+import gzip
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from interfaces.IRepositorio import IRepositorio
+from services.FabricaGestores import crear_gestores
+from utils.GrabadorCarga import huella_resultado
+
+MAXIMO_EJEMPLOS = 10
+
+def _percentiles(valores: List[int]) -> Dict[str, int]:
+    if not valores:
+        return {'p50': 0, 'p90': 0, 'p99': 0, 'max': 0}
+    valores = sorted(valores)
+    posicion = lambda p: valores[min(len(valores) - 1, int(p * len(valores)))]
+    return {'p50': posicion(0.50), 'p90': posicion(0.90), 'p99': posicion(0.99), 'max': valores[-1]}
+
+class ReproductorCarga:
+    """Vuelve a ejecutar una carga grabada contra cualquier par de repositorios.
+    Principio DIP: Los gestores se construyen con una fábrica sobre los IRepositorio recibidos.
+    Reporta rendimiento, distribución de latencias (total y por método) y las llamadas cuyo
+    resultado difiere del grabado o del obtenido con otro backend. Para que los resultados sean
+    comparables, los repositorios deben partir del mismo estado que tenían al grabar."""
+    
+    def __init__(self, ruta: str):
+        self._llamadas: List[list] = []
+        with gzip.open(ruta, 'rt', encoding='utf-8') as archivo:
+            for linea in archivo:
+                if linea.strip():
+                    self._llamadas.append(json.loads(linea))
+        # Las líneas se escriben al terminar cada llamada: se ordenan por inicio
+        self._llamadas.sort(key=lambda llamada: llamada[0])
+    
+    @property
+    def cantidad_llamadas(self) -> int:
+        return len(self._llamadas)
+    
+    def _ejecutar(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio,
+                  tiempo_original: bool, fabrica_gestores: Callable) -> Tuple[Dict[str, Any], List[Any]]:
+        gestores = fabrica_gestores(repositorio_alumnos, repositorio_asignaturas)._asdict()
+        latencias: List[int] = []
+        por_metodo: Dict[str, List[int]] = {}
+        huellas: List[Any] = []
+        ejemplos: List[Dict[str, Any]] = []
+        divergencias = omitidas = 0
+        inicio_total = time.perf_counter_ns()
+        for indice, (inicio_us, _, gestor, metodo, args, kwargs, huella_grabada) in enumerate(self._llamadas):
+            if args is None:
+                omitidas += 1
+                huellas.append(None)
+                continue
+            if tiempo_original:
+                espera = inicio_total + inicio_us * 1000 - time.perf_counter_ns()
+                if espera > 0:
+                    time.sleep(espera / 1e9)
+            funcion = getattr(gestores[gestor], metodo)
+            inicio = time.perf_counter_ns()
+            try:
+                resultado = funcion(*args, **kwargs)
+            except Exception as error:
+                huella = f"error:{type(error).__name__}"
+            else:
+                huella = huella_resultado(resultado)
+            duracion = (time.perf_counter_ns() - inicio) // 1000
+            latencias.append(duracion)
+            por_metodo.setdefault(f"{gestor}.{metodo}", []).append(duracion)
+            huellas.append(huella)
+            if huella != huella_grabada:
+                divergencias += 1
+                if len(ejemplos) < MAXIMO_EJEMPLOS:
+                    ejemplos.append({'indice': indice, 'metodo': f"{gestor}.{metodo}", 'args': args})
+        duracion_total = (time.perf_counter_ns() - inicio_total) / 1e9
+        reporte = {
+            'operaciones': len(latencias),
+            'omitidas': omitidas,
+            'duracion_s': round(duracion_total, 4),
+            'operaciones_por_segundo': round(len(latencias) / duracion_total, 1) if duracion_total else 0.0,
+            'latencia_us': _percentiles(latencias),
+            'latencia_grabada_us': _percentiles([llamada[1] for llamada in self._llamadas if llamada[4] is not None]),
+            'por_metodo': {metodo: dict(cantidad=len(valores), total_ms=round(sum(valores) / 1000, 3), **_percentiles(valores))
+                           for metodo, valores in sorted(por_metodo.items())},
+            'divergencias_con_grabacion': divergencias,
+            'ejemplos_divergencia': ejemplos
+        }
+        return reporte, huellas
+    
+    def reproducir(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio,
+                   tiempo_original: bool = False, fabrica_gestores: Optional[Callable] = None) -> Dict[str, Any]:
+        """Reproduce la carga a máxima velocidad (o respetando los tiempos grabados) y retorna el reporte."""
+        return self._ejecutar(repositorio_alumnos, repositorio_asignaturas, tiempo_original,
+                              fabrica_gestores or crear_gestores)[0]
+    
+    def comparar(self, backends: Dict[str, Tuple[IRepositorio, IRepositorio]], tiempo_original: bool = False,
+                 fabrica_gestores: Optional[Callable] = None) -> Dict[str, Any]:
+        """Reproduce la carga en cada backend (nombre -> (repositorio_alumnos, repositorio_asignaturas))
+        y reporta las llamadas cuyo resultado difiere del primer backend."""
+        if not backends:
+            raise ValueError("Se necesita al menos un backend")
+        reportes, huellas = {}, {}
+        for nombre, (repositorio_alumnos, repositorio_asignaturas) in backends.items():
+            reportes[nombre], huellas[nombre] = self._ejecutar(repositorio_alumnos, repositorio_asignaturas, tiempo_original,
+                                                               fabrica_gestores or crear_gestores)
+        referencia = next(iter(backends))
+        divergencias = {}
+        for nombre in list(backends)[1:]:
+            indices = [indice for indice, (a, b) in enumerate(zip(huellas[referencia], huellas[nombre])) if a != b]
+            divergencias[nombre] = {
+                'cantidad': len(indices),
+                'ejemplos': [{'indice': indice, 'metodo': f"{self._llamadas[indice][2]}.{self._llamadas[indice][3]}",
+                              'args': self._llamadas[indice][4]} for indice in indices[:MAXIMO_EJEMPLOS]]
+            }
+        return {'referencia': referencia, 'reportes': reportes, 'divergencias_entre_backends': divergencias}
+
+def main():
+    if len(sys.argv) < 2:
+        print("Uso: python -m services.ReproductorCarga archivo.jsonl.gz [--tiempo-original]")
+        return
+    from repositories.RepositorioAlumnos import RepositorioAlumnos
+    from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+    from repositories.RepositorioCache import RepositorioCache
+    reproductor = ReproductorCarga(sys.argv[1])
+    resultado = reproductor.comparar({
+        'memoria': (RepositorioAlumnos(), RepositorioAsignaturas()),
+        'cache': (RepositorioCache(RepositorioAlumnos()), RepositorioCache(RepositorioAsignaturas()))
+    }, tiempo_original='--tiempo-original' in sys.argv)
+    print(f"=== Reproducción de {reproductor.cantidad_llamadas} llamadas ===")
+    for nombre, reporte in resultado['reportes'].items():
+        latencia = reporte['latencia_us']
+        print(f"{nombre:<10} {reporte['operaciones_por_segundo']:10.0f} op/s  p50 {latencia['p50']} µs  "
+              f"p90 {latencia['p90']} µs  p99 {latencia['p99']} µs  omitidas {reporte['omitidas']}  "
+              f"divergencias con la grabación {reporte['divergencias_con_grabacion']}")
+    for nombre, divergencia in resultado['divergencias_entre_backends'].items():
+        print(f"Divergencias {nombre} vs {resultado['referencia']}: {divergencia['cantidad']}")
+        for ejemplo in divergencia['ejemplos']:
+            print(f"  #{ejemplo['indice']} {ejemplo['metodo']} {ejemplo['args']}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
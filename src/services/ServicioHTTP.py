@@ -0,0 +1,316 @@
+"""
+Servicio HTTP/JSON local sobre los gestores de alumnos, asignaturas, matrículas y reportes.
+
+Uso (desde src/):  python -m services.ServicioHTTP [puerto]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from typing import Optional, Dict, Any, Tuple, Callable
+from urllib.parse import urlsplit, parse_qsl, unquote
+from interfaces.IRepositorio import IRepositorio
+from interfaces.IGestorMatriculas import IGestorMatriculas
+from interfaces.IGestorReportes import IGestorReportes
+from services.GestorAlumnos import GestorAlumnos
+from services.GestorAsignaturas import GestorAsignaturas
+from services.FabricaGestores import crear_gestores
+
+ESTADOS = {200: 'OK', 201: 'Created', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+# Campos obligatorios por tipo de alumno, en el orden de los métodos crear_* del gestor (todos texto)
+TIPOS_ALUMNO = {
+    'pregrado': ('crear_estudiante_pregrado', ('id', 'nombre', 'apellido', 'email', 'carrera')),
+    'ayudante': ('crear_estudiante_ayudante', ('id', 'nombre', 'apellido', 'email', 'carrera')),
+    'magister': ('crear_estudiante_magister', ('id', 'nombre', 'apellido', 'email', 'carrera', 'tema_tesis')),
+    'doctorado': ('crear_estudiante_doctorado', ('id', 'nombre', 'apellido', 'email', 'carrera', 'tema_tesis', 'linea_investigacion')),
+    'titulado': ('crear_titulado', ('id', 'nombre', 'apellido', 'email', 'titulo', 'especialidad')),
+}
+
+TAMANO_MAXIMO_CUERPO = 1024 * 1024
+CAPACIDAD_RESPUESTAS = 10000
+
+class ErrorHTTP(Exception):
+    """Error que se responde al cliente con un código de estado y un mensaje."""
+    
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+class ServicioHTTP:
+    """Servicio HTTP/JSON (asyncio, conexiones persistentes) que expone las operaciones de los gestores.
+    Principio SRP: Solo traduce HTTP a llamadas de los gestores; la lógica de negocio sigue en ellos.
+    Principio DIP: Recibe los gestores y repositorios ya construidos.
+    Cada respuesta GET lleva un ETag derivado de la versión de mutación de lo que muestra (una
+    entidad o el repositorio completo). Si el cliente envía el mismo ETag se responde 304 sin
+    serializar nada, y si otro cliente pide la misma versión se reutiliza el cuerpo ya serializado."""
+    
+    def __init__(self, gestor_alumnos: GestorAlumnos, gestor_asignaturas: GestorAsignaturas,
+                 gestor_matriculas: IGestorMatriculas, gestor_reportes: IGestorReportes,
+                 repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio):
+        self._gestor_alumnos = gestor_alumnos
+        self._gestor_asignaturas = gestor_asignaturas
+        self._gestor_matriculas = gestor_matriculas
+        self._gestor_reportes = gestor_reportes
+        # (colección, id) -> versión; (colección, None) es la versión de toda la colección
+        self._versiones: Dict[Tuple[str, Optional[str]], int] = {}
+        # Los contadores parten de cero en cada arranque: el prefijo evita reutilizar ETags de otra instancia
+        self._instancia = format(time.time_ns(), 'x')
+        # ruta completa -> (etag, cuerpo serializado), acotado a CAPACIDAD_RESPUESTAS rutas
+        self._respuestas: Dict[str, Tuple[str, bytes]] = {}
+        self._metricas = {'solicitudes': 0, 'no_modificados': 0, 'cuerpos_reutilizados': 0, 'serializaciones': 0}
+        repositorio_alumnos.suscribir_cambios(lambda operacion, id, entidad: self._registrar_cambio('alumnos', id))
+        repositorio_asignaturas.suscribir_cambios(lambda operacion, id, entidad: self._registrar_cambio('asignaturas', id))
+        self._rutas = [
+            ('GET', ('alumnos',), self._buscar_alumnos),
+            ('POST', ('alumnos',), self._crear_alumno),
+            ('GET', ('alumnos', None), self._obtener_alumno),
+            ('GET', ('asignaturas',), self._listar_asignaturas),
+            ('POST', ('asignaturas',), self._crear_asignatura),
+            ('GET', ('asignaturas', None), self._obtener_asignatura),
+            ('GET', ('asignaturas', None, 'estudiantes'), self._obtener_nomina),
+            ('POST', ('matriculas',), self._matricular),
+            ('DELETE', ('matriculas', None, None), self._desmatricular),
+            ('GET', ('estadisticas',), self._obtener_estadisticas),
+        ]
+    
+    def _registrar_cambio(self, coleccion: str, id: str) -> None:
+        self._versiones[(coleccion, id)] = self._versiones.get((coleccion, id), 0) + 1
+        self._versiones[(coleccion, None)] = self._versiones.get((coleccion, None), 0) + 1
+    
+    def _etag(self, *claves: Tuple[str, Optional[str]]) -> str:
+        partes = [f"{coleccion}{'/' + id if id else ''}:{self._versiones.get((coleccion, id), 0)}" for coleccion, id in claves]
+        return f'"{self._instancia}-' + ';'.join(partes) + '"'
+    
+    # --- Manejadores: retornan (estado, datos o función que los produce, etag) ---
+    
+    def _buscar_alumnos(self, parametros: Dict[str, str], cuerpo: Any):
+        criterio = {campo: parametros[campo] for campo in ('nombre', 'apellido', 'email') if campo in parametros}
+        return 200, lambda: [alumno.obtener_info_completa() for alumno in self._gestor_alumnos.buscar_alumnos(criterio)], \
+            self._etag(('alumnos', None))
+    
+    def _crear_alumno(self, parametros: Dict[str, str], cuerpo: Any):
+        datos = self._exigir_objeto(cuerpo)
+        tipo = datos.get('tipo', 'pregrado')
+        if tipo not in TIPOS_ALUMNO:
+            raise ErrorHTTP(400, f"Tipo de alumno desconocido: {tipo}")
+        metodo, campos = TIPOS_ALUMNO[tipo]
+        self._exigir_campos(datos, {campo: str for campo in campos})
+        if not getattr(self._gestor_alumnos, metodo)(*(datos[campo] for campo in campos)):
+            raise ErrorHTTP(409, f"Ya existe un alumno con ID {datos['id']}")
+        return 201, {'id': datos['id']}, None
+    
+    def _obtener_alumno(self, parametros: Dict[str, str], cuerpo: Any, alumno_id: str):
+        alumno = self._gestor_alumnos.obtener_alumno(alumno_id)
+        if alumno is None:
+            raise ErrorHTTP(404, f"Alumno no encontrado: {alumno_id}")
+        return 200, alumno.obtener_info_completa, self._etag(('alumnos', alumno_id))
+    
+    def _listar_asignaturas(self, parametros: Dict[str, str], cuerpo: Any):
+        if 'semestre' in parametros:
+            semestre = self._exigir_entero(parametros['semestre'], 'semestre')
+            producir = lambda: [asignatura.obtener_info_completa()
+                                for asignatura in self._gestor_asignaturas.listar_asignaturas_por_semestre(semestre)]
+        else:
+            producir = lambda: [asignatura.obtener_info_completa() for asignatura in self._gestor_asignaturas.listar_todas_asignaturas()]
+        return 200, producir, self._etag(('asignaturas', None))
+    
+    def _crear_asignatura(self, parametros: Dict[str, str], cuerpo: Any):
+        datos = self._exigir_objeto(cuerpo)
+        self._exigir_campos(datos, {'id': str, 'nombre': str, 'creditos': int, 'semestre': int, 'profesor_id': str},
+                            opcionales={'cupo': int})
+        if not self._gestor_asignaturas.crear_asignatura(datos['id'], datos['nombre'], datos['creditos'], datos['semestre'],
+                                                         datos['profesor_id'], datos.get('cupo')):
+            raise ErrorHTTP(409, f"Ya existe una asignatura con ID {datos['id']}")
+        return 201, {'id': datos['id']}, None
+    
+    def _obtener_asignatura(self, parametros: Dict[str, str], cuerpo: Any, asignatura_id: str):
+        asignatura = self._gestor_asignaturas.obtener_asignatura(asignatura_id)
+        if asignatura is None:
+            raise ErrorHTTP(404, f"Asignatura no encontrada: {asignatura_id}")
+        return 200, asignatura.obtener_info_completa, self._etag(('asignaturas', asignatura_id))
+    
+    def _obtener_nomina(self, parametros: Dict[str, str], cuerpo: Any, asignatura_id: str):
+        if self._gestor_asignaturas.obtener_asignatura(asignatura_id) is None:
+            raise ErrorHTTP(404, f"Asignatura no encontrada: {asignatura_id}")
+        return 200, lambda: {'asignatura_id': asignatura_id,
+                             'estudiantes': self._gestor_asignaturas.obtener_estudiantes_asignatura(asignatura_id)}, \
+            self._etag(('asignaturas', asignatura_id))
+    
+    def _matricular(self, parametros: Dict[str, str], cuerpo: Any):
+        datos = self._exigir_objeto(cuerpo)
+        self._exigir_campos(datos, {'alumno_id': str, 'asignatura_id': str})
+        resultado = self._gestor_matriculas.solicitar_matricula(datos['alumno_id'], datos['asignatura_id'])
+        if resultado == IGestorMatriculas.RECHAZADO:
+            raise ErrorHTTP(409, "Matrícula rechazada")
+        return (201 if resultado == IGestorMatriculas.MATRICULADO else 200), {'resultado': resultado}, None
+    
+    def _desmatricular(self, parametros: Dict[str, str], cuerpo: Any, alumno_id: str, asignatura_id: str):
+        if not self._gestor_matriculas.desmatricular_alumno(alumno_id, asignatura_id):
+            raise ErrorHTTP(404, f"No existe la matrícula de {alumno_id} en {asignatura_id}")
+        return 200, {'resultado': 'desmatriculado'}, None
+    
+    def _obtener_estadisticas(self, parametros: Dict[str, str], cuerpo: Any):
+        return 200, lambda: {'alumnos': self._gestor_reportes.obtener_estadisticas(),
+                             'asignaturas': self._gestor_asignaturas.obtener_estadisticas_generales()}, \
+            self._etag(('alumnos', None), ('asignaturas', None))
+    
+    @staticmethod
+    def _exigir_objeto(cuerpo: Any) -> Dict[str, Any]:
+        if not isinstance(cuerpo, dict):
+            raise ErrorHTTP(400, "Se esperaba un objeto JSON")
+        return cuerpo
+    
+    @staticmethod
+    def _exigir_campos(datos: Dict[str, Any], campos: Dict[str, type], opcionales: Optional[Dict[str, type]] = None) -> None:
+        """Verifica que estén los campos obligatorios y que cada campo presente (no nulo) tenga su tipo JSON."""
+        opcionales = opcionales or {}
+        faltantes = [campo for campo in campos if campo not in datos]
+        if faltantes:
+            raise ErrorHTTP(400, f"Faltan campos: {', '.join(faltantes)}")
+        for campo, tipo in {**campos, **opcionales}.items():
+            valor = datos.get(campo)
+            if campo in opcionales and valor is None:
+                continue
+            # En JSON true/false no son números, aunque bool herede de int
+            if not isinstance(valor, tipo) or isinstance(valor, bool):
+                raise ErrorHTTP(400, f"'{campo}' debe ser {'un entero' if tipo is int else 'un texto'}")
+    
+    @staticmethod
+    def _exigir_entero(valor: str, nombre: str) -> int:
+        try:
+            return int(valor)
+        except ValueError:
+            raise ErrorHTTP(400, f"'{nombre}' debe ser un entero")
+    
+    # --- HTTP ---
+    
+    def _resolver(self, metodo: str, ruta: str) -> Tuple[Callable, list]:
+        segmentos = [unquote(segmento) for segmento in ruta.strip('/').split('/') if segmento]
+        metodo_incorrecto = False
+        for metodo_ruta, patron, manejador in self._rutas:
+            if len(patron) != len(segmentos) or any(p is not None and p != s for p, s in zip(patron, segmentos)):
+                continue
+            if metodo_ruta != metodo:
+                metodo_incorrecto = True
+                continue
+            return manejador, [s for p, s in zip(patron, segmentos) if p is None]
+        if metodo_incorrecto:
+            raise ErrorHTTP(405, f"Método no permitido: {metodo}")
+        raise ErrorHTTP(404, f"Ruta no encontrada: {ruta}")
+    
+    def atender(self, metodo: str, objetivo: str, encabezados: Dict[str, str], cuerpo: bytes) -> Tuple[int, bytes, Optional[str]]:
+        """Atiende una solicitud ya leída y retorna (estado, cuerpo JSON, etag)."""
+        self._metricas['solicitudes'] += 1
+        partes = urlsplit(objetivo)
+        try:
+            manejador, argumentos = self._resolver(metodo, partes.path)
+            try:
+                datos_cuerpo = json.loads(cuerpo) if cuerpo else None
+            except ValueError:
+                raise ErrorHTTP(400, "Cuerpo JSON inválido")
+            estado, datos, etag = manejador(dict(parse_qsl(partes.query)), datos_cuerpo, *argumentos)
+        except ErrorHTTP as error:
+            return error.estado, json.dumps({'error': str(error)}, ensure_ascii=False).encode('utf-8'), None
+        
+        if etag is None:
+            return estado, json.dumps(datos, ensure_ascii=False, default=str).encode('utf-8'), None
+        if encabezados.get('if-none-match') == etag:
+            self._metricas['no_modificados'] += 1
+            return 304, b'', etag
+        guardada = self._respuestas.get(objetivo)
+        if guardada is not None and guardada[0] == etag:
+            self._metricas['cuerpos_reutilizados'] += 1
+            return estado, guardada[1], etag
+        self._metricas['serializaciones'] += 1
+        cuerpo_respuesta = json.dumps(datos(), ensure_ascii=False, default=str).encode('utf-8')
+        if guardada is None and len(self._respuestas) >= CAPACIDAD_RESPUESTAS:
+            del self._respuestas[next(iter(self._respuestas))]
+        self._respuestas[objetivo] = (etag, cuerpo_respuesta)
+        return estado, cuerpo_respuesta, etag
+    
+    async def _atender_conexion(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    cabecera = await lector.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lineas = cabecera.decode('latin-1').split('\r\n')
+                try:
+                    metodo, objetivo, version = lineas[0].split(' ', 2)
+                except ValueError:
+                    break
+                encabezados = {}
+                for linea in lineas[1:]:
+                    if ':' in linea:
+                        nombre, valor = linea.split(':', 1)
+                        encabezados[nombre.strip().lower()] = valor.strip()
+                try:
+                    largo = int(encabezados.get('content-length', 0) or 0)
+                except ValueError:
+                    largo = -1
+                if largo < 0:
+                    # Sin un largo válido no se sabe dónde termina el cuerpo: se responde y se cierra
+                    estado, cuerpo, etag = 400, b'{"error": "Content-Length inv\u00e1lido"}', None
+                    mantener = False
+                elif largo > TAMANO_MAXIMO_CUERPO:
+                    estado, cuerpo, etag = 413, b'{"error": "Cuerpo demasiado grande"}', None
+                    mantener = False
+                else:
+                    cuerpo = await lector.readexactly(largo) if largo else b''
+                    try:
+                        estado, cuerpo, etag = self.atender(metodo, objetivo, encabezados, cuerpo)
+                    except Exception as error:
+                        estado, cuerpo, etag = 500, json.dumps({'error': str(error)}).encode('utf-8'), None
+                    conexion = encabezados.get('connection', '').lower()
+                    mantener = conexion == 'keep-alive' if version == 'HTTP/1.0' else conexion != 'close'
+                respuesta = [f"HTTP/1.1 {estado} {ESTADOS.get(estado, '')}",
+                             f"Content-Length: {len(cuerpo)}",
+                             f"Connection: {'keep-alive' if mantener else 'close'}"]
+                if estado != 304:
+                    respuesta.append("Content-Type: application/json; charset=utf-8")
+                if etag is not None:
+                    respuesta.append(f"ETag: {etag}")
+                escritor.write(('\r\n'.join(respuesta) + '\r\n\r\n').encode('latin-1') + cuerpo)
+                await escritor.drain()
+                if not mantener:
+                    break
+        finally:
+            escritor.close()
+    
+    async def iniciar(self, host: str = '127.0.0.1', puerto: int = 8080) -> asyncio.AbstractServer:
+        """Comienza a escuchar conexiones y retorna el servidor de asyncio."""
+        return await asyncio.start_server(self._atender_conexion, host, puerto)
+    
+    def obtener_metricas(self) -> Dict[str, int]:
+        """Obtiene métricas del servicio: solicitudes, respuestas 304, cuerpos reutilizados y serializaciones."""
+        return dict(self._metricas)
+
+def crear_servicio() -> ServicioHTTP:
+    """Crea un servicio con repositorios en memoria y gestores con la configuración por defecto."""
+    from repositories.RepositorioAlumnos import RepositorioAlumnos
+    from repositories.RepositorioAsignaturas import RepositorioAsignaturas
+    repositorio_alumnos = RepositorioAlumnos()
+    repositorio_asignaturas = RepositorioAsignaturas()
+    gestores = crear_gestores(repositorio_alumnos, repositorio_asignaturas)
+    return ServicioHTTP(gestores.alumnos, gestores.asignaturas, gestores.matriculas, gestores.reportes,
+                        repositorio_alumnos, repositorio_asignaturas)
+
+async def _servir(puerto: int) -> None:
+    servidor = await crear_servicio().iniciar(puerto=puerto)
+    print(f"Servicio escuchando en http://127.0.0.1:{puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+def main():
+    puerto = int(sys.argv[1]) if len(sys.argv) > 1 else 8080
+    try:
+        asyncio.run(_servir(puerto))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
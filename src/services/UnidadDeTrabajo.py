@@ -0,0 +1,299 @@
+import copy
+from collections import deque
+from contextlib import ExitStack
+from typing import List, Optional, Dict, Any, Callable, Tuple
+from interfaces.IRepositorio import IRepositorio
+
+class _OperacionFallida(Exception):
+    """Uso interno: una operación del lote no pudo aplicarse."""
+    pass
+
+def _copiar_colecciones(estado: Dict[str, Any]) -> Dict[str, Any]:
+    return {clave: valor.copy() if isinstance(valor, (list, dict, set, deque)) else valor for clave, valor in estado.items()}
+
+def capturar_estado(entidad: Any) -> Dict[str, Any]:
+    """Captura el estado interno de una entidad (copiando sus colecciones) para poder restaurarlo."""
+    return _copiar_colecciones(vars(entidad))
+
+def restaurar_estado(entidad: Any, estado: Dict[str, Any]) -> None:
+    """Restaura una entidad al estado capturado con capturar_estado."""
+    vars(entidad).clear()
+    vars(entidad).update(_copiar_colecciones(estado))
+
+class UnidadDeTrabajo:
+    """Transacción que agrupa cambios sobre uno o más repositorios.
+    Principio SRP: Solo registra, confirma y revierte cambios; la lógica de negocio queda en los gestores.
+    Aislamiento: en una unidad aislada los gestores modifican copias de trabajo (obtener) y las
+    entidades reales solo cambian al confirmar, por lo que nadie ve cambios de una transacción
+    abierta y revertir no toca los repositorios. Al confirmar se valida el lote completo
+    (existencia y conflictos con cambios confirmados por otros desde que se tomó la copia) antes
+    de aplicar nada; luego se copian a cada entidad real solo los atributos que cambiaron y se
+    aplica un lote por repositorio (aplicar_lote si el repositorio lo ofrece).
+    Validar, volcar las copias y aplicar los lotes ocurre con los locks de las entidades
+    afectadas tomados (ver 'bloqueos'), los mismos que retienen las operaciones sueltas de los
+    gestores, así que dos confirmaciones sobre una misma entidad no pueden validarse a la vez.
+    Copiar cuesta O(tamaño de la entidad), así que una operación suelta, que retiene los locks
+    de sus entidades hasta confirmar, usa una unidad no aislada: obtener entrega la entidad real
+    y revertir la restaura en memoria con las acciones 'deshacer', también sin notificar."""
+    
+    def __init__(self, aislada: bool = True,
+                 bloqueos: Optional[Callable[[IRepositorio, str], Optional[Tuple[int, Any]]]] = None):
+        self._aislada = aislada
+        # bloqueos(repositorio, id) -> (nivel, lock) que protege a la entidad, o None. Al confirmar se
+        # toman por nivel ascendente, el mismo orden en que los anida el gestor que los define
+        self._bloqueos = bloqueos
+        # (repositorio, id) -> (operacion, entidad); una sola operación final por entidad
+        self._operaciones: Dict[Tuple[int, str], Tuple[IRepositorio, str, str, Any]] = {}
+        # (repositorio, id) -> (entidad real, copia de trabajo, estado de la real al tomar la copia)
+        self._copias: Dict[Tuple[int, str], Tuple[Any, Any, Dict[str, Any]]] = {}
+        # Sin aislamiento: (repositorio, id) -> (entidad, estado previo a la transacción)
+        self._estados_originales: Dict[Tuple[int, str], Tuple[Any, Dict[str, Any]]] = {}
+        self._compensaciones: List[Callable[[], None]] = []
+        # Condiciones externas que deben seguir cumpliéndose al confirmar (ej. que no cambió el período)
+        self._validaciones: List[Callable[[], bool]] = []
+        self._al_confirmar: List[Callable[[], None]] = []
+        self._finalizada = False
+    
+    @property
+    def finalizada(self) -> bool:
+        return self._finalizada
+    
+    def cantidad_operaciones(self) -> int:
+        """Cantidad de operaciones pendientes de confirmar."""
+        return len(self._operaciones)
+    
+    def _verificar_abierta(self) -> None:
+        if self._finalizada:
+            raise RuntimeError("La unidad de trabajo ya fue confirmada o revertida")
+    
+    def obtener(self, repositorio: IRepositorio, id_entidad: str) -> Optional[Any]:
+        """Obtiene la copia de trabajo de una entidad (la misma en toda la transacción), o None.
+        Ve los cambios ya hechos en la transacción; la entidad real no cambia hasta confirmar.
+        En una unidad no aislada retorna la entidad real."""
+        self._verificar_abierta()
+        clave = (id(repositorio), id_entidad)
+        operacion = self._operaciones.get(clave)
+        if operacion is not None and operacion[1] != 'actualizar':
+            return operacion[3]
+        if not self._aislada:
+            return repositorio.obtener_por_id(id_entidad)
+        copia = self._copias.get(clave)
+        if copia is not None:
+            return copia[1]
+        real = repositorio.obtener_por_id(id_entidad)
+        if real is None:
+            return None
+        trabajo = copy.copy(real)
+        vars(trabajo).update(capturar_estado(real))
+        self._copias[clave] = (real, trabajo, capturar_estado(real))
+        return trabajo
+    
+    def registrar_nuevo(self, repositorio: IRepositorio, entidad: Any) -> None:
+        """Registra una entidad nueva que se agregará al confirmar."""
+        self._verificar_abierta()
+        self._operaciones[(id(repositorio), entidad.id)] = (repositorio, 'agregar', entidad.id, entidad)
+    
+    def registrar_modificacion(self, repositorio: IRepositorio, entidad: Any,
+                               deshacer: Optional[Callable[[], None]] = None) -> None:
+        """Registra que se modificó una entidad obtenida con obtener (su copia de trabajo).
+        Sin aislamiento, 'deshacer' revierte el cambio en memoria; si falta, se captura el estado
+        completo de la entidad, por lo que debe llamarse ANTES de mutarla. Con aislamiento no
+        hace falta: revertir descarta la copia."""
+        self._verificar_abierta()
+        clave = (id(repositorio), entidad.id)
+        operacion = self._operaciones.get(clave)
+        if not self._aislada:
+            if deshacer is not None:
+                self._compensaciones.append(deshacer)
+            elif clave not in self._estados_originales:
+                self._estados_originales[clave] = (entidad, capturar_estado(entidad))
+            if operacion is None or operacion[1] != 'agregar':
+                self._operaciones[clave] = (repositorio, 'actualizar', entidad.id, entidad)
+            return
+        if operacion is not None and operacion[1] != 'actualizar':
+            return
+        copia = self._copias.get(clave)
+        if copia is None or copia[1] is not entidad:
+            raise ValueError(f"La entidad {entidad.id} no es una copia de trabajo de esta transacción")
+        self._operaciones[clave] = (repositorio, 'actualizar', entidad.id, entidad)
+    
+    def registrar_compensacion(self, deshacer: Callable[[], None]) -> None:
+        """Registra una acción que deshace un cambio fuera de los repositorios (ej. un índice derivado)."""
+        self._verificar_abierta()
+        self._compensaciones.append(deshacer)
+    
+    def registrar_eliminacion(self, repositorio: IRepositorio, id_entidad: str) -> None:
+        """Registra la eliminación de una entidad."""
+        self._verificar_abierta()
+        clave = (id(repositorio), id_entidad)
+        operacion = self._operaciones.get(clave)
+        if operacion is not None and operacion[1] == 'agregar':
+            # Agregada y eliminada dentro de la misma transacción
+            del self._operaciones[clave]
+            return
+        self._operaciones[clave] = (repositorio, 'eliminar', id_entidad, None)
+    
+    def registrar_validacion(self, validar: Callable[[], bool]) -> None:
+        """Registra una condición que se evalúa al confirmar, con los locks tomados; si retorna
+        False la transacción se revierte."""
+        self._verificar_abierta()
+        self._validaciones.append(validar)
+    
+    def al_confirmar(self, accion: Callable[[], None]) -> None:
+        """Registra una acción a ejecutar solo si la transacción se confirma (ej. publicar eventos)."""
+        self._verificar_abierta()
+        self._al_confirmar.append(accion)
+    
+    def confirmar(self) -> bool:
+        """Aplica todas las operaciones de forma atómica. Retorna False y revierte si alguna no es
+        válida o si otra transacción ya confirmó un cambio sobre los mismos atributos."""
+        self._verificar_abierta()
+        with self._bloquear():
+            if not self._confirmar_bloqueado():
+                return False
+        for accion in self._al_confirmar:
+            accion()
+        return True
+    
+    def _bloquear(self) -> ExitStack:
+        """Toma los locks de las entidades afectadas (sin duplicados y en un orden global fijo)."""
+        pila = ExitStack()
+        if self._bloqueos is None:
+            return pila
+        locks: Dict[int, Tuple[int, Any]] = {}
+        for repositorio, _, id_entidad, _ in self._operaciones.values():
+            bloqueo = self._bloqueos(repositorio, id_entidad)
+            if bloqueo is not None:
+                locks[id(bloqueo[1])] = bloqueo
+        with pila:
+            for _, lock in sorted(locks.values(), key=lambda bloqueo: (bloqueo[0], id(bloqueo[1]))):
+                pila.enter_context(lock)
+            return pila.pop_all()
+    
+    def _confirmar_bloqueado(self) -> bool:
+        if not all(validar() for validar in self._validaciones):
+            self.revertir()
+            return False
+        grupos = self._agrupar_por_repositorio()
+        # Con un solo repositorio que ofrece aplicar_lote, el propio lote valida la existencia
+        verificar_existencia = len(grupos) > 1 or any(getattr(repositorio, 'aplicar_lote', None) is None
+                                                      for repositorio, _ in grupos)
+        cambios = self._validar(verificar_existencia)
+        if cambios is None:
+            self.revertir()
+            return False
+        # Se vuelcan las copias sobre las entidades reales, que son las que guardan los repositorios
+        instaladas: List[Tuple[Any, Dict[str, Any]]] = []
+        for clave, atributos in cambios.items():
+            real = self._copias[clave][0]
+            instaladas.append((real, {nombre: vars(real)[nombre] for nombre in atributos}))
+            vars(real).update(atributos)
+            repositorio, operacion, id_entidad, _ = self._operaciones[clave]
+            self._operaciones[clave] = (repositorio, operacion, id_entidad, real)
+        if cambios:
+            grupos = self._agrupar_por_repositorio()
+        
+        aplicadas: List[Tuple[IRepositorio, str, str, Any, Any]] = []
+        try:
+            for repositorio, operaciones in grupos:
+                # Solo una eliminación necesita la entidad previa para deshacerse
+                previas = [(op, id_entidad, repositorio.obtener_por_id(id_entidad) if op == 'eliminar' else entidad)
+                           for op, id_entidad, entidad in operaciones]
+                aplicar_lote = getattr(repositorio, 'aplicar_lote', None)
+                if aplicar_lote is not None:
+                    if not aplicar_lote(operaciones):
+                        raise _OperacionFallida()
+                    aplicadas.extend((repositorio, op, id_entidad, entidad, previa)
+                                     for (op, id_entidad, entidad), (_, _, previa) in zip(operaciones, previas))
+                else:
+                    for (op, id_entidad, entidad), (_, _, previa) in zip(operaciones, previas):
+                        if not self._aplicar(repositorio, op, id_entidad, entidad):
+                            raise _OperacionFallida()
+                        aplicadas.append((repositorio, op, id_entidad, entidad, previa))
+        except Exception as error:
+            # Solo se llega aquí si un repositorio cambió tras validar o lanzó una excepción: lo
+            # ya aplicado se deshace a través de los repositorios, que vuelven a notificar
+            for real, anteriores in instaladas:
+                vars(real).update(anteriores)
+            self._deshacer(aplicadas)
+            self.revertir()
+            if isinstance(error, _OperacionFallida):
+                return False
+            raise
+        self._finalizada = True
+        self._copias.clear()
+        self._estados_originales.clear()
+        return True
+    
+    def revertir(self) -> None:
+        """Descarta las operaciones pendientes y las copias de trabajo (sin aislamiento, restaura
+        las entidades en memoria); los repositorios no se tocan, por lo que no se notifica nada."""
+        for deshacer in reversed(self._compensaciones):
+            deshacer()
+        for entidad, estado in self._estados_originales.values():
+            restaurar_estado(entidad, estado)
+        self._operaciones.clear()
+        self._copias.clear()
+        self._estados_originales.clear()
+        self._compensaciones.clear()
+        self._validaciones.clear()
+        self._al_confirmar.clear()
+        self._finalizada = True
+    
+    def _validar(self, verificar_existencia: bool = True) -> Optional[Dict[Tuple[int, str], Dict[str, Any]]]:
+        """Valida el lote completo sin aplicar nada. Retorna, por cada entidad modificada, los
+        atributos de su copia que cambiaron, o None si alguna operación no puede aplicarse."""
+        cambios: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for clave, (repositorio, operacion, id_entidad, entidad) in self._operaciones.items():
+            if verificar_existencia and (operacion == 'agregar') == (repositorio.obtener_por_id(id_entidad) is not None):
+                return None
+            if operacion != 'actualizar' or not self._aislada:
+                continue
+            real, trabajo, base = self._copias[clave]
+            actual = vars(real)
+            atributos = {}
+            for nombre, valor in vars(trabajo).items():
+                if nombre in base and valor == base[nombre]:
+                    continue
+                # Conflicto: otra transacción confirmó un cambio en el mismo atributo
+                if nombre in base and actual.get(nombre) != base[nombre]:
+                    return None
+                atributos[nombre] = valor
+            cambios[clave] = atributos
+        return cambios
+    
+    def _agrupar_por_repositorio(self) -> List[Tuple[IRepositorio, List[Tuple[str, str, Any]]]]:
+        grupos: Dict[int, Tuple[IRepositorio, List[Tuple[str, str, Any]]]] = {}
+        for repositorio, operacion, id_entidad, entidad in self._operaciones.values():
+            grupos.setdefault(id(repositorio), (repositorio, []))[1].append((operacion, id_entidad, entidad))
+        return list(grupos.values())
+    
+    @staticmethod
+    def _aplicar(repositorio: IRepositorio, operacion: str, id_entidad: str, entidad: Any) -> bool:
+        if operacion == 'agregar':
+            return repositorio.agregar(entidad)
+        if operacion == 'actualizar':
+            return repositorio.actualizar(id_entidad, entidad)
+        return repositorio.eliminar(id_entidad)
+    
+    @staticmethod
+    def _deshacer(aplicadas: List[Tuple[IRepositorio, str, str, Any, Any]]) -> None:
+        for repositorio, operacion, id_entidad, entidad, previa in reversed(aplicadas):
+            if operacion == 'agregar':
+                repositorio.eliminar(id_entidad)
+            elif operacion == 'eliminar' and previa is not None:
+                repositorio.agregar(previa)
+            elif operacion == 'actualizar' and previa is not None:
+                repositorio.actualizar(id_entidad, previa)
+    
+    def __enter__(self) -> 'UnidadDeTrabajo':
+        return self
+    
+    def __exit__(self, tipo_error, error, traza) -> bool:
+        if self._finalizada:
+            return False
+        if tipo_error is not None:
+            self.revertir()
+        else:
+            self.confirmar()
+        return False
\ No newline at end of file
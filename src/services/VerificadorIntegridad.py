@@ -0,0 +1,62 @@
+from typing import List, Dict, Any, Set, Tuple
+from interfaces.IRepositorio import IRepositorio
+
+class VerificadorIntegridad:
+    """Busca referencias colgantes entre alumnos y asignaturas.
+    Principio SRP: Solo detecta inconsistencias; repararlas es responsabilidad de los gestores.
+    Recorre cada repositorio una sola vez, apoyándose en conjuntos de IDs en vez de
+    búsquedas cruzadas, por lo que el costo es O(alumnos + asignaturas + matrículas)."""
+    
+    # Tipos de problema reportados
+    MATRICULA_ASIGNATURA_INEXISTENTE = 'matricula_asignatura_inexistente'
+    ESTUDIANTE_INEXISTENTE = 'estudiante_inexistente'
+    ESPERA_ESTUDIANTE_INEXISTENTE = 'espera_estudiante_inexistente'
+    PROFESOR_INEXISTENTE = 'profesor_inexistente'
+    MATRICULA_SIN_REFLEJO_EN_ASIGNATURA = 'matricula_sin_reflejo_en_asignatura'
+    MATRICULA_SIN_REFLEJO_EN_ALUMNO = 'matricula_sin_reflejo_en_alumno'
+    
+    def __init__(self, repositorio_alumnos: IRepositorio, repositorio_asignaturas: IRepositorio):
+        self._repositorio_alumnos = repositorio_alumnos
+        self._repositorio_asignaturas = repositorio_asignaturas
+    
+    def verificar(self, incluir_profesores: bool = True) -> List[Dict[str, Any]]:
+        """Retorna la lista de problemas encontrados (tipo, alumno_id, asignatura_id).
+        Con incluir_profesores se reportan también profesores que no existen como alumnos/titulados."""
+        asignaturas = self._repositorio_asignaturas.obtener_todos()
+        ids_asignaturas = {asignatura.id for asignatura in asignaturas}
+        problemas: List[Dict[str, Any]] = []
+        
+        # Pasada sobre alumnos: matrículas vistas desde el lado del alumno
+        ids_alumnos: Set[str] = set()
+        pares_alumno: Set[Tuple[str, str]] = set()
+        for alumno in self._repositorio_alumnos.obtener_todos():
+            ids_alumnos.add(alumno.id)
+            for asignatura_id in alumno.asignaturas_matriculadas:
+                if asignatura_id in ids_asignaturas:
+                    pares_alumno.add((alumno.id, asignatura_id))
+                else:
+                    problemas.append(self._problema(self.MATRICULA_ASIGNATURA_INEXISTENTE, alumno.id, asignatura_id))
+        
+        # Pasada sobre asignaturas: cada par encontrado se descuenta del lado del alumno
+        for asignatura in asignaturas:
+            for estudiante_id in asignatura.estudiantes_matriculados:
+                if estudiante_id not in ids_alumnos:
+                    problemas.append(self._problema(self.ESTUDIANTE_INEXISTENTE, estudiante_id, asignatura.id))
+                elif (estudiante_id, asignatura.id) in pares_alumno:
+                    pares_alumno.discard((estudiante_id, asignatura.id))
+                else:
+                    problemas.append(self._problema(self.MATRICULA_SIN_REFLEJO_EN_ALUMNO, estudiante_id, asignatura.id))
+            for estudiante_id in asignatura.lista_espera:
+                if estudiante_id not in ids_alumnos:
+                    problemas.append(self._problema(self.ESPERA_ESTUDIANTE_INEXISTENTE, estudiante_id, asignatura.id))
+            if incluir_profesores and asignatura.profesor_id is not None and asignatura.profesor_id not in ids_alumnos:
+                problemas.append(self._problema(self.PROFESOR_INEXISTENTE, asignatura.profesor_id, asignatura.id))
+        
+        # Los pares que quedan están en el alumno pero no en la asignatura
+        for alumno_id, asignatura_id in sorted(pares_alumno):
+            problemas.append(self._problema(self.MATRICULA_SIN_REFLEJO_EN_ASIGNATURA, alumno_id, asignatura_id))
+        return problemas
+    
+    @staticmethod
+    def _problema(tipo: str, alumno_id: str, asignatura_id: str) -> Dict[str, Any]:
+        return {'tipo': tipo, 'alumno_id': alumno_id, 'asignatura_id': asignatura_id}
\ No newline at end of file
@@ -0,0 +1,170 @@
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Dict
+
+class BlobNoEncontrado(LookupError):
+    """El hash no está en el almacén."""
+    pass
+
+class BlobCorrupto(ValueError):
+    """El contenido en disco no coincide con su hash."""
+    pass
+
+class AlmacenBlobs:
+    """Almacén de contenidos en disco direccionado por contenido (SHA-256).
+    Principio SRP: Solo guarda y recupera textos; no sabe qué representan.
+    Un mismo texto se guarda una sola vez (deduplicación) y los textos leídos se mantienen
+    en una caché LRU acotada en bytes. Todo lo que se lee de disco se verifica contra su hash,
+    tanto al leer como al deduplicar (un archivo dañado se reescribe), por lo que la caché
+    solo contiene textos verificados.
+    Los textos duran lo que dure el directorio: el almacén predeterminado (ver
+    obtener_almacen_predeterminado) es temporal, así que un uso real debe indicar uno persistente."""
+    
+    def __init__(self, directorio: str, capacidad_cache: int = 8 * 1024 * 1024):
+        self._directorio = directorio
+        # Privado: solo el usuario del proceso puede leer o reemplazar los textos
+        os.makedirs(directorio, mode=0o700, exist_ok=True)
+        self._capacidad_cache = capacidad_cache
+        self._cache: OrderedDict = OrderedDict()
+        self._bytes_cache = 0
+        # Hashes que ya se sabe que están en disco, para no consultar el sistema de archivos
+        self._conocidos: set = set()
+        self._lock = threading.Lock()
+        self._estadisticas = {'escrituras': 0, 'deduplicados': 0, 'reparados': 0, 'aciertos_cache': 0, 'lecturas_disco': 0}
+        _almacenes_abiertos[directorio] = self
+    
+    def __reduce__(self):
+        """Al serializar (ej. una entidad que baja a disco) solo viaja el directorio: los textos ya están en él."""
+        return (_abrir_almacen, (self._directorio, self._capacidad_cache))
+    
+    @property
+    def directorio(self) -> str:
+        return self._directorio
+    
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self._directorio, clave[:2], clave[2:])
+    
+    def _leer_verificado(self, clave: str) -> Optional[bytes]:
+        """Lee el archivo de un hash; None si no existe. Lanza BlobCorrupto si no coincide."""
+        try:
+            with open(self._ruta(clave), 'rb') as archivo:
+                datos = archivo.read()
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(datos).hexdigest() != clave:
+            raise BlobCorrupto(f"El contenido de {clave} no coincide con su hash")
+        return datos
+    
+    def guardar(self, contenido: str) -> str:
+        """Guarda un texto y retorna su hash. Si ya existe (y está íntegro) no se vuelve a escribir."""
+        datos = contenido.encode('utf-8')
+        clave = hashlib.sha256(datos).hexdigest()
+        with self._lock:
+            if clave in self._cache:
+                # La caché solo tiene textos verificados
+                self._cache.move_to_end(clave)
+                self._estadisticas['deduplicados'] += 1
+                return clave
+            try:
+                integro = self._leer_verificado(clave) is not None
+            except BlobCorrupto:
+                integro = False
+                self._estadisticas['reparados'] += 1
+            if integro:
+                self._estadisticas['deduplicados'] += 1
+            else:
+                # Escritura atómica: archivo temporal y luego renombrar
+                ruta = self._ruta(clave)
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta))
+                with os.fdopen(descriptor, 'wb') as archivo:
+                    archivo.write(datos)
+                os.replace(temporal, ruta)
+                self._estadisticas['escrituras'] += 1
+            self._conocidos.add(clave)
+            self._agregar_a_cache(clave, contenido, len(datos))
+        return clave
+    
+    def obtener(self, clave: str) -> str:
+        """Obtiene el texto de un hash, desde la caché o desde disco.
+        Lanza BlobNoEncontrado si no existe y BlobCorrupto si el archivo está dañado."""
+        with self._lock:
+            entrada = self._cache.get(clave)
+            if entrada is not None:
+                self._cache.move_to_end(clave)
+                self._estadisticas['aciertos_cache'] += 1
+                return entrada[0]
+        datos = self._leer_verificado(clave)
+        if datos is None:
+            raise BlobNoEncontrado(f"No existe el contenido {clave}")
+        contenido = datos.decode('utf-8')
+        with self._lock:
+            self._estadisticas['lecturas_disco'] += 1
+            self._agregar_a_cache(clave, contenido, len(datos))
+        return contenido
+    
+    def existe(self, clave: str) -> bool:
+        """Indica si el hash está almacenado."""
+        return clave in self._conocidos or os.path.exists(self._ruta(clave))
+    
+    def _agregar_a_cache(self, clave: str, contenido: str, tamano: int) -> None:
+        """Agrega un texto a la caché LRU y expulsa los menos usados (requiere el lock)."""
+        if tamano > self._capacidad_cache or clave in self._cache:
+            return
+        self._cache[clave] = (contenido, tamano)
+        self._bytes_cache += tamano
+        while self._bytes_cache > self._capacidad_cache:
+            _, (_, tamano_expulsado) = self._cache.popitem(last=False)
+            self._bytes_cache -= tamano_expulsado
+    
+    def vaciar_cache(self) -> None:
+        """Descarta los textos en memoria (el contenido sigue en disco)."""
+        with self._lock:
+            self._cache.clear()
+            self._bytes_cache = 0
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene métricas del almacén: escrituras, deduplicados, aciertos de caché y lecturas de disco."""
+        with self._lock:
+            estadisticas = dict(self._estadisticas)
+            estadisticas['blobs'] = len(self._conocidos)
+            estadisticas['textos_en_cache'] = len(self._cache)
+            estadisticas['bytes_en_cache'] = self._bytes_cache
+            return estadisticas
+
+_almacen_predeterminado: Optional[AlmacenBlobs] = None
+_lock_predeterminado = threading.Lock()
+# directorio -> almacén abierto en este proceso, para reutilizarlo al deserializar
+_almacenes_abiertos: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+def _abrir_almacen(directorio: str, capacidad_cache: int) -> AlmacenBlobs:
+    """Reconstruye un almacén serializado, reutilizando el del proceso si ya hay uno en ese directorio."""
+    almacen = _almacenes_abiertos.get(directorio)
+    return almacen if almacen is not None else AlmacenBlobs(directorio, capacidad_cache)
+
+def obtener_almacen_predeterminado() -> AlmacenBlobs:
+    """Obtiene el almacén compartido del proceso. Si no se configuró uno con
+    establecer_almacen_predeterminado, usa un directorio temporal privado (creado con mkdtemp)
+    que se borra al terminar el proceso, junto con todos los textos de publicaciones: sirve para
+    pruebas y demostraciones, no para datos que deban sobrevivir a la ejecución."""
+    global _almacen_predeterminado
+    with _lock_predeterminado:
+        if _almacen_predeterminado is None:
+            directorio = tempfile.mkdtemp(prefix='aula_virtual_blobs_')
+            atexit.register(shutil.rmtree, directorio, True)
+            _almacen_predeterminado = AlmacenBlobs(directorio)
+        return _almacen_predeterminado
+
+def establecer_almacen_predeterminado(almacen: AlmacenBlobs) -> None:
+    """Configura el almacén compartido, ej. AlmacenBlobs('/var/lib/aula_virtual/blobs') para que
+    los textos persistan. Debe llamarse antes de crear publicaciones: las ya creadas siguen
+    apuntando al almacén anterior."""
+    global _almacen_predeterminado
+    with _lock_predeterminado:
+        _almacen_predeterminado = almacen
\ No newline at end of file
@@ -0,0 +1,144 @@
+import gzip
+import json
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Dict
+
+# Nombres con que se registran los gestores en el archivo
+GESTORES = ('alumnos', 'asignaturas', 'matriculas', 'cierre', 'reportes')
+
+def normalizar_resultado(valor: Any) -> Any:
+    """Convierte un resultado de gestor en datos comparables entre ejecuciones.
+    Las entidades se reemplazan por su información completa sin las fechas, que dependen del reloj."""
+    if hasattr(valor, 'obtener_info_completa'):
+        valor = valor.obtener_info_completa()
+    if isinstance(valor, dict):
+        return {str(clave): normalizar_resultado(dato) for clave, dato in valor.items() if not str(clave).startswith('fecha')}
+    if isinstance(valor, (list, tuple)):
+        return [normalizar_resultado(dato) for dato in valor]
+    if isinstance(valor, (set, frozenset)):
+        return sorted((normalizar_resultado(dato) for dato in valor), key=repr)
+    if isinstance(valor, float):
+        return round(valor, 9)
+    if isinstance(valor, datetime):
+        return None
+    if valor is None or isinstance(valor, (str, int)):
+        return valor
+    # Otros objetos (ej. una UnidadDeTrabajo) solo se comparan por su tipo
+    return type(valor).__name__
+
+def huella_resultado(valor: Any) -> int:
+    """Huella (CRC32) de un resultado normalizado, para detectar divergencias sin guardar el resultado."""
+    return zlib.crc32(json.dumps(normalizar_resultado(valor), sort_keys=True, default=str).encode('utf-8'))
+
+class _GestorGrabado:
+    """Proxy que registra cada llamada a un método público del gestor envuelto."""
+    
+    def __init__(self, grabador: 'GrabadorCarga', gestor: Any, nombre: str):
+        self._grabador = grabador
+        self._gestor = gestor
+        self._nombre = nombre
+    
+    def __getattr__(self, metodo: str) -> Any:
+        atributo = getattr(self._gestor, metodo)
+        if metodo.startswith('_') or not callable(atributo):
+            return atributo
+        grabador, nombre = self._grabador, self._nombre
+        
+        def envoltura(*args, **kwargs):
+            if not grabador._activo:
+                return atributo(*args, **kwargs)
+            inicio = time.perf_counter_ns()
+            try:
+                resultado = atributo(*args, **kwargs)
+            except Exception as error:
+                grabador._registrar(nombre, metodo, args, kwargs, inicio, f"error:{type(error).__name__}")
+                raise
+            grabador._registrar(nombre, metodo, args, kwargs, inicio, resultado)
+            return resultado
+        
+        return envoltura
+
+class GrabadorCarga:
+    """Registra en un archivo compacto (JSON por líneas comprimido con gzip) las llamadas a los gestores.
+    Principio OCP: Se activa envolviendo los gestores, sin modificarlos.
+    Cada línea guarda [inicio_us, duracion_us, gestor, metodo, args, kwargs, huella del resultado].
+    Los argumentos que son funciones (ej. 'progreso') se guardan como null; una llamada con otros
+    argumentos no serializables (ej. una transacción abierta) se guarda con args null y el
+    reproductor la omite."""
+    
+    def __init__(self, ruta: str, nivel_compresion: int = 6):
+        self._ruta = ruta
+        self._archivo = gzip.open(ruta, 'wt', encoding='utf-8', compresslevel=nivel_compresion)
+        self._lock = threading.Lock()
+        self._origen = time.perf_counter_ns()
+        self._activo = True
+        self._llamadas = 0
+        self._no_serializables = 0
+    
+    @property
+    def ruta(self) -> str:
+        return self._ruta
+    
+    @property
+    def activo(self) -> bool:
+        return self._activo
+    
+    def envolver(self, gestor: Any, nombre: str) -> Any:
+        """Retorna un proxy del gestor que registra sus llamadas bajo 'nombre' (uno de GESTORES)."""
+        if nombre not in GESTORES:
+            raise ValueError(f"Nombre de gestor desconocido: {nombre}")
+        return _GestorGrabado(self, gestor, nombre)
+    
+    def pausar(self) -> None:
+        """Deja de registrar llamadas sin cerrar el archivo."""
+        self._activo = False
+    
+    def reanudar(self) -> None:
+        """Vuelve a registrar llamadas."""
+        self._activo = True
+    
+    @staticmethod
+    def _serializable(valor: Any) -> Any:
+        return None if callable(valor) else valor
+    
+    def _registrar(self, gestor: str, metodo: str, args: tuple, kwargs: Dict[str, Any], inicio: int, resultado: Any) -> None:
+        fin = time.perf_counter_ns()
+        huella = resultado if isinstance(resultado, str) and resultado.startswith('error:') else huella_resultado(resultado)
+        try:
+            argumentos = json.dumps([[self._serializable(valor) for valor in args],
+                                     {clave: self._serializable(valor) for clave, valor in kwargs.items()}],
+                                    ensure_ascii=False, separators=(',', ':'))
+        except (TypeError, ValueError):
+            argumentos = 'null,null'
+            self._no_serializables += 1
+        else:
+            argumentos = argumentos[1:-1]
+        linea = (f'[{(inicio - self._origen) // 1000},{(fin - inicio) // 1000},"{gestor}","{metodo}",'
+                 f'{argumentos},{json.dumps(huella)}]\n')
+        with self._lock:
+            if self._archivo is None:
+                return
+            self._archivo.write(linea)
+            self._llamadas += 1
+    
+    def cerrar(self) -> None:
+        """Cierra el archivo; las llamadas posteriores ya no se registran."""
+        with self._lock:
+            self._activo = False
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+    
+    def __enter__(self) -> 'GrabadorCarga':
+        return self
+    
+    def __exit__(self, tipo_error, error, traza) -> bool:
+        self.cerrar()
+        return False
+    
+    def obtener_estadisticas(self) -> Dict[str, int]:
+        """Obtiene cuántas llamadas se registraron y cuántas no pudieron serializarse."""
+        return {'llamadas': self._llamadas, 'no_serializables': self._no_serializables}
\ No newline at end of file
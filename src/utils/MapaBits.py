@@ -0,0 +1,177 @@
+from array import array
+from bisect import bisect_left
+from itertools import chain, compress
+from typing import Dict, Iterable, Iterator, Union
+
+# Cada bloque cubre 2^16 posiciones; bajo este umbral se guarda como arreglo ordenado
+TAMANO_BLOQUE = 1 << 16
+LIMITE_ARREGLO = 4096
+
+Bloque = Union[array, int]
+
+def _a_bits(posiciones: Iterable[int]) -> int:
+    """Convierte posiciones de un bloque en un entero usado como mapa de bits."""
+    datos = bytearray(TAMANO_BLOQUE // 8)
+    for posicion in posiciones:
+        datos[posicion >> 3] |= 1 << (posicion & 7)
+    return int.from_bytes(datos, 'little')
+
+# Traduce los dígitos '0'/'1' de bin() a bytes 0/1 para filtrar posiciones con compress
+_DIGITOS_A_BYTES = bytes.maketrans(b'01', b'\x00\x01')
+_POSICIONES = range(TAMANO_BLOQUE)
+
+def _a_arreglo(bits: int) -> array:
+    """Convierte un mapa de bits de un bloque en un arreglo ordenado de posiciones."""
+    banderas = format(bits, f'0{TAMANO_BLOQUE}b')[::-1].encode('ascii').translate(_DIGITOS_A_BYTES)
+    return array('H', compress(_POSICIONES, banderas))
+
+def _cantidad(bloque: Bloque) -> int:
+    return bloque.bit_count() if isinstance(bloque, int) else len(bloque)
+
+def _normalizar(bloque: Bloque) -> Bloque:
+    """Elige la representación más compacta para el bloque."""
+    if isinstance(bloque, int):
+        return _a_arreglo(bloque) if bloque.bit_count() <= LIMITE_ARREGLO else bloque
+    return array('H', bloque) if len(bloque) <= LIMITE_ARREGLO else _a_bits(bloque)
+
+def _contiene(bloque: Bloque, posicion: int) -> bool:
+    if isinstance(bloque, int):
+        return bool(bloque >> posicion & 1)
+    indice = bisect_left(bloque, posicion)
+    return indice < len(bloque) and bloque[indice] == posicion
+
+def _interseccion(a: Bloque, b: Bloque) -> Bloque:
+    if isinstance(a, int) and isinstance(b, int):
+        return a & b
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        datos = b.to_bytes(TAMANO_BLOQUE // 8, 'little')
+        return array('H', [posicion for posicion in a if datos[posicion >> 3] >> (posicion & 7) & 1])
+    return array('H', sorted(set(a).intersection(b)))
+
+def _union(a: Bloque, b: Bloque) -> Bloque:
+    if isinstance(a, int) and isinstance(b, int):
+        return a | b
+    if isinstance(a, int) or isinstance(b, int):
+        bits, otro = (a, b) if isinstance(a, int) else (b, a)
+        return bits | _a_bits(otro)
+    return array('H', sorted(set(a).union(b)))
+
+def _diferencia(a: Bloque, b: Bloque) -> Bloque:
+    if isinstance(a, int) and isinstance(b, int):
+        return a & ~b
+    if isinstance(a, int):
+        return a & ~_a_bits(b)
+    if isinstance(b, int):
+        datos = b.to_bytes(TAMANO_BLOQUE // 8, 'little')
+        return array('H', [posicion for posicion in a if not datos[posicion >> 3] >> (posicion & 7) & 1])
+    return array('H', sorted(set(a).difference(b)))
+
+class MapaBits:
+    """Conjunto de enteros no negativos comprimido por bloques (al estilo de los Roaring bitmaps).
+    Principio SRP: Solo representa el conjunto y su álgebra.
+    Cada bloque de 2^16 posiciones se guarda como arreglo ordenado si tiene pocos elementos o
+    como mapa de bits si es denso, de modo que intersección, unión, diferencia y conteo
+    trabajan bloque a bloque sin pasar por listas de IDs."""
+    
+    __slots__ = ('_bloques',)
+    
+    def __init__(self, valores: Iterable[int] = ()):
+        self._bloques: Dict[int, Bloque] = {}
+        agrupados: Dict[int, list] = {}
+        for valor in valores:
+            agrupados.setdefault(valor >> 16, []).append(valor & 0xFFFF)
+        for clave, posiciones in agrupados.items():
+            self._bloques[clave] = _normalizar(sorted(set(posiciones)))
+    
+    @classmethod
+    def _desde_bloques(cls, bloques: Dict[int, Bloque]) -> 'MapaBits':
+        mapa = cls()
+        mapa._bloques = {clave: _normalizar(bloque) for clave, bloque in bloques.items() if _cantidad(bloque)}
+        return mapa
+    
+    def agregar(self, valor: int) -> bool:
+        """Agrega un valor. Retorna False si ya estaba."""
+        clave, posicion = valor >> 16, valor & 0xFFFF
+        bloque = self._bloques.get(clave)
+        if bloque is None:
+            self._bloques[clave] = array('H', [posicion])
+            return True
+        if isinstance(bloque, int):
+            if bloque >> posicion & 1:
+                return False
+            self._bloques[clave] = bloque | (1 << posicion)
+            return True
+        indice = bisect_left(bloque, posicion)
+        if indice < len(bloque) and bloque[indice] == posicion:
+            return False
+        bloque.insert(indice, posicion)
+        if len(bloque) > LIMITE_ARREGLO:
+            self._bloques[clave] = _a_bits(bloque)
+        return True
+    
+    def quitar(self, valor: int) -> bool:
+        """Quita un valor. Retorna False si no estaba."""
+        clave, posicion = valor >> 16, valor & 0xFFFF
+        bloque = self._bloques.get(clave)
+        if bloque is None or not _contiene(bloque, posicion):
+            return False
+        if isinstance(bloque, int):
+            bloque &= ~(1 << posicion)
+            self._bloques[clave] = _normalizar(bloque)
+        else:
+            del bloque[bisect_left(bloque, posicion)]
+        if not _cantidad(self._bloques[clave]):
+            del self._bloques[clave]
+        return True
+    
+    def __contains__(self, valor: int) -> bool:
+        bloque = self._bloques.get(valor >> 16)
+        return bloque is not None and _contiene(bloque, valor & 0xFFFF)
+    
+    def __len__(self) -> int:
+        return sum(_cantidad(bloque) for bloque in self._bloques.values())
+    
+    def __iter__(self) -> Iterator[int]:
+        bloques = []
+        for clave in sorted(self._bloques):
+            bloque = self._bloques[clave]
+            posiciones = _a_arreglo(bloque) if isinstance(bloque, int) else bloque
+            bloques.append(map((clave << 16).__add__, posiciones) if clave else posiciones)
+        return chain.from_iterable(bloques)
+    
+    def __and__(self, otro: 'MapaBits') -> 'MapaBits':
+        return MapaBits._desde_bloques({clave: _interseccion(bloque, otro._bloques[clave])
+                                        for clave, bloque in self._bloques.items() if clave in otro._bloques})
+    
+    def __or__(self, otro: 'MapaBits') -> 'MapaBits':
+        bloques = dict(self._bloques)
+        for clave, bloque in otro._bloques.items():
+            bloques[clave] = _union(bloques[clave], bloque) if clave in bloques else bloque
+        return MapaBits._desde_bloques(bloques)
+    
+    def __sub__(self, otro: 'MapaBits') -> 'MapaBits':
+        return MapaBits._desde_bloques({clave: _diferencia(bloque, otro._bloques[clave]) if clave in otro._bloques else bloque
+                                        for clave, bloque in self._bloques.items()})
+    
+    def contar_interseccion(self, otro: 'MapaBits') -> int:
+        """Cantidad de elementos comunes, sin construir el conjunto resultante."""
+        total = 0
+        for clave, bloque in self._bloques.items():
+            otro_bloque = otro._bloques.get(clave)
+            if otro_bloque is None:
+                continue
+            if isinstance(bloque, int) and isinstance(otro_bloque, int):
+                total += (bloque & otro_bloque).bit_count()
+            else:
+                total += _cantidad(_interseccion(bloque, otro_bloque))
+        return total
+    
+    def copiar(self) -> 'MapaBits':
+        """Crea una copia independiente."""
+        return MapaBits._desde_bloques({clave: bloque if isinstance(bloque, int) else array('H', bloque)
+                                        for clave, bloque in self._bloques.items()})
+    
+    def __repr__(self) -> str:
+        return f"MapaBits({len(self)} elementos, {len(self._bloques)} bloques)"
\ No newline at end of file
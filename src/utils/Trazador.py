@@ -0,0 +1,155 @@
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+class _Tramo:
+    """Tramo (span) en curso. Se usa como context manager."""
+    
+    __slots__ = ('_trazador', '_nombre', '_categoria', '_args', '_inicio', '_muestreado')
+    
+    def __init__(self, trazador: 'Trazador', nombre: str, categoria: str, args: Optional[Dict[str, Any]]):
+        self._trazador = trazador
+        self._nombre = nombre
+        self._categoria = categoria
+        self._args = args
+        self._inicio = 0
+        self._muestreado = False
+    
+    def __enter__(self) -> '_Tramo':
+        self._muestreado = self._trazador._abrir_tramo()
+        self._inicio = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, tipo_error, error, traza) -> bool:
+        fin = time.perf_counter_ns()
+        self._trazador._cerrar_tramo(self, fin, tipo_error)
+        return False
+
+class Trazador:
+    """Registra tramos anidados de operaciones y los exporta al formato Chrome trace.
+    Principio SRP: Se encarga únicamente de medir y registrar la ejecución.
+    El muestreo se decide en el tramo raíz y lo heredan sus tramos hijos,
+    de modo que cada traza registrada queda completa."""
+    
+    def __init__(self, tasa_muestreo: float = 1.0, capacidad: int = 100000):
+        self._tasa_muestreo = tasa_muestreo
+        self._eventos: deque = deque(maxlen=capacidad)
+        self._local = threading.local()
+        self._activo = False
+        self._origen = time.perf_counter_ns()
+        self._pid = os.getpid()
+    
+    @property
+    def activo(self) -> bool:
+        return self._activo
+    
+    @property
+    def tasa_muestreo(self) -> float:
+        return self._tasa_muestreo
+    
+    def activar(self, tasa_muestreo: Optional[float] = None) -> None:
+        """Activa el registro de tramos, opcionalmente con una nueva tasa de muestreo."""
+        if tasa_muestreo is not None:
+            if tasa_muestreo < 0 or tasa_muestreo > 1:
+                raise ValueError("La tasa de muestreo debe estar entre 0 y 1")
+            self._tasa_muestreo = tasa_muestreo
+        self._activo = True
+    
+    def desactivar(self) -> None:
+        """Desactiva el registro de tramos."""
+        self._activo = False
+    
+    def limpiar(self) -> None:
+        """Descarta los eventos registrados."""
+        self._eventos.clear()
+    
+    def tramo(self, nombre: str, categoria: str = "general", args: Optional[Dict[str, Any]] = None) -> _Tramo:
+        """Crea un tramo para usar con 'with'."""
+        return _Tramo(self, nombre, categoria, args)
+    
+    def _abrir_tramo(self) -> bool:
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = []
+            self._local.pila = pila
+        if pila:
+            muestreado = pila[-1]
+        else:
+            muestreado = self._tasa_muestreo >= 1 or random.random() < self._tasa_muestreo
+        pila.append(muestreado)
+        return muestreado
+    
+    def _cerrar_tramo(self, tramo: _Tramo, fin: int, tipo_error) -> None:
+        self._local.pila.pop()
+        if not tramo._muestreado:
+            return
+        evento = {
+            'name': tramo._nombre,
+            'cat': tramo._categoria,
+            'ph': 'X',
+            'ts': (tramo._inicio - self._origen) / 1000,
+            'dur': (fin - tramo._inicio) / 1000,
+            'pid': self._pid,
+            'tid': threading.get_ident()
+        }
+        args = dict(tramo._args) if tramo._args else {}
+        if tipo_error is not None:
+            args['error'] = tipo_error.__name__
+        if args:
+            evento['args'] = args
+        self._eventos.append(evento)
+    
+    def obtener_eventos(self) -> List[Dict[str, Any]]:
+        """Obtiene una copia de los eventos registrados."""
+        return list(self._eventos)
+    
+    def exportar_chrome(self) -> Dict[str, Any]:
+        """Obtiene los eventos en el formato JSON de Chrome trace-event."""
+        return {
+            'traceEvents': self.obtener_eventos(),
+            'displayTimeUnit': 'ms',
+            'otherData': {'tasa_muestreo': self._tasa_muestreo}
+        }
+    
+    def guardar_chrome(self, ruta: str) -> int:
+        """Guarda la traza en un archivo legible por chrome://tracing o Perfetto.
+        Retorna la cantidad de eventos escritos."""
+        datos = self.exportar_chrome()
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo, ensure_ascii=False)
+        return len(datos['traceEvents'])
+    
+    def obtener_resumen(self) -> Dict[str, Dict[str, float]]:
+        """Agrupa los eventos por nombre: cantidad, tiempo total y promedio (en µs)."""
+        resumen: Dict[str, Dict[str, float]] = {}
+        for evento in self._eventos:
+            datos = resumen.setdefault(evento['name'], {'cantidad': 0, 'total_us': 0.0})
+            datos['cantidad'] += 1
+            datos['total_us'] += evento['dur']
+        for datos in resumen.values():
+            datos['promedio_us'] = datos['total_us'] / datos['cantidad']
+        return resumen
+
+# Trazador global del sistema, inactivo por defecto
+trazador = Trazador()
+
+def trazado(categoria: str) -> Callable:
+    """Decorador que registra cada llamada al método como un tramo del trazador global.
+    Si el trazador está inactivo el costo es una sola verificación de atributo."""
+    def decorador(funcion: Callable) -> Callable:
+        nombre = funcion.__qualname__
+        
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not trazador._activo:
+                return funcion(*args, **kwargs)
+            with _Tramo(trazador, nombre, categoria, None):
+                return funcion(*args, **kwargs)
+        
+        return envoltura
+    return decorador
\ No newline at end of file
@@ -0,0 +1 @@
+# Paquete de utilidades
\ No newline at end of file